@@ -0,0 +1,265 @@
+"""Benchmark project parsing, staging and result copy-back on a synthetic project.
+
+Generates a large synthetic project (see ``hecras_runner.synthetic``) and
+times the I/O paths that scale with project size:
+
+- ``parse_project`` without the project cache (sequential and threaded) and
+  with a warm cache
+- ``copy_project_to_temp`` with plan patching
+- ``copy_results_back``
+- the DSS patchers ``update_dss_paths`` and ``_fix_dss_paths_for_temp``
+
+Results are written as JSON so runs can be compared across versions; progress
+goes to stderr, so redirecting stdout works as well as ``--output``::
+
+    python benchmarks/bench_io.py --workdir D:/bench --output new.json
+    python benchmarks/bench_io.py --workdir D:/bench > new.json
+    python benchmarks/bench_io.py --workdir D:/bench --compare old.json
+
+Point ``--workdir`` at the drive you want to measure (local SSD, RAM disk,
+network share); the project is generated once and reused.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import UTC, datetime
+
+from hecras_runner import __version__
+from hecras_runner.file_ops import (
+    _fix_dss_paths_for_temp,
+    copy_project_to_temp,
+    copy_results_back,
+    update_dss_paths,
+)
+from hecras_runner.parser import DEFAULT_PARSE_WORKERS, parse_project
+from hecras_runner.project_cache import ProjectCache
+from hecras_runner.rasmap import staged_size
+from hecras_runner.scratch import directory_size
+from hecras_runner.synthetic import SyntheticSpec, generate_project
+
+_SPEC_FILE = "bench_spec.json"
+
+
+def _quiet(_msg: str) -> None:
+    pass
+
+
+def _project(workdir: str, spec: SyntheticSpec) -> str:
+    """Generate the project in *workdir* unless one with the same spec exists."""
+    project_dir = os.path.join(workdir, spec.name)
+    prj = os.path.join(project_dir, f"{spec.name}.prj")
+    spec_path = os.path.join(project_dir, _SPEC_FILE)
+    try:
+        with open(spec_path, encoding="utf-8") as f:
+            if json.load(f) == asdict(spec) and os.path.isfile(prj):
+                return prj
+    except (OSError, ValueError):
+        pass
+    shutil.rmtree(project_dir, ignore_errors=True)
+    print(f"Generating {spec.plans}-plan project in {project_dir}...", file=sys.stderr)
+    generate_project(project_dir, spec)
+    with open(spec_path, "w", encoding="utf-8") as f:
+        json.dump(asdict(spec), f, indent=2)
+    return prj
+
+
+def _copy_files(src_dir: str, dst_dir: str, markers: tuple[str, ...] = ()) -> None:
+    """Copy the top-level files of *src_dir* whose name contains one of *markers*."""
+    os.makedirs(dst_dir, exist_ok=True)
+    for entry in os.scandir(src_dir):
+        if entry.is_file() and (not markers or any(m in entry.name for m in markers)):
+            shutil.copy2(entry.path, os.path.join(dst_dir, entry.name))
+
+
+def _measure(
+    repeat: int,
+    run: Callable[[], object],
+    setup: Callable[[], object] | None = None,
+    teardown: Callable[[], object] | None = None,
+) -> dict[str, object]:
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        run()
+        runs.append(time.perf_counter() - t0)
+        if teardown:
+            teardown()
+    return {
+        "runs": [round(r, 6) for r in runs],
+        "min": round(min(runs), 6),
+        "median": round(statistics.median(runs), 6),
+        "mean": round(statistics.fmean(runs), 6),
+    }
+
+
+def run_benchmarks(prj: str, repeat: int, scratch_dir: str) -> dict[str, dict[str, object]]:
+    results: dict[str, dict[str, object]] = {}
+    project_dir = os.path.dirname(prj)
+    cache_dir = tempfile.mkdtemp(prefix="bench_cache_", dir=scratch_dir)
+
+    def bench(name: str, *args: Callable[[], object] | None) -> None:
+        print(f"  {name}...", end="", flush=True, file=sys.stderr)
+        results[name] = _measure(repeat, *args)  # type: ignore[arg-type]
+        print(f" {results[name]['median']:.3f}s", file=sys.stderr)
+
+    bench("parse_project.cold_sequential", lambda: parse_project(prj))
+    bench(
+        "parse_project.cold_threaded",
+        lambda: parse_project(prj, max_workers=DEFAULT_PARSE_WORKERS),
+    )
+
+    parse_project(prj, cache=ProjectCache(prj, cache_dir))
+    bench(
+        "parse_project.warm_cache",
+        lambda: parse_project(prj, cache=ProjectCache(prj, cache_dir), max_workers=1),
+    )
+
+    staged: list[str] = []
+
+    def stage() -> None:
+        staged.append(
+            copy_project_to_temp(
+                prj, log=_quiet, plan_key="p01", write_detailed=True, temp_root=scratch_dir
+            )
+        )
+
+    def drop_staged() -> None:
+        while staged:
+            shutil.rmtree(os.path.dirname(staged.pop()), ignore_errors=True)
+
+    bench("copy_project_to_temp", stage, None, drop_staged)
+
+    # Results: a fresh .p01.hdf in a staged copy, copied back into a copy of
+    # the project's top-level files (the terrain is not needed there)
+    work_dir = tempfile.mkdtemp(prefix="bench_work_", dir=scratch_dir)
+    main_copy = os.path.join(work_dir, "main")
+    _copy_files(project_dir, main_copy)
+    name = os.path.splitext(os.path.basename(prj))[0]
+
+    def stage_with_results() -> None:
+        stage()
+        with open(os.path.join(os.path.dirname(staged[-1]), f"{name}.p01.hdf"), "wb") as f:
+            f.write(os.urandom(8 * 1024**2))
+
+    bench(
+        "copy_results_back",
+        lambda: copy_results_back(staged[-1], main_copy, "01", log=_quiet),
+        stage_with_results,
+        drop_staged,
+    )
+
+    # DSS patchers rewrite every .u## in place, so each run gets fresh copies
+    patch_dir = os.path.join(work_dir, "patch")
+    external = r"C:\Data\external.dss"
+
+    def fresh_flows(absolute: bool = False) -> None:
+        shutil.rmtree(patch_dir, ignore_errors=True)
+        _copy_files(project_dir, patch_dir, (".u", ".dss"))
+        if absolute:
+            # Point every boundary at an absolute path of a DSS file that is
+            # present, which is what the temp-copy fixer rewrites; the stale
+            # root must be absolute on this OS for the fixer to touch it
+            dss = next(f for f in os.listdir(patch_dir) if f.endswith(".dss"))
+            stale_root = os.path.abspath(os.sep + "OldMachine")
+            update_dss_paths(patch_dir, os.path.join(stale_root, dss), log=_quiet)
+
+    bench(
+        "update_dss_paths",
+        lambda: update_dss_paths(patch_dir, external, log=_quiet),
+        fresh_flows,
+    )
+    bench(
+        "fix_dss_paths_for_temp",
+        lambda: _fix_dss_paths_for_temp(patch_dir, log=_quiet),
+        lambda: fresh_flows(absolute=True),
+    )
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def _compare(current: dict, baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(
+        f"\nCompared with {baseline_path} (version {baseline.get('version', '?')}):",
+        file=sys.stderr,
+    )
+    for name, stats in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            print(f"  {name:<34} {stats['median']:>9.3f}s  (new)", file=sys.stderr)
+            continue
+        ratio = stats["median"] / old["median"] if old["median"] else float("inf")
+        print(
+            f"  {name:<34} {stats['median']:>9.3f}s  vs {old['median']:>9.3f}s  x{ratio:.2f}",
+            file=sys.stderr,
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "hecras_bench"))
+    parser.add_argument("--plans", type=int, default=99)
+    parser.add_argument("--cross-sections", type=int, default=1500, metavar="N")
+    parser.add_argument("--terrain-gb", type=float, default=2.0, metavar="GB")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", metavar="JSON", help="Write results here (default: stdout)")
+    parser.add_argument("--compare", metavar="JSON", help="Baseline results to compare with")
+    args = parser.parse_args(argv)
+
+    spec = SyntheticSpec(
+        plans=args.plans,
+        flows=args.plans,
+        cross_sections=args.cross_sections,
+        terrain_gb=args.terrain_gb,
+    )
+    os.makedirs(args.workdir, exist_ok=True)
+    prj = _project(args.workdir, spec)
+    scratch_dir = tempfile.mkdtemp(prefix="bench_scratch_", dir=args.workdir)
+
+    print(f"Benchmarking {prj} ({args.repeat} run(s) each)", file=sys.stderr)
+    try:
+        results = run_benchmarks(prj, args.repeat, scratch_dir)
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    report = {
+        "version": __version__,
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "workdir": os.path.abspath(args.workdir),
+        "spec": asdict(spec),
+        "project_bytes": directory_size(os.path.dirname(prj)),
+        "staged_bytes": staged_size(prj),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        _compare(report, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
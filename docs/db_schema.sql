@@ -126,3 +126,214 @@ CREATE INDEX IF NOT EXISTS idx_metrics_job_id
 INSERT INTO hecras_runner.schema_version (version, description)
 VALUES (1, 'Core tables: workers, batches, jobs, metrics')
 ON CONFLICT DO NOTHING;
+
+-- ── Migration 002: Job queue notifications ──
+
+-- Wake LISTENing workers as soon as a job is queued (new or re-queued)
+CREATE OR REPLACE FUNCTION hecras_runner.notify_job_queued() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('hecras_jobs', NEW.batch_id::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jobs_notify_queued ON hecras_runner.jobs;
+CREATE TRIGGER jobs_notify_queued
+    AFTER INSERT OR UPDATE OF status ON hecras_runner.jobs
+    FOR EACH ROW WHEN (NEW.status = 'queued')
+    EXECUTE FUNCTION hecras_runner.notify_job_queued();
+
+INSERT INTO hecras_runner.schema_version (version, description)
+VALUES (2, 'NOTIFY hecras_jobs when a job is queued')
+ON CONFLICT DO NOTHING;
+
+-- ── Migration 003: Batch status counters ──
+
+-- Per-status job counts on batches, maintained by a trigger; the same UPDATE
+-- settles the batch status, so batch completion is decided atomically
+ALTER TABLE hecras_runner.batches
+    ADD COLUMN IF NOT EXISTS queued_jobs    INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS assigned_jobs  INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS running_jobs   INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS completed_jobs INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS failed_jobs    INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS cancelled_jobs INTEGER NOT NULL DEFAULT 0;
+
+UPDATE hecras_runner.batches b SET
+    queued_jobs = c.queued,
+    assigned_jobs = c.assigned,
+    running_jobs = c.running,
+    completed_jobs = c.completed,
+    failed_jobs = c.failed,
+    cancelled_jobs = c.cancelled
+FROM (
+    SELECT batch_id,
+        COUNT(*) FILTER (WHERE status = 'queued') AS queued,
+        COUNT(*) FILTER (WHERE status = 'assigned') AS assigned,
+        COUNT(*) FILTER (WHERE status = 'running') AS running,
+        COUNT(*) FILTER (WHERE status = 'completed') AS completed,
+        COUNT(*) FILTER (WHERE status = 'failed') AS failed,
+        COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled
+    FROM hecras_runner.jobs GROUP BY batch_id
+) c
+WHERE b.id = c.batch_id;
+
+CREATE OR REPLACE FUNCTION hecras_runner.count_job_status() RETURNS trigger AS $$
+DECLARE
+    old_status TEXT;
+    new_status TEXT;
+    batch UUID;
+    dq INTEGER; da INTEGER; dr INTEGER; dc INTEGER; df INTEGER; dx INTEGER;
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.status = NEW.status THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        old_status := OLD.status;
+        batch := OLD.batch_id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        new_status := NEW.status;
+        batch := NEW.batch_id;
+    END IF;
+    dq := (new_status IS NOT DISTINCT FROM 'queued')::int
+        - (old_status IS NOT DISTINCT FROM 'queued')::int;
+    da := (new_status IS NOT DISTINCT FROM 'assigned')::int
+        - (old_status IS NOT DISTINCT FROM 'assigned')::int;
+    dr := (new_status IS NOT DISTINCT FROM 'running')::int
+        - (old_status IS NOT DISTINCT FROM 'running')::int;
+    dc := (new_status IS NOT DISTINCT FROM 'completed')::int
+        - (old_status IS NOT DISTINCT FROM 'completed')::int;
+    df := (new_status IS NOT DISTINCT FROM 'failed')::int
+        - (old_status IS NOT DISTINCT FROM 'failed')::int;
+    dx := (new_status IS NOT DISTINCT FROM 'cancelled')::int
+        - (old_status IS NOT DISTINCT FROM 'cancelled')::int;
+
+    UPDATE hecras_runner.batches SET
+        queued_jobs = queued_jobs + dq,
+        assigned_jobs = assigned_jobs + da,
+        running_jobs = running_jobs + dr,
+        completed_jobs = completed_jobs + dc,
+        failed_jobs = failed_jobs + df,
+        cancelled_jobs = cancelled_jobs + dx,
+        status = CASE
+            WHEN status IN ('completed', 'failed', 'cancelled') THEN status
+            WHEN completed_jobs + dc + failed_jobs + df + cancelled_jobs + dx >= total_jobs
+                THEN CASE WHEN failed_jobs + df > 0 THEN 'failed' ELSE 'completed' END
+            WHEN status = 'pending' AND running_jobs + dr > 0 THEN 'running'
+            ELSE status
+        END,
+        completed_at = CASE
+            WHEN status NOT IN ('completed', 'failed', 'cancelled')
+                 AND completed_jobs + dc + failed_jobs + df + cancelled_jobs + dx >= total_jobs
+                THEN now()
+            ELSE completed_at
+        END
+    WHERE id = batch;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jobs_count_status ON hecras_runner.jobs;
+CREATE TRIGGER jobs_count_status
+    AFTER INSERT OR UPDATE OF status OR DELETE ON hecras_runner.jobs
+    FOR EACH ROW EXECUTE FUNCTION hecras_runner.count_job_status();
+
+INSERT INTO hecras_runner.schema_version (version, description)
+VALUES (3, 'Per-status job counters on batches')
+ON CONFLICT DO NOTHING;
+
+-- ── Migration 004: Job leases and reaper ──
+
+-- Claims lease a job; worker heartbeats extend the lease. Live workers call
+-- reap_expired_jobs() on every heartbeat (it can also be scheduled, e.g. with
+-- pg_cron) to requeue jobs of dead workers, failing them after max_attempts.
+ALTER TABLE hecras_runner.jobs
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS attempts         INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS max_attempts     INTEGER NOT NULL DEFAULT 3;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_lease
+    ON hecras_runner.jobs (lease_expires_at) WHERE status IN ('assigned', 'running');
+
+CREATE OR REPLACE FUNCTION hecras_runner.reap_expired_jobs() RETURNS INTEGER AS $$
+DECLARE
+    reaped INTEGER;
+BEGIN
+    WITH expired AS (
+        SELECT id FROM hecras_runner.jobs
+        WHERE status IN ('assigned', 'running') AND lease_expires_at < now()
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE hecras_runner.jobs j SET
+        status = CASE WHEN j.attempts >= j.max_attempts THEN 'failed' ELSE 'queued' END,
+        error_message = CASE
+            WHEN j.attempts >= j.max_attempts
+                THEN format('Worker lost (lease expired) on all %s attempts', j.attempts)
+            ELSE j.error_message
+        END,
+        completed_at = CASE WHEN j.attempts >= j.max_attempts THEN now() END,
+        worker_id = NULL,
+        lease_expires_at = NULL,
+        assigned_at = NULL,
+        started_at = NULL,
+        progress = 0.0
+    FROM expired
+    WHERE j.id = expired.id;
+    GET DIAGNOSTICS reaped = ROW_COUNT;
+    RETURN reaped;
+END;
+$$ LANGUAGE plpgsql;
+
+INSERT INTO hecras_runner.schema_version (version, description)
+VALUES (4, 'Job leases, attempts and reaper')
+ON CONFLICT DO NOTHING;
+
+-- ── Migration 005: Job requirements and terrain hash ──
+
+ALTER TABLE hecras_runner.jobs
+    ADD COLUMN IF NOT EXISTS requirements JSONB NOT NULL DEFAULT '{}'::jsonb,
+    ADD COLUMN IF NOT EXISTS terrain_hash TEXT NOT NULL DEFAULT '';
+
+INSERT INTO hecras_runner.schema_version (version, description)
+VALUES (5, 'Job requirements and terrain hash for worker matching')
+ON CONFLICT DO NOTHING;
+
+-- ── Migration 006: Job priorities and fair-share ──
+
+ALTER TABLE hecras_runner.jobs
+    ADD COLUMN IF NOT EXISTS priority     INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS submitted_by TEXT NOT NULL DEFAULT '',
+    ADD COLUMN IF NOT EXISTS queued_at    TIMESTAMPTZ NOT NULL DEFAULT now();
+
+UPDATE hecras_runner.jobs j
+SET submitted_by = b.submitted_by, queued_at = b.submitted_at
+FROM hecras_runner.batches b
+WHERE b.id = j.batch_id;
+
+-- Fair-share weights; submitters without a row have weight 1
+CREATE TABLE IF NOT EXISTS hecras_runner.user_shares (
+    submitted_by TEXT PRIMARY KEY,
+    weight       REAL NOT NULL DEFAULT 1.0 CHECK (weight > 0)
+);
+
+-- Claims rank queued jobs per submitter by priority
+DROP INDEX IF EXISTS hecras_runner.idx_jobs_queued;
+CREATE INDEX IF NOT EXISTS idx_jobs_queued_fair
+    ON hecras_runner.jobs (submitted_by, priority DESC, id) WHERE status = 'queued';
+
+INSERT INTO hecras_runner.schema_version (version, description)
+VALUES (6, 'Job priorities and fair-share across submitters')
+ON CONFLICT DO NOTHING;
+
+-- ── Migration 007: Queued-jobs index in claim order ──
+
+-- Claims read each submitter's queued jobs from this index in the order
+-- they are handed out (oldest first within a priority)
+DROP INDEX IF EXISTS hecras_runner.idx_jobs_queued_fair;
+CREATE INDEX IF NOT EXISTS idx_jobs_queued_claim
+    ON hecras_runner.jobs (submitted_by, priority DESC, queued_at, id) WHERE status = 'queued';
+
+INSERT INTO hecras_runner.schema_version (version, description)
+VALUES (7, 'Queued-jobs index in claim order')
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,554 @@
+"""SQL and row helpers shared by the job queue clients.
+
+:class:`~hecras_runner.db.DbClient` and
+:class:`~hecras_runner.async_db.AsyncDbClient` run these statements against
+PostgreSQL; :class:`~hecras_runner.sqlite_queue.SqliteQueueClient` returns
+rows in the same shape through the row helpers.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import socket
+
+from hecras_runner.settings import DbSettings
+
+# Schema version managed by this code
+CURRENT_SCHEMA_VERSION = 7
+
+SCHEMA = "hecras_runner"
+
+# NOTIFY channel workers LISTEN on; the jobs trigger (migration 2) sends the
+# batch id whenever a job becomes queued
+JOBS_CHANNEL = "hecras_jobs"
+
+# Longest single blocking wait on the LISTEN socket, so stop requests are
+# noticed promptly; waking up costs no query
+LISTEN_SLICE = 1.0
+# Back-off before reopening a LISTEN connection that failed
+LISTEN_RETRY_DELAY = 30.0
+
+# How often a worker with a heartbeat thread writes buffered job progress;
+# the write carries the heartbeat too, so it costs one statement
+DEFAULT_PROGRESS_FLUSH_SECONDS = 5.0
+
+MIGRATION_002 = f"""
+CREATE OR REPLACE FUNCTION {SCHEMA}.notify_job_queued() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{JOBS_CHANNEL}', NEW.batch_id::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jobs_notify_queued ON {SCHEMA}.jobs;
+CREATE TRIGGER jobs_notify_queued
+    AFTER INSERT OR UPDATE OF status ON {SCHEMA}.jobs
+    FOR EACH ROW WHEN (NEW.status = 'queued')
+    EXECUTE FUNCTION {SCHEMA}.notify_job_queued();
+"""
+
+# Per-status job counters on batches, kept by a trigger on every job insert,
+# status change and delete. The same UPDATE that bumps the counters settles
+# the batch status, so completion is decided atomically under the batch row
+# lock and status reads are primary-key lookups.
+JOB_STATUSES = ("queued", "assigned", "running", "completed", "failed", "cancelled")
+
+MIGRATION_003 = f"""
+ALTER TABLE {SCHEMA}.batches
+    ADD COLUMN IF NOT EXISTS queued_jobs    INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS assigned_jobs  INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS running_jobs   INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS completed_jobs INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS failed_jobs    INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS cancelled_jobs INTEGER NOT NULL DEFAULT 0;
+
+UPDATE {SCHEMA}.batches b SET
+    queued_jobs = c.queued,
+    assigned_jobs = c.assigned,
+    running_jobs = c.running,
+    completed_jobs = c.completed,
+    failed_jobs = c.failed,
+    cancelled_jobs = c.cancelled
+FROM (
+    SELECT batch_id,
+        COUNT(*) FILTER (WHERE status = 'queued') AS queued,
+        COUNT(*) FILTER (WHERE status = 'assigned') AS assigned,
+        COUNT(*) FILTER (WHERE status = 'running') AS running,
+        COUNT(*) FILTER (WHERE status = 'completed') AS completed,
+        COUNT(*) FILTER (WHERE status = 'failed') AS failed,
+        COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled
+    FROM {SCHEMA}.jobs GROUP BY batch_id
+) c
+WHERE b.id = c.batch_id;
+
+CREATE OR REPLACE FUNCTION {SCHEMA}.count_job_status() RETURNS trigger AS $$
+DECLARE
+    old_status TEXT;
+    new_status TEXT;
+    batch UUID;
+    dq INTEGER; da INTEGER; dr INTEGER; dc INTEGER; df INTEGER; dx INTEGER;
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.status = NEW.status THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        old_status := OLD.status;
+        batch := OLD.batch_id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        new_status := NEW.status;
+        batch := NEW.batch_id;
+    END IF;
+    dq := (new_status IS NOT DISTINCT FROM 'queued')::int
+        - (old_status IS NOT DISTINCT FROM 'queued')::int;
+    da := (new_status IS NOT DISTINCT FROM 'assigned')::int
+        - (old_status IS NOT DISTINCT FROM 'assigned')::int;
+    dr := (new_status IS NOT DISTINCT FROM 'running')::int
+        - (old_status IS NOT DISTINCT FROM 'running')::int;
+    dc := (new_status IS NOT DISTINCT FROM 'completed')::int
+        - (old_status IS NOT DISTINCT FROM 'completed')::int;
+    df := (new_status IS NOT DISTINCT FROM 'failed')::int
+        - (old_status IS NOT DISTINCT FROM 'failed')::int;
+    dx := (new_status IS NOT DISTINCT FROM 'cancelled')::int
+        - (old_status IS NOT DISTINCT FROM 'cancelled')::int;
+
+    UPDATE {SCHEMA}.batches SET
+        queued_jobs = queued_jobs + dq,
+        assigned_jobs = assigned_jobs + da,
+        running_jobs = running_jobs + dr,
+        completed_jobs = completed_jobs + dc,
+        failed_jobs = failed_jobs + df,
+        cancelled_jobs = cancelled_jobs + dx,
+        status = CASE
+            WHEN status IN ('completed', 'failed', 'cancelled') THEN status
+            WHEN completed_jobs + dc + failed_jobs + df + cancelled_jobs + dx >= total_jobs
+                THEN CASE WHEN failed_jobs + df > 0 THEN 'failed' ELSE 'completed' END
+            WHEN status = 'pending' AND running_jobs + dr > 0 THEN 'running'
+            ELSE status
+        END,
+        completed_at = CASE
+            WHEN status NOT IN ('completed', 'failed', 'cancelled')
+                 AND completed_jobs + dc + failed_jobs + df + cancelled_jobs + dx >= total_jobs
+                THEN now()
+            ELSE completed_at
+        END
+    WHERE id = batch;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jobs_count_status ON {SCHEMA}.jobs;
+CREATE TRIGGER jobs_count_status
+    AFTER INSERT OR UPDATE OF status OR DELETE ON {SCHEMA}.jobs
+    FOR EACH ROW EXECUTE FUNCTION {SCHEMA}.count_job_status();
+"""
+
+# Claimed jobs are leased: claims set lease_expires_at, heartbeats extend it,
+# and reap_expired_jobs() requeues jobs whose worker stopped heartbeating, or
+# fails them once max_attempts claims have all been lost
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+MIGRATION_004 = f"""
+ALTER TABLE {SCHEMA}.jobs
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS attempts         INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS max_attempts     INTEGER NOT NULL DEFAULT {DEFAULT_MAX_ATTEMPTS};
+
+CREATE INDEX IF NOT EXISTS idx_jobs_lease
+    ON {SCHEMA}.jobs (lease_expires_at) WHERE status IN ('assigned', 'running');
+
+CREATE OR REPLACE FUNCTION {SCHEMA}.reap_expired_jobs() RETURNS INTEGER AS $$
+DECLARE
+    reaped INTEGER;
+BEGIN
+    WITH expired AS (
+        SELECT id FROM {SCHEMA}.jobs
+        WHERE status IN ('assigned', 'running') AND lease_expires_at < now()
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE {SCHEMA}.jobs j SET
+        status = CASE WHEN j.attempts >= j.max_attempts THEN 'failed' ELSE 'queued' END,
+        error_message = CASE
+            WHEN j.attempts >= j.max_attempts
+                THEN format('Worker lost (lease expired) on all %s attempts', j.attempts)
+            ELSE j.error_message
+        END,
+        completed_at = CASE WHEN j.attempts >= j.max_attempts THEN now() END,
+        worker_id = NULL,
+        lease_expires_at = NULL,
+        assigned_at = NULL,
+        started_at = NULL,
+        progress = 0.0
+    FROM expired
+    WHERE j.id = expired.id;
+    GET DIAGNOSTICS reaped = ROW_COUNT;
+    RETURN reaped;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+# What a job needs (ram_gb, cores, hecras_version, scratch_gb) and the hash of
+# its terrain, matched in the claim query against the capabilities workers
+# keep in workers.metadata (see hecras_runner.capabilities)
+MIGRATION_005 = f"""
+ALTER TABLE {SCHEMA}.jobs
+    ADD COLUMN IF NOT EXISTS requirements JSONB NOT NULL DEFAULT '{{}}'::jsonb,
+    ADD COLUMN IF NOT EXISTS terrain_hash TEXT NOT NULL DEFAULT '';
+"""
+
+# Claim order: priority first, then weighted round-robin across submitters
+# (user_shares.weight, default 1), so one user's sweep cannot hold back
+# everyone else's jobs. Waiting jobs gain one priority level per
+# aging_seconds, up to the highest priority queued, so low-priority work is
+# never starved. submitted_by and queued_at are copied from the batch so the
+# claim reads only the partial index over queued jobs.
+DEFAULT_AGING_SECONDS = 600.0
+
+MIGRATION_006 = f"""
+ALTER TABLE {SCHEMA}.jobs
+    ADD COLUMN IF NOT EXISTS priority     INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS submitted_by TEXT NOT NULL DEFAULT '',
+    ADD COLUMN IF NOT EXISTS queued_at    TIMESTAMPTZ NOT NULL DEFAULT now();
+
+UPDATE {SCHEMA}.jobs j
+SET submitted_by = b.submitted_by, queued_at = b.submitted_at
+FROM {SCHEMA}.batches b
+WHERE b.id = j.batch_id;
+
+CREATE TABLE IF NOT EXISTS {SCHEMA}.user_shares (
+    submitted_by TEXT PRIMARY KEY,
+    weight       REAL NOT NULL DEFAULT 1.0 CHECK (weight > 0)
+);
+
+DROP INDEX IF EXISTS {SCHEMA}.idx_jobs_queued;
+CREATE INDEX IF NOT EXISTS idx_jobs_queued_fair
+    ON {SCHEMA}.jobs (submitted_by, priority DESC, id) WHERE status = 'queued';
+"""
+
+# The claim reads each submitter's queued jobs straight from this index, in
+# the order it hands them out (oldest first within a priority).
+MIGRATION_007 = f"""
+DROP INDEX IF EXISTS {SCHEMA}.idx_jobs_queued_fair;
+CREATE INDEX IF NOT EXISTS idx_jobs_queued_claim
+    ON {SCHEMA}.jobs (submitted_by, priority DESC, queued_at, id) WHERE status = 'queued';
+"""
+
+MIGRATIONS = (
+    (2, MIGRATION_002, "NOTIFY hecras_jobs when a job is queued"),
+    (3, MIGRATION_003, "Per-status job counters on batches"),
+    (4, MIGRATION_004, "Job leases, attempts and reaper"),
+    (5, MIGRATION_005, "Job requirements and terrain hash for worker matching"),
+    (6, MIGRATION_006, "Job priorities and fair-share across submitters"),
+    (7, MIGRATION_007, "Queued-jobs index in claim order"),
+)
+
+# ── Queries shared by DbClient and AsyncDbClient ──
+
+SQL_SCHEMA_VERSION = f"SELECT MAX(version) FROM {SCHEMA}.schema_version"
+
+SQL_RECORD_VERSION = f"""
+INSERT INTO {SCHEMA}.schema_version (version, description)
+VALUES (%s, %s) ON CONFLICT DO NOTHING
+"""
+
+SQL_REGISTER_WORKER = f"""
+INSERT INTO {SCHEMA}.workers
+    (hostname, ip_address, os_version, hecras_version, hecras_path,
+     max_concurrent, status, last_heartbeat, metadata)
+VALUES (%s, %s, %s, %s, %s, %s, 'idle', now(), %s::jsonb)
+RETURNING id
+"""
+
+SQL_REAP = f"SELECT {SCHEMA}.reap_expired_jobs()"
+
+SQL_SET_OFFLINE = f"UPDATE {SCHEMA}.workers SET status = 'offline' WHERE id = %s"
+
+# Sibling CTEs run as one statement; the jobs' foreign key is checked at its
+# end, after the batch row exists. The pg_notify is delivered on commit. The
+# jobs trigger sends the same payload on migrated schemas and PostgreSQL
+# folds duplicates within a transaction, so workers wake once.
+SQL_SUBMIT_BATCH = f"""
+WITH new_batch AS (
+    INSERT INTO {SCHEMA}.batches
+        (id, project_path, project_title, submitted_by, total_jobs, status)
+    VALUES (%s, %s, %s, %s, %s, 'pending')
+), new_jobs AS (
+    INSERT INTO {SCHEMA}.jobs
+        (id, batch_id, plan_name, plan_suffix, terrain_hash, requirements,
+         priority, submitted_by, status)
+    SELECT j.id, %s::uuid, j.plan_name, j.plan_suffix, j.terrain_hash,
+           j.requirements::jsonb, j.priority, %s, 'queued'
+    FROM unnest(%s::uuid[], %s::text[], %s::text[], %s::text[], %s::text[], %s::int[])
+        AS j(id, plan_name, plan_suffix, terrain_hash, requirements, priority)
+)
+SELECT pg_notify(%s, %s)
+"""
+
+SQL_BATCH_STATUS = f"""
+SELECT status, total_jobs, queued_jobs, assigned_jobs, running_jobs,
+       completed_jobs, failed_jobs, cancelled_jobs
+FROM {SCHEMA}.batches WHERE id = %s
+"""
+
+
+def fits(requirement: str, capability: str) -> str:
+    """SQL condition: the job's numeric *requirement* is within the worker's *capability*."""
+    need = f"j.requirements->>'{requirement}'"
+    have = f"me.caps->>'{capability}'"
+    return f"({need} IS NULL OR {have} IS NULL OR ({need})::real <= ({have})::real)"
+
+
+# The worker's fresh capabilities are merged into its row first; only jobs
+# they satisfy are candidates. A requirement or capability that is not given
+# does not restrict the match. The queued-jobs index is read one submitter at
+# a time: a loose index scan finds the submitters with queued work, then the
+# next CLAIM_WINDOW jobs of each that the worker can run are read in index
+# order. Candidates are ordered by aged priority, then by each submitter's
+# turn: the jobs they already have running plus the job's rank among their
+# queued ones (cached terrain first), divided by their share weight. Jobs
+# with a cached terrain break the remaining ties, then the oldest goes first.
+CLAIM_WINDOW = 32
+
+SQL_CLAIM_JOBS = f"""
+WITH RECURSIVE me AS (
+    UPDATE {SCHEMA}.workers SET metadata = metadata || %s::jsonb
+    WHERE id = %s
+    RETURNING metadata AS caps
+), submitters AS (
+    (SELECT submitted_by FROM {SCHEMA}.jobs
+     WHERE status = 'queued'
+     ORDER BY submitted_by LIMIT 1)
+    UNION ALL
+    SELECT (SELECT j.submitted_by FROM {SCHEMA}.jobs j
+            WHERE j.status = 'queued' AND j.submitted_by > s.submitted_by
+            ORDER BY j.submitted_by LIMIT 1)
+    FROM submitters s
+    WHERE s.submitted_by IS NOT NULL
+), active AS (
+    SELECT submitted_by, sum(assigned_jobs + running_jobs) AS jobs
+    FROM {SCHEMA}.batches
+    WHERE status IN ('pending', 'running')
+    GROUP BY submitted_by
+), candidates AS (
+    SELECT q.id, q.queued_at, q.cached,
+           q.priority + floor(extract(epoch FROM now() - q.queued_at) / %s) AS aged,
+           max(q.priority) OVER () AS top,
+           (COALESCE(a.jobs, 0) + row_number() OVER (
+                PARTITION BY q.submitted_by
+                ORDER BY q.priority DESC, q.cached DESC, q.queued_at, q.id
+           )) / COALESCE(w.weight, 1.0) AS turn
+    FROM submitters s
+    CROSS JOIN me
+    CROSS JOIN LATERAL (
+        SELECT j.id, j.submitted_by, j.priority, j.queued_at,
+               COALESCE(me.caps->'terrain_hashes' ? j.terrain_hash, false) AS cached
+        FROM {SCHEMA}.jobs j
+        WHERE j.status = 'queued' AND j.submitted_by = s.submitted_by
+          AND {fits("ram_gb", "ram_gb")}
+          AND {fits("cores", "cores")}
+          AND {fits("scratch_gb", "scratch_free_gb")}
+          AND (j.requirements->>'hecras_version' IS NULL
+               OR me.caps->>'hecras_version' IS NULL
+               OR starts_with(me.caps->>'hecras_version', j.requirements->>'hecras_version'))
+        ORDER BY j.priority DESC, j.queued_at, j.id
+        LIMIT %s
+    ) q
+    LEFT JOIN active a ON a.submitted_by = q.submitted_by
+    LEFT JOIN {SCHEMA}.user_shares w ON w.submitted_by = q.submitted_by
+), picked AS (
+    SELECT j.id FROM {SCHEMA}.jobs j
+    JOIN candidates c ON c.id = j.id
+    WHERE j.status = 'queued'
+    ORDER BY LEAST(c.aged, c.top) DESC, c.turn, c.cached DESC, c.queued_at, j.id
+    FOR UPDATE OF j SKIP LOCKED
+    LIMIT %s
+)
+UPDATE {SCHEMA}.jobs j
+SET status = 'assigned', worker_id = %s, assigned_at = now(),
+    lease_expires_at = now() + make_interval(secs => %s),
+    attempts = j.attempts + 1
+FROM picked, {SCHEMA}.batches b
+WHERE j.id = picked.id AND b.id = j.batch_id
+RETURNING j.id, j.batch_id, j.plan_name, j.plan_suffix,
+          b.project_path, j.metadata, j.attempts, j.terrain_hash
+"""
+
+SQL_START_JOB = f"""
+UPDATE {SCHEMA}.jobs
+SET status = 'running', started_at = now(),
+    lease_expires_at = now() + make_interval(secs => %s)
+WHERE id = %s AND (%s::uuid IS NULL OR worker_id = %s::uuid)
+"""
+
+SQL_COMPLETE_JOB = f"""
+UPDATE {SCHEMA}.jobs
+SET status = %s, completed_at = now(), elapsed_seconds = %s,
+    error_message = %s, exit_code = %s, hdf_verified = %s,
+    progress = CASE WHEN %s THEN 1.0 ELSE progress END,
+    lease_expires_at = NULL
+WHERE id = %s AND (%s::uuid IS NULL OR worker_id = %s::uuid)
+"""
+
+SQL_UPDATE_PROGRESS = f"UPDATE {SCHEMA}.jobs SET progress = %s WHERE id = %s"
+
+SQL_ACTIVE_WORKERS = f"""
+SELECT id, hostname, ip_address, status, hecras_version,
+       max_concurrent, last_heartbeat
+FROM {SCHEMA}.workers
+WHERE last_heartbeat > now() - INTERVAL '2 minutes'
+ORDER BY hostname
+"""
+
+SQL_BATCH_JOBS = f"""
+SELECT id, plan_name, plan_suffix, status, worker_id,
+       elapsed_seconds, error_message, progress
+FROM {SCHEMA}.jobs
+WHERE batch_id = %s
+ORDER BY plan_suffix
+"""
+
+
+def settings_conninfo(settings: DbSettings) -> str:
+    return (
+        f"host={settings.host} port={settings.port} "
+        f"dbname={settings.dbname} user={settings.user} "
+        f"password={settings.password}"
+    )
+
+
+def host_identity() -> tuple[str, str, str]:
+    """Hostname, IP address and OS version a worker registers with."""
+    hostname = socket.gethostname()
+    try:
+        ip_address = socket.gethostbyname(hostname)
+    except socket.gaierror:
+        ip_address = "127.0.0.1"
+    return hostname, ip_address, platform.platform()
+
+
+def heartbeat_statement(
+    worker_id: str,
+    lease_seconds: float,
+    progress: dict[str, float],
+) -> tuple[str, tuple]:
+    """The heartbeat + lease + buffered progress UPDATE and its parameters.
+
+    The worker row is updated in a CTE and every job the worker holds gets a
+    new lease plus, if one is given in *progress*, its latest progress. The
+    ownership filter is on the updated row itself, so a job completed while
+    the statement waited for its row lock is re-checked and left alone.
+    """
+    if progress:
+        values = ", ".join(["(%s::uuid, %s::real)"] * len(progress))
+        set_progress = f""",
+        progress = COALESCE(
+            (SELECT v.progress FROM (VALUES {values}) AS v(id, progress) WHERE v.id = j.id),
+            j.progress
+        )"""
+    else:
+        set_progress = ""
+    sql = f"""
+    WITH beat AS (
+        UPDATE {SCHEMA}.workers SET last_heartbeat = now() WHERE id = %s
+    )
+    UPDATE {SCHEMA}.jobs j
+    SET lease_expires_at = now() + make_interval(secs => %s){set_progress}
+    WHERE j.worker_id = %s AND j.status IN ('assigned', 'running')
+    """
+    params = [value for item in progress.items() for value in item]
+    return sql, (worker_id, lease_seconds, *params, worker_id)
+
+
+def submit_params(
+    batch_id: str,
+    job_ids: list[str],
+    project_path: str,
+    project_title: str,
+    jobs: list[dict],
+    submitted_by: str,
+    priority: int = 0,
+) -> tuple:
+    return (
+        batch_id,
+        project_path,
+        project_title,
+        submitted_by,
+        len(jobs),
+        batch_id,
+        submitted_by,
+        job_ids,
+        [job["plan_name"] for job in jobs],
+        [job["plan_suffix"] for job in jobs],
+        [job.get("terrain_hash") or "" for job in jobs],
+        [json.dumps(job.get("requirements") or {}) for job in jobs],
+        [int(job.get("priority", priority)) for job in jobs],
+        JOBS_CHANNEL,
+        batch_id,
+    )
+
+
+def claim_params(
+    worker_id: str,
+    limit: int,
+    capabilities: dict | None,
+    aging_seconds: float,
+    lease_seconds: float,
+) -> tuple:
+    return (
+        json.dumps(capabilities or {}),
+        worker_id,
+        aging_seconds,
+        max(limit, CLAIM_WINDOW),
+        limit,
+        worker_id,
+        lease_seconds,
+    )
+
+
+def batch_status(row: tuple | None) -> dict:
+    if row is None:
+        return {"status": "not_found", "total": 0, "completed": 0, "failed": 0}
+    counts = dict(zip(JOB_STATUSES, row[2:], strict=True))
+    return {"status": row[0], "total": row[1], **counts}
+
+
+def claimed_job(row: tuple, worker_id: str) -> dict:
+    return {
+        "job_id": str(row[0]),
+        "batch_id": str(row[1]),
+        "plan_name": row[2],
+        "plan_suffix": row[3],
+        "project_path": row[4] or "",
+        "metadata": row[5] or {},
+        "attempt": row[6],
+        "terrain_hash": row[7] or "",
+        "worker_id": worker_id,
+    }
+
+
+def worker_row(row: tuple) -> dict:
+    return {
+        "id": str(row[0]),
+        "hostname": row[1],
+        "ip_address": str(row[2]) if row[2] else "",
+        "status": row[3],
+        "hecras_version": row[4] or "",
+        "max_concurrent": row[5],
+        "last_heartbeat": row[6],
+    }
+
+
+def batch_job(row: tuple) -> dict:
+    return {
+        "id": str(row[0]),
+        "plan_name": row[1],
+        "plan_suffix": row[2],
+        "status": row[3],
+        "worker_id": str(row[4]) if row[4] else None,
+        "elapsed_seconds": row[5],
+        "error_message": row[6],
+        "progress": row[7] or 0.0,
+    }
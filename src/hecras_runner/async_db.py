@@ -0,0 +1,529 @@
+"""asyncio client for the PostgreSQL job queue.
+
+:class:`AsyncDbClient` has the same methods as :class:`~hecras_runner.db.DbClient`
+and runs the same SQL, as coroutines on a ``psycopg_pool.AsyncConnectionPool``.
+Concurrent queries wait for a pooled connection instead of blocking a thread
+each, and the heartbeat and LISTEN loops are tasks rather than threads.
+
+Code that is not itself async (the GUI) drives the client through one
+:class:`EventLoopThread`::
+
+    loop = EventLoopThread()
+    client = loop.run(AsyncDbClient.connect(settings))
+    future = loop.submit(client.get_active_workers())  # concurrent.futures.Future
+
+Optional dependency: ``psycopg[binary]`` + ``psycopg_pool``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future
+from typing import Any
+
+from hecras_runner._queue_sql import (
+    CURRENT_SCHEMA_VERSION,
+    DEFAULT_AGING_SECONDS,
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_PROGRESS_FLUSH_SECONDS,
+    JOBS_CHANNEL,
+    LISTEN_RETRY_DELAY,
+    LISTEN_SLICE,
+    MIGRATIONS,
+    SQL_ACTIVE_WORKERS,
+    SQL_BATCH_JOBS,
+    SQL_BATCH_STATUS,
+    SQL_CLAIM_JOBS,
+    SQL_COMPLETE_JOB,
+    SQL_REAP,
+    SQL_RECORD_VERSION,
+    SQL_REGISTER_WORKER,
+    SQL_SCHEMA_VERSION,
+    SQL_SET_OFFLINE,
+    SQL_START_JOB,
+    SQL_SUBMIT_BATCH,
+    SQL_UPDATE_PROGRESS,
+    batch_job,
+    batch_status,
+    claim_params,
+    claimed_job,
+    heartbeat_statement,
+    host_identity,
+    settings_conninfo,
+    submit_params,
+    worker_row,
+)
+from hecras_runner.db import BatchSubmission, WorkerInfo
+from hecras_runner.settings import DbSettings
+
+# Connections shared by every concurrent query of one client
+_POOL_MAX_SIZE = 4
+
+
+class EventLoopThread:
+    """An asyncio event loop running on a daemon thread.
+
+    Coroutines are handed to it from any thread with :meth:`submit` (returns
+    a ``concurrent.futures.Future``) or :meth:`run` (blocks for the result).
+    On Windows the loop is a selector loop, which psycopg's async connections
+    need.
+    """
+
+    def __init__(self, name: str = "db-loop") -> None:
+        if sys.platform == "win32":
+            self.loop: asyncio.AbstractEventLoop = asyncio.SelectorEventLoop()
+        else:
+            self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule *coro* on the loop and return its future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+        """Run *coro* on the loop and wait for its result (re-raising its errors)."""
+        return self.submit(coro).result(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel the loop's pending tasks, stop the loop and wait for the thread to end.
+
+        Cancelled tasks get to run their cleanup (``finally`` blocks, closing
+        connections) before the loop is closed.
+        """
+        if self.loop.is_closed():
+            return
+        if self._thread.is_alive():
+            with contextlib.suppress(Exception):
+                self.run(self._cancel_tasks(), timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self.loop.close()
+
+    async def _cancel_tasks(self) -> None:
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.loop.shutdown_asyncgens()
+
+
+class AsyncDbClient:
+    """asyncio counterpart of :class:`~hecras_runner.db.DbClient`.
+
+    Use the ``connect()`` classmethod to create an instance. Every method
+    must run on the loop the client was created on.
+    """
+
+    def __init__(
+        self,
+        pool: object,
+        log: Callable[[str], None] = print,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        aging_seconds: float = DEFAULT_AGING_SECONDS,
+    ) -> None:
+        self._pool = pool
+        self._log = log
+        self._lease_seconds = lease_seconds
+        self._aging_seconds = aging_seconds
+        self._heartbeat_stop = asyncio.Event()
+        self._heartbeat_task: asyncio.Task | None = None
+        # Latest unwritten progress per job while the heartbeat task runs;
+        # only touched on the loop, so no lock
+        self._progress: dict[str, float] = {}
+        self._listen_conn: object | None = None
+        self._listen_retry_at = 0.0
+
+    @classmethod
+    async def connect(
+        cls,
+        settings: DbSettings,
+        log: Callable[[str], None] = print,
+    ) -> AsyncDbClient | None:
+        """Create an AsyncDbClient with a connection pool. Returns None on failure."""
+        try:
+            from psycopg_pool import AsyncConnectionPool
+        except ImportError:
+            log("psycopg not installed — database features unavailable")
+            return None
+
+        try:
+            pool = AsyncConnectionPool(
+                conninfo=settings_conninfo(settings),
+                min_size=1,
+                max_size=_POOL_MAX_SIZE,
+                open=False,
+            )
+            await pool.open()
+            # Quick connectivity check
+            async with pool.connection() as conn:
+                await conn.execute("SELECT 1")
+            log(f"Connected to {settings.host}:{settings.port}/{settings.dbname}")
+            return cls(pool, log=log)
+        except Exception as e:
+            log(f"Database connection failed: {e}")
+            return None
+
+    async def close(self) -> None:
+        """Close the connection pool and stop heartbeat."""
+        await self.stop_heartbeat()
+        await self._close_listen_conn()
+        with contextlib.suppress(Exception):
+            await self._pool.close()  # type: ignore[attr-defined]
+
+    # ── Schema migration ──
+
+    async def migrate(self) -> None:
+        """Run forward-only schema migrations under an advisory lock."""
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            await conn.execute("SELECT pg_advisory_lock(42)")
+            try:
+                try:
+                    cur = await conn.execute(SQL_SCHEMA_VERSION)
+                    row = await cur.fetchone()
+                    current = row[0] if row and row[0] is not None else 0
+                except Exception:
+                    await conn.rollback()
+                    current = 0
+                if current < CURRENT_SCHEMA_VERSION:
+                    self._log(f"Migrating schema from v{current} to v{CURRENT_SCHEMA_VERSION}")
+                    if current < 1:
+                        self._log("Migration 0->1 should be applied via docs/db_schema.sql")
+                        return
+                    for version, sql, description in MIGRATIONS:
+                        if current < version:
+                            await conn.execute(sql)
+                            await conn.execute(SQL_RECORD_VERSION, (version, description))
+                    await conn.commit()
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock(42)")
+
+    # ── Worker lifecycle ──
+
+    async def register_worker(
+        self,
+        hecras_version: str = "",
+        hecras_path: str = "",
+        max_concurrent: int = 1,
+        capabilities: dict | None = None,
+    ) -> WorkerInfo:
+        """Register this machine as a worker with its *capabilities*. Returns WorkerInfo."""
+        # Name lookups block, so they run off the loop
+        hostname, ip_address, os_version = await asyncio.to_thread(host_identity)
+
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            cur = await conn.execute(
+                SQL_REGISTER_WORKER,
+                (
+                    hostname,
+                    ip_address,
+                    os_version,
+                    hecras_version,
+                    hecras_path,
+                    max_concurrent,
+                    json.dumps(capabilities or {}),
+                ),
+            )
+            row = await cur.fetchone()
+            await conn.commit()
+
+        worker_id = str(row[0])
+        self._log(f"Registered as worker {worker_id} ({hostname})")
+        return WorkerInfo(worker_id=worker_id, hostname=hostname, ip_address=ip_address)
+
+    async def heartbeat(self, worker_id: str) -> None:
+        """Update the worker heartbeat, extend its job leases and write buffered progress."""
+        progress, self._progress = self._progress, {}
+        try:
+            async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+                await conn.execute(*heartbeat_statement(worker_id, self._lease_seconds, progress))
+                await conn.commit()
+        except Exception:
+            for job_id, value in progress.items():
+                self._progress.setdefault(job_id, value)
+            raise
+
+    async def reap_expired_jobs(self) -> int:
+        """Requeue (or fail, after max_attempts) jobs whose lease has expired."""
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            cur = await conn.execute(SQL_REAP)
+            row = await cur.fetchone()
+            await conn.commit()
+        return int(row[0]) if row and row[0] else 0
+
+    async def start_heartbeat(
+        self,
+        worker_id: str,
+        interval: float = 30.0,
+        flush_interval: float = DEFAULT_PROGRESS_FLUSH_SECONDS,
+    ) -> None:
+        """Start a task that sends heartbeats every *interval* seconds.
+
+        Buffered progress is flushed every *flush_interval* seconds and each
+        beat reaps expired leases, as with :meth:`DbClient.start_heartbeat`.
+        """
+        self._heartbeat_stop.clear()
+
+        async def _loop() -> None:
+            next_beat = time.monotonic() + interval
+            while True:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._heartbeat_stop.wait(), min(interval, flush_interval)
+                    )
+                if self._heartbeat_stop.is_set():
+                    break
+                now = time.monotonic()
+                if now < next_beat and not self._progress:
+                    continue
+                try:
+                    await self.heartbeat(worker_id)
+                    if now >= next_beat:
+                        next_beat = now + interval
+                        reaped = await self.reap_expired_jobs()
+                        if reaped:
+                            self._log(f"Requeued {reaped} job(s) from unresponsive workers")
+                except Exception as e:
+                    self._log(f"Heartbeat failed: {e}")
+            if self._progress:
+                try:
+                    await self.heartbeat(worker_id)
+                except Exception as e:
+                    self._log(f"Heartbeat failed: {e}")
+
+        self._heartbeat_task = asyncio.create_task(_loop())
+
+    async def stop_heartbeat(self) -> None:
+        """Stop the heartbeat task (after its final progress flush)."""
+        self._heartbeat_stop.set()
+        task, self._heartbeat_task = self._heartbeat_task, None
+        if task is not None:
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(task, 5)
+
+    async def set_worker_offline(self, worker_id: str) -> None:
+        """Mark a worker as offline."""
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            await conn.execute(SQL_SET_OFFLINE, (worker_id,))
+            await conn.commit()
+
+    # ── Batch submission (orchestrator side) ──
+
+    async def submit_batch(
+        self,
+        project_path: str,
+        project_title: str,
+        jobs: list[dict],
+        submitted_by: str = "",
+        priority: int = 0,
+    ) -> BatchSubmission:
+        """Submit a batch of simulation jobs in one round trip."""
+        batch_id = str(uuid.uuid4())
+        job_ids = [str(job.get("job_id") or uuid.uuid4()) for job in jobs]
+        params = submit_params(
+            batch_id, job_ids, project_path, project_title, jobs, submitted_by, priority
+        )
+
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            await conn.execute(SQL_SUBMIT_BATCH, params)
+            await conn.commit()
+
+        self._log(f"Submitted batch {batch_id} with {len(jobs)} jobs")
+        return BatchSubmission(batch_id=batch_id, job_ids=job_ids)
+
+    async def get_batch_status(self, batch_id: str) -> dict:
+        """Get summary status of a batch (one primary-key lookup)."""
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            cur = await conn.execute(SQL_BATCH_STATUS, (batch_id,))
+            row = await cur.fetchone()
+        return batch_status(row)
+
+    # ── Job pickup (worker side) ──
+
+    async def claim_jobs(
+        self,
+        worker_id: str,
+        limit: int = 1,
+        capabilities: dict | None = None,
+    ) -> list[dict]:
+        """Claim up to *limit* queued jobs (see :meth:`DbClient.claim_jobs`)."""
+        if limit < 1:
+            return []
+        params = claim_params(
+            worker_id, limit, capabilities, self._aging_seconds, self._lease_seconds
+        )
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            cur = await conn.execute(SQL_CLAIM_JOBS, params)
+            rows = await cur.fetchall()
+            await conn.commit()
+        return [claimed_job(r, worker_id) for r in rows]
+
+    async def claim_job(self, worker_id: str, capabilities: dict | None = None) -> dict | None:
+        """Claim the next queued job. Returns a job dict, or None if no jobs available."""
+        jobs = await self.claim_jobs(worker_id, 1, capabilities)
+        return jobs[0] if jobs else None
+
+    async def start_job(self, job_id: str, worker_id: str | None = None) -> bool:
+        """Mark a job as running; False if *worker_id* no longer holds it."""
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            cur = await conn.execute(
+                SQL_START_JOB, (self._lease_seconds, job_id, worker_id, worker_id)
+            )
+            await conn.commit()
+        return bool(cur.rowcount)
+
+    async def complete_job(
+        self,
+        job_id: str,
+        success: bool,
+        elapsed_seconds: float,
+        error_message: str | None = None,
+        exit_code: int | None = None,
+        hdf_verified: bool | None = None,
+        worker_id: str | None = None,
+    ) -> bool:
+        """Mark a job as completed or failed; False if *worker_id* no longer holds it."""
+        status = "completed" if success else "failed"
+        self._progress.pop(job_id, None)
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            cur = await conn.execute(
+                SQL_COMPLETE_JOB,
+                (
+                    status,
+                    elapsed_seconds,
+                    error_message,
+                    exit_code,
+                    hdf_verified,
+                    success,
+                    job_id,
+                    worker_id,
+                    worker_id,
+                ),
+            )
+            await conn.commit()
+        updated = bool(cur.rowcount)
+        if not updated:
+            self._log(f"Job {job_id} is no longer held by this worker; result not recorded")
+        return updated
+
+    async def update_progress(self, job_id: str, progress: float) -> None:
+        """Update job progress (0.0 to 1.0); buffered while the heartbeat task runs."""
+        if self._heartbeat_task is not None:
+            self._progress[job_id] = progress
+            return
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            await conn.execute(SQL_UPDATE_PROGRESS, (progress, job_id))
+            await conn.commit()
+
+    # ── Real-time notifications ──
+
+    async def _connect_listener(self) -> object:
+        """Open a dedicated autocommit connection LISTENing on the jobs channel."""
+        import psycopg
+
+        conninfo = self._pool.conninfo  # type: ignore[attr-defined]
+        conn = await psycopg.AsyncConnection.connect(conninfo, autocommit=True)
+        await conn.execute(f"LISTEN {JOBS_CHANNEL}")
+        return conn
+
+    async def _close_listen_conn(self) -> None:
+        conn, self._listen_conn = self._listen_conn, None
+        if conn is not None:
+            with contextlib.suppress(Exception):
+                await conn.close()  # type: ignore[attr-defined]
+
+    async def wait_for_jobs(self, timeout: float, stop: Callable[[], bool] | None = None) -> bool:
+        """Wait until a job is queued, *timeout* seconds pass or *stop* returns True.
+
+        Returns True when a ``hecras_jobs`` notification arrived.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (stop is not None and stop()):
+                return False
+            wait = min(remaining, LISTEN_SLICE)
+
+            if self._listen_conn is None and time.monotonic() >= self._listen_retry_at:
+                try:
+                    self._listen_conn = await self._connect_listener()
+                except Exception as e:
+                    self._log(f"LISTEN connection failed: {e}")
+                    self._listen_retry_at = time.monotonic() + LISTEN_RETRY_DELAY
+            if self._listen_conn is None:
+                await asyncio.sleep(wait)
+                continue
+
+            try:
+                async for _notify in self._listen_conn.notifies(  # type: ignore[attr-defined]
+                    timeout=wait, stop_after=1
+                ):
+                    return True
+            except Exception as e:
+                self._log(f"LISTEN connection lost: {e}")
+                await self._close_listen_conn()
+                self._listen_retry_at = time.monotonic() + LISTEN_RETRY_DELAY
+
+    async def listen_for_jobs(
+        self,
+        callback: Callable[[str], None],
+        stop: threading.Event | None = None,
+    ) -> asyncio.Task:
+        """Start a task that calls *callback* with each ``hecras_jobs`` payload.
+
+        The connection is reopened after errors; set *stop* (from any
+        thread) or cancel the returned task to end it.
+        """
+        stop = stop or threading.Event()
+
+        async def _listen() -> None:
+            conn = None
+            try:
+                while not stop.is_set():
+                    try:
+                        if conn is None:
+                            conn = await self._connect_listener()
+                        async for notify in conn.notifies(  # type: ignore[attr-defined]
+                            timeout=LISTEN_SLICE
+                        ):
+                            callback(notify.payload)
+                    except Exception as e:
+                        self._log(f"LISTEN task error: {e}")
+                        if conn is not None:
+                            with contextlib.suppress(Exception):
+                                await conn.close()  # type: ignore[attr-defined]
+                        conn = None
+                        retry_at = time.monotonic() + LISTEN_RETRY_DELAY
+                        while not stop.is_set() and time.monotonic() < retry_at:
+                            await asyncio.sleep(LISTEN_SLICE)
+            finally:
+                if conn is not None:
+                    with contextlib.suppress(Exception):
+                        await conn.close()  # type: ignore[attr-defined]
+
+        return asyncio.create_task(_listen())
+
+    # ── Queries ──
+
+    async def get_active_workers(self) -> list[dict]:
+        """Return workers with heartbeat within the last 2 minutes."""
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            cur = await conn.execute(SQL_ACTIVE_WORKERS)
+            rows = await cur.fetchall()
+        return [worker_row(r) for r in rows]
+
+    async def get_batch_jobs(self, batch_id: str) -> list[dict]:
+        """Return all jobs for a batch."""
+        async with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            cur = await conn.execute(SQL_BATCH_JOBS, (batch_id,))
+            rows = await cur.fetchall()
+        return [batch_job(r) for r in rows]
@@ -0,0 +1,139 @@
+"""What a worker can run and what a job needs, for matching in the job queue.
+
+Workers advertise their capabilities in ``workers.metadata`` (refreshed on
+every claim) and jobs carry ``requirements`` plus the ``terrain_hash`` of
+their project. The claim query (see :meth:`hecras_runner.db.DbClient.claim_jobs`)
+only hands a worker jobs it can run, and prefers jobs whose terrain it
+already has in its local cache.
+
+Capabilities::
+
+    {"ram_gb": 63.7, "cores": 16, "hecras_version": "6.6",
+     "scratch_free_gb": 412.5, "terrain_hashes": ["9f2c...", ...]}
+
+Requirements use the same names: ``ram_gb``, ``cores``, ``hecras_version``
+(a prefix, so ``"6"`` accepts any 6.x install) and ``scratch_gb``. A key
+missing on either side does not restrict the match.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import sys
+
+from hecras_runner.scratch import ScratchManager, estimate_footprint
+from hecras_runner.transfer import terrain_cache_complete
+
+_GB = 1024**3
+
+_VERSION_DIR = re.compile(r"^\d+(\.\d+)*$")
+
+
+def total_ram_bytes() -> int:
+    """Physical memory of this machine in bytes, 0 if it cannot be read."""
+    if sys.platform == "win32":
+        import ctypes
+
+        class _MemoryStatus(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("sullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = _MemoryStatus()
+        status.dwLength = ctypes.sizeof(_MemoryStatus)
+        kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+        if kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return int(status.ullTotalPhys)
+        return 0
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+def hecras_version_from_path(ras_exe: str) -> str:
+    """HEC-RAS version from its install folder (``...\\HEC-RAS\\6.6\\Ras.exe`` -> ``"6.6"``)."""
+    folder = os.path.basename(os.path.dirname(ras_exe.replace("\\", os.sep)))
+    return folder if _VERSION_DIR.match(folder) else ""
+
+
+def cached_terrain_hashes(terrain_cache_dir: str | None) -> list[str]:
+    """Terrain hashes with a complete entry in *terrain_cache_dir* (see ``share_to_local``)."""
+    if not terrain_cache_dir:
+        return []
+    try:
+        entries = list(os.scandir(terrain_cache_dir))
+    except OSError:
+        return []
+    # Entries being filled are hidden temp folders without the completion marker
+    return sorted(
+        e.name
+        for e in entries
+        if not e.name.startswith(".") and e.is_dir() and terrain_cache_complete(e.path)
+    )
+
+
+def worker_capabilities(
+    ras_exe: str | None = None,
+    scratch: ScratchManager | None = None,
+    terrain_cache_dir: str | None = None,
+) -> dict:
+    """Capabilities of this machine in the ``workers.metadata`` format.
+
+    Values that cannot be determined are left out, so they do not restrict
+    matching.
+    """
+    caps: dict = {}
+    ram = total_ram_bytes()
+    if ram:
+        caps["ram_gb"] = round(ram / _GB, 1)
+    cores = os.cpu_count()
+    if cores:
+        caps["cores"] = cores
+    version = hecras_version_from_path(ras_exe) if ras_exe else ""
+    if version:
+        caps["hecras_version"] = version
+    if scratch is not None:
+        free = max((scratch.available(root) for root in scratch.roots), default=-1)
+        if free >= 0:
+            caps["scratch_free_gb"] = round(free / _GB, 2)
+    caps["terrain_hashes"] = cached_terrain_hashes(terrain_cache_dir)
+    return caps
+
+
+def job_requirements(
+    project_path: str,
+    plan_suffix: str,
+    ram_gb: float | None = None,
+    cores: int | None = None,
+    hecras_version: str | None = None,
+    project_bytes: int | None = None,
+) -> dict:
+    """Requirements of one plan run in the ``jobs.requirements`` format.
+
+    Scratch space is estimated from the project (see
+    :func:`~hecras_runner.scratch.estimate_footprint`; pass *project_bytes*
+    when submitting many plans of one project); memory, cores and HEC-RAS
+    version are only required when given.
+    """
+    requirements: dict = {}
+    with contextlib.suppress(OSError):
+        footprint = estimate_footprint(project_path, plan_suffix, project_bytes=project_bytes)
+        requirements["scratch_gb"] = round(footprint / _GB, 2)
+    if ram_gb:
+        requirements["ram_gb"] = ram_gb
+    if cores:
+        requirements["cores"] = cores
+    if hecras_version:
+        requirements["hecras_version"] = hecras_version
+    return requirements
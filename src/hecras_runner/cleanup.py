@@ -0,0 +1,317 @@
+"""Background deletion of temporary run directories.
+
+Ras.exe can keep files locked for a while after it exits, so removing a temp
+copy may take several attempts. ``CleanupService`` moves that off the critical
+path: directories are queued, retried with exponential backoff on a daemon
+thread, and recorded in ``%APPDATA%/hecras_runner/pending_cleanup.json`` so
+deletions interrupted by an exit are finished on the next start.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import heapq
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+from hecras_runner.settings import _settings_dir, load_settings
+
+# Prefix used by tempfile.mkdtemp() for every staged project copy
+TEMP_PREFIX = "HECRAS_"
+
+# A state lock file older than this was left behind by a crashed process
+_STATE_LOCK_STALE = 30.0
+
+
+def _state_path() -> str:
+    """Return the path of the persisted pending-deletion list."""
+    return os.path.join(_settings_dir(), "pending_cleanup.json")
+
+
+@contextlib.contextmanager
+def _file_lock(path: str, timeout: float = 5.0) -> Iterator[bool]:
+    """Hold the lock file *path* while the block runs.
+
+    Yields False if the lock could not be taken within *timeout* seconds;
+    the caller then goes ahead unlocked rather than losing its update.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            with contextlib.suppress(OSError):
+                if time.time() - os.path.getmtime(path) > _STATE_LOCK_STALE:
+                    os.remove(path)
+                    continue
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(0.02)
+            continue
+        except OSError:
+            break
+        os.close(fd)
+        try:
+            yield True
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+        return
+    yield False
+
+
+def _newest_mtime(path: str) -> float:
+    """Newest mtime of *path* and its top-level entries (0.0 if unreadable)."""
+    try:
+        newest = os.path.getmtime(path)
+        with os.scandir(path) as it:
+            for entry in it:
+                with contextlib.suppress(OSError):
+                    newest = max(newest, entry.stat(follow_symlinks=False).st_mtime)
+        return newest
+    except OSError:
+        return 0.0
+
+
+class CleanupService:
+    """Queue of directories to delete, retried with backoff on a daemon thread.
+
+    Use :func:`get_cleanup_service` for the process-wide instance.
+    """
+
+    def __init__(
+        self,
+        state_path: str | None = None,
+        log: Callable[[str], None] = print,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        max_attempts: int = 8,
+    ) -> None:
+        self._state_path = state_path or _state_path()
+        self._log = log
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._max_attempts = max_attempts
+
+        self._cond = threading.Condition()
+        # (due_monotonic, seq, attempt, path, log)
+        self._heap: list[tuple[float, int, int, str, Callable[[str], None]]] = []
+        self._seq = itertools.count()
+        self._queued: set[str] = set()
+        self._persisted: set[str] = set()
+        # Deleted since the last save; dropped from the shared state file
+        self._removed: set[str] = set()
+        self._active = 0
+        self._stop = False
+        self._thread: threading.Thread | None = None
+
+    # ── Lifecycle ──
+
+    def start(self) -> None:
+        """Re-queue deletions persisted by a previous run and start the worker thread."""
+        for path in self._load_state():
+            self.enqueue(path)
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def shutdown(self, timeout: float | None = None) -> bool:
+        """Wait up to *timeout* seconds for the queue to drain, then stop.
+
+        Anything still pending stays in the state file for the next start.
+        Returns True if the queue drained.
+        """
+        drained = self.wait_idle(timeout)
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join(timeout=5)
+        return drained
+
+    # ── Public API ──
+
+    def enqueue(self, path: str, log: Callable[[str], None] | None = None) -> None:
+        """Queue *path* for deletion. Returns immediately."""
+        path = os.path.abspath(path)
+        with self._cond:
+            if path in self._queued:
+                return
+            self._queued.add(path)
+            self._persisted.add(path)
+            entry = (time.monotonic(), next(self._seq), 0, path, log or self._log)
+            heapq.heappush(self._heap, entry)
+            self._save_state()
+            self._cond.notify_all()
+
+    def sweep_orphans(self, temp_root: str | None = None, max_age_hours: float = 12.0) -> int:
+        """Queue ``HECRAS_*`` directories in *temp_root* untouched for *max_age_hours*.
+
+        Directories of runs that are still in progress are skipped because
+        Ras.exe keeps writing to them. Returns the number queued.
+        """
+        temp_root = temp_root or tempfile.gettempdir()
+        cutoff = time.time() - max_age_hours * 3600
+        count = 0
+        try:
+            entries = list(os.scandir(temp_root))
+        except OSError:
+            return 0
+
+        for entry in entries:
+            if not entry.name.startswith(TEMP_PREFIX):
+                continue
+            with contextlib.suppress(OSError):
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            if _newest_mtime(entry.path) < cutoff:
+                self.enqueue(entry.path)
+                count += 1
+
+        if count:
+            self._log(f"Queued {count} orphaned temp folder(s) in {temp_root} for cleanup")
+        return count
+
+    def pending(self) -> list[str]:
+        """Paths still waiting for deletion (queued or given up this session)."""
+        with self._cond:
+            return sorted(self._persisted)
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until no deletions are queued or in progress. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._heap and not self._active, timeout)
+
+    # ── Worker thread ──
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stop:
+                    now = time.monotonic()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    self._cond.wait(self._heap[0][0] - now if self._heap else None)
+                if self._stop:
+                    return
+                _due, _seq, attempt, path, log = heapq.heappop(self._heap)
+                self._active += 1
+
+            removed = self._try_remove(path)
+            gave_up = not removed and attempt + 1 >= self._max_attempts
+
+            with self._cond:
+                self._active -= 1
+                if removed:
+                    self._queued.discard(path)
+                    self._persisted.discard(path)
+                    self._removed.add(path)
+                    self._save_state()
+                elif gave_up:
+                    # Stays persisted so the next start tries again
+                    self._queued.discard(path)
+                else:
+                    delay = min(self._base_delay * 2**attempt, self._max_delay)
+                    heapq.heappush(
+                        self._heap,
+                        (time.monotonic() + delay, next(self._seq), attempt + 1, path, log),
+                    )
+                self._cond.notify_all()
+
+            if removed:
+                log(f"Cleaned up: {path}")
+            elif gave_up:
+                log(f"Could not clean up {path} (files may still be locked)")
+
+    @staticmethod
+    def _try_remove(path: str) -> bool:
+        if not os.path.exists(path):
+            return True
+        try:
+            shutil.rmtree(path)
+        except OSError:
+            return not os.path.exists(path)
+        return True
+
+    # ── Persistence ──
+
+    def _load_state(self) -> list[str]:
+        try:
+            with open(self._state_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError, ValueError):
+            return []
+        if not isinstance(data, list):
+            return []
+        return [str(p) for p in data]
+
+    def _save_state(self) -> None:
+        """Merge this process's pending list into the state file. Caller holds ``self._cond``.
+
+        The GUI, CLI runs and workers share one state file, so it is re-read
+        under a lock file: paths this process deleted are dropped, paths it
+        queued are added and other processes' entries are kept.
+        """
+        try:
+            os.makedirs(os.path.dirname(self._state_path), exist_ok=True)
+            with _file_lock(f"{self._state_path}.lock"):
+                merged = (set(self._load_state()) - self._removed) | self._persisted
+                tmp_path = f"{self._state_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(sorted(merged), f, indent=2)
+                os.replace(tmp_path, self._state_path)
+            self._removed.clear()
+        except OSError as e:
+            self._log(f"Could not save cleanup state: {e}")
+
+
+_service: CleanupService | None = None
+_service_lock = threading.Lock()
+
+
+def get_cleanup_service(log: Callable[[str], None] = print) -> CleanupService:
+    """Return the process-wide cleanup service, starting it on first use.
+
+    On start, deletions persisted by a previous run are resumed and orphaned
+    ``HECRAS_*`` folders in the system temp directory and the configured
+    scratch roots (including a RAM-disk path) are queued.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = CleanupService(log=log)
+            _service.start()
+            _service.sweep_orphans()
+            scratch = load_settings().scratch
+            roots = list(scratch.temp_roots)
+            if scratch.ram_disk_path:
+                roots.append(scratch.ram_disk_path)
+            for root in roots:
+                if os.path.abspath(root) != os.path.abspath(tempfile.gettempdir()):
+                    _service.sweep_orphans(root)
+        return _service
+
+
+def shutdown_cleanup_service(timeout: float | None = None) -> bool:
+    """Drain and stop the process-wide service if it was started.
+
+    Call before exiting so queued folders get a chance to be deleted; anything
+    still locked after *timeout* seconds is retried on the next start.
+    """
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is None:
+        return True
+    return service.shutdown(timeout)
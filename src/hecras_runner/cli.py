@@ -6,11 +6,16 @@ import argparse
 import os
 import signal
 import sys
-import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
+from hecras_runner.cleanup import get_cleanup_service, shutdown_cleanup_service
 from hecras_runner.discovery import check_hecras_installed, find_hecras_exe
-from hecras_runner.parser import parse_project
+from hecras_runner.parser import DEFAULT_PARSE_WORKERS, parse_project
+from hecras_runner.preflight import validate_plans
+from hecras_runner.project_cache import ProjectCache
 from hecras_runner.runner import SimulationJob, run_simulations
+from hecras_runner.scratch import ScratchManager, estimate_footprint
+from hecras_runner.settings import load_settings
 
 
 def _build_run_parser(subparsers: argparse._SubParsersAction) -> None:
@@ -74,6 +79,47 @@ def _build_run_parser(subparsers: argparse._SubParsersAction) -> None:
         metavar="SECONDS",
         help="Per-plan timeout in seconds (default: 7200)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse all project files instead of using the parsed-project cache",
+    )
+    parser.add_argument(
+        "--scratch",
+        action="append",
+        metavar="DIR",
+        help="Temp root for staged copies; repeat for several drives (default: from settings)",
+    )
+    parser.add_argument(
+        "--ram-disk",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Stage copies on a RAM disk when they fit the memory budget "
+        "(default path: /dev/shm on Linux, or scratch.ram_disk_path from settings)",
+    )
+    parser.add_argument(
+        "--ram-budget",
+        type=float,
+        metavar="GB",
+        help="Memory budget for RAM-disk staging (default: from settings, 4 GB)",
+    )
+    parser.add_argument(
+        "--skip-preflight",
+        action="store_true",
+        help="Launch without checking plan, geometry, flow, DSS and terrain files first",
+    )
+    parser.add_argument(
+        "--queue",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help=(
+            "Submit the plans to a local SQLite queue for 'worker --queue' "
+            "instead of running them (default path: "
+            "%%APPDATA%%/hecras_runner/queue.sqlite)"
+        ),
+    )
 
 
 def _build_worker_parser(subparsers: argparse._SubParsersAction) -> None:
@@ -102,9 +148,67 @@ def _build_worker_parser(subparsers: argparse._SubParsersAction) -> None:
     parser.add_argument(
         "--poll-interval",
         type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help=(
+            "Fallback seconds between job queue polls; queued jobs wake the "
+            "worker immediately via NOTIFY (default: 60)"
+        ),
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
         default=5.0,
         metavar="SECONDS",
-        help="Seconds between job queue polls (default: 5)",
+        help=(
+            "Seconds between writes of buffered job progress; each write also "
+            "carries the heartbeat (default: 5)"
+        ),
+    )
+    parser.add_argument(
+        "--queue",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help=(
+            "Take jobs from a local SQLite queue instead of the database; "
+            "workers on this machine can share one (default path: "
+            "%%APPDATA%%/hecras_runner/queue.sqlite)"
+        ),
+    )
+
+
+def _build_index_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the 'index' subcommand."""
+    parser = subparsers.add_parser(
+        "index",
+        help="Index projects under directory trees and query the index",
+    )
+    parser.add_argument(
+        "roots",
+        nargs="*",
+        metavar="DIR",
+        help="Directory trees to (re-)index; unchanged projects are skipped",
+    )
+    parser.add_argument("--db", metavar="PATH", help="Index database (default: in app data)")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-parse every project, even if unchanged",
+    )
+    parser.add_argument("--geometry", metavar="PATTERN", help="Plans using this geometry")
+    parser.add_argument("--flow", metavar="PATTERN", help="Plans using this flow")
+    parser.add_argument("--plan", metavar="PATTERN", help="Plans with this key or title")
+    parser.add_argument("--project", metavar="PATTERN", help="Projects with this path or title")
+    parser.add_argument(
+        "--unrun",
+        action="store_true",
+        help="Only plans without a results file (.p##.hdf)",
+    )
+    parser.add_argument(
+        "--dss",
+        metavar="PATTERN",
+        help="Projects referencing this DSS file (not combined with the plan filters)",
     )
 
 
@@ -116,6 +220,7 @@ def build_parser() -> argparse.ArgumentParser:
     subparsers = parser.add_subparsers(dest="command")
     _build_run_parser(subparsers)
     _build_worker_parser(subparsers)
+    _build_index_parser(subparsers)
 
     # Backward compat: if no subcommand is given but positional args look like
     # the old interface (a .prj path), treat it as the 'run' subcommand.
@@ -127,7 +232,13 @@ def _run_command(args: argparse.Namespace) -> int:
     """Handle the 'run' subcommand."""
     # Parse project
     try:
-        project = parse_project(args.project)
+        cache = None if args.no_cache else ProjectCache(args.project)
+        project = parse_project(
+            args.project,
+            cache=cache,
+            max_workers=DEFAULT_PARSE_WORKERS,
+            read_hdf=args.list_plans,
+        )
     except (OSError, UnicodeDecodeError) as e:
         print(f"Error: Cannot read project file: {e}", file=sys.stderr)
         return 1
@@ -144,6 +255,14 @@ def _run_command(args: argparse.Namespace) -> int:
             current = " (current)" if plan.key == project.current_plan else ""
             geom, flow = plan.geom_ref, plan.flow_ref
             print(f"  {plan.key}: {plan.title}  [geom={geom}, flow={flow}]{current}")
+        sized = [g for g in project.geometries if g.cells_2d is not None]
+        if sized:
+            print("Geometry sizes:")
+            for g in sized:
+                print(
+                    f"  {g.key}: {g.cells_2d:,} 2D cells in {len(g.flow_areas_2d or {})} "
+                    f"area(s), {g.cross_sections} cross sections, {g.structures} structures"
+                )
         return 0
 
     # Determine which plans to run
@@ -160,11 +279,15 @@ def _run_command(args: argparse.Namespace) -> int:
         print("Error: Specify --plans, --all, or --list", file=sys.stderr)
         return 1
 
+    if args.queue is not None and (args.dss or args.use_com):
+        print("Error: --dss and --use-com cannot be combined with --queue", file=sys.stderr)
+        return 1
+
     # Determine backend
     backend = "com" if args.use_com else "cli"
 
-    # Check HEC-RAS installation
-    if not check_hecras_installed(backend=backend):
+    # Check HEC-RAS installation (queued plans run on the workers' install)
+    if args.queue is None and not check_hecras_installed(backend=backend):
         if backend == "com":
             print(
                 "Error: HEC-RAS is not installed or COM server is not accessible.",
@@ -185,6 +308,31 @@ def _run_command(args: argparse.Namespace) -> int:
         for plan in selected
     ]
 
+    if not args.skip_preflight:
+        report = validate_plans(args.project, jobs)
+        for issue in report.issues:
+            print(issue, file=sys.stderr)
+        print(report.summary())
+        if not report.ok:
+            print(
+                "Error: Pre-flight checks failed; fix the problems above or use --skip-preflight.",
+                file=sys.stderr,
+            )
+            return 1
+
+    if args.queue is not None:
+        return _submit_to_queue(args, project.title, jobs)
+
+    scratch_settings = load_settings().scratch
+    if args.scratch:
+        scratch_settings.temp_roots = args.scratch
+    if args.ram_disk is not None:
+        scratch_settings.ram_disk = True
+        scratch_settings.ram_disk_path = args.ram_disk or scratch_settings.ram_disk_path
+    if args.ram_budget is not None:
+        scratch_settings.ram_budget_gb = args.ram_budget
+    scratch = ScratchManager.from_settings(scratch_settings)
+
     run_simulations(
         project_path=args.project,
         jobs=jobs,
@@ -194,7 +342,50 @@ def _run_command(args: argparse.Namespace) -> int:
         backend=backend,
         max_cores=args.max_cores,
         timeout_seconds=args.timeout,
+        scratch=scratch,
     )
+
+    # Let queued temp folders finish deleting before the process exits;
+    # anything still locked is retried on the next start.
+    shutdown_cleanup_service(timeout=30)
+    return 0
+
+
+def _submit_to_queue(args: argparse.Namespace, title: str, jobs: list[SimulationJob]) -> int:
+    """Submit *jobs* as one batch to the local SQLite queue."""
+    from hecras_runner.capabilities import job_requirements
+    from hecras_runner.rasmap import staged_size
+    from hecras_runner.sqlite_queue import SqliteQueueClient
+
+    queue = SqliteQueueClient.connect(args.queue or None)
+    if queue is None:
+        print("Error: Cannot open the local job queue.", file=sys.stderr)
+        return 1
+
+    # Workers open the project in place, so store a path that does not
+    # depend on this shell's working directory
+    project_path = os.path.abspath(args.project)
+    project_bytes = staged_size(project_path)
+    try:
+        queue.submit_batch(
+            project_path=project_path,
+            project_title=title,
+            jobs=[
+                {
+                    "plan_name": job.plan_name,
+                    "plan_suffix": job.plan_suffix,
+                    "requirements": job_requirements(
+                        project_path, job.plan_suffix, project_bytes=project_bytes
+                    ),
+                }
+                for job in jobs
+            ],
+            submitted_by=os.environ.get("USERNAME") or os.environ.get("USER", ""),
+        )
+    finally:
+        queue.close()
+    worker = "hecras-runner worker --queue" + (f" {args.queue}" if args.queue else "")
+    print(f"Run the queued plans with: {worker}")
     return 0
 
 
@@ -204,26 +395,31 @@ def _run_worker_job(
     args: argparse.Namespace,
     db: object,
     settings: object,
+    scratch: ScratchManager | None = None,
 ) -> None:
     """Execute a single claimed job — with SMB transfer if share configured."""
     import tempfile
 
-    from hecras_runner.file_ops import cleanup_temp_dir
     from hecras_runner.runner import run_hecras_cli
 
     job_id = job["job_id"]
     plan_name = job["plan_name"]
     plan_suffix = job["plan_suffix"]
     project_path = job["project_path"]
+    worker_id = job.get("worker_id")
 
-    db.start_job(job_id)  # type: ignore[attr-defined]
+    if not db.start_job(job_id, worker_id=worker_id):  # type: ignore[attr-defined]
+        print(f"  Job {job_id}: lease lost before start, skipping")
+        return
 
     share_path = settings.network.share_path  # type: ignore[attr-defined]
-    use_transfer = bool(share_path)
+    # Local queue jobs point at the project itself, not at an upload
+    use_transfer = bool(share_path) and args.queue is None
 
     if use_transfer:
         from hecras_runner.transfer import (
             TransferManifest,
+            default_terrain_cache_dir,
             results_to_share,
             share_to_local,
         )
@@ -237,40 +433,68 @@ def _run_worker_job(
         with open(manifest_file, encoding="utf-8") as f:
             mdata = json.load(f)
         manifest = TransferManifest(**mdata)
-
-        local_temp = tempfile.mkdtemp(prefix="HECRAS_")
-        temp_prj = share_to_local(manifest, local_temp)
+        source_prj = os.path.join(share_project_dir, os.path.basename(project_path))
     else:
-        from hecras_runner.file_ops import copy_project_to_temp
+        source_prj = project_path
 
-        temp_prj = copy_project_to_temp(project_path)
-        local_temp = os.path.dirname(temp_prj)
+    # Wait for scratch space rather than filling the drive mid-run
+    scratch = scratch or ScratchManager()
+    lease = scratch.reserve(estimate_footprint(source_prj, plan_suffix), timeout=600)
+    if lease is None:
+        raise RuntimeError("Insufficient scratch space")
 
-    result = run_hecras_cli(
-        temp_prj,
-        plan_suffix=plan_suffix,
-        plan_name=plan_name,
-        ras_exe=ras_exe,
-        max_cores=args.max_cores,
-        timeout_seconds=args.timeout,
-    )
+    try:
+        if use_transfer:
+            local_temp = tempfile.mkdtemp(prefix="HECRAS_", dir=lease.root)
+            temp_prj = share_to_local(
+                manifest,  # type: ignore[possibly-undefined]
+                local_temp,
+                terrain_cache_dir=default_terrain_cache_dir(),  # type: ignore[possibly-undefined]
+            )
+        else:
+            from hecras_runner.file_ops import copy_project_to_temp
 
-    # Upload results to share if applicable
-    if use_transfer:
-        results_to_share(
+            temp_prj = copy_project_to_temp(
+                project_path,
+                plan_key=f"p{plan_suffix}",
+                write_detailed=True,
+                temp_root=lease.root,
+            )
+            local_temp = os.path.dirname(temp_prj)
+
+        result = run_hecras_cli(
             temp_prj,
-            manifest.share_results_dir,  # type: ignore[possibly-undefined]
-            plan_suffix,
+            plan_suffix=plan_suffix,
+            plan_name=plan_name,
+            ras_exe=ras_exe,
+            max_cores=args.max_cores,
+            timeout_seconds=args.timeout,
+            # Buffered by the DB client and written with the heartbeat
+            on_progress=lambda fraction, _ts: db.update_progress(  # type: ignore[attr-defined]
+                job_id, fraction
+            ),
+            prepared=not use_transfer,
         )
 
-    db.complete_job(  # type: ignore[attr-defined]
-        job_id,
-        success=result.success,
-        elapsed_seconds=result.elapsed_seconds,
-        error_message=result.error_message,
-        hdf_verified=result.success,
-    )
-    cleanup_temp_dir(local_temp)
+        # Upload results to share if applicable
+        if use_transfer:
+            results_to_share(
+                temp_prj,
+                manifest.share_results_dir,  # type: ignore[possibly-undefined]
+                plan_suffix,
+            )
+
+        db.complete_job(  # type: ignore[attr-defined]
+            job_id,
+            success=result.success,
+            elapsed_seconds=result.elapsed_seconds,
+            error_message=result.error_message,
+            hdf_verified=result.success,
+            worker_id=worker_id,
+        )
+        get_cleanup_service().enqueue(local_temp)
+    finally:
+        scratch.release(lease)
 
     status = "OK" if result.success else "FAILED"
     print(f"  Job {job_id}: {status} ({result.elapsed_seconds:.1f}s)")
@@ -278,11 +502,12 @@ def _run_worker_job(
 
 def _worker_command(args: argparse.Namespace) -> int:
     """Handle the 'worker' subcommand — claim and run jobs from the DB queue."""
+    from hecras_runner.capabilities import worker_capabilities
     from hecras_runner.db import DbClient
-    from hecras_runner.settings import load_settings
+    from hecras_runner.transfer import default_terrain_cache_dir
 
     settings = load_settings()
-    if not settings.db.host:
+    if args.queue is None and not settings.db.host:
         print("Error: Database not configured. Run the GUI to set up connection.", file=sys.stderr)
         return 1
 
@@ -293,18 +518,27 @@ def _worker_command(args: argparse.Namespace) -> int:
         return 1
 
     # Connect to DB
-    db = DbClient.connect(settings.db)
+    if args.queue is not None:
+        from hecras_runner.sqlite_queue import SqliteQueueClient
+
+        db = SqliteQueueClient.connect(args.queue or None)
+    else:
+        db = DbClient.connect(settings.db)
     if db is None:
         print("Error: Cannot connect to database.", file=sys.stderr)
         return 1
 
+    scratch = ScratchManager.from_settings(settings.scratch)
+    terrain_cache_dir = default_terrain_cache_dir()
+
     try:
         # Register as worker
         worker = db.register_worker(
             hecras_path=ras_exe,
             max_concurrent=args.max_concurrent,
+            capabilities=worker_capabilities(ras_exe, scratch, terrain_cache_dir),
         )
-        db.start_heartbeat(worker.worker_id)
+        db.start_heartbeat(worker.worker_id, flush_interval=args.progress_interval)
 
         # Graceful shutdown on Ctrl+C
         shutdown = False
@@ -318,40 +552,98 @@ def _worker_command(args: argparse.Namespace) -> int:
 
         print(f"Worker {worker.worker_id} online ({worker.hostname})")
         print(
-            f"Polling for jobs every {args.poll_interval}s (max concurrent: {args.max_concurrent})"
+            f"Waiting for jobs (NOTIFY, fallback poll every {args.poll_interval}s, "
+            f"max concurrent: {args.max_concurrent})"
         )
 
-        while not shutdown:
-            job = db.claim_job(worker.worker_id)
-            if job is None:
-                time.sleep(args.poll_interval)
-                continue
-
+        def _process(job: dict) -> None:
             job_id = job["job_id"]
-            plan_name = job["plan_name"]
-            plan_suffix = job["plan_suffix"]
-
-            print(f"Claimed job {job_id}: {plan_name} (p{plan_suffix})")
-            db.start_job(job_id)
-
+            print(f"Claimed job {job_id}: {job['plan_name']} (p{job['plan_suffix']})")
             try:
-                _run_worker_job(job, ras_exe, args, db, settings)
+                _run_worker_job(job, ras_exe, args, db, settings, scratch)
             except Exception as e:
                 db.complete_job(
                     job_id,
                     success=False,
                     elapsed_seconds=0.0,
                     error_message=str(e),
+                    worker_id=job.get("worker_id"),
                 )
                 print(f"  Job {job_id}: ERROR ({e})")
 
+        slots = max(args.max_concurrent, 1)
+        running: set[Future] = set()
+        with ThreadPoolExecutor(max_workers=slots, thread_name_prefix="job") as pool:
+            while not shutdown:
+                running = {f for f in running if not f.done()}
+                free = slots - len(running)
+                if free:
+                    # Fill every free slot from one claim statement; free
+                    # scratch and cached terrains change between claims
+                    caps = worker_capabilities(ras_exe, scratch, terrain_cache_dir)
+                    jobs = db.claim_jobs(worker.worker_id, free, capabilities=caps)
+                    running |= {pool.submit(_process, job) for job in jobs}
+                    if jobs:
+                        continue
+                    db.wait_for_jobs(
+                        args.poll_interval,
+                        stop=lambda active=running: shutdown or any(f.done() for f in active),
+                    )
+                else:
+                    wait(running, timeout=1.0, return_when=FIRST_COMPLETED)
+            # Let claimed jobs finish before going offline
+            wait(running)
+
         # Clean shutdown
         db.set_worker_offline(worker.worker_id)
         print("Worker offline.")
 
     finally:
         db.close()
+        shutdown_cleanup_service(timeout=30)
+
+    return 0
+
 
+def _index_command(args: argparse.Namespace) -> int:
+    """Handle the 'index' subcommand — update and/or query the workspace index."""
+    from hecras_runner.index import WorkspaceIndex
+
+    with WorkspaceIndex(args.db) as index:
+        for root in args.roots:
+            if not os.path.isdir(root):
+                print(f"Error: Not a directory: {root}", file=sys.stderr)
+                return 1
+        if args.roots:
+            index.scan(args.roots, force=args.force)
+
+        if args.dss:
+            for project_path, source, dss_path in index.find_dss(args.dss):
+                print(f"{project_path}  [{source}]  {dss_path}")
+            return 0
+
+        filters = (args.geometry, args.flow, args.plan, args.project)
+        if any(filters) or args.unrun:
+            plans = index.find_plans(
+                geometry=args.geometry,
+                flow=args.flow,
+                plan=args.plan,
+                project=args.project,
+                unrun=args.unrun,
+            )
+            last_project = None
+            for plan in plans:
+                if plan.project_path != last_project:
+                    print(f"{plan.project_path}  ({plan.project_title})")
+                    last_project = plan.project_path
+                status = "results" if plan.has_results else "not run"
+                print(
+                    f"  {plan.key}: {plan.title}  [geom={plan.geom_ref} {plan.geom_title}, "
+                    f"flow={plan.flow_ref} {plan.flow_title}]  {status}"
+                )
+            print(f"{len(plans)} plan(s)")
+        elif not args.roots:
+            print(f"{index.project_count()} project(s) indexed in {index.db_path}")
     return 0
 
 
@@ -362,15 +654,22 @@ def main(argv: list[str] | None = None) -> int:
     # a file path or flag, insert "run" as the subcommand.
     if argv is None:
         argv = sys.argv[1:]
-    if argv and argv[0] not in ("run", "worker", "-h", "--help"):
+    if argv and argv[0] not in ("run", "worker", "index", "-h", "--help"):
         argv = ["run", *argv]
 
     args = parser.parse_args(argv)
 
+    if args.command == "index" and args.dss:
+        plan_filters = (args.geometry, args.flow, args.plan, args.project, args.unrun)
+        if any(plan_filters):
+            parser.error("index: --dss cannot be combined with plan filters")
+
     if args.command == "run":
         return _run_command(args)
     elif args.command == "worker":
         return _worker_command(args)
+    elif args.command == "index":
+        return _index_command(args)
     else:
         parser.print_help()
         return 0
@@ -7,19 +7,47 @@ If psycopg is not installed, ``DbClient.connect()`` returns None gracefully.
 from __future__ import annotations
 
 import contextlib
-import platform
-import socket
+import json
 import threading
+import time
+import uuid
 from collections.abc import Callable
-from dataclasses import dataclass
-
+from dataclasses import dataclass, field
+
+from hecras_runner._queue_sql import (
+    CURRENT_SCHEMA_VERSION,
+    DEFAULT_AGING_SECONDS,
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_PROGRESS_FLUSH_SECONDS,
+    JOBS_CHANNEL,
+    LISTEN_RETRY_DELAY,
+    LISTEN_SLICE,
+    MIGRATIONS,
+    SQL_ACTIVE_WORKERS,
+    SQL_BATCH_JOBS,
+    SQL_BATCH_STATUS,
+    SQL_CLAIM_JOBS,
+    SQL_COMPLETE_JOB,
+    SQL_REAP,
+    SQL_RECORD_VERSION,
+    SQL_REGISTER_WORKER,
+    SQL_SCHEMA_VERSION,
+    SQL_SET_OFFLINE,
+    SQL_START_JOB,
+    SQL_SUBMIT_BATCH,
+    SQL_UPDATE_PROGRESS,
+    batch_job,
+    batch_status,
+    claim_params,
+    claimed_job,
+    heartbeat_statement,
+    host_identity,
+    settings_conninfo,
+    submit_params,
+    worker_row,
+)
 from hecras_runner.settings import DbSettings
 
-# Schema version managed by this code
-_CURRENT_SCHEMA_VERSION = 1
-
-_SCHEMA = "hecras_runner"
-
 
 @dataclass
 class WorkerInfo:
@@ -30,6 +58,14 @@ class WorkerInfo:
     ip_address: str
 
 
+@dataclass
+class BatchSubmission:
+    """IDs created by :meth:`DbClient.submit_batch`."""
+
+    batch_id: str
+    job_ids: list[str] = field(default_factory=list)  # same order as the submitted jobs
+
+
 class DbClient:
     """PostgreSQL client for the hecras_runner distributed job queue.
 
@@ -37,11 +73,24 @@ class DbClient:
     if psycopg is not installed or the database is unreachable.
     """
 
-    def __init__(self, pool: object, log: Callable[[str], None] = print) -> None:
+    def __init__(
+        self,
+        pool: object,
+        log: Callable[[str], None] = print,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        aging_seconds: float = DEFAULT_AGING_SECONDS,
+    ) -> None:
         self._pool = pool
         self._log = log
+        self._lease_seconds = lease_seconds
+        self._aging_seconds = aging_seconds
         self._heartbeat_stop = threading.Event()
         self._heartbeat_thread: threading.Thread | None = None
+        # Latest unwritten progress per job while the heartbeat thread runs
+        self._progress: dict[str, float] = {}
+        self._progress_lock = threading.Lock()
+        self._listen_conn: object | None = None
+        self._listen_retry_at = 0.0
 
     @classmethod
     def connect(
@@ -56,15 +105,9 @@ class DbClient:
             log("psycopg not installed — database features unavailable")
             return None
 
-        conninfo = (
-            f"host={settings.host} port={settings.port} "
-            f"dbname={settings.dbname} user={settings.user} "
-            f"password={settings.password}"
-        )
-
         try:
             pool = ConnectionPool(
-                conninfo=conninfo,
+                conninfo=settings_conninfo(settings),
                 min_size=1,
                 max_size=3,
                 open=True,
@@ -81,6 +124,7 @@ class DbClient:
     def close(self) -> None:
         """Close the connection pool and stop heartbeat."""
         self.stop_heartbeat()
+        self._close_listen_conn()
         with contextlib.suppress(Exception):
             self._pool.close()  # type: ignore[attr-defined]
 
@@ -93,8 +137,8 @@ class DbClient:
             conn.execute("SELECT pg_advisory_lock(42)")
             try:
                 current = self._get_schema_version(conn)
-                if current < _CURRENT_SCHEMA_VERSION:
-                    self._log(f"Migrating schema from v{current} to v{_CURRENT_SCHEMA_VERSION}")
+                if current < CURRENT_SCHEMA_VERSION:
+                    self._log(f"Migrating schema from v{current} to v{CURRENT_SCHEMA_VERSION}")
                     self._apply_migrations(conn, current)
                     conn.commit()
             finally:
@@ -103,20 +147,25 @@ class DbClient:
     def _get_schema_version(self, conn: object) -> int:
         """Get current schema version, 0 if table doesn't exist."""
         try:
-            row = conn.execute(  # type: ignore[attr-defined]
-                f"SELECT MAX(version) FROM {_SCHEMA}.schema_version"
-            ).fetchone()
+            row = conn.execute(SQL_SCHEMA_VERSION).fetchone()  # type: ignore[attr-defined]
             return row[0] if row and row[0] is not None else 0
         except Exception:
             conn.rollback()  # type: ignore[attr-defined]
             return 0
 
     def _apply_migrations(self, conn: object, from_version: int) -> None:
-        """Apply migrations from from_version to _CURRENT_SCHEMA_VERSION."""
+        """Apply migrations from from_version to CURRENT_SCHEMA_VERSION."""
         # Migration 0 -> 1 is the initial schema (applied via db_schema.sql)
-        # Future migrations go here as elif blocks
         if from_version < 1:
             self._log("Migration 0->1 should be applied via docs/db_schema.sql")
+            return
+        for version, sql, description in MIGRATIONS:
+            if from_version < version:
+                conn.execute(sql)  # type: ignore[attr-defined]
+                self._record_version(conn, version, description)
+
+    def _record_version(self, conn: object, version: int, description: str) -> None:
+        conn.execute(SQL_RECORD_VERSION, (version, description))  # type: ignore[attr-defined]
 
     # ── Worker lifecycle ──
 
@@ -125,25 +174,27 @@ class DbClient:
         hecras_version: str = "",
         hecras_path: str = "",
         max_concurrent: int = 1,
+        capabilities: dict | None = None,
     ) -> WorkerInfo:
-        """Register this machine as a worker. Returns WorkerInfo."""
-        hostname = socket.gethostname()
-        try:
-            ip_address = socket.gethostbyname(hostname)
-        except socket.gaierror:
-            ip_address = "127.0.0.1"
-        os_version = platform.platform()
+        """Register this machine as a worker. Returns WorkerInfo.
+
+        *capabilities* (see :func:`hecras_runner.capabilities.worker_capabilities`)
+        are stored in the worker's metadata.
+        """
+        hostname, ip_address, os_version = host_identity()
 
         with self._pool.connection() as conn:  # type: ignore[attr-defined]
             row = conn.execute(
-                f"""
-                INSERT INTO {_SCHEMA}.workers
-                    (hostname, ip_address, os_version, hecras_version, hecras_path,
-                     max_concurrent, status, last_heartbeat)
-                VALUES (%s, %s, %s, %s, %s, %s, 'idle', now())
-                RETURNING id
-                """,
-                (hostname, ip_address, os_version, hecras_version, hecras_path, max_concurrent),
+                SQL_REGISTER_WORKER,
+                (
+                    hostname,
+                    ip_address,
+                    os_version,
+                    hecras_version,
+                    hecras_path,
+                    max_concurrent,
+                    json.dumps(capabilities or {}),
+                ),
             ).fetchone()
             conn.commit()
 
@@ -152,20 +203,70 @@ class DbClient:
         return WorkerInfo(worker_id=worker_id, hostname=hostname, ip_address=ip_address)
 
     def heartbeat(self, worker_id: str) -> None:
-        """Update worker heartbeat timestamp."""
+        """Update the worker heartbeat, extend its job leases and write buffered progress.
+
+        Everything goes out in one statement (see
+        :func:`~hecras_runner._queue_sql.heartbeat_statement`).
+        """
+        with self._progress_lock:
+            progress, self._progress = self._progress, {}
+        try:
+            with self._pool.connection() as conn:  # type: ignore[attr-defined]
+                conn.execute(*heartbeat_statement(worker_id, self._lease_seconds, progress))
+                conn.commit()
+        except Exception:
+            # Keep the progress for the next flush unless newer values arrived
+            with self._progress_lock:
+                for job_id, value in progress.items():
+                    self._progress.setdefault(job_id, value)
+            raise
+
+    def reap_expired_jobs(self) -> int:
+        """Requeue (or fail, after max_attempts) jobs whose lease has expired.
+
+        Any live worker may call this; concurrent reapers skip each other's
+        rows. Returns the number of jobs reaped.
+        """
         with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            conn.execute(
-                f"UPDATE {_SCHEMA}.workers SET last_heartbeat = now() WHERE id = %s",
-                (worker_id,),
-            )
+            row = conn.execute(SQL_REAP).fetchone()
             conn.commit()
+        return int(row[0]) if row and row[0] else 0
 
-    def start_heartbeat(self, worker_id: str, interval: float = 30.0) -> None:
-        """Start a daemon thread that sends heartbeats every *interval* seconds."""
+    def start_heartbeat(
+        self,
+        worker_id: str,
+        interval: float = 30.0,
+        flush_interval: float = DEFAULT_PROGRESS_FLUSH_SECONDS,
+    ) -> None:
+        """Start a daemon thread that sends heartbeats every *interval* seconds.
+
+        While it runs, :meth:`update_progress` only buffers; the thread
+        writes the buffer every *flush_interval* seconds when something is
+        pending, together with the heartbeat. Each beat also reaps jobs
+        abandoned by dead workers, so a fleet with at least one live worker
+        recovers lost jobs on its own.
+        """
         self._heartbeat_stop.clear()
 
         def _loop() -> None:
-            while not self._heartbeat_stop.wait(interval):
+            next_beat = time.monotonic() + interval
+            while not self._heartbeat_stop.wait(min(interval, flush_interval)):
+                now = time.monotonic()
+                with self._progress_lock:
+                    pending = bool(self._progress)
+                if now < next_beat and not pending:
+                    continue
+                try:
+                    self.heartbeat(worker_id)
+                    if now >= next_beat:
+                        next_beat = now + interval
+                        reaped = self.reap_expired_jobs()
+                        if reaped:
+                            self._log(f"Requeued {reaped} job(s) from unresponsive workers")
+                except Exception as e:
+                    self._log(f"Heartbeat failed: {e}")
+            # Do not lose the progress reported since the last flush
+            if self._progress:
                 try:
                     self.heartbeat(worker_id)
                 except Exception as e:
@@ -184,10 +285,7 @@ class DbClient:
     def set_worker_offline(self, worker_id: str) -> None:
         """Mark a worker as offline."""
         with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            conn.execute(
-                f"UPDATE {_SCHEMA}.workers SET status = 'offline' WHERE id = %s",
-                (worker_id,),
-            )
+            conn.execute(SQL_SET_OFFLINE, (worker_id,))
             conn.commit()
 
     # ── Batch submission (orchestrator side) ──
@@ -198,129 +296,86 @@ class DbClient:
         project_title: str,
         jobs: list[dict],
         submitted_by: str = "",
-    ) -> str:
-        """Submit a batch of simulation jobs. Returns the batch_id (UUID string)."""
-        with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            row = conn.execute(
-                f"""
-                INSERT INTO {_SCHEMA}.batches
-                    (project_path, project_title, submitted_by, total_jobs, status)
-                VALUES (%s, %s, %s, %s, 'pending')
-                RETURNING id
-                """,
-                (project_path, project_title, submitted_by, len(jobs)),
-            ).fetchone()
-            batch_id = str(row[0])
-
-            for job in jobs:
-                conn.execute(
-                    f"""
-                    INSERT INTO {_SCHEMA}.jobs
-                        (batch_id, plan_name, plan_suffix, status)
-                    VALUES (%s, %s, %s, 'queued')
-                    """,
-                    (batch_id, job["plan_name"], job["plan_suffix"]),
-                )
+        priority: int = 0,
+    ) -> BatchSubmission:
+        """Submit a batch of simulation jobs in one round trip.
+
+        Each job dict needs ``plan_name`` and ``plan_suffix`` and may carry a
+        ``job_id`` (UUID string) chosen by the caller, e.g. the id a project
+        was uploaded to the share under; other jobs get a fresh UUID. Jobs
+        may also carry ``requirements`` (see
+        :func:`hecras_runner.capabilities.job_requirements`) and the
+        ``terrain_hash`` of their upload for worker matching. Jobs with a
+        higher *priority* (or per-job ``priority``) are claimed first;
+        within a priority, submitters take turns. The
+        batch row, every job row and the worker notification go out as a
+        single statement, so a 500-plan sweep costs one round trip instead
+        of 500.
+        """
+        batch_id = str(uuid.uuid4())
+        job_ids = [str(job.get("job_id") or uuid.uuid4()) for job in jobs]
+        params = submit_params(
+            batch_id, job_ids, project_path, project_title, jobs, submitted_by, priority
+        )
 
+        with self._pool.connection() as conn:  # type: ignore[attr-defined]
+            conn.execute(SQL_SUBMIT_BATCH, params)
             conn.commit()
 
         self._log(f"Submitted batch {batch_id} with {len(jobs)} jobs")
-        return batch_id
+        return BatchSubmission(batch_id=batch_id, job_ids=job_ids)
 
     def get_batch_status(self, batch_id: str) -> dict:
-        """Get summary status of a batch."""
+        """Get summary status of a batch (one primary-key lookup)."""
         with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            batch_row = conn.execute(
-                f"SELECT status, total_jobs FROM {_SCHEMA}.batches WHERE id = %s",
-                (batch_id,),
-            ).fetchone()
-
-            if batch_row is None:
-                return {"status": "not_found", "total": 0, "completed": 0, "failed": 0}
-
-            counts = conn.execute(
-                f"""
-                SELECT status, COUNT(*) FROM {_SCHEMA}.jobs
-                WHERE batch_id = %s GROUP BY status
-                """,
-                (batch_id,),
-            ).fetchall()
-
-        status_counts = dict(counts)
-        return {
-            "status": batch_row[0],
-            "total": batch_row[1],
-            "completed": status_counts.get("completed", 0),
-            "failed": status_counts.get("failed", 0),
-            "running": status_counts.get("running", 0),
-            "queued": status_counts.get("queued", 0),
-        }
+            row = conn.execute(SQL_BATCH_STATUS, (batch_id,)).fetchone()
+        return batch_status(row)
 
     # ── Job pickup (worker side) ──
 
-    def claim_job(self, worker_id: str) -> dict | None:
-        """Claim the next queued job using SELECT ... FOR UPDATE SKIP LOCKED.
-
-        Returns a dict with job details, or None if no jobs available.
+    def claim_jobs(
+        self,
+        worker_id: str,
+        limit: int = 1,
+        capabilities: dict | None = None,
+    ) -> list[dict]:
+        """Claim up to *limit* queued jobs using SELECT ... FOR UPDATE SKIP LOCKED.
+
+        The claim is one ``UPDATE ... FROM`` joined with the batch row, so
+        each job comes back with its project path and metadata in the same
+        round trip. *capabilities* refresh the worker's metadata in the same
+        statement; only jobs whose requirements they meet are claimed. Jobs
+        go by priority (aged by ``aging_seconds``), then round-robin across
+        submitters, then cached terrain first. Claimed jobs are leased for
+        ``lease_seconds``; heartbeats keep the lease alive. Returns a list
+        of job dicts (empty if none are queued).
         """
+        if limit < 1:
+            return []
+        params = claim_params(
+            worker_id, limit, capabilities, self._aging_seconds, self._lease_seconds
+        )
         with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            row = conn.execute(
-                f"""
-                UPDATE {_SCHEMA}.jobs
-                SET status = 'assigned', worker_id = %s, assigned_at = now()
-                WHERE id = (
-                    SELECT id FROM {_SCHEMA}.jobs
-                    WHERE status = 'queued'
-                    ORDER BY id
-                    FOR UPDATE SKIP LOCKED
-                    LIMIT 1
-                )
-                RETURNING id, batch_id, plan_name, plan_suffix
-                """,
-                (worker_id,),
-            ).fetchone()
+            rows = conn.execute(SQL_CLAIM_JOBS, params).fetchall()
             conn.commit()
+        return [claimed_job(r, worker_id) for r in rows]
 
-        if row is None:
-            return None
+    def claim_job(self, worker_id: str, capabilities: dict | None = None) -> dict | None:
+        """Claim the next queued job. Returns a job dict, or None if no jobs available."""
+        jobs = self.claim_jobs(worker_id, 1, capabilities)
+        return jobs[0] if jobs else None
 
-        # Fetch project_path from batch
-        with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            batch_row = conn.execute(
-                f"SELECT project_path FROM {_SCHEMA}.batches WHERE id = %s",
-                (str(row[1]),),
-            ).fetchone()
-
-        return {
-            "job_id": str(row[0]),
-            "batch_id": str(row[1]),
-            "plan_name": row[2],
-            "plan_suffix": row[3],
-            "project_path": batch_row[0] if batch_row else "",
-        }
+    def start_job(self, job_id: str, worker_id: str | None = None) -> bool:
+        """Mark a job as running (the counter trigger marks the batch running).
 
-    def start_job(self, job_id: str) -> None:
-        """Mark a job as running."""
+        With *worker_id*, only a job this worker still holds is updated.
+        Returns False if the job was not updated (e.g. its lease expired and
+        it was requeued).
+        """
         with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            conn.execute(
-                f"""
-                UPDATE {_SCHEMA}.jobs
-                SET status = 'running', started_at = now()
-                WHERE id = %s
-                """,
-                (job_id,),
-            )
-            # Update batch status if this is the first running job
-            conn.execute(
-                f"""
-                UPDATE {_SCHEMA}.batches b
-                SET status = 'running'
-                WHERE b.id = (SELECT batch_id FROM {_SCHEMA}.jobs WHERE id = %s)
-                  AND b.status = 'pending'
-                """,
-                (job_id,),
-            )
+            cur = conn.execute(SQL_START_JOB, (self._lease_seconds, job_id, worker_id, worker_id))
             conn.commit()
+        return bool(cur.rowcount)
 
     def complete_job(
         self,
@@ -330,90 +385,142 @@ class DbClient:
         error_message: str | None = None,
         exit_code: int | None = None,
         hdf_verified: bool | None = None,
-    ) -> None:
-        """Mark a job as completed or failed."""
+        worker_id: str | None = None,
+    ) -> bool:
+        """Mark a job as completed or failed.
+
+        The counter trigger updates the batch in the same statement and
+        closes it when this was its last outstanding job. With *worker_id*,
+        a job that was reaped and handed to another worker is left alone;
+        returns False in that case.
+        """
         status = "completed" if success else "failed"
+        with self._progress_lock:
+            self._progress.pop(job_id, None)
         with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            conn.execute(
-                f"""
-                UPDATE {_SCHEMA}.jobs
-                SET status = %s, completed_at = now(), elapsed_seconds = %s,
-                    error_message = %s, exit_code = %s, hdf_verified = %s,
-                    progress = CASE WHEN %s THEN 1.0 ELSE progress END
-                WHERE id = %s
-                """,
-                (status, elapsed_seconds, error_message, exit_code, hdf_verified, success, job_id),
+            cur = conn.execute(
+                SQL_COMPLETE_JOB,
+                (
+                    status,
+                    elapsed_seconds,
+                    error_message,
+                    exit_code,
+                    hdf_verified,
+                    success,
+                    job_id,
+                    worker_id,
+                    worker_id,
+                ),
             )
-
-            # Check if all jobs in batch are done
-            batch_row = conn.execute(
-                f"""
-                SELECT batch_id FROM {_SCHEMA}.jobs WHERE id = %s
-                """,
-                (job_id,),
-            ).fetchone()
-
-            if batch_row:
-                batch_id = str(batch_row[0])
-                remaining = conn.execute(
-                    f"""
-                    SELECT COUNT(*) FROM {_SCHEMA}.jobs
-                    WHERE batch_id = %s AND status NOT IN ('completed', 'failed')
-                    """,
-                    (batch_id,),
-                ).fetchone()
-
-                if remaining and remaining[0] == 0:
-                    # All done — mark batch completed/failed
-                    failed = conn.execute(
-                        f"""
-                        SELECT COUNT(*) FROM {_SCHEMA}.jobs
-                        WHERE batch_id = %s AND status = 'failed'
-                        """,
-                        (batch_id,),
-                    ).fetchone()
-                    batch_status = "failed" if (failed and failed[0] > 0) else "completed"
-                    conn.execute(
-                        f"""
-                        UPDATE {_SCHEMA}.batches
-                        SET status = %s, completed_at = now()
-                        WHERE id = %s
-                        """,
-                        (batch_status, batch_id),
-                    )
-
             conn.commit()
+        updated = bool(cur.rowcount)
+        if not updated:
+            self._log(f"Job {job_id} is no longer held by this worker; result not recorded")
+        return updated
 
     def update_progress(self, job_id: str, progress: float) -> None:
-        """Update job progress (0.0 to 1.0)."""
+        """Update job progress (0.0 to 1.0).
+
+        While the heartbeat thread runs this only records the value; the
+        thread writes the latest value of every job in its next flush.
+        Otherwise the job is updated immediately.
+        """
+        if self._heartbeat_thread is not None:
+            with self._progress_lock:
+                self._progress[job_id] = progress
+            return
         with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            conn.execute(
-                f"UPDATE {_SCHEMA}.jobs SET progress = %s WHERE id = %s",
-                (progress, job_id),
-            )
+            conn.execute(SQL_UPDATE_PROGRESS, (progress, job_id))
             conn.commit()
 
     # ── Real-time notifications ──
 
-    def listen_for_jobs(self, callback: Callable[[str], None]) -> threading.Thread:
+    def _connect_listener(self) -> object:
+        """Open a dedicated autocommit connection LISTENing on the jobs channel.
+
+        LISTEN needs a connection of its own: pooled connections are shared
+        and notifications only arrive on the session that asked for them.
+        """
+        import psycopg
+
+        conninfo = self._pool.conninfo  # type: ignore[attr-defined]
+        conn = psycopg.connect(conninfo, autocommit=True)
+        conn.execute(f"LISTEN {JOBS_CHANNEL}")
+        return conn
+
+    def _close_listen_conn(self) -> None:
+        conn, self._listen_conn = self._listen_conn, None
+        if conn is not None:
+            with contextlib.suppress(Exception):
+                conn.close()  # type: ignore[attr-defined]
+
+    def wait_for_jobs(self, timeout: float, stop: Callable[[], bool] | None = None) -> bool:
+        """Block until a job is queued, *timeout* seconds pass or *stop* returns True.
+
+        Returns True when a ``hecras_jobs`` notification arrived, False
+        otherwise; callers claim after either, so a lost notification or an
+        unreachable LISTEN connection only delays pickup to the next timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (stop is not None and stop()):
+                return False
+            wait = min(remaining, LISTEN_SLICE)
+
+            if self._listen_conn is None and time.monotonic() >= self._listen_retry_at:
+                try:
+                    self._listen_conn = self._connect_listener()
+                except Exception as e:
+                    self._log(f"LISTEN connection failed: {e}")
+                    self._listen_retry_at = time.monotonic() + LISTEN_RETRY_DELAY
+            if self._listen_conn is None:
+                time.sleep(wait)
+                continue
+
+            try:
+                for _notify in self._listen_conn.notifies(  # type: ignore[attr-defined]
+                    timeout=wait, stop_after=1
+                ):
+                    return True
+            except Exception as e:
+                self._log(f"LISTEN connection lost: {e}")
+                self._close_listen_conn()
+                self._listen_retry_at = time.monotonic() + LISTEN_RETRY_DELAY
+
+    def listen_for_jobs(
+        self,
+        callback: Callable[[str], None],
+        stop: threading.Event | None = None,
+    ) -> threading.Thread:
         """Start a daemon thread that listens for NOTIFY on ``hecras_jobs`` channel.
 
-        The callback receives the notification payload string.
+        The callback receives the notification payload (the batch id). The
+        connection is reopened after errors; set *stop* to end the thread.
         Returns the thread (already started).
         """
+        stop = stop or threading.Event()
 
         def _listen() -> None:
-            try:
-                import psycopg
-
-                # Use a dedicated connection for LISTEN (not from pool)
-                conninfo = self._pool.conninfo  # type: ignore[attr-defined]
-                with psycopg.connect(conninfo, autocommit=True) as conn:
-                    conn.execute("LISTEN hecras_jobs")
-                    for notify in conn.notifies():
+            conn = None
+            while not stop.is_set():
+                try:
+                    if conn is None:
+                        conn = self._connect_listener()
+                    for notify in conn.notifies(  # type: ignore[attr-defined]
+                        timeout=LISTEN_SLICE
+                    ):
                         callback(notify.payload)
-            except Exception as e:
-                self._log(f"LISTEN thread error: {e}")
+                except Exception as e:
+                    self._log(f"LISTEN thread error: {e}")
+                    if conn is not None:
+                        with contextlib.suppress(Exception):
+                            conn.close()  # type: ignore[attr-defined]
+                    conn = None
+                    stop.wait(LISTEN_RETRY_DELAY)
+            if conn is not None:
+                with contextlib.suppress(Exception):
+                    conn.close()  # type: ignore[attr-defined]
 
         t = threading.Thread(target=_listen, daemon=True)
         t.start()
@@ -424,53 +531,11 @@ class DbClient:
     def get_active_workers(self) -> list[dict]:
         """Return workers with heartbeat within the last 2 minutes."""
         with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            rows = conn.execute(
-                f"""
-                SELECT id, hostname, ip_address, status, hecras_version,
-                       max_concurrent, last_heartbeat
-                FROM {_SCHEMA}.workers
-                WHERE last_heartbeat > now() - INTERVAL '2 minutes'
-                ORDER BY hostname
-                """
-            ).fetchall()
-
-        return [
-            {
-                "id": str(r[0]),
-                "hostname": r[1],
-                "ip_address": str(r[2]) if r[2] else "",
-                "status": r[3],
-                "hecras_version": r[4] or "",
-                "max_concurrent": r[5],
-                "last_heartbeat": r[6],
-            }
-            for r in rows
-        ]
+            rows = conn.execute(SQL_ACTIVE_WORKERS).fetchall()
+        return [worker_row(r) for r in rows]
 
     def get_batch_jobs(self, batch_id: str) -> list[dict]:
         """Return all jobs for a batch."""
         with self._pool.connection() as conn:  # type: ignore[attr-defined]
-            rows = conn.execute(
-                f"""
-                SELECT id, plan_name, plan_suffix, status, worker_id,
-                       elapsed_seconds, error_message, progress
-                FROM {_SCHEMA}.jobs
-                WHERE batch_id = %s
-                ORDER BY plan_suffix
-                """,
-                (batch_id,),
-            ).fetchall()
-
-        return [
-            {
-                "id": str(r[0]),
-                "plan_name": r[1],
-                "plan_suffix": r[2],
-                "status": r[3],
-                "worker_id": str(r[4]) if r[4] else None,
-                "elapsed_seconds": r[5],
-                "error_message": r[6],
-                "progress": r[7] or 0.0,
-            }
-            for r in rows
-        ]
+            rows = conn.execute(SQL_BATCH_JOBS, (batch_id,)).fetchall()
+        return [batch_job(r) for r in rows]
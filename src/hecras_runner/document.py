@@ -0,0 +1,157 @@
+"""Round-trip model of HEC-RAS ``Key=value`` text files (.prj, .p##, .u##).
+
+HEC-RAS project, plan and flow files are mostly ``Key=value`` lines mixed with
+data blocks the runner never touches. ``RasDocument`` keeps every line as the
+raw bytes read from disk and indexes the key lines, so edits are keyed
+lookups in memory and everything not edited is written back byte for byte,
+line endings included. A document is read once, edited any number of times
+and serialized once; :meth:`RasDocument.copy` is cheap, which makes it the
+basis for generating plan variants in memory.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+
+def _eol(line: bytes) -> bytes:
+    """The line terminator of *line* (empty for a final unterminated line)."""
+    if line.endswith(b"\r\n"):
+        return b"\r\n"
+    if line.endswith((b"\n", b"\r")):
+        return line[-1:]
+    return b""
+
+
+class RasDocument:
+    """Ordered lines of a HEC-RAS text file with keyed access to ``Key=value`` lines.
+
+    Keys are the text before the first ``=`` (``"Plan Title"``,
+    ``"DSS File"``); a key may occur on several lines. Values are returned
+    exactly as stored, without the line ending, so callers strip them if
+    needed. The file's encoding (UTF-8, else latin-1) is detected once on
+    load and reused for edited lines.
+    """
+
+    def __init__(self, lines: list[bytes] | None = None, encoding: str = "utf-8") -> None:
+        self._lines: list[bytes] = lines if lines is not None else []
+        self.encoding = encoding
+        self.modified = False
+        self._index: dict[str, list[int]] | None = None
+
+    # ── Loading and saving ──
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> RasDocument:
+        try:
+            data.decode("utf-8")
+            encoding = "utf-8"
+        except UnicodeDecodeError:
+            encoding = "latin-1"
+        return cls(data.splitlines(keepends=True), encoding)
+
+    @classmethod
+    def load(cls, path: str) -> RasDocument:
+        """Read *path* in one pass. Raises ``OSError`` if it cannot be read."""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self._lines)
+
+    def save(self, path: str) -> None:
+        """Write the document to *path* in one pass. Raises ``OSError`` on failure."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    def copy(self) -> RasDocument:
+        """Independent copy; lines are immutable bytes, so this is a list copy."""
+        doc = RasDocument(list(self._lines), self.encoding)
+        doc.modified = self.modified
+        return doc
+
+    # ── Keyed access ──
+
+    def _key_index(self) -> dict[str, list[int]]:
+        if self._index is None:
+            index: dict[str, list[int]] = {}
+            for i, line in enumerate(self._lines):
+                pos = line.find(b"=")
+                if pos > 0:
+                    key = line[:pos].decode("latin-1")
+                    index.setdefault(key, []).append(i)
+            self._index = index
+        return self._index
+
+    def _value_at(self, i: int) -> str:
+        line = self._lines[i]
+        raw = line[line.find(b"=") + 1 : len(line) - len(_eol(line))]
+        return raw.decode(self.encoding, errors="replace")
+
+    def _set_at(self, i: int, value: str) -> bool:
+        line = self._lines[i]
+        prefix = line[: line.find(b"=") + 1]  # original key bytes
+        new_line = prefix + value.encode(self.encoding) + _eol(line)
+        if new_line == line:
+            return False
+        self._lines[i] = new_line
+        self.modified = True
+        return True
+
+    def keys(self) -> list[str]:
+        """Distinct keys in file order."""
+        return list(self._key_index())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._key_index()
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        """Value of the first *key* line, or *default*."""
+        positions = self._key_index().get(key)
+        if not positions:
+            return default
+        return self._value_at(positions[0])
+
+    def get_all(self, key: str) -> list[str]:
+        """Values of every *key* line, in file order."""
+        return [self._value_at(i) for i in self._key_index().get(key, [])]
+
+    def set(self, key: str, value: str, insert_at: int | None = None) -> bool:
+        """Set the first *key* line to ``key=value``.
+
+        If there is no such line, one is inserted at line *insert_at*
+        (appended if None) using the file's line ending. Returns True if the
+        document changed.
+        """
+        positions = self._key_index().get(key)
+        if positions:
+            return self._set_at(positions[0], value)
+
+        eol = (_eol(self._lines[0]) if self._lines else b"") or b"\n"
+        if self._lines and not _eol(self._lines[-1]):
+            self._lines[-1] += eol
+        new_line = f"{key}={value}".encode(self.encoding) + eol
+        if insert_at is None:
+            self._lines.append(new_line)
+        else:
+            self._lines.insert(min(insert_at, len(self._lines)), new_line)
+        self._index = None
+        self.modified = True
+        return True
+
+    def set_all(self, key: str, value: str) -> int:
+        """Set every *key* line to ``key=value``. Returns the number changed."""
+        return self.update_all(key, lambda _old: value)
+
+    def update_all(self, key: str, transform: Callable[[str], str | None]) -> int:
+        """Replace each *key* value with ``transform(value)``.
+
+        *transform* returns None to leave a line alone. Returns the number of
+        lines changed.
+        """
+        changed = 0
+        for i in self._key_index().get(key, []):
+            new_value = transform(self._value_at(i))
+            if new_value is not None and self._set_at(i, new_value):
+                changed += 1
+        return changed
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import filecmp
 import os
 import re
 import shutil
@@ -9,6 +10,9 @@ import tempfile
 import time
 from collections.abc import Callable
 
+from hecras_runner.document import RasDocument
+from hecras_runner.rasmap import copy_tree_filtered, project_file_filter
+
 _U_FILE_PATTERN = re.compile(r"\.u\d{2}$", re.IGNORECASE)
 
 # Extensions whose suffix indicates result files to copy back.
@@ -20,34 +24,124 @@ def copy_project_to_temp(
     project_path: str,
     dss_path: str | None = None,
     log: Callable[[str], None] = print,
+    plan_key: str | None = None,
+    write_detailed: bool = False,
+    plan_overrides: dict[str, str] | None = None,
+    temp_root: str | None = None,
 ) -> str:
-    """Copy the entire project directory to a temp dir.
+    """Copy the project directory to a temp dir.
 
     Returns the path to the .prj file inside the temp directory.
+    Top-level files are always copied. Subfolders holding ``.rasmap`` layers
+    (terrain, land cover) only contribute the files those layers use; see
+    :func:`hecras_runner.rasmap.project_file_filter`.
     If *dss_path* is provided, all DSS File= lines are overwritten with that path.
     Otherwise, DSS paths are automatically fixed so that files already present
     in the temp copy are referenced by filename (relative), while truly external
     DSS files keep their original absolute paths.
+
+    Text files that need patching are rewritten while they are copied (one read,
+    one write per file) instead of being copied and then re-read in place:
+
+    - ``.u##`` files get their ``DSS File=`` lines fixed as described above.
+    - If *plan_key* is given (e.g. ``"p03"``), ``Current Plan=`` in the .prj is
+      set to it, and the plan file receives ``Write Detailed= 1`` when
+      *write_detailed* is True plus any ``Key=value`` pairs in *plan_overrides*.
+
+    The temp dir is created under *temp_root* (system temp if None); see
+    :class:`hecras_runner.scratch.ScratchManager` for choosing one.
     """
     project_path = os.path.abspath(project_path)
     original_folder = os.path.dirname(project_path)
-    temp_dir = tempfile.mkdtemp(prefix="HECRAS_")
+    prj_name = os.path.basename(project_path)
+    basename = os.path.splitext(prj_name)[0]
+    temp_dir = tempfile.mkdtemp(prefix="HECRAS_", dir=temp_root)
     log(f"Copying project to temporary folder: {temp_dir}")
 
-    for item in os.listdir(original_folder):
+    items = os.listdir(original_folder)
+    present_lower = {item.lower() for item in items}
+    plan_name = f"{basename}.{plan_key}".lower() if plan_key else None
+    keep = project_file_filter(project_path)
+
+    for item in items:
         src = os.path.join(original_folder, item)
         dst = os.path.join(temp_dir, item)
         if os.path.isdir(src):
-            shutil.copytree(src, dst, dirs_exist_ok=True)
-        else:
+            copy_tree_filtered(src, dst, keep, item)
+            continue
+
+        patches: list[Callable[[RasDocument], bool]] = []
+        if _U_FILE_PATTERN.search(item):
+            if dss_path:
+                patches.append(lambda doc: _override_dss(doc, dss_path))
+            else:
+                patches.append(lambda doc: _relativize_dss(doc, present_lower))
+        elif plan_key and item == prj_name:
+            patches.append(lambda doc: doc.set("Current Plan", plan_key, insert_at=1))
+        elif plan_name and item.lower() == plan_name:
+            if write_detailed:
+                patches.append(lambda doc: doc.set("Write Detailed", " 1 "))
+            for key, value in (plan_overrides or {}).items():
+                patches.append(lambda doc, k=key, v=value: doc.set(k, v))
+
+        if not patches:
             shutil.copy2(src, dst)
+        elif _rewrite_text_file(src, dst, patches):
+            log(f"Patched {item}")
+
+    return os.path.join(temp_dir, prj_name)
+
+
+# ── Document patchers ──
+#
+# Each patcher edits a RasDocument in memory and returns True if anything
+# changed. They are shared by the staging pipeline above and the in-place
+# directory rewriters below.
+
+
+def _override_dss(doc: RasDocument, new_dss_path: str) -> bool:
+    """Point every ``DSS File=`` line at *new_dss_path*."""
+    return doc.set_all("DSS File", os.path.normpath(new_dss_path)) > 0
+
+
+def _relativize_dss(doc: RasDocument, present_lower: set[str]) -> bool:
+    """Rewrite absolute ``DSS File=`` paths to bare filenames present in the copy."""
+
+    def relativize(value: str) -> str | None:
+        dss_value = value.strip()
+        # Only fix absolute paths whose file exists in the temp dir
+        if os.path.isabs(dss_value):
+            basename = os.path.basename(dss_value)
+            if basename.lower() in present_lower:
+                return basename
+        return None
 
-    if dss_path:
-        update_dss_paths(temp_dir, dss_path, log=log)
-    else:
-        _fix_dss_paths_for_temp(temp_dir, log=log)
+    return doc.update_all("DSS File", relativize) > 0
 
-    return os.path.join(temp_dir, os.path.basename(project_path))
+
+def _rewrite_text_file(
+    src: str,
+    dst: str,
+    patches: list[Callable[[RasDocument], bool]],
+) -> bool:
+    """Read *src* once, apply *patches* and write the result to *dst* once.
+
+    Lines the patches don't touch keep their exact bytes (see
+    :class:`~hecras_runner.document.RasDocument`). If nothing changed and
+    *dst* differs from *src*, the original bytes and timestamps are copied.
+    Returns True if any patch modified the content.
+    """
+    doc = RasDocument.load(src)
+    modified = False
+    for patch in patches:
+        modified = patch(doc) or modified
+
+    if modified:
+        doc.save(dst)
+    elif os.path.abspath(src) != os.path.abspath(dst):
+        doc.save(dst)
+        shutil.copystat(src, dst)
+    return modified
 
 
 def update_dss_paths(
@@ -59,7 +153,6 @@ def update_dss_paths(
 
     Returns the number of files modified.
     """
-    normalized = os.path.normpath(new_dss_path)
     count = 0
 
     for filename in os.listdir(directory):
@@ -69,25 +162,7 @@ def update_dss_paths(
         if not _U_FILE_PATTERN.search(filename):
             continue
 
-        try:
-            with open(filepath, encoding="utf-8") as f:
-                lines = f.readlines()
-        except UnicodeDecodeError:
-            with open(filepath, encoding="latin-1") as f:
-                lines = f.readlines()
-
-        new_lines = []
-        modified = False
-        for line in lines:
-            if line.startswith("DSS File="):
-                new_lines.append(f"DSS File={normalized}\n")
-                modified = True
-            else:
-                new_lines.append(line)
-
-        if modified:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.writelines(new_lines)
+        if _rewrite_text_file(filepath, filepath, [lambda doc: _override_dss(doc, new_dss_path)]):
             log(f"Updated DSS path in {filename}")
             count += 1
 
@@ -111,48 +186,62 @@ def _fix_dss_paths_for_temp(
 
     Returns the number of files modified.
     """
-    temp_files_lower = {f.lower() for f in os.listdir(directory)}
+    filenames = os.listdir(directory)
+    temp_files_lower = {f.lower() for f in filenames}
     count = 0
 
-    for filename in os.listdir(directory):
+    for filename in filenames:
         filepath = os.path.join(directory, filename)
         if not os.path.isfile(filepath):
             continue
         if not _U_FILE_PATTERN.search(filename):
             continue
 
-        try:
-            with open(filepath, encoding="utf-8") as f:
-                lines = f.readlines()
-        except UnicodeDecodeError:
-            with open(filepath, encoding="latin-1") as f:
-                lines = f.readlines()
-
-        new_lines = []
-        modified = False
-        for line in lines:
-            if line.startswith("DSS File="):
-                dss_value = line[len("DSS File=") :].strip()
-                # Only fix absolute paths whose file exists in the temp dir
-                if os.path.isabs(dss_value):
-                    basename = os.path.basename(dss_value)
-                    if basename.lower() in temp_files_lower:
-                        new_lines.append(f"DSS File={basename}\n")
-                        modified = True
-                        continue
-                new_lines.append(line)
-            else:
-                new_lines.append(line)
-
-        if modified:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.writelines(new_lines)
+        if _rewrite_text_file(
+            filepath, filepath, [lambda doc: _relativize_dss(doc, temp_files_lower)]
+        ):
             log(f"Fixed DSS paths in {filename}")
             count += 1
 
     return count
 
 
+def files_identical(src: str, dst: str) -> bool:
+    """Return True if *dst* already holds the same content as *src*.
+
+    Cheapest checks first: a missing *dst* or a size mismatch means changed;
+    matching size and mtime (``shutil.copy2`` preserves mtime) means unchanged.
+    Only when size matches but mtime differs are the two files streamed and
+    compared chunk by chunk.
+    """
+    try:
+        src_stat = os.stat(src)
+        dst_stat = os.stat(dst)
+    except OSError:
+        return False
+
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    try:
+        return filecmp.cmp(src, dst, shallow=False)
+    except OSError:
+        return False
+
+
+def _format_bytes(num_bytes: int) -> str:
+    """Human-readable byte count, e.g. ``"1.5 GB"``."""
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    size = num_bytes / 1024
+    for unit in ("KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
 def copy_results_back(
     temp_path: str,
     main_dir: str,
@@ -162,10 +251,14 @@ def copy_results_back(
     """Copy result files from *temp_path* back to *main_dir*.
 
     Matches files by extension+suffix pattern (e.g. ``.p03``, ``.p03.hdf``).
+    Files that are identical to the copy already in *main_dir* (unchanged
+    inputs such as ``.g03.hdf``) are skipped; see :func:`files_identical`.
     Returns a list of copied filenames.
     """
     temp_dir = os.path.dirname(temp_path) if os.path.isfile(temp_path) else temp_path
     copied: list[str] = []
+    skipped = 0
+    bytes_saved = 0
 
     for filename in os.listdir(temp_dir):
         src = os.path.join(temp_dir, filename)
@@ -191,6 +284,10 @@ def copy_results_back(
 
         if matched:
             dst = os.path.join(main_dir, filename)
+            if files_identical(src, dst):
+                skipped += 1
+                bytes_saved += os.path.getsize(src)
+                continue
             try:
                 shutil.copy2(src, dst)
                 log(f"Copied: {filename}")
@@ -198,6 +295,9 @@ def copy_results_back(
             except OSError as e:
                 log(f"Error copying {filename}: {e}")
 
+    if skipped:
+        log(f"Skipped {skipped} unchanged file(s) ({_format_bytes(bytes_saved)} not copied)")
+
     return copied
 
 
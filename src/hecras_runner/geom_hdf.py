@@ -0,0 +1,98 @@
+"""Size metadata from HEC-RAS geometry HDF files (.g##.hdf).
+
+How long a plan runs and how much memory it needs depend mostly on the
+number of 2D cells, cross sections and structures in its geometry, none of
+which the text ``.g##`` header tells us. The preprocessed ``.g##.hdf`` has
+them in small attribute tables, so they can be read from dataset shapes and
+a few rows without loading any coordinate or property data.
+
+h5py is optional: without it (or for a missing/unreadable file)
+:func:`read_geom_hdf` returns None and callers carry on without the numbers.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_FLOW_AREAS = "Geometry/2D Flow Areas"
+_CROSS_SECTIONS = "Geometry/Cross Sections/Attributes"
+_STRUCTURES = "Geometry/Structures/Attributes"
+
+
+@dataclass
+class GeomHdfInfo:
+    """Counts read from a .g##.hdf file."""
+
+    flow_areas: dict[str, int] = field(default_factory=dict)  # 2D area name -> cells
+    cross_sections: int = 0
+    structures: int = 0
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace").strip()
+    return str(value).strip()
+
+
+def _row_count(hf: Any, path: str) -> int:
+    ds = hf.get(path)
+    if ds is None or not getattr(ds, "shape", None):
+        return 0
+    return int(ds.shape[0])
+
+
+def _flow_area_cells(hf: Any) -> dict[str, int]:
+    """2D flow area name -> cell count.
+
+    HEC-RAS 6 stores a ``Cell Count`` column in the areas' attribute table;
+    older files only have per-area datasets, whose row count is used instead.
+    """
+    group = hf.get(_FLOW_AREAS)
+    if group is None:
+        return {}
+    attrs = group.get("Attributes")
+    names = getattr(getattr(attrs, "dtype", None), "names", None) or ()
+    if attrs is None or "Name" not in names:
+        return {}
+
+    table = attrs[()]  # one row per 2D area
+    areas: dict[str, int] = {}
+    for row in table:
+        name = _text(row["Name"])
+        if "Cell Count" in names:
+            areas[name] = int(row["Cell Count"])
+            continue
+        area = group.get(name)
+        cells = area.get("Cells Center Coordinate") if area is not None else None
+        areas[name] = int(cells.shape[0]) if cells is not None else 0
+    return areas
+
+
+def read_geom_hdf(path: str) -> GeomHdfInfo | None:
+    """Read 2D area cell counts, cross-section and structure counts from *path*.
+
+    Returns None if the file does not exist, h5py is not installed or the
+    file cannot be read.
+    """
+    if not os.path.isfile(path):
+        return None
+    try:
+        import h5py
+    except ImportError:
+        return None
+
+    try:
+        with h5py.File(path, "r") as hf:
+            return GeomHdfInfo(
+                flow_areas=_flow_area_cells(hf),
+                cross_sections=_row_count(hf, _CROSS_SECTIONS),
+                structures=_row_count(hf, _STRUCTURES),
+            )
+    except (OSError, KeyError, ValueError, TypeError) as e:
+        logger.warning("Cannot read geometry HDF %s: %s", path, e)
+        return None
@@ -11,6 +11,9 @@ import sys
 import threading
 import time
 import traceback
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future
+from typing import Any
 
 from PyQt6.QtCore import (
     QModelIndex,
@@ -47,6 +50,8 @@ from PyQt6.QtWidgets import (
 )
 
 from hecras_runner import __version__
+from hecras_runner.async_db import AsyncDbClient, EventLoopThread
+from hecras_runner.cleanup import shutdown_cleanup_service
 from hecras_runner.discovery import (
     check_hecras_installed,
     find_hecras_exe,
@@ -54,6 +59,7 @@ from hecras_runner.discovery import (
     open_parent_instance,
     refresh_parent_instance,
 )
+from hecras_runner.index import IndexedPlan, WorkspaceIndex
 from hecras_runner.models import (
     COL_DSS,
     COL_FLOW,
@@ -67,13 +73,21 @@ from hecras_runner.models import (
     PlanRow,
     PlanTableModel,
 )
-from hecras_runner.parser import RasProject, parse_project
+from hecras_runner.parser import (
+    DEFAULT_PARSE_WORKERS,
+    GeomEntry,
+    LazyRasProject,
+    RasProject,
+)
+from hecras_runner.preflight import validate_plans
+from hecras_runner.project_cache import ProjectCache
 from hecras_runner.runner import (
     ProgressMessage,
     SimulationJob,
     SimulationResult,
     run_simulations,
 )
+from hecras_runner.scratch import ScratchManager, estimate_footprint
 from hecras_runner.settings import load_settings, save_settings
 from hecras_runner.version_check import VersionInfo, check_for_update
 
@@ -375,6 +389,103 @@ class DbConnectionDialog(QDialog):
         }
 
 
+# ── Workspace Index Dialog ──
+
+
+class IndexSearchDialog(QDialog):
+    """Search the workspace index; double-click a plan to open its project."""
+
+    scan_finished = pyqtSignal(str)
+
+    def __init__(self, index: WorkspaceIndex, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Workspace Index")
+        self.resize(900, 500)
+        self._index = index
+        self._plans: list[IndexedPlan] = []
+        self.selected_project: str | None = None
+
+        layout = QVBoxLayout(self)
+
+        search_row = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Plan, geometry, flow or project (wildcards * ?)")
+        self.search_edit.textChanged.connect(self.refresh)
+        search_row.addWidget(self.search_edit)
+        self.unrun_check = QCheckBox("Not run only")
+        self.unrun_check.toggled.connect(self.refresh)
+        search_row.addWidget(self.unrun_check)
+        layout.addLayout(search_row)
+
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["Project", "Plan", "Geometry", "Flow", "Results"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.cellDoubleClicked.connect(self._open_row)
+        layout.addWidget(self.table)
+
+        btn_row = QHBoxLayout()
+        self.status_label = QLabel()
+        btn_row.addWidget(self.status_label)
+        btn_row.addStretch()
+        self._scan_btn = QPushButton("Index Folder...")
+        self._scan_btn.clicked.connect(self._scan_folder)
+        btn_row.addWidget(self._scan_btn)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.reject)
+        btn_row.addWidget(close_btn)
+        layout.addLayout(btn_row)
+
+        self.scan_finished.connect(self._on_scan_finished)
+        self.refresh()
+
+    def refresh(self) -> None:
+        self._plans = self._index.search(self.search_edit.text(), self.unrun_check.isChecked())
+        self.table.setRowCount(len(self._plans))
+        for i, plan in enumerate(self._plans):
+            values = [
+                plan.project_path,
+                f"{plan.key}: {plan.title}",
+                f"{plan.geom_ref}: {plan.geom_title}",
+                f"{plan.flow_ref}: {plan.flow_title}",
+                "Yes" if plan.has_results else "Not run",
+            ]
+            for col, value in enumerate(values):
+                self.table.setItem(i, col, QTableWidgetItem(value))
+        self.status_label.setText(
+            f"{len(self._plans)} plan(s) in {self._index.project_count()} indexed project(s)"
+        )
+
+    def _open_row(self, row: int, _col: int) -> None:
+        if 0 <= row < len(self._plans):
+            self.selected_project = self._plans[row].project_path
+            self.accept()
+
+    def _scan_folder(self) -> None:
+        root = QFileDialog.getExistingDirectory(self, "Select Folder to Index")
+        if not root:
+            return
+        self._scan_btn.setEnabled(False)
+        self.status_label.setText(f"Indexing {root}...")
+
+        def _scan() -> None:
+            try:
+                stats = self._index.scan([root])
+                summary = f"{stats.found} project(s), {stats.updated} updated"
+            except Exception as e:
+                summary = f"Indexing failed: {e}"
+            with contextlib.suppress(RuntimeError):  # dialog closed meanwhile
+                self.scan_finished.emit(summary)
+
+        threading.Thread(target=_scan, daemon=True).start()
+
+    def _on_scan_finished(self, summary: str) -> None:
+        self._scan_btn.setEnabled(True)
+        self.refresh()
+        self.status_label.setText(f"{self.status_label.text()} \u2014 {summary}")
+
+
 # ── Icon path ──
 
 
@@ -387,14 +498,29 @@ def _icon_path() -> str:
 # ── Pure helpers (testable without QApplication) ──
 
 
+def format_geom_label(geom_ref: str, geom: GeomEntry | None) -> str:
+    """Geometry column text, with its size when the .g##.hdf was read."""
+    if geom is None:
+        return f"{geom_ref}: ?"
+    label = f"{geom_ref}: {geom.title}"
+    sizes = []
+    if geom.cells_2d:
+        sizes.append(f"{geom.cells_2d:,} cells")
+    if geom.cross_sections:
+        sizes.append(f"{geom.cross_sections} XS")
+    if sizes:
+        label += f" ({', '.join(sizes)})"
+    return label
+
+
 def build_plan_rows(project: RasProject) -> list[PlanRow]:
     """Convert a parsed RasProject into PlanRow list for the table model."""
-    geom_map = {g.key: g.title for g in project.geometries}
+    geom_map = {g.key: g for g in project.geometries}
     flow_map = {f.key: f for f in project.flows}
 
     rows: list[PlanRow] = []
     for plan in project.plans:
-        geom_label = f"{plan.geom_ref}: {geom_map.get(plan.geom_ref, '?')}"
+        geom_label = format_geom_label(plan.geom_ref, geom_map.get(plan.geom_ref))
         flow_entry = flow_map.get(plan.flow_ref)
         flow_label = f"{plan.flow_ref}: {flow_entry.title}" if flow_entry else plan.flow_ref
         dss_label = ", ".join(flow_entry.dss_files) if flow_entry else ""
@@ -415,6 +541,21 @@ def build_plan_rows(project: RasProject) -> list[PlanRow]:
     return rows
 
 
+def build_pending_rows(project: LazyRasProject) -> list[PlanRow]:
+    """Rows for the plan keys of a project whose plan files are still loading."""
+    return [
+        PlanRow(
+            selected=True,
+            key=key,
+            title="\u2026",  # ellipsis until the plan file is read
+            progress="\u2014",  # em dash
+            log="View",
+            is_current=(key == project.current_plan),
+        )
+        for key in dict.fromkeys(project.plan_keys)
+    ]
+
+
 def format_result_progress(result: SimulationResult) -> tuple[str, str]:
     """Return (progress_text, tag) for a completed simulation result.
 
@@ -443,6 +584,13 @@ def plan_rows_to_jobs(rows: list[PlanRow]) -> list[SimulationJob]:
 
 # ── Main Window ──
 
+# Worker mode claims when NOTIFY says a job was queued; this poll only
+# covers lost notifications and databases without the jobs trigger
+_WORKER_FALLBACK_POLL_MS = 60000
+
+# Priority of batches submitted as urgent (normal batches are 0)
+_URGENT_PRIORITY = 10
+
 
 class MainWindow(QMainWindow):
     """Main application window."""
@@ -451,6 +599,7 @@ class MainWindow(QMainWindow):
     _log_signal = pyqtSignal(str)
     _db_result_signal = pyqtSignal(bool, str)  # (success, detail_message)
     _version_signal = pyqtSignal(object)
+    _worker_poll_signal = pyqtSignal(int)  # delay in ms before the next job claim
 
     def __init__(self):
         super().__init__()
@@ -459,7 +608,9 @@ class MainWindow(QMainWindow):
 
         # State
         self.project_path = ""
-        self.project: RasProject | None = None
+        self.project: RasProject | None = None  # set once all details are loaded
+        self._lazy_project: LazyRasProject | None = None
+        self._detail_refresh_pending = False
         self._plan_progress: dict[str, float] = {}
         self._plan_results: dict[str, SimulationResult] = {}
         self._log_messages: list[str] = []
@@ -471,11 +622,19 @@ class MainWindow(QMainWindow):
 
         # Network state
         self._settings = load_settings()
-        self._db_client: object | None = None
+        # All DB calls are coroutines on one background event loop
+        self._db_loop: EventLoopThread | None = None
+        self._db_client: AsyncDbClient | None = None
         self._worker_info: object | None = None
+        self._worker_ras_exe: str | None = None
+        # One scratch manager for the whole worker session, so reservations
+        # made by a running job are seen by the next capability report
+        self._worker_scratch: ScratchManager | None = None
         self._worker_polling_active = False
         self._distributed_batch_id: str | None = None
         self._worker_mode_active = False
+        self._worker_busy = False  # claiming or running a job
+        self._worker_listen_stop: threading.Event | None = None
 
         # Version check result (cached for About dialog)
         self._update_info: VersionInfo | None = None
@@ -488,6 +647,13 @@ class MainWindow(QMainWindow):
         self._log_signal.connect(self._append_log)
         self._db_result_signal.connect(self._on_db_result)
         self._version_signal.connect(self._on_version_check_result)
+        self._worker_poll_signal.connect(self._schedule_worker_poll)
+
+        # Worker job claims: one re-armable timer, so NOTIFY wake-ups and the
+        # fallback poll never stack up parallel claim chains
+        self._worker_poll_timer = QTimer(self)
+        self._worker_poll_timer.setSingleShot(True)
+        self._worker_poll_timer.timeout.connect(self._worker_poll_jobs)
 
         self._build_ui()
         self._build_menu()
@@ -510,6 +676,10 @@ class MainWindow(QMainWindow):
         open_act.setShortcut("Ctrl+O")
         open_act.triggered.connect(self._browse_project)
         file_menu.addAction(open_act)
+        index_act = QAction("Find in &Index...", self)
+        index_act.setShortcut("Ctrl+F")
+        index_act.triggered.connect(self._show_index)
+        file_menu.addAction(index_act)
         file_menu.addSeparator()
         exit_act = QAction("E&xit", self)
         exit_act.setShortcut("Ctrl+Q")
@@ -808,6 +978,12 @@ class MainWindow(QMainWindow):
         self._dist_execute_btn.clicked.connect(self._execute_distributed)
         action_row.addWidget(self._dist_execute_btn)
 
+        self._dist_urgent_cb = QCheckBox("Urgent")
+        self._dist_urgent_cb.setToolTip(
+            "Queue these plans ahead of normal-priority jobs from every user"
+        )
+        action_row.addWidget(self._dist_urgent_cb)
+
         self._save_settings_btn = QPushButton("Save Settings")
         self._save_settings_btn.clicked.connect(self._save_network_settings)
         action_row.addWidget(self._save_settings_btn)
@@ -900,30 +1076,92 @@ class MainWindow(QMainWindow):
             self.log(f"Project selected: {filename}")
             self._load_project(filename)
 
+    def _show_index(self) -> None:
+        index = WorkspaceIndex(log=self.log)
+        try:
+            dialog = IndexSearchDialog(index, parent=self)
+            dialog.exec()
+            selected = dialog.selected_project
+        finally:
+            index.close()
+        if selected:
+            self._proj_edit.setText(selected)
+            self.project_path = selected
+            self.log(f"Project selected: {selected}")
+            self._load_project(selected)
+
     def _load_project(self, prj_path: str) -> None:
         self.setCursor(Qt.CursorShape.WaitCursor)
         self._statusbar.showMessage("Loading project...")
-        self._plan_loading_bar.setVisible(True)
         QApplication.processEvents()
 
+        # Only the .prj is read here; plan, geometry and flow details are
+        # parsed in the background and fill in the table as they arrive.
         try:
-            self.project = parse_project(prj_path)
+            lazy = LazyRasProject(prj_path, cache=ProjectCache(prj_path), read_hdf=True)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to parse project: {e}")
+            self._statusbar.showMessage("Ready")
             return
         finally:
             self.unsetCursor()
-            self._plan_loading_bar.setVisible(False)
-            self._statusbar.showMessage("Ready")
 
-        rows = build_plan_rows(self.project)
-        self._plan_model.set_plans(rows)
+        self.project = None
+        self._lazy_project = lazy
+        self._detail_refresh_pending = False
+        self._plan_model.set_plans(build_pending_rows(lazy))
         self._plan_results.clear()
         self._plan_progress.clear()
+        self._plan_loading_bar.setVisible(True)
+
+        def _on_entry(_kind: str, _key: str, _entry: object) -> None:
+            # Coalesce bursts of entries into one table refresh
+            if not self._detail_refresh_pending:
+                self._detail_refresh_pending = True
+                QTimer.singleShot(50, lambda: self._refresh_plan_details(lazy))
+
+        def _prefetch() -> None:
+            error = ""
+            try:
+                lazy.prefetch(max_workers=DEFAULT_PARSE_WORKERS, on_entry=_on_entry)
+            except Exception as e:
+                error = str(e)
+            QTimer.singleShot(0, lambda: self._on_project_loaded(lazy, error))
+
+        threading.Thread(target=_prefetch, daemon=True).start()
+
+    def _refresh_plan_details(self, lazy: LazyRasProject) -> None:
+        self._detail_refresh_pending = False
+        if lazy is self._lazy_project:
+            self._plan_model.update_details(build_plan_rows(lazy.snapshot()))
+
+    def _on_project_loaded(self, lazy: LazyRasProject, error: str) -> None:
+        if lazy is not self._lazy_project:
+            return  # another project was opened meanwhile
+        self._plan_loading_bar.setVisible(False)
+        self._statusbar.showMessage("Ready")
+        if error:
+            self.log(f"Error loading project details: {error}")
+            return
+
+        self.project = lazy.snapshot()
+        rows = build_plan_rows(self.project)
+        self._plan_model.update_details(rows)
+        # Plans listed in the .prj whose files are missing
+        self._plan_model.retain_keys({r.key for r in rows})
         self.log(f"Loaded {len(self.project.plans)} plans from {self.project.title}")
 
         self._check_hecras_running()
 
+    def _ensure_project(self) -> RasProject | None:
+        """Return the fully loaded project, finishing a background load if needed."""
+        if self.project is None and self.project_path:
+            if self._lazy_project is None:
+                self._load_project(self.project_path)
+            if self._lazy_project is not None:
+                self.project = self._lazy_project.to_project(max_workers=DEFAULT_PARSE_WORKERS)
+        return self.project
+
     # ── Plan table interaction ──
 
     def _on_table_click(self, proxy_index: QModelIndex) -> None:
@@ -1014,16 +1252,18 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", "Project file does not exist")
             return
 
-        if self.project is None:
-            self._load_project(self.project_path)
-            if self.project is None:
-                return
+        if self._ensure_project() is None:
+            return
 
         selected = [r for r in self._plan_model.all_rows() if r.selected]
         if not selected:
             QMessageBox.critical(self, "Error", "Please select at least one plan")
             return
 
+        selected = self._preflight(selected)
+        if not selected:
+            return
+
         self._execute_btn.setEnabled(False)
         self._plan_progress.clear()
         self._plan_results.clear()
@@ -1046,6 +1286,36 @@ class MainWindow(QMainWindow):
         thread = threading.Thread(target=self._run_thread, args=(plans_for_runner,), daemon=True)
         thread.start()
 
+    def _preflight(self, selected: list[PlanRow]) -> list[PlanRow]:
+        """Validate *selected* plans; return those to run (empty to cancel)."""
+        self.setCursor(Qt.CursorShape.WaitCursor)
+        try:
+            report = validate_plans(self.project_path, plan_rows_to_jobs(selected))
+        finally:
+            self.unsetCursor()
+        for issue in report.issues:
+            self.log(str(issue))
+        self.log(report.summary())
+        if report.ok:
+            return selected
+
+        failed = report.failed_suffixes()
+        runnable = [r for r in selected if r.key[1:] not in failed]
+        problems = "\n".join(str(i) for i in report.errors[:20])
+        if len(report.errors) > 20:
+            problems += f"\n... and {len(report.errors) - 20} more (see log)"
+        if not runnable:
+            QMessageBox.critical(self, "Pre-flight Check Failed", problems)
+            return []
+        answer = QMessageBox.question(
+            self,
+            "Pre-flight Check Failed",
+            f"{problems}\n\nRun the other {len(runnable)} plan(s)?",
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return []
+        return runnable
+
     def _run_thread(self, plans: list[SimulationJob]) -> None:
         start_time = time.monotonic()
         results: list[SimulationResult] = []
@@ -1078,6 +1348,7 @@ class MainWindow(QMainWindow):
                 log=self.log,
                 progress_queue=self.progress_queue,
                 result_callback=_on_plan_result,
+                scratch=ScratchManager.from_settings(self._settings.scratch, log=self.log),
             )
 
         except Exception as e:
@@ -1171,11 +1442,13 @@ class MainWindow(QMainWindow):
         dialog.status_label.setText("Connecting...")
         self._set_traffic_light("yellow")
 
+        if self._db_loop is None:
+            self._db_loop = EventLoopThread()
+
         # #5 — Close any existing failing/stale connection first
         if self._db_client is not None:
             self.log("Closing previous DB connection...")
-            with contextlib.suppress(Exception):
-                self._db_client.close()  # type: ignore[attr-defined]
+            self._db_loop.submit(self._db_client.close())
             self._db_client = None
 
         conninfo = (
@@ -1183,33 +1456,34 @@ class MainWindow(QMainWindow):
         )
         self.log(f"DB: Attempting connection to {conninfo}")
 
-        def _connect() -> None:
-            try:
-                from hecras_runner.db import DbClient
-                from hecras_runner.settings import DbSettings
-
-                settings = DbSettings(
-                    host=vals["host"],
-                    port=int(vals["port"] or "5432"),
-                    dbname=vals["dbname"],
-                    user=vals["user"],
-                    password=vals["password"],
-                )
-                client = DbClient.connect(settings, log=self.log)
+        from hecras_runner.settings import DbSettings
+
+        settings = DbSettings(
+            host=vals["host"],
+            port=int(vals["port"] or "5432"),
+            dbname=vals["dbname"],
+            user=vals["user"],
+            password=vals["password"],
+        )
 
+        def _connected(future: Future) -> None:
+            try:
+                client = future.result()
                 if client is not None:
                     self._db_client = client
                     self.log("DB: Connection successful")
                     self._db_result_signal.emit(True, "Connected")
                 else:
-                    self.log("DB: DbClient.connect() returned None")
+                    self.log("DB: AsyncDbClient.connect() returned None")
                     self._db_result_signal.emit(False, "Connection failed (see log)")
             except Exception as e:
                 self.log(f"DB: Connection exception: {e}")
                 self.log(traceback.format_exc())
                 self._db_result_signal.emit(False, f"Error: {e}")
 
-        threading.Thread(target=_connect, daemon=True).start()
+        self._db_loop.submit(AsyncDbClient.connect(settings, log=self.log)).add_done_callback(
+            _connected
+        )
 
     def _on_db_result(self, success: bool, detail: str) -> None:
         """Handle DB connection result on the GUI thread."""
@@ -1242,6 +1516,24 @@ class MainWindow(QMainWindow):
         save_settings(self._settings)
         self.log("Settings saved.")
 
+    def _db_call(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        on_result: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+    ) -> None:
+        """Run a DB coroutine on the event loop and hand its outcome to the GUI thread."""
+
+        def _done(future: Future) -> None:
+            try:
+                result = future.result()
+            except Exception as exc:
+                QTimer.singleShot(0, lambda e=exc: on_error(e))
+                return
+            QTimer.singleShot(0, lambda r=result: on_result(r))
+
+        self._db_loop.submit(coro).add_done_callback(_done)  # type: ignore[union-attr]
+
     # ── Network: Worker list polling ──
 
     def _start_worker_polling(self) -> None:
@@ -1254,15 +1546,11 @@ class MainWindow(QMainWindow):
         if not self._worker_polling_active or self._db_client is None:
             return
 
-        def _fetch() -> None:
-            try:
-                workers = self._db_client.get_active_workers()  # type: ignore[attr-defined]
-                QTimer.singleShot(0, lambda w=workers: self._update_worker_table(w))
-            except Exception as exc:
-                msg = f"Poll error: {exc}"
-                QTimer.singleShot(0, lambda m=msg: self.log(m))
-
-        threading.Thread(target=_fetch, daemon=True).start()
+        self._db_call(
+            self._db_client.get_active_workers(),
+            self._update_worker_table,
+            lambda exc: self.log(f"Poll error: {exc}"),
+        )
         QTimer.singleShot(10000, self._poll_workers)
 
     def _update_worker_table(self, workers: list[dict]) -> None:
@@ -1295,7 +1583,7 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", "Share path not configured")
             return
 
-        if not self.project_path or self.project is None:
+        if not self.project_path or self._ensure_project() is None:
             QMessageBox.critical(self, "Error", "No project loaded")
             return
 
@@ -1307,23 +1595,31 @@ class MainWindow(QMainWindow):
         self._dist_execute_btn.setEnabled(False)
         self._status_label.setText("Running...")
 
-        thread = threading.Thread(target=self._distributed_thread, args=(selected,), daemon=True)
+        priority = _URGENT_PRIORITY if self._dist_urgent_cb.isChecked() else 0
+        thread = threading.Thread(
+            target=self._distributed_thread, args=(selected, priority), daemon=True
+        )
         thread.start()
 
-    def _distributed_thread(self, plan_rows: list[PlanRow]) -> None:
+    def _distributed_thread(self, plan_rows: list[PlanRow], priority: int = 0) -> None:
         try:
+            from hecras_runner.capabilities import job_requirements
+            from hecras_runner.rasmap import staged_size
             from hecras_runner.transfer import project_to_share
 
             self.log("Uploading project to share...")
             QTimer.singleShot(0, lambda: self._statusbar.showMessage("Uploading to share..."))
 
+            project_bytes = staged_size(self.project_path)
             jobs_for_db: list[dict] = []
             for row in plan_rows:
                 suffix = row.key[1:]
                 import uuid
 
+                # The job row gets the same id, which is how workers find
+                # the upload (projects/{job_id}/manifest.json)
                 job_id = str(uuid.uuid4())
-                project_to_share(
+                manifest = project_to_share(
                     self.project_path,
                     self._settings.network.share_path,
                     job_id,
@@ -1332,18 +1628,27 @@ class MainWindow(QMainWindow):
                 )
                 jobs_for_db.append(
                     {
+                        "job_id": job_id,
                         "plan_name": row.title,
                         "plan_suffix": suffix,
+                        "terrain_hash": manifest.terrain_hash,
+                        "requirements": job_requirements(
+                            self.project_path, suffix, project_bytes=project_bytes
+                        ),
                     }
                 )
 
             self.log("Submitting batch to database...")
-            batch_id = self._db_client.submit_batch(  # type: ignore[attr-defined]
-                project_path=self._settings.network.share_path,
-                project_title=self.project.title if self.project else "",
-                jobs=jobs_for_db,
-                submitted_by=os.environ.get("USERNAME", ""),
+            submission = self._db_loop.run(  # type: ignore[union-attr]
+                self._db_client.submit_batch(  # type: ignore[union-attr]
+                    project_path=self._settings.network.share_path,
+                    project_title=self.project.title if self.project else "",
+                    jobs=jobs_for_db,
+                    submitted_by=os.environ.get("USERNAME", ""),
+                    priority=priority,
+                )
             )
+            batch_id = submission.batch_id
             self._distributed_batch_id = batch_id
             self.log(f"Batch {batch_id} submitted with {len(plan_rows)} jobs")
             QTimer.singleShot(
@@ -1360,18 +1665,15 @@ class MainWindow(QMainWindow):
         if self._distributed_batch_id is None or self._db_client is None:
             return
 
-        def _check() -> None:
-            try:
-                status = self._db_client.get_batch_status(  # type: ignore[attr-defined]
-                    self._distributed_batch_id
-                )
-                QTimer.singleShot(0, lambda s=status: self._handle_batch_status(s))
-            except Exception as exc:
-                msg = f"Batch poll error: {exc}"
-                QTimer.singleShot(0, lambda m=msg: self.log(m))
-                QTimer.singleShot(5000, self._poll_batch_status)
+        def _failed(exc: Exception) -> None:
+            self.log(f"Batch poll error: {exc}")
+            QTimer.singleShot(5000, self._poll_batch_status)
 
-        threading.Thread(target=_check, daemon=True).start()
+        self._db_call(
+            self._db_client.get_batch_status(self._distributed_batch_id),
+            self._handle_batch_status,
+            _failed,
+        )
 
     def _handle_batch_status(self, status: dict) -> None:
         total = status.get("total", 0)
@@ -1401,8 +1703,8 @@ class MainWindow(QMainWindow):
             try:
                 from hecras_runner.transfer import results_from_share
 
-                jobs = self._db_client.get_batch_jobs(  # type: ignore[attr-defined]
-                    self._distributed_batch_id
+                jobs = self._db_loop.run(  # type: ignore[union-attr]
+                    self._db_client.get_batch_jobs(self._distributed_batch_id)
                 )
                 main_dir = os.path.dirname(self.project_path)
                 for job in jobs:
@@ -1434,15 +1736,29 @@ class MainWindow(QMainWindow):
             self._worker_mode_active = False
             return
 
+        self._worker_ras_exe = ras_exe
+        self._worker_scratch = ScratchManager.from_settings(self._settings.scratch, log=self.log)
         try:
-            self._worker_info = self._db_client.register_worker(  # type: ignore[attr-defined]
-                hecras_path=ras_exe,
+            client, loop = self._db_client, self._db_loop
+            self._worker_info = loop.run(  # type: ignore[union-attr]
+                client.register_worker(  # type: ignore[union-attr]
+                    hecras_path=ras_exe, capabilities=self._worker_capabilities()
+                )
             )
             worker_id = self._worker_info.worker_id  # type: ignore[attr-defined]
-            self._db_client.start_heartbeat(worker_id)  # type: ignore[attr-defined]
+            loop.run(client.start_heartbeat(worker_id))  # type: ignore[union-attr]
             self.log(f"Worker mode started ({worker_id[:8]}...)")
             self._statusbar.showMessage("Worker: idle")
 
+            # Wake up as soon as a job is queued instead of waiting for the poll
+            self._worker_listen_stop = threading.Event()
+            loop.run(  # type: ignore[union-attr]
+                client.listen_for_jobs(
+                    lambda _batch_id: self._worker_poll_signal.emit(0),
+                    stop=self._worker_listen_stop,
+                )
+            )
+
             # Ensure polling is active, then force an immediate refresh
             self._start_worker_polling()
             self._poll_workers()
@@ -1452,32 +1768,55 @@ class MainWindow(QMainWindow):
             self._worker_mode_active = False
 
     def _stop_worker(self) -> None:
+        self._worker_poll_timer.stop()
+        if self._worker_listen_stop is not None:
+            self._worker_listen_stop.set()
+            self._worker_listen_stop = None
         if self._db_client is not None and self._worker_info is not None:
             with contextlib.suppress(Exception):
                 worker_id = self._worker_info.worker_id  # type: ignore[attr-defined]
-                self._db_client.set_worker_offline(worker_id)  # type: ignore[attr-defined]
-                self._db_client.stop_heartbeat()  # type: ignore[attr-defined]
+                client, loop = self._db_client, self._db_loop
+                loop.run(client.set_worker_offline(worker_id))  # type: ignore[union-attr]
+                loop.run(client.stop_heartbeat())  # type: ignore[union-attr]
         self._worker_info = None
         self._statusbar.showMessage("Ready")
         self.log("Worker mode stopped.")
 
+    def _schedule_worker_poll(self, delay_ms: int) -> None:
+        """(Re)arm the job claim timer; NOTIFY wake-ups arrive with a delay of 0."""
+        if self._worker_mode_active and not self._worker_busy:
+            self._worker_poll_timer.start(delay_ms)
+
     def _worker_poll_jobs(self) -> None:
         if not self._worker_mode_active or self._db_client is None or self._worker_info is None:
             return
-
-        def _try_claim() -> None:
-            try:
-                worker_id = self._worker_info.worker_id  # type: ignore[attr-defined]
-                job = self._db_client.claim_job(worker_id)  # type: ignore[attr-defined]
-                if job:
-                    QTimer.singleShot(0, lambda j=job: self._run_worker_job(j))
-                else:
-                    QTimer.singleShot(5000, self._worker_poll_jobs)
-            except Exception as e:
-                self.log(f"Job claim error: {e}")
-                QTimer.singleShot(10000, self._worker_poll_jobs)
-
-        threading.Thread(target=_try_claim, daemon=True).start()
+        if self._worker_busy:
+            return  # the running job schedules the next claim when it ends
+        self._worker_busy = True
+
+        def _claimed(job: dict | None) -> None:
+            if job:
+                self._run_worker_job(job)
+            else:
+                self._worker_busy = False
+                self._schedule_worker_poll(_WORKER_FALLBACK_POLL_MS)
+
+        def _failed(exc: Exception) -> None:
+            self.log(f"Job claim error: {exc}")
+            self._worker_busy = False
+            self._schedule_worker_poll(10000)
+
+        worker_id = self._worker_info.worker_id  # type: ignore[attr-defined]
+        caps = self._worker_capabilities()
+        self._db_call(self._db_client.claim_job(worker_id, caps), _claimed, _failed)
+
+    def _worker_capabilities(self) -> dict:
+        from hecras_runner.capabilities import worker_capabilities
+        from hecras_runner.transfer import default_terrain_cache_dir
+
+        return worker_capabilities(
+            self._worker_ras_exe, self._worker_scratch, default_terrain_cache_dir()
+        )
 
     def _run_worker_job(self, job: dict) -> None:
         job_id = job["job_id"]
@@ -1485,46 +1824,79 @@ class MainWindow(QMainWindow):
         self.log(f"Running job {job_id[:8]}...: {plan_name}")
         self._statusbar.showMessage(f"Worker: running {plan_name}")
 
+        client, loop = self._db_client, self._db_loop
+        scratch = self._worker_scratch
+
+        def _report(fraction: float, _timestamp: str) -> None:
+            # Buffered by the DB client and written with the heartbeat
+            loop.submit(client.update_progress(job_id, fraction))  # type: ignore[union-attr]
+
         def _execute() -> None:
             try:
-                from hecras_runner.file_ops import cleanup_temp_dir, copy_project_to_temp
+                from hecras_runner.cleanup import get_cleanup_service
+                from hecras_runner.file_ops import copy_project_to_temp
                 from hecras_runner.runner import run_hecras_cli
 
-                self._db_client.start_job(job_id)  # type: ignore[attr-defined]
+                worker_id = job.get("worker_id")
+                start = client.start_job(job_id, worker_id=worker_id)  # type: ignore[union-attr]
+                if not loop.run(start):  # type: ignore[union-attr]
+                    raise RuntimeError("lease lost before start")
 
                 ras_exe = find_hecras_exe(log=self.log)
-                temp_prj = copy_project_to_temp(job["project_path"], log=self.log)
-                result = run_hecras_cli(
-                    temp_prj,
-                    plan_suffix=job["plan_suffix"],
-                    plan_name=plan_name,
-                    ras_exe=ras_exe,
-                    log=self.log,
-                )
+                footprint = estimate_footprint(job["project_path"], job["plan_suffix"])
+                lease = scratch.reserve(footprint, timeout=600)  # type: ignore[union-attr]
+                if lease is None:
+                    raise RuntimeError("Insufficient scratch space")
+                try:
+                    temp_prj = copy_project_to_temp(
+                        job["project_path"],
+                        log=self.log,
+                        plan_key=f"p{job['plan_suffix']}",
+                        write_detailed=True,
+                        temp_root=lease.root,
+                    )
+                    result = run_hecras_cli(
+                        temp_prj,
+                        plan_suffix=job["plan_suffix"],
+                        plan_name=plan_name,
+                        ras_exe=ras_exe,
+                        log=self.log,
+                        on_progress=_report,
+                        prepared=True,
+                    )
+                finally:
+                    scratch.release(lease)  # type: ignore[union-attr]
 
-                self._db_client.complete_job(  # type: ignore[attr-defined]
-                    job_id,
-                    success=result.success,
-                    elapsed_seconds=result.elapsed_seconds,
-                    error_message=result.error_message,
-                    hdf_verified=result.success,
+                loop.run(  # type: ignore[union-attr]
+                    client.complete_job(  # type: ignore[union-attr]
+                        job_id,
+                        success=result.success,
+                        elapsed_seconds=result.elapsed_seconds,
+                        error_message=result.error_message,
+                        hdf_verified=result.success,
+                        worker_id=worker_id,
+                    )
                 )
-                cleanup_temp_dir(os.path.dirname(temp_prj), log=self.log)
+                get_cleanup_service(log=self.log).enqueue(os.path.dirname(temp_prj), log=self.log)
 
                 status = "OK" if result.success else "FAILED"
                 self.log(f"Job {job_id[:8]}...: {status} ({result.elapsed_seconds:.1f}s)")
             except Exception as e:
                 self.log(f"Job {job_id[:8]}... ERROR: {e}")
                 with contextlib.suppress(Exception):
-                    self._db_client.complete_job(  # type: ignore[attr-defined]
-                        job_id,
-                        success=False,
-                        elapsed_seconds=0.0,
-                        error_message=str(e),
+                    loop.run(  # type: ignore[union-attr]
+                        client.complete_job(  # type: ignore[union-attr]
+                            job_id,
+                            success=False,
+                            elapsed_seconds=0.0,
+                            error_message=str(e),
+                            worker_id=job.get("worker_id"),
+                        )
                     )
 
             QTimer.singleShot(0, lambda: self._statusbar.showMessage("Worker: idle"))
-            QTimer.singleShot(1000, self._worker_poll_jobs)
+            self._worker_busy = False
+            self._worker_poll_signal.emit(0)
 
         threading.Thread(target=_execute, daemon=True).start()
 
@@ -1553,9 +1925,11 @@ class MainWindow(QMainWindow):
         self._worker_polling_active = False
 
         # Close DB connection
-        if self._db_client is not None:
-            with contextlib.suppress(Exception):
-                self._db_client.close()  # type: ignore[attr-defined]
+        if self._db_loop is not None:
+            if self._db_client is not None:
+                with contextlib.suppress(Exception):
+                    self._db_loop.run(self._db_client.close(), timeout=10)
+            self._db_loop.stop()
 
         if self._parent_ras is not None:
             answer = QMessageBox.question(
@@ -1575,6 +1949,9 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
 
+        # Pending temp folders are persisted and retried on the next start
+        shutdown_cleanup_service(timeout=5)
+
         event.accept()
 
 
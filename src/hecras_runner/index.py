@@ -0,0 +1,446 @@
+"""Local index of HEC-RAS projects across directory trees.
+
+Questions like "which plans use geometry X" or "which projects have plans
+that were never run" otherwise mean opening every project in turn. A
+``WorkspaceIndex`` walks directory trees with ``os.scandir``, parses each
+HEC-RAS ``.prj`` it finds and stores its plans, geometries, flows, DSS
+references and result-file status in SQLite
+(``%APPDATA%/hecras_runner/index.sqlite`` by default).
+
+Re-scanning is incremental: a project is re-parsed only when the size or
+mtime of one of its files (``.prj``, ``.p##``, ``.g##``, ``.u##`` and the
+``.p##.hdf`` results) changed since it was indexed. Queries run against
+the SQLite file only and never touch the shares.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+from hecras_runner.parser import DEFAULT_PARSE_WORKERS, RasProject, parse_project
+from hecras_runner.settings import _settings_dir
+
+INDEX_SCHEMA_VERSION = 1
+
+# Files whose size/mtime make up a project's stamp: the .prj and everything
+# with the same basename and a plan, geometry, flow or results extension.
+_PROJECT_FILE_RE = re.compile(r"\.(prj|[pgu]\d{2}|p\d{2}\.hdf)$", re.IGNORECASE)
+_RESULTS_RE = re.compile(r"\.p(\d{2})\.hdf$", re.IGNORECASE)
+
+# Directories never worth descending into
+_SKIP_DIRS = {".git", "__pycache__", "$recycle.bin", "system volume information"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id           INTEGER PRIMARY KEY,
+    path         TEXT NOT NULL UNIQUE,
+    title        TEXT NOT NULL,
+    current_plan TEXT,
+    stamp        TEXT NOT NULL,
+    indexed_at   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS plans (
+    project_id      INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    key             TEXT NOT NULL,
+    title           TEXT NOT NULL,
+    geom_ref        TEXT NOT NULL,
+    flow_ref        TEXT NOT NULL,
+    sim_start       TEXT NOT NULL,
+    sim_end         TEXT NOT NULL,
+    has_results     INTEGER NOT NULL,
+    results_mtime   REAL,
+    PRIMARY KEY (project_id, key)
+);
+CREATE TABLE IF NOT EXISTS geometries (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    key        TEXT NOT NULL,
+    title      TEXT NOT NULL,
+    PRIMARY KEY (project_id, key)
+);
+CREATE TABLE IF NOT EXISTS flows (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    key        TEXT NOT NULL,
+    title      TEXT NOT NULL,
+    PRIMARY KEY (project_id, key)
+);
+CREATE TABLE IF NOT EXISTS dss_refs (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    source     TEXT NOT NULL,  -- "prj" or the flow key ("u01")
+    path       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS plans_geom ON plans(geom_ref);
+CREATE INDEX IF NOT EXISTS geometries_title ON geometries(title);
+CREATE INDEX IF NOT EXISTS dss_refs_path ON dss_refs(path);
+"""
+
+
+def default_index_path() -> str:
+    """Location of the default index database."""
+    return os.path.join(_settings_dir(), "index.sqlite")
+
+
+@dataclass
+class IndexedPlan:
+    """One plan row of a query result."""
+
+    project_path: str
+    project_title: str
+    key: str  # e.g. "p03"
+    title: str
+    geom_ref: str
+    geom_title: str
+    flow_ref: str
+    flow_title: str
+    has_results: bool
+    is_current: bool = False
+
+
+@dataclass
+class ScanStats:
+    """Outcome of :meth:`WorkspaceIndex.scan`."""
+
+    found: int = 0  # HEC-RAS projects seen
+    updated: int = 0  # (re-)parsed and written
+    unchanged: int = 0  # skipped by stamp
+    removed: int = 0  # indexed under the roots but gone from disk
+    failed: int = 0  # could not be parsed
+    elapsed_seconds: float = 0.0
+
+
+def _is_ras_project(path: str) -> bool:
+    """True if *path* is a HEC-RAS project rather than e.g. an ESRI projection .prj."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(64)
+    except OSError:
+        return False
+    return head.lstrip(b"\xef\xbb\xbf").startswith(b"Proj Title=")
+
+
+def iter_project_dirs(roots: Iterable[str]) -> Iterator[tuple[str, list[os.DirEntry]]]:
+    """Walk *roots* with ``os.scandir``, yielding ``(dir, entries)`` for dirs with a .prj.
+
+    Unreadable directories are skipped silently, symlinked directories are
+    not followed.
+    """
+    stack = [os.path.abspath(r) for r in roots]
+    seen: set[str] = set()
+    while stack:
+        path = stack.pop()
+        key = os.path.normcase(path)
+        if key in seen:
+            continue
+        seen.add(key)
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        has_prj = False
+        subdirs = []
+        for entry in entries:
+            with contextlib.suppress(OSError):
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name.lower() not in _SKIP_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.name.lower().endswith(".prj"):
+                    has_prj = True
+        if has_prj:
+            yield path, entries
+        stack.extend(sorted(subdirs, reverse=True))
+
+
+def _project_stamp(prj_path: str, entries: list[os.DirEntry]) -> tuple[str, dict[str, float]]:
+    """Stamp of one project from its directory listing, plus results mtimes by plan key.
+
+    The stamp is a digest of name, size and mtime of the project's files, so
+    it changes when any of them is edited, added, removed or (re-)computed.
+    """
+    base = os.path.splitext(os.path.basename(prj_path))[0].lower()
+    parts = []
+    results: dict[str, float] = {}
+    for entry in entries:
+        name = entry.name.lower()
+        if not name.startswith(base + ".") or not _PROJECT_FILE_RE.search(name):
+            continue
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        parts.append(f"{name}:{st.st_size}:{st.st_mtime_ns}")
+        m = _RESULTS_RE.search(name)
+        if m and name == f"{base}.p{m.group(1)}.hdf":
+            results[f"p{m.group(1)}"] = st.st_mtime
+    digest = hashlib.sha1("\n".join(sorted(parts)).encode("utf-8")).hexdigest()
+    return digest, results
+
+
+def _like_pattern(pattern: str) -> str:
+    """Translate a ``*``/``?`` wildcard pattern to a SQL LIKE pattern."""
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%").replace("?", "_")
+
+
+def _is_under(path: str, root: str) -> bool:
+    path = os.path.normcase(path)
+    root = os.path.normcase(root).rstrip("\\/")
+    return path == root or path.startswith(root + os.sep)
+
+
+class WorkspaceIndex:
+    """SQLite index of HEC-RAS projects.
+
+    One connection is shared by the instance and guarded by a lock, so an
+    index may be scanned on a worker thread while the GUI queries it.
+    """
+
+    def __init__(self, db_path: str | None = None, log: Callable[[str], None] = print) -> None:
+        self.db_path = db_path or default_index_path()
+        self._log = log
+        self._lock = threading.Lock()
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._ensure_schema()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> WorkspaceIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _ensure_schema(self) -> None:
+        with self._lock, self._conn:
+            row = None
+            with contextlib.suppress(sqlite3.OperationalError):
+                row = self._conn.execute(
+                    "SELECT value FROM meta WHERE key = 'schema_version'"
+                ).fetchone()
+            if row is not None and int(row[0]) != INDEX_SCHEMA_VERSION:
+                # The index is a cache of what is on disk; rebuild it
+                for table in ("dss_refs", "flows", "geometries", "plans", "projects", "meta"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(INDEX_SCHEMA_VERSION),),
+            )
+
+    # ── Scanning ──
+
+    def scan(
+        self,
+        roots: Iterable[str],
+        force: bool = False,
+        max_workers: int | None = DEFAULT_PARSE_WORKERS,
+    ) -> ScanStats:
+        """Index every HEC-RAS project under *roots*.
+
+        Projects whose stamp is unchanged are skipped unless *force*.
+        Projects indexed under one of *roots* that are no longer on disk are
+        removed.
+        """
+        t0 = time.monotonic()
+        roots = [os.path.abspath(r) for r in roots]
+        stats = ScanStats()
+        with self._lock:
+            known = dict(self._conn.execute("SELECT path, stamp FROM projects").fetchall())
+
+        seen: set[str] = set()
+        for _dirpath, entries in iter_project_dirs(roots):
+            for entry in entries:
+                if not entry.name.lower().endswith(".prj") or not _is_ras_project(entry.path):
+                    continue
+                prj_path = os.path.abspath(entry.path)
+                seen.add(prj_path)
+                stats.found += 1
+                stamp, results = _project_stamp(prj_path, entries)
+                if not force and known.get(prj_path) == stamp:
+                    stats.unchanged += 1
+                    continue
+                try:
+                    project = parse_project(prj_path, max_workers=max_workers)
+                except (OSError, UnicodeDecodeError) as e:
+                    self._log(f"Cannot index {prj_path}: {e}")
+                    stats.failed += 1
+                    continue
+                self._store(project, stamp, results)
+                stats.updated += 1
+
+        stale = [
+            path
+            for path in known
+            if path not in seen and any(_is_under(path, root) for root in roots)
+        ]
+        if stale:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM projects WHERE path = ?", [(p,) for p in stale])
+            stats.removed = len(stale)
+
+        stats.elapsed_seconds = time.monotonic() - t0
+        self._log(
+            f"Indexed {stats.found} project(s) in {stats.elapsed_seconds:.1f}s: "
+            f"{stats.updated} updated, {stats.unchanged} unchanged, "
+            f"{stats.removed} removed, {stats.failed} failed"
+        )
+        return stats
+
+    def _store(self, project: RasProject, stamp: str, results: dict[str, float]) -> None:
+        path = os.path.abspath(project.path)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM projects WHERE path = ?", (path,))
+            cur = self._conn.execute(
+                "INSERT INTO projects (path, title, current_plan, stamp, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, project.title, project.current_plan, stamp, time.time()),
+            )
+            pid = cur.lastrowid
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        pid,
+                        p.key,
+                        p.title,
+                        p.geom_ref,
+                        p.flow_ref,
+                        p.sim_start,
+                        p.sim_end,
+                        int(p.key in results),
+                        results.get(p.key),
+                    )
+                    for p in project.plans
+                ],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO geometries VALUES (?, ?, ?)",
+                [(pid, g.key, g.title) for g in project.geometries],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO flows VALUES (?, ?, ?)",
+                [(pid, f.key, f.title) for f in project.flows],
+            )
+            dss = [(pid, "prj", d) for d in project.dss_files]
+            dss += [(pid, f.key, d) for f in project.flows for d in f.dss_files]
+            self._conn.executemany("INSERT INTO dss_refs VALUES (?, ?, ?)", dss)
+
+    # ── Queries ──
+
+    def find_plans(
+        self,
+        geometry: str | None = None,
+        flow: str | None = None,
+        plan: str | None = None,
+        project: str | None = None,
+        unrun: bool = False,
+    ) -> list[IndexedPlan]:
+        """Plans matching all given filters, ordered by project path and plan key.
+
+        *geometry*, *flow* and *plan* match the key (``g01``) or the title,
+        *project* matches the project path or title. All accept ``*`` and
+        ``?`` wildcards and are case-insensitive. *unrun* keeps only plans
+        without a ``.p##.hdf`` results file.
+        """
+        where = []
+        params: list[str] = []
+        for column_key, column_title, pattern in (
+            ("p.geom_ref", "g.title", geometry),
+            ("p.flow_ref", "f.title", flow),
+            ("p.key", "p.title", plan),
+            ("pr.path", "pr.title", project),
+        ):
+            if pattern:
+                like = _like_pattern(pattern)
+                where.append(
+                    f"({column_key} LIKE ? ESCAPE '\\' OR {column_title} LIKE ? ESCAPE '\\')"
+                )
+                params += [like, like]
+        if unrun:
+            where.append("p.has_results = 0")
+        return self._query_plans(where, params)
+
+    def search(self, text: str, unrun: bool = False) -> list[IndexedPlan]:
+        """Plans where any key, title or the project path contains *text*.
+
+        Used for the GUI's free-text search; *text* may contain wildcards.
+        """
+        like = _like_pattern(f"*{text.strip()}*")
+        columns = ("p.key", "p.title", "p.geom_ref", "g.title")
+        columns += ("p.flow_ref", "f.title", "pr.path", "pr.title")
+        where = ["(" + " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in columns) + ")"]
+        params = [like] * len(columns)
+        if unrun:
+            where.append("p.has_results = 0")
+        return self._query_plans(where, params)
+
+    def _query_plans(self, where: list[str], params: list[str]) -> list[IndexedPlan]:
+        sql = (
+            "SELECT pr.path, pr.title, p.key, p.title, p.geom_ref, COALESCE(g.title, ''), "
+            "p.flow_ref, COALESCE(f.title, ''), p.has_results, "
+            "COALESCE(pr.current_plan = p.key, 0) "
+            "FROM plans p JOIN projects pr ON pr.id = p.project_id "
+            "LEFT JOIN geometries g ON g.project_id = p.project_id AND g.key = p.geom_ref "
+            "LEFT JOIN flows f ON f.project_id = p.project_id AND f.key = p.flow_ref"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY pr.path, p.key"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            IndexedPlan(
+                project_path=r[0],
+                project_title=r[1],
+                key=r[2],
+                title=r[3],
+                geom_ref=r[4],
+                geom_title=r[5],
+                flow_ref=r[6],
+                flow_title=r[7],
+                has_results=bool(r[8]),
+                is_current=bool(r[9]),
+            )
+            for r in rows
+        ]
+
+    def projects_with_unrun_plans(self) -> list[tuple[str, int]]:
+        """``(project_path, unrun_count)`` for projects with plans lacking results."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT pr.path, COUNT(*) FROM plans p JOIN projects pr ON pr.id = p.project_id "
+                "WHERE p.has_results = 0 GROUP BY pr.path ORDER BY pr.path"
+            ).fetchall()
+
+    def find_dss(self, pattern: str) -> list[tuple[str, str, str]]:
+        """``(project_path, source, dss_path)`` for DSS references matching *pattern*."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT DISTINCT pr.path, d.source, d.path FROM dss_refs d "
+                "JOIN projects pr ON pr.id = d.project_id "
+                "WHERE d.path LIKE ? ESCAPE '\\' ORDER BY pr.path, d.source",
+                (_like_pattern(pattern),),
+            ).fetchall()
+
+    def project_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
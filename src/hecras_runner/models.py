@@ -56,6 +56,35 @@ class PlanTableModel(QAbstractTableModel):
         self._rows = list(rows)
         self.endResetModel()
 
+    def update_details(self, rows: list[PlanRow]) -> None:
+        """Fill in title, geometry, flow and DSS of existing rows, matched by key.
+
+        Selection, progress and results are kept, so the table can be filled
+        in progressively while the user is already working with it.
+        """
+        by_key = {r.key: r for r in rows}
+        for i, r in enumerate(self._rows):
+            new = by_key.get(r.key)
+            if new is None:
+                continue
+            details = (new.title, new.geom, new.flow, new.dss, new.is_current)
+            if details == (r.title, r.geom, r.flow, r.dss, r.is_current):
+                continue
+            r.title, r.geom, r.flow, r.dss, r.is_current = details
+            self.dataChanged.emit(
+                self.index(i, COL_KEY),
+                self.index(i, COL_DSS),
+                [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.FontRole],
+            )
+
+    def retain_keys(self, keys: set[str]) -> None:
+        """Remove rows whose key is not in *keys*."""
+        for i in reversed(range(len(self._rows))):
+            if self._rows[i].key not in keys:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self._rows[i]
+                self.endRemoveRows()
+
     def get_row(self, row: int) -> PlanRow | None:
         if 0 <= row < len(self._rows):
             return self._rows[row]
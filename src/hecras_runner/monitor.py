@@ -11,6 +11,8 @@ import time
 from collections.abc import Callable
 from datetime import datetime
 
+from hecras_runner.document import RasDocument
+
 
 def patch_write_detailed(plan_path: str) -> bool:
     """Set ``Write Detailed= 1`` in a .p## file so .bco output is generated.
@@ -19,25 +21,10 @@ def patch_write_detailed(plan_path: str) -> bool:
     False if the file could not be read/written.
     """
     try:
-        with open(plan_path, encoding="utf-8") as f:
-            lines = f.readlines()
-    except OSError:
-        return False
-
-    found = False
-    for i, line in enumerate(lines):
-        if line.startswith("Write Detailed="):
-            lines[i] = "Write Detailed= 1 \n"
-            found = True
-            break
-
-    if not found:
-        # Append if not present
-        lines.append("Write Detailed= 1 \n")
-
-    try:
-        with open(plan_path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
+        doc = RasDocument.load(plan_path)
+        # Appended if not present
+        if doc.set("Write Detailed", " 1 "):
+            doc.save(plan_path)
     except OSError:
         return False
     return True
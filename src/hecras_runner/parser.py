@@ -5,10 +5,26 @@ from __future__ import annotations
 import logging
 import os
 import re
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from hecras_runner.geom_hdf import GeomHdfInfo, read_geom_hdf
+
+if TYPE_CHECKING:
+    from hecras_runner.project_cache import ProjectCache
 
 logger = logging.getLogger(__name__)
 
+# Bump when parsing changes what ends up in the entries below; persisted
+# caches (see hecras_runner.project_cache) are discarded on mismatch.
+PARSER_VERSION = 2
+
+# Thread pool size used by the CLI and GUI when loading projects
+DEFAULT_PARSE_WORKERS = 8
+
 
 @dataclass
 class PlanEntry:
@@ -28,6 +44,17 @@ class GeomEntry:
 
     key: str  # e.g. "g01"
     title: str  # e.g. "geoBR"
+    # From the .g##.hdf when read with read_hdf=True; None if not available
+    flow_areas_2d: dict[str, int] | None = None  # 2D area name -> cells
+    cross_sections: int | None = None
+    structures: int | None = None
+
+    @property
+    def cells_2d(self) -> int | None:
+        """Total 2D cells over all flow areas, or None if unknown."""
+        if self.flow_areas_2d is None:
+            return None
+        return sum(self.flow_areas_2d.values())
 
 
 @dataclass
@@ -39,6 +66,18 @@ class FlowEntry:
     dss_files: list[str] = field(default_factory=list)
 
 
+@dataclass
+class _ProjectHeader:
+    """What the .prj itself declares, before referenced files are parsed."""
+
+    title: str = ""
+    current_plan: str | None = None
+    plan_keys: list[str] = field(default_factory=list)
+    geom_keys: list[str] = field(default_factory=list)
+    flow_keys: list[str] = field(default_factory=list)
+    dss_files: list[str] = field(default_factory=list)
+
+
 @dataclass
 class RasProject:
     """Parsed HEC-RAS project."""
@@ -52,94 +91,106 @@ class RasProject:
     dss_files: list[str] = field(default_factory=list)
 
 
-def _read_file(path: str) -> str:
-    """Read a text file with encoding fallback: utf-8 -> latin-1 -> cp1252."""
-    for encoding in ("utf-8", "latin-1", "cp1252"):
-        try:
-            with open(path, encoding=encoding) as f:
-                return f.read()
-        except (UnicodeDecodeError, UnicodeError):
-            continue
-    raise UnicodeDecodeError("utf-8/latin-1/cp1252", b"", 0, 1, f"Cannot decode {path}")
-
+def _iter_keyed_lines(path: str, prefixes: tuple[str, ...]) -> Iterator[tuple[str, str]]:
+    """Stream *path* and yield ``(prefix, value)`` for lines starting with a prefix.
 
-def _get_value(line: str, prefix: str) -> str | None:
-    """Extract value after 'Prefix=' from a line, or None if no match."""
-    if line.startswith(prefix):
-        return line[len(prefix) :].strip()
-    return None
+    The file is read as raw bytes, line by line, and only matching lines are
+    decoded: as UTF-8 until a line fails to decode, then as latin-1 for the
+    rest of the file, so nothing is read twice. Callers that stop iterating
+    early stop reading the file there, which is what keeps header lookups in
+    multi-megabyte geometry files cheap. Values are stripped.
+    """
+    encoded = [(prefix, prefix.encode("ascii")) for prefix in prefixes]
+    all_prefixes = tuple(raw for _, raw in encoded)
+    encoding = "utf-8"
+
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.startswith(all_prefixes):
+                continue
+            for prefix, raw in encoded:
+                if line.startswith(raw):
+                    rest = line[len(raw) :]
+                    try:
+                        value = rest.decode(encoding)
+                    except UnicodeDecodeError:
+                        encoding = "latin-1"
+                        value = rest.decode(encoding)
+                    yield prefix, value.strip()
+                    break
 
 
 def parse_plan_file(path: str, key: str) -> PlanEntry | None:
-    """Parse a .p## file and return a PlanEntry."""
+    """Parse a .p## file and return a PlanEntry.
+
+    Stops reading once title, geometry, flow and simulation dates are found.
+    """
+    values: dict[str, str] = {}
+    wanted = ("Plan Title=", "Geom File=", "Flow File=", "Simulation Date=")
     try:
-        text = _read_file(path)
-    except (OSError, UnicodeDecodeError) as e:
+        for prefix, value in _iter_keyed_lines(path, wanted):
+            if value and prefix not in values:
+                values[prefix] = value
+                if len(values) == len(wanted):
+                    break
+    except OSError as e:
         logger.warning("Cannot read plan file %s: %s", path, e)
         return None
 
-    title = ""
-    geom_ref = ""
-    flow_ref = ""
     sim_start = ""
     sim_end = ""
-
-    for line in text.splitlines():
-        if v := _get_value(line, "Plan Title="):
-            title = v
-        elif v := _get_value(line, "Geom File="):
-            geom_ref = v
-        elif v := _get_value(line, "Flow File="):
-            flow_ref = v
-        elif v := _get_value(line, "Simulation Date="):
-            parts = v.split(",")
-            if len(parts) >= 4:
-                sim_start = f"{parts[0]},{parts[1]}"
-                sim_end = f"{parts[2]},{parts[3]}"
+    parts = values.get("Simulation Date=", "").split(",")
+    if len(parts) >= 4:
+        sim_start = f"{parts[0]},{parts[1]}"
+        sim_end = f"{parts[2]},{parts[3]}"
 
     return PlanEntry(
         key=key,
-        title=title,
-        geom_ref=geom_ref,
-        flow_ref=flow_ref,
+        title=values.get("Plan Title=", ""),
+        geom_ref=values.get("Geom File=", ""),
+        flow_ref=values.get("Flow File=", ""),
         sim_start=sim_start,
         sim_end=sim_end,
     )
 
 
 def parse_geom_file(path: str, key: str) -> GeomEntry | None:
-    """Parse a .g## file and return a GeomEntry."""
+    """Parse a .g## file and return a GeomEntry.
+
+    Only the header is read: the scan stops at ``Geom Title=``, before the
+    cross-section and 2D area data that make up the bulk of the file.
+    """
+    title = ""
     try:
-        text = _read_file(path)
-    except (OSError, UnicodeDecodeError) as e:
+        for _prefix, value in _iter_keyed_lines(path, ("Geom Title=",)):
+            if value:
+                title = value
+                break
+    except OSError as e:
         logger.warning("Cannot read geometry file %s: %s", path, e)
         return None
 
-    title = ""
-    for line in text.splitlines():
-        if v := _get_value(line, "Geom Title="):
-            title = v
-            break
-
     return GeomEntry(key=key, title=title)
 
 
 def parse_flow_file(path: str, key: str) -> FlowEntry | None:
     """Parse a .u## file and return a FlowEntry."""
-    try:
-        text = _read_file(path)
-    except (OSError, UnicodeDecodeError) as e:
-        logger.warning("Cannot read flow file %s: %s", path, e)
-        return None
-
     title = ""
     dss_files: list[str] = []
 
-    for line in text.splitlines():
-        if v := _get_value(line, "Flow Title="):
-            title = v
-        elif (v := _get_value(line, "DSS File=")) and v not in dss_files:
-            dss_files.append(v)
+    # DSS File= lines sit with each boundary condition, so the whole file is
+    # scanned; only matching lines are decoded.
+    try:
+        for prefix, value in _iter_keyed_lines(path, ("Flow Title=", "DSS File=")):
+            if not value:
+                continue
+            if prefix == "Flow Title=":
+                title = value
+            elif value not in dss_files:
+                dss_files.append(value)
+    except OSError as e:
+        logger.warning("Cannot read flow file %s: %s", path, e)
+        return None
 
     return FlowEntry(key=key, title=title, dss_files=dss_files)
 
@@ -147,83 +198,250 @@ def parse_flow_file(path: str, key: str) -> FlowEntry | None:
 _KEY_PATTERN = re.compile(r"^[a-z]\d{2}$")
 
 
-def parse_project(prj_path: str) -> RasProject:
+def parse_geom_hdf(path: str, key: str) -> GeomHdfInfo | None:
+    """Read size metadata from a .g##.hdf file (None without h5py or file)."""
+    return read_geom_hdf(path)
+
+
+def _parser_for(kind: str) -> Callable[[str, str], Any]:
+    if kind == "plan":
+        return parse_plan_file
+    if kind == "geom":
+        return parse_geom_file
+    if kind == "geom_hdf":
+        return parse_geom_hdf
+    return parse_flow_file
+
+
+def _parse_with_cache[Entry: (PlanEntry, GeomEntry, FlowEntry, GeomHdfInfo)](
+    cache: ProjectCache | None,
+    path: str,
+    kind: str,
+    key: str,
+    parse: Callable[[str, str], Entry | None],
+) -> Entry | None:
+    if cache is None:
+        return parse(path, key)
+    return cache.get_or_parse(path, kind, lambda: parse(path, key))
+
+
+def _parse_project_header(prj_path: str) -> _ProjectHeader:
+    """Read title, current plan, file keys and DSS files from a .prj."""
+    header = _ProjectHeader()
+    prefixes = (
+        "Proj Title=",
+        "Current Plan=",
+        "Plan File=",
+        "Geom File=",
+        "Unsteady File=",
+        "DSS File=",
+    )
+    for prefix, v in _iter_keyed_lines(prj_path, prefixes):
+        if not v:
+            continue
+        if prefix == "Proj Title=":
+            header.title = v
+        elif prefix == "Current Plan=":
+            header.current_plan = v
+        elif prefix == "Plan File=" and _KEY_PATTERN.match(v):
+            header.plan_keys.append(v)
+        elif prefix == "Geom File=" and _KEY_PATTERN.match(v):
+            header.geom_keys.append(v)
+        elif prefix == "Unsteady File=" and _KEY_PATTERN.match(v):
+            header.flow_keys.append(v)
+        elif prefix == "DSS File=" and v not in header.dss_files:
+            header.dss_files.append(v)
+    return header
+
+
+def parse_project(
+    prj_path: str,
+    cache: ProjectCache | None = None,
+    max_workers: int | None = None,
+    read_hdf: bool = False,
+) -> RasProject:
     """Parse a .prj file and all referenced plan/geom/flow files.
 
-    Missing referenced files are logged and skipped.
+    Missing referenced files are logged and skipped. With *cache*, files whose
+    size and mtime match the cached entry are not re-read; the cache is saved
+    before returning.
+
+    With *max_workers* > 1, referenced files are opened and parsed on a thread
+    pool of that size. On network shares latency, not bytes, dominates, so
+    overlapping the round trips cuts cold loads substantially. Entries come
+    back in the same order as a sequential parse.
+
+    With *read_hdf*, geometries also get 2D cell, cross-section and structure
+    counts from their ``.g##.hdf`` (see :mod:`hecras_runner.geom_hdf`).
     """
-    prj_path = os.path.abspath(prj_path)
-    prj_dir = os.path.dirname(prj_path)
-    basename = os.path.splitext(os.path.basename(prj_path))[0]
+    lazy = LazyRasProject(prj_path, cache=cache, read_hdf=read_hdf)
+    return lazy.to_project(max_workers=max_workers)
 
-    text = _read_file(prj_path)
 
-    title = ""
-    current_plan: str | None = None
-    plan_keys: list[str] = []
-    geom_keys: list[str] = []
-    flow_keys: list[str] = []
-    dss_files: list[str] = []
+EntryCallback = Callable[[str, str, Any], None]
 
-    for line in text.splitlines():
-        if v := _get_value(line, "Proj Title="):
-            title = v
-        elif v := _get_value(line, "Current Plan="):
-            current_plan = v
-        elif (v := _get_value(line, "Plan File=")) and _KEY_PATTERN.match(v):
-            plan_keys.append(v)
-        elif (v := _get_value(line, "Geom File=")) and _KEY_PATTERN.match(v):
-            geom_keys.append(v)
-        elif (v := _get_value(line, "Unsteady File=")) and _KEY_PATTERN.match(v):
-            flow_keys.append(v)
-        elif (v := _get_value(line, "DSS File=")) and v not in dss_files:
-            dss_files.append(v)
-
-    # Parse referenced files
-    plans: list[PlanEntry] = []
-    for key in plan_keys:
-        path = os.path.join(prj_dir, f"{basename}.{key}")
-        entry = parse_plan_file(path, key)
-        if entry:
-            plans.append(entry)
-
-    geometries: list[GeomEntry] = []
-    seen_geom_keys = set()
-    # Collect geom keys from both .prj and plan references
-    all_geom_keys = list(geom_keys)
-    for plan in plans:
-        if plan.geom_ref and plan.geom_ref not in all_geom_keys:
-            all_geom_keys.append(plan.geom_ref)
-    for key in all_geom_keys:
-        if key in seen_geom_keys:
-            continue
-        seen_geom_keys.add(key)
-        path = os.path.join(prj_dir, f"{basename}.{key}")
-        entry = parse_geom_file(path, key)
-        if entry:
-            geometries.append(entry)
-
-    flows: list[FlowEntry] = []
-    seen_flow_keys = set()
-    all_flow_keys = list(flow_keys)
-    for plan in plans:
-        if plan.flow_ref and plan.flow_ref not in all_flow_keys:
-            all_flow_keys.append(plan.flow_ref)
-    for key in all_flow_keys:
-        if key in seen_flow_keys:
-            continue
-        seen_flow_keys.add(key)
-        path = os.path.join(prj_dir, f"{basename}.{key}")
-        entry = parse_flow_file(path, key)
-        if entry:
-            flows.append(entry)
-
-    return RasProject(
-        path=prj_path,
-        title=title,
-        plans=plans,
-        geometries=geometries,
-        flows=flows,
-        current_plan=current_plan,
-        dss_files=dss_files,
-    )
+
+class LazyRasProject:
+    """A project whose plan, geometry and flow files are parsed on demand.
+
+    Construction reads only the .prj (title, current plan, file keys), so a
+    caller can show the plan list immediately. :meth:`plan`,
+    :meth:`geometry` and :meth:`flow` parse a file on first access;
+    :meth:`prefetch` loads everything, reporting each entry as it arrives;
+    :meth:`snapshot` returns what is loaded so far without touching disk.
+    Safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        prj_path: str,
+        cache: ProjectCache | None = None,
+        read_hdf: bool = False,
+    ) -> None:
+        self.path = os.path.abspath(prj_path)
+        self._dir = os.path.dirname(self.path)
+        self._basename = os.path.splitext(os.path.basename(self.path))[0]
+        self._cache = cache
+        self.read_hdf = read_hdf
+
+        if cache is None:
+            header = _parse_project_header(self.path)
+        else:
+            header = cache.get_or_parse(self.path, "prj", lambda: _parse_project_header(self.path))
+        self.title = header.title
+        self.current_plan = header.current_plan
+        self.dss_files = header.dss_files
+        self.plan_keys = header.plan_keys
+        self._geom_keys = list(dict.fromkeys(header.geom_keys))
+        self._flow_keys = list(dict.fromkeys(header.flow_keys))
+
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], Any] = {}  # None = missing/unreadable
+
+    # ── On-demand access ──
+
+    def plan(self, key: str) -> PlanEntry | None:
+        return self._get("plan", key)
+
+    def geometry(self, key: str) -> GeomEntry | None:
+        return self._get("geom", key)
+
+    def flow(self, key: str) -> FlowEntry | None:
+        return self._get("flow", key)
+
+    def _get(self, kind: str, key: str) -> Any:
+        with self._lock:
+            if (kind, key) in self._entries:
+                return self._entries[(kind, key)]
+        entry = self._parse(kind, key)
+        with self._lock:
+            return self._entries.setdefault((kind, key), entry)
+
+    def _parse(self, kind: str, key: str) -> Any:
+        path = os.path.join(self._dir, f"{self._basename}.{key}")
+        entry = _parse_with_cache(self._cache, path, kind, key, _parser_for(kind))
+        if kind == "geom" and entry is not None and self.read_hdf:
+            # Cached under the .hdf's own size/mtime, so re-preprocessing
+            # the geometry refreshes the counts
+            info = _parse_with_cache(
+                self._cache, f"{path}.hdf", "geom_hdf", key, _parser_for("geom_hdf")
+            )
+            if info is not None:
+                entry.flow_areas_2d = dict(info.flow_areas)
+                entry.cross_sections = info.cross_sections
+                entry.structures = info.structures
+        return entry
+
+    # ── Bulk loading ──
+
+    def prefetch(
+        self,
+        max_workers: int | None = DEFAULT_PARSE_WORKERS,
+        on_entry: EntryCallback | None = None,
+    ) -> None:
+        """Load every referenced file, concurrently when *max_workers* > 1.
+
+        Plans (and the files the .prj declares) come first, then geometry and
+        flow files only plans reference. *on_entry* is called on the calling
+        thread as ``on_entry(kind, key, entry)`` for each file loaded, with
+        ``entry`` None for missing files. Saves the cache when done.
+        """
+        self._load(
+            [("plan", key) for key in self.plan_keys]
+            + [("geom", key) for key in self._geom_keys]
+            + [("flow", key) for key in self._flow_keys],
+            max_workers,
+            on_entry,
+        )
+        geom_keys, flow_keys = self._all_geom_flow_keys()
+        self._load(
+            [("geom", key) for key in geom_keys] + [("flow", key) for key in flow_keys],
+            max_workers,
+            on_entry,
+        )
+        if self._cache is not None:
+            kinds = ["prj", "plan", "geom", "flow"]
+            self._cache.save([*kinds, "geom_hdf"] if self.read_hdf else kinds)
+
+    def _load(
+        self,
+        requests: list[tuple[str, str]],
+        max_workers: int | None,
+        on_entry: EntryCallback | None,
+    ) -> None:
+        with self._lock:
+            todo = list(dict.fromkeys(r for r in requests if r not in self._entries))
+        if not todo:
+            return
+
+        if not max_workers or max_workers <= 1:
+            for kind, key in todo:
+                entry = self._get(kind, key)
+                if on_entry:
+                    on_entry(kind, key, entry)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parse") as pool:
+            futures = {pool.submit(self._get, kind, key): (kind, key) for kind, key in todo}
+            for future in as_completed(futures):
+                kind, key = futures[future]
+                entry = future.result()
+                if on_entry:
+                    on_entry(kind, key, entry)
+
+    def _all_geom_flow_keys(self) -> tuple[list[str], list[str]]:
+        """Geometry/flow keys from the .prj plus those referenced by loaded plans."""
+        geom_keys = list(self._geom_keys)
+        flow_keys = list(self._flow_keys)
+        with self._lock:
+            plans = [self._entries.get(("plan", key)) for key in self.plan_keys]
+        for plan in plans:
+            if plan is None:
+                continue
+            if plan.geom_ref and plan.geom_ref not in geom_keys:
+                geom_keys.append(plan.geom_ref)
+            if plan.flow_ref and plan.flow_ref not in flow_keys:
+                flow_keys.append(plan.flow_ref)
+        return geom_keys, flow_keys
+
+    # ── Conversion ──
+
+    def snapshot(self) -> RasProject:
+        """A ``RasProject`` of the entries loaded so far (no file access)."""
+        geom_keys, flow_keys = self._all_geom_flow_keys()
+        with self._lock:
+            entries = dict(self._entries)
+        return RasProject(
+            path=self.path,
+            title=self.title,
+            plans=[e for key in self.plan_keys if (e := entries.get(("plan", key)))],
+            geometries=[e for key in geom_keys if (e := entries.get(("geom", key)))],
+            flows=[e for key in flow_keys if (e := entries.get(("flow", key)))],
+            current_plan=self.current_plan,
+            dss_files=list(self.dss_files),
+        )
+
+    def to_project(self, max_workers: int | None = None) -> RasProject:
+        """Load anything not loaded yet and return the full ``RasProject``."""
+        self.prefetch(max_workers=max_workers)
+        return self.snapshot()
@@ -0,0 +1,184 @@
+"""Pre-flight validation of plans before they are staged and launched.
+
+Many problems only surface once a project has been copied and Ras.exe has
+started: a missing ``.g##``, a DSS file that moved, an empty or inverted
+simulation window, a terrain that is no longer where the ``.rasmap`` says.
+:func:`validate_plans` checks every selected plan's dependencies up front and
+reports all problems in one pass. It only stats files and reads headers, and
+plans are checked on a thread pool so the round trips overlap on network
+shares, which keeps it cheap enough to run before every batch.
+"""
+
+from __future__ import annotations
+
+import ntpath
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from hecras_runner.monitor import parse_hecras_datetime
+from hecras_runner.parser import DEFAULT_PARSE_WORKERS, parse_flow_file, parse_plan_file
+from hecras_runner.rasmap import RasMapLayer, parse_rasmap, rasmap_path_for
+from hecras_runner.runner import SimulationJob
+
+
+@dataclass
+class PreflightIssue:
+    """One problem found for a plan (or the project, with an empty plan key)."""
+
+    plan_key: str  # e.g. "p03"
+    plan_name: str
+    message: str
+    severity: str = "error"  # "error" blocks the plan, "warning" does not
+
+    def __str__(self) -> str:
+        where = f"{self.plan_name} ({self.plan_key})" if self.plan_key else "Project"
+        return f"{self.severity.upper()}: {where}: {self.message}"
+
+
+@dataclass
+class PreflightReport:
+    """All issues found by :func:`validate_plans`."""
+
+    issues: list[PreflightIssue] = field(default_factory=list)
+    plans_checked: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def errors(self) -> list[PreflightIssue]:
+        return [i for i in self.issues if i.severity == "error"]
+
+    @property
+    def warnings(self) -> list[PreflightIssue]:
+        return [i for i in self.issues if i.severity != "error"]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def failed_suffixes(self) -> set[str]:
+        """Plan suffixes (``"03"``) with at least one error."""
+        return {i.plan_key[1:] for i in self.errors if i.plan_key}
+
+    def summary(self) -> str:
+        return (
+            f"Pre-flight: {self.plans_checked} plan(s) checked in "
+            f"{self.elapsed_seconds:.2f}s, {len(self.errors)} error(s), "
+            f"{len(self.warnings)} warning(s)"
+        )
+
+
+def _resolve(project_dir: str, path: str) -> str:
+    """Resolve a path from a project file relative to the project folder."""
+    if os.path.isabs(path) or ntpath.isabs(path):
+        return path
+    return os.path.normpath(os.path.join(project_dir, path.replace("\\", os.sep)))
+
+
+def _needs_preprocessing(geom_path: str) -> bool:
+    """Whether the geometry has no preprocessed ``.g##.hdf`` newer than itself."""
+    try:
+        return os.path.getmtime(f"{geom_path}.hdf") < os.path.getmtime(geom_path)
+    except OSError:
+        return True
+
+
+def _check_plan(
+    project_path: str,
+    job: SimulationJob,
+    terrains: list[RasMapLayer],
+) -> list[PreflightIssue]:
+    project_dir = os.path.dirname(project_path)
+    base = os.path.splitext(project_path)[0]
+    key = f"p{job.plan_suffix}"
+    issues: list[PreflightIssue] = []
+
+    def error(message: str, severity: str = "error") -> None:
+        issues.append(PreflightIssue(key, job.plan_name, message, severity))
+
+    plan_path = f"{base}.{key}"
+    if not os.path.isfile(plan_path):
+        error(f"Plan file not found: {os.path.basename(plan_path)}")
+        return issues
+    plan = parse_plan_file(plan_path, key)
+    if plan is None:
+        error(f"Cannot read plan file: {os.path.basename(plan_path)}")
+        return issues
+
+    geom_path = f"{base}.{plan.geom_ref}"
+    if not plan.geom_ref:
+        error("Plan has no geometry (Geom File=)")
+    elif not os.path.isfile(geom_path):
+        error(f"Geometry file not found: {os.path.basename(geom_path)}")
+
+    flow_path = f"{base}.{plan.flow_ref}"
+    flow = None
+    if not plan.flow_ref:
+        error("Plan has no flow file (Flow File=)")
+    elif not os.path.isfile(flow_path):
+        error(f"Flow file not found: {os.path.basename(flow_path)}")
+    else:
+        flow = parse_flow_file(flow_path, plan.flow_ref)
+
+    if plan.flow_ref.startswith("u"):
+        start = parse_hecras_datetime(plan.sim_start)
+        end = parse_hecras_datetime(plan.sim_end)
+        if start is None or end is None:
+            error("Simulation window missing or unreadable (Simulation Date=)")
+        elif end <= start:
+            error(f"Simulation window ends before it starts ({plan.sim_start} to {plan.sim_end})")
+
+    # DSS: an explicit override replaces every DSS File= line when staged
+    dss_files = [job.dss_path] if job.dss_path else (flow.dss_files if flow else [])
+    for dss in dss_files:
+        if dss.lower() == "dss":  # HEC-RAS shorthand for the project's default DSS
+            continue
+        if not os.path.isfile(_resolve(project_dir, dss)):
+            error(f"DSS file not found: {dss}")
+
+    # A missing terrain only stops the run when the geometry must be
+    # preprocessed again; otherwise RAS Mapper output is all that suffers.
+    missing = [t for t in terrains if not t.exists]
+    if missing and plan.geom_ref and os.path.isfile(geom_path):
+        severity = "error" if _needs_preprocessing(geom_path) else "warning"
+        for terrain in missing:
+            error(f"Terrain file not found: {terrain.filename}", severity)
+
+    return issues
+
+
+def validate_plans(
+    project_path: str,
+    jobs: list[SimulationJob],
+    max_workers: int | None = DEFAULT_PARSE_WORKERS,
+) -> PreflightReport:
+    """Check that every job's plan, geometry, flow, DSS and terrain files are usable.
+
+    Returns a report listing every problem found; nothing is raised for
+    missing files. Issues are ordered like *jobs*.
+    """
+    t0 = time.monotonic()
+    project_path = os.path.abspath(project_path)
+    report = PreflightReport(plans_checked=len(jobs))
+
+    if not os.path.isfile(project_path):
+        report.issues.append(PreflightIssue("", "", f"Project file not found: {project_path}"))
+        report.elapsed_seconds = time.monotonic() - t0
+        return report
+
+    rasmap = rasmap_path_for(project_path)
+    deps = parse_rasmap(rasmap) if rasmap else None
+    terrains = deps.terrains if deps else []
+
+    if max_workers and max_workers > 1 and len(jobs) > 1:
+        workers = min(max_workers, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preflight") as pool:
+            per_job = list(pool.map(lambda j: _check_plan(project_path, j, terrains), jobs))
+    else:
+        per_job = [_check_plan(project_path, j, terrains) for j in jobs]
+
+    for issues in per_job:
+        report.issues.extend(issues)
+    report.elapsed_seconds = time.monotonic() - t0
+    return report
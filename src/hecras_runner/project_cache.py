@@ -0,0 +1,193 @@
+"""On-disk cache of parsed project files.
+
+Parsing a project opens the ``.prj`` and every referenced ``.p##``, ``.g##``
+and ``.u##`` file, which on an SMB share with 99 plans is hundreds of round
+trips. ``ProjectCache`` keeps the parsed entry of each file together with the
+file's size and mtime, so a reload only stats the files and re-parses the
+ones that changed.
+
+One JSON file per project lives under ``%APPDATA%/hecras_runner/cache/``.
+The whole file is discarded when ``CACHE_SCHEMA_VERSION`` or
+:data:`hecras_runner.parser.PARSER_VERSION` changes.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import asdict
+from typing import Any, TypeVar
+
+from hecras_runner.geom_hdf import GeomHdfInfo
+from hecras_runner.parser import (
+    PARSER_VERSION,
+    FlowEntry,
+    GeomEntry,
+    PlanEntry,
+    _ProjectHeader,
+)
+from hecras_runner.settings import _settings_dir
+
+logger = logging.getLogger(__name__)
+
+CACHE_SCHEMA_VERSION = 1
+
+_ENTRY_TYPES: dict[str, type] = {
+    "prj": _ProjectHeader,
+    "plan": PlanEntry,
+    "geom": GeomEntry,
+    "flow": FlowEntry,
+    "geom_hdf": GeomHdfInfo,
+}
+
+T = TypeVar("T")
+
+
+def _cache_dir() -> str:
+    return os.path.join(_settings_dir(), "cache")
+
+
+def _stamp(path: str) -> tuple[int, int] | None:
+    """(size, mtime_ns) of *path*, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class ProjectCache:
+    """Parsed entries of one project's files, persisted between runs.
+
+    Entries are keyed by filename (all project files share the .prj's
+    directory) and are valid while the file's size and mtime are unchanged.
+    Call :meth:`save` after parsing; of the kinds that were read, only files
+    looked up since loading are written back, so entries for deleted files
+    drop out. Lookups are safe
+    from several threads (see ``parse_project(max_workers=...)``).
+    """
+
+    def __init__(self, prj_path: str, cache_dir: str | None = None) -> None:
+        prj_path = os.path.abspath(prj_path)
+        digest = hashlib.sha1(os.path.normcase(prj_path).encode("utf-8")).hexdigest()
+        self.prj_path = prj_path
+        self.path = os.path.join(cache_dir or _cache_dir(), f"{digest}.json")
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = self._load()
+        self._used: set[str] = set()
+        self._dirty = False
+        self._changes = 0  # bumped on every update; tells save() what it missed
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_parse(
+        self,
+        path: str,
+        kind: str,
+        parse: Callable[[], T | None],
+    ) -> T | None:
+        """Return the cached entry for *path*, or call *parse* and cache its result.
+
+        *kind* is one of ``"prj"``, ``"plan"``, ``"geom"``, ``"flow"``,
+        ``"geom_hdf"``. Files that cannot be stat'ed are parsed uncached (the
+        parser reports them).
+        """
+        stamp = _stamp(path)
+        if stamp is None:
+            return parse()
+
+        name = os.path.basename(path)
+        with self._lock:
+            self._used.add(name)
+            cached = self._entries.get(name)
+        if (
+            isinstance(cached, dict)
+            and cached.get("kind") == kind
+            and tuple(cached.get("stamp", ())) == stamp
+        ):
+            try:
+                entry = _ENTRY_TYPES[kind](**cached["entry"])
+            except (KeyError, TypeError):
+                pass
+            else:
+                with self._lock:
+                    self.hits += 1
+                return entry
+
+        # Parsed outside the lock so concurrent lookups overlap their I/O
+        entry = parse()
+        with self._lock:
+            self.misses += 1
+            if entry is None:
+                self._entries.pop(name, None)
+            else:
+                self._entries[name] = {
+                    "kind": kind,
+                    "stamp": list(stamp),
+                    "entry": asdict(entry),
+                }
+            self._dirty = True
+            self._changes += 1
+        return entry
+
+    def save(self, kinds: Iterable[str] | None = None) -> None:
+        """Write the cache if anything changed. Errors are logged, not raised.
+
+        Unused entries of the given *kinds* (default: all) are dropped. A
+        caller that did not read some kind of file, e.g. ``geom_hdf`` without
+        ``read_hdf``, passes the kinds it did read so those entries are kept.
+        """
+        with self._lock:
+            stale = {
+                name
+                for name, cached in self._entries.items()
+                if name not in self._used
+                and (kinds is None or not isinstance(cached, dict) or cached.get("kind") in kinds)
+            }
+            if not self._dirty and not stale:
+                return
+            for name in stale:
+                del self._entries[name]
+
+            data = {
+                "schema": CACHE_SCHEMA_VERSION,
+                "parser": PARSER_VERSION,
+                "prj_path": self.prj_path,
+                "files": dict(self._entries),
+            }
+            changes = self._changes
+        # Saves can overlap (GUI prefetch thread, a CLI run on the same
+        # project), so every writer gets its own temp file
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Cannot save project cache %s: %s", self.path, e)
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            # Entries added after the snapshot still need writing
+            if self._changes == changes:
+                self._dirty = False
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        if data.get("schema") != CACHE_SCHEMA_VERSION or data.get("parser") != PARSER_VERSION:
+            return {}
+        files = data.get("files")
+        return files if isinstance(files, dict) else {}
@@ -0,0 +1,338 @@
+"""Parse RAS Mapper ``.rasmap`` files into the files a project depends on.
+
+A project's terrain, land cover and other map layers live in subfolders and
+are referenced from ``<project>.rasmap``; everything else in those folders
+(old terrain versions, source rasters, scratch exports) is not used. Knowing
+the exact files lets staging, transfer and terrain hashing move only the
+bytes a run needs instead of whole directories.
+
+A referenced layer file expands to:
+
+- the file itself,
+- files next to it sharing its stem (``existing.hdf`` -> ``existing.vrt``,
+  ``existing.source.tif``), which is how RAS Mapper names terrain tiles and
+  raster companions,
+- sources listed by any ``.vrt`` among those, recursively,
+- for shapefiles, their sidecars (``.shx``, ``.dbf``, ``.prj``...).
+
+Geometry, plan, flow and result layers point at the project's own top-level
+files and are ignored here.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import ntpath
+import os
+import shutil
+import xml.etree.ElementTree as ET
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+# Layer types that display project files rather than reference map data
+_PROJECT_LAYER_TYPES = {
+    "RASGeometry",
+    "RASPlan",
+    "RASResults",
+    "RASEventConditions",
+    "InterpretationRasterizerLayer",
+    "ResultWindLayer",
+    "RASEncroachments",
+    "RASEncroachmentZones",
+    "RASEncroachmentPolygons",
+}
+
+
+@dataclass
+class RasMapLayer:
+    """One layer with a file reference in a .rasmap."""
+
+    name: str
+    type: str
+    filename: str  # as written in the .rasmap (e.g. ".\\Terrain\\t.hdf")
+    path: str  # resolved absolute path
+
+    @property
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+
+    @property
+    def is_feature(self) -> bool:
+        """Vector display layers (shapefiles) that no computation reads."""
+        return self.type.endswith("FeatureLayer")
+
+
+@dataclass
+class RasMapDependencies:
+    """Files a project's .rasmap references."""
+
+    rasmap_path: str
+    projection: str | None = None
+    terrains: list[RasMapLayer] = field(default_factory=list)
+    map_layers: list[RasMapLayer] = field(default_factory=list)  # land cover, soils...
+
+    @property
+    def project_dir(self) -> str:
+        return os.path.dirname(self.rasmap_path)
+
+    def terrain_files(self) -> list[str]:
+        """Absolute paths of the terrain HDFs and their tiles that exist."""
+        return _expand_all(layer.path for layer in self.terrains)
+
+    def files(self, include_features: bool = False) -> list[str]:
+        """Absolute paths of every existing referenced file, expanded.
+
+        Feature (shapefile) layers are left out unless *include_features*:
+        they only matter for display in RAS Mapper.
+        """
+        paths = [layer.path for layer in self.terrains]
+        paths += [
+            layer.path for layer in self.map_layers if include_features or not layer.is_feature
+        ]
+        if self.projection:
+            paths.append(self.projection)
+        return _expand_all(paths)
+
+    def layer_dirs(self) -> set[str]:
+        """Subfolders of the project holding at least one referenced layer file."""
+        dirs = set()
+        for layer in [*self.terrains, *self.map_layers]:
+            folder = os.path.dirname(layer.path)
+            if is_inside(folder, self.project_dir):
+                dirs.add(os.path.normcase(folder))
+        return dirs
+
+
+def is_inside(path: str, root: str) -> bool:
+    """True if *path* is strictly inside *root*."""
+    path = os.path.normcase(os.path.abspath(path))
+    root = os.path.normcase(os.path.abspath(root)).rstrip("\\/")
+    return path.startswith(root + os.sep)
+
+
+def _resolve(base_dir: str, filename: str) -> str:
+    """Resolve a .rasmap/.vrt path (Windows separators, ``.\\`` relative)."""
+    if ntpath.isabs(filename) or os.path.isabs(filename):
+        return filename
+    return os.path.normpath(os.path.join(base_dir, filename.replace("\\", os.sep)))
+
+
+def rasmap_path_for(project_path: str) -> str | None:
+    """``<project>.rasmap`` next to *project_path*, if it exists."""
+    path = f"{os.path.splitext(os.path.abspath(project_path))[0]}.rasmap"
+    return path if os.path.isfile(path) else None
+
+
+def parse_rasmap(rasmap_path: str) -> RasMapDependencies | None:
+    """Read the terrain, map-layer and projection references of a .rasmap.
+
+    Returns None if the file cannot be read or is not valid XML.
+    """
+    rasmap_path = os.path.abspath(rasmap_path)
+    try:
+        root = ET.parse(rasmap_path).getroot()
+    except (OSError, ET.ParseError):
+        return None
+
+    base_dir = os.path.dirname(rasmap_path)
+    deps = RasMapDependencies(rasmap_path=rasmap_path)
+
+    projection = root.find("RASProjectionFilename")
+    if projection is not None and projection.get("Filename"):
+        deps.projection = _resolve(base_dir, projection.get("Filename", ""))
+
+    seen: set[str] = set()
+    for section in root:
+        if section.tag in ("Geometries", "Results", "EventConditions", "Plans"):
+            continue
+        for layer in section.iter("Layer"):
+            filename = layer.get("Filename")
+            layer_type = layer.get("Type", "")
+            if not filename or layer_type in _PROJECT_LAYER_TYPES:
+                continue
+            path = _resolve(base_dir, filename)
+            if os.path.normcase(path) in seen:
+                continue
+            seen.add(os.path.normcase(path))
+            entry = RasMapLayer(layer.get("Name", ""), layer_type, filename, path)
+            if layer_type == "TerrainLayer":
+                deps.terrains.append(entry)
+            else:
+                deps.map_layers.append(entry)
+    return deps
+
+
+# ── Expanding a layer file to what is on disk ──
+
+_SHAPEFILE_SIDECARS = (".shx", ".dbf", ".prj", ".cpg", ".sbn", ".sbx", ".qix", ".shp.xml")
+
+
+def _vrt_sources(vrt_path: str) -> list[str]:
+    try:
+        root = ET.parse(vrt_path).getroot()
+    except (OSError, ET.ParseError):
+        return []
+    base_dir = os.path.dirname(vrt_path)
+    sources = []
+    for element in root.iter("SourceFilename"):
+        text = (element.text or "").strip()
+        if not text:
+            continue
+        if element.get("relativeToVRT") == "1":
+            sources.append(_resolve(base_dir, text))
+        else:
+            sources.append(text)
+    return sources
+
+
+def expand_layer_file(path: str) -> list[str]:
+    """The files on disk that make up the layer stored at *path* (existing only)."""
+    folder = os.path.dirname(path)
+    name = os.path.basename(path)
+    stem, ext = os.path.splitext(name)
+    found: dict[str, None] = {}
+
+    try:
+        siblings = os.listdir(folder)
+    except OSError:
+        siblings = []
+    lower_stem = stem.lower()
+    for sibling in siblings:
+        lower = sibling.lower()
+        if ext.lower() == ".shp":
+            matches = lower == name.lower() or any(
+                lower == lower_stem + side for side in _SHAPEFILE_SIDECARS
+            )
+        else:
+            matches = lower == name.lower() or lower.startswith(lower_stem + ".")
+        if matches:
+            full = os.path.join(folder, sibling)
+            if os.path.isfile(full):
+                found[full] = None
+
+    pending = [p for p in found if p.lower().endswith(".vrt")]
+    visited: set[str] = set()
+    while pending:
+        vrt = pending.pop()
+        if vrt in visited:
+            continue
+        visited.add(vrt)
+        for source in _vrt_sources(vrt):
+            if os.path.isfile(source) and source not in found:
+                found[source] = None
+                if source.lower().endswith(".vrt"):
+                    pending.append(source)
+    return list(found)
+
+
+def _expand_all(paths) -> list[str]:
+    result: dict[str, None] = {}
+    for path in paths:
+        for item in expand_layer_file(path):
+            result[item] = None
+    return list(result)
+
+
+# ── Selecting project files to stage ──
+
+
+def project_file_filter(project_path: str) -> Callable[[str], bool] | None:
+    """Predicate deciding which files inside project subfolders to stage.
+
+    The predicate takes a path relative to the project folder. Files in a
+    folder holding rasmap layers (e.g. ``Terrain``) are kept only if a
+    terrain, map layer or the projection needs them; folders the .rasmap
+    does not mention are kept whole since other references (DSS files,
+    restart files) may point into them. Returns None when the project has
+    no readable .rasmap, meaning everything is staged.
+    """
+    rasmap = rasmap_path_for(project_path)
+    deps = parse_rasmap(rasmap) if rasmap else None
+    if deps is None:
+        return None
+
+    project_dir = deps.project_dir
+    needed = {os.path.normcase(os.path.relpath(p, project_dir)) for p in deps.files()}
+    feature_dirs = {
+        os.path.normcase(os.path.dirname(layer.path))
+        for layer in deps.map_layers
+        if layer.is_feature and is_inside(layer.path, project_dir)
+    }
+    layer_dirs = {
+        os.path.normcase(os.path.relpath(d, project_dir)) for d in deps.layer_dirs() | feature_dirs
+    }
+
+    def keep(rel_path: str) -> bool:
+        rel = os.path.normcase(os.path.normpath(rel_path))
+        if rel in needed:
+            return True
+        folder = os.path.dirname(rel)
+        while folder:
+            if folder in layer_dirs:
+                return False
+            folder = os.path.dirname(folder)
+        return True
+
+    return keep
+
+
+def _walk_files(src_dir: str, rel_root: str) -> list[str]:
+    """Paths relative to the project folder of all files under *src_dir*."""
+    found = []
+    for root, _dirs, files in os.walk(src_dir):
+        rel_dir = os.path.join(rel_root, os.path.relpath(root, src_dir))
+        found += [os.path.normpath(os.path.join(rel_dir, name)) for name in files]
+    return found
+
+
+def copy_tree_filtered(
+    src_dir: str,
+    dst_dir: str,
+    keep: Callable[[str], bool] | None,
+    rel_root: str,
+) -> list[str]:
+    """Copy the files under *src_dir* that *keep* accepts into *dst_dir*.
+
+    *rel_root* is *src_dir* relative to the project folder, so *keep* sees
+    project-relative paths. With *keep* None the whole tree is copied.
+    Returns the project-relative paths copied.
+    """
+    copied = []
+    for rel in _walk_files(src_dir, rel_root):
+        if keep is not None and not keep(rel):
+            continue
+        src = os.path.join(src_dir, os.path.relpath(rel, rel_root))
+        dst = os.path.join(dst_dir, os.path.relpath(rel, rel_root))
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copy2(src, dst)
+        copied.append(rel)
+    return copied
+
+
+def staged_files(project_path: str) -> list[str]:
+    """Project-relative paths of every file a staged copy of *project_path* gets."""
+    project_dir = os.path.dirname(os.path.abspath(project_path))
+    keep = project_file_filter(project_path)
+    files = []
+    try:
+        entries = list(os.scandir(project_dir))
+    except OSError:
+        return []
+    for entry in entries:
+        if entry.is_dir():
+            files += [
+                rel for rel in _walk_files(entry.path, entry.name) if keep is None or keep(rel)
+            ]
+        elif entry.is_file():
+            files.append(entry.name)
+    return files
+
+
+def staged_size(project_path: str) -> int:
+    """Bytes :func:`staged_files` adds up to (unreadable files count as 0)."""
+    project_dir = os.path.dirname(os.path.abspath(project_path))
+    total = 0
+    for rel in staged_files(project_path):
+        with contextlib.suppress(OSError):
+            total += os.path.getsize(os.path.join(project_dir, rel))
+    return total
@@ -12,6 +12,7 @@ from collections.abc import Callable
 from dataclasses import dataclass, field
 from multiprocessing import Process, Queue
 
+from hecras_runner.cleanup import get_cleanup_service
 from hecras_runner.discovery import (  # noqa: F401
     HECRAS_PROGID,
     check_hecras_installed,
@@ -20,7 +21,14 @@ from hecras_runner.discovery import (  # noqa: F401
     open_parent_instance,
     refresh_parent_instance,
 )
-from hecras_runner.file_ops import cleanup_temp_dir, copy_project_to_temp, copy_results_back
+from hecras_runner.document import RasDocument
+from hecras_runner.file_ops import copy_project_to_temp, copy_results_back
+from hecras_runner.rasmap import staged_size
+from hecras_runner.scratch import (
+    ScratchLease,
+    ScratchManager,
+    estimate_footprint,
+)
 
 
 @dataclass
@@ -65,22 +73,10 @@ def set_current_plan(prj_path: str, plan_key: str) -> None:
     argument on the command line.
     """
     try:
-        with open(prj_path, encoding="utf-8") as f:
-            lines = f.readlines()
-    except OSError:
-        return
-
-    for i, line in enumerate(lines):
-        if line.startswith("Current Plan="):
-            lines[i] = f"Current Plan={plan_key}\n"
-            break
-    else:
-        # No Current Plan line found — insert after Proj Title
-        lines.insert(1, f"Current Plan={plan_key}\n")
-
-    try:
-        with open(prj_path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
+        doc = RasDocument.load(prj_path)
+        # No Current Plan line — insert after Proj Title
+        if doc.set("Current Plan", plan_key, insert_at=1):
+            doc.save(prj_path)
     except OSError:
         pass
 
@@ -135,6 +131,7 @@ def run_hecras_cli(
     on_progress: Callable[[float, str], None] | None = None,
     result_queue: Queue | None = None,
     progress_queue: Queue | None = None,
+    prepared: bool = False,
     **_kwargs: object,
 ) -> SimulationResult:
     """Run a single HEC-RAS plan via ``Ras.exe -c``.
@@ -165,6 +162,10 @@ def run_hecras_cli(
     progress_queue : Queue, optional
         If provided, ``ProgressMessage`` objects are put onto this queue during
         .bco monitoring (for parallel mode GUI updates).
+    prepared : bool
+        True if the project was staged by ``copy_project_to_temp`` with this
+        plan's ``plan_key`` (and ``write_detailed`` when progress is wanted),
+        so ``Current Plan=`` and ``Write Detailed=`` are already set.
     """
     from hecras_runner.monitor import monitor_bco, patch_write_detailed, verify_hdf_completion
 
@@ -193,7 +194,8 @@ def run_hecras_cli(
 
     # Set current plan in .prj file — Ras.exe -c always runs the "Current Plan"
     # and ignores the plan argument in HEC-RAS 6.6.
-    set_current_plan(project_path, plan_file)
+    if not prepared:
+        set_current_plan(project_path, plan_file)
 
     # Build command — no plan arg needed since we set Current Plan in .prj
     cmd = f'"{ras_exe}" -c "{project_path}"'
@@ -215,7 +217,7 @@ def run_hecras_cli(
         except OSError:
             pass
 
-    if on_progress or progress_queue is not None:
+    if not prepared and (on_progress or progress_queue is not None):
         patch_write_detailed(plan_path)
 
     # Parse simulation dates for .bco monitoring
@@ -447,11 +449,21 @@ def run_simulations(
     on_progress: Callable[[float, str], None] | None = None,
     progress_queue: Queue | None = None,
     result_callback: Callable[[SimulationResult], None] | None = None,
+    scratch: ScratchManager | None = None,
+    scratch_wait_seconds: float = 600.0,
 ) -> list[SimulationResult]:
     """Run one or more HEC-RAS simulation jobs.
 
     Each job gets its own temp directory copy. Results are copied back
     after all simulations finish. Returns a list of SimulationResult.
+    With *cleanup*, temp directories are handed to the background
+    ``CleanupService`` rather than deleted before returning.
+
+    Copies are placed by *scratch* (system temp by default), on its RAM
+    disk when one is configured and the copy fits the memory budget. When
+    the scratch roots cannot hold every copy at once, plans run in waves and
+    the rest wait for space instead of failing mid-run. Either way results
+    are copied back to the project folder as each wave finishes.
 
     Parameters
     ----------
@@ -471,6 +483,11 @@ def run_simulations(
     result_callback : callable, optional
         Called with each ``SimulationResult`` as soon as a plan finishes,
         before waiting for remaining plans.
+    scratch : ScratchManager, optional
+        Chooses the temp root for each copy and tracks free space.
+    scratch_wait_seconds : float
+        How long to wait for space before the first plan of a wave is
+        failed with "Insufficient scratch space" (default 600).
     """
     project_path = os.path.abspath(project_path)
     main_dir = os.path.dirname(project_path)
@@ -482,107 +499,182 @@ def run_simulations(
     # Select the runner function based on backend
     run_fn = run_hecras_cli if backend == "cli" else run_hecras_plan
 
-    temp_entries: list[tuple[str, SimulationJob]] = []  # (temp_prj_path, job)
+    scratch = scratch or ScratchManager(log=log)
+    project_bytes = staged_size(project_path)
+
+    staged: list[tuple[str, SimulationJob]] = []  # every copy made, for cleanup
+    leases: list[ScratchLease] = []
     results: list[SimulationResult] = []
+    remaining = list(jobs)
+
+    # CLI runs need Current Plan (and Write Detailed when progress is monitored)
+    # set in the staged copy; do it during the copy rather than afterwards.
+    prepare = backend == "cli"
+    write_detailed = prepare and (parallel or on_progress is not None)
+
+    # Create progress queue for parallel CLI mode if not provided
+    if parallel and backend == "cli" and progress_queue is None:
+        progress_queue = Queue()
 
     try:
-        # 1. Create temp copies
-        for job in jobs:
-            log(f"\nPreparing {job.plan_name}...")
-            temp_prj = copy_project_to_temp(project_path, dss_path=job.dss_path, log=log)
-            temp_entries.append((temp_prj, job))
-
-        # 2. Run simulations
-        if parallel:
-            result_queue: Queue = Queue()
-            # Create progress queue for parallel CLI mode if not provided
-            if backend == "cli" and progress_queue is None:
-                progress_queue = Queue()
-            processes: list[Process] = []
-            for temp_prj, job in temp_entries:
-                kwargs: dict[str, object] = {"result_queue": result_queue}
-                if backend == "cli":
-                    kwargs.update(
-                        plan_suffix=job.plan_suffix,
-                        plan_name=job.plan_name,
-                        ras_exe=ras_exe,
-                        max_cores=max_cores,
-                        timeout_seconds=timeout_seconds,
-                        progress_queue=progress_queue,
-                    )
-                    p = Process(
-                        target=run_fn,
-                        args=(temp_prj,),
-                        kwargs=kwargs,
-                    )
+        # Jobs run in waves: as many as the scratch roots have room for. Usually
+        # that is the whole batch; otherwise the rest is held back until the
+        # current wave finishes and its copies are cleaned up.
+        while remaining:
+            # 1. Create temp copies
+            temp_entries: list[tuple[str, SimulationJob]] = []  # (temp_prj_path, job)
+            while remaining:
+                job = remaining[0]
+                footprint = estimate_footprint(
+                    project_path, job.plan_suffix, project_bytes=project_bytes
+                )
+                # Copies kept with cleanup off would hold the RAM budget for good
+                if temp_entries:
+                    lease = scratch.try_reserve(footprint, allow_ram=cleanup)
                 else:
-                    kwargs.update(
-                        show_ras=show_ras,
-                        plan_suffix=job.plan_suffix,
+                    lease = scratch.reserve(
+                        footprint, timeout=scratch_wait_seconds, allow_ram=cleanup
                     )
-                    p = Process(
-                        target=run_fn,
-                        args=(temp_prj, job.plan_name),
-                        kwargs=kwargs,
+                if lease is None:
+                    break
+                leases.append(lease)
+                remaining.pop(0)
+
+                log(f"\nPreparing {job.plan_name}...")
+                if lease.in_memory:
+                    log(f"Staging on RAM disk ({lease.root})")
+                temp_prj = copy_project_to_temp(
+                    project_path,
+                    dss_path=job.dss_path,
+                    log=log,
+                    plan_key=f"p{job.plan_suffix}" if prepare else None,
+                    write_detailed=write_detailed,
+                    temp_root=lease.root,
+                )
+                scratch.mark_staged(lease, project_bytes)
+                temp_entries.append((temp_prj, job))
+                staged.append((temp_prj, job))
+
+            if not temp_entries:
+                log("Not enough scratch space for the remaining plan(s).")
+                for job in remaining:
+                    result = SimulationResult(
+                        plan_name=job.plan_name,
+                        plan_suffix=job.plan_suffix,
+                        success=False,
+                        elapsed_seconds=0.0,
+                        error_message="Insufficient scratch space",
                     )
-                p.start()
-                log(f"Started {job.plan_name} in parallel")
-                processes.append(p)
-
-            # Collect results as each process finishes (enables per-plan GUI updates)
-            import queue as _queue_mod
-
-            collected = 0
-            while collected < len(temp_entries):
-                try:
-                    result = result_queue.get(timeout=1.0)
                     results.append(result)
-                    collected += 1
                     if result_callback:
                         result_callback(result)
-                except _queue_mod.Empty:
-                    pass
-
-            for p in processes:
-                p.join(timeout=30)
-        else:
-            for temp_prj, job in temp_entries:
-                if backend == "cli":
-                    result = run_fn(
-                        temp_prj,
-                        plan_suffix=job.plan_suffix,
-                        plan_name=job.plan_name,
-                        ras_exe=ras_exe,
-                        max_cores=max_cores,
-                        timeout_seconds=timeout_seconds,
-                        log=log,
-                        on_progress=on_progress,
-                    )
-                else:
-                    result = run_fn(
-                        temp_prj,
-                        job.plan_name,
-                        show_ras=show_ras,
-                        log=log,
-                        plan_suffix=job.plan_suffix,
-                    )
-                results.append(result)
-                if result_callback:
-                    result_callback(result)
+                break
+            if remaining:
+                log(
+                    f"\nScratch space allows {len(temp_entries)} plan(s) at once; "
+                    f"holding back {len(remaining)}."
+                )
 
-        log("\nAll simulations completed.")
+            # 2. Run simulations
+            wave_results: list[SimulationResult] = []
+            if parallel:
+                result_queue: Queue = Queue()
+                processes: list[Process] = []
+                for temp_prj, job in temp_entries:
+                    kwargs: dict[str, object] = {"result_queue": result_queue}
+                    if backend == "cli":
+                        kwargs.update(
+                            plan_suffix=job.plan_suffix,
+                            plan_name=job.plan_name,
+                            ras_exe=ras_exe,
+                            max_cores=max_cores,
+                            timeout_seconds=timeout_seconds,
+                            progress_queue=progress_queue,
+                            prepared=True,
+                        )
+                        p = Process(
+                            target=run_fn,
+                            args=(temp_prj,),
+                            kwargs=kwargs,
+                        )
+                    else:
+                        kwargs.update(
+                            show_ras=show_ras,
+                            plan_suffix=job.plan_suffix,
+                        )
+                        p = Process(
+                            target=run_fn,
+                            args=(temp_prj, job.plan_name),
+                            kwargs=kwargs,
+                        )
+                    p.start()
+                    log(f"Started {job.plan_name} in parallel")
+                    processes.append(p)
+
+                # Collect results as each process finishes (enables per-plan GUI updates)
+                import queue as _queue_mod
+
+                collected = 0
+                while collected < len(temp_entries):
+                    try:
+                        result = result_queue.get(timeout=1.0)
+                        wave_results.append(result)
+                        collected += 1
+                        if result_callback:
+                            result_callback(result)
+                    except _queue_mod.Empty:
+                        pass
+
+                for p in processes:
+                    p.join(timeout=30)
+            else:
+                for temp_prj, job in temp_entries:
+                    if backend == "cli":
+                        result = run_fn(
+                            temp_prj,
+                            plan_suffix=job.plan_suffix,
+                            plan_name=job.plan_name,
+                            ras_exe=ras_exe,
+                            max_cores=max_cores,
+                            timeout_seconds=timeout_seconds,
+                            log=log,
+                            on_progress=on_progress,
+                            prepared=True,
+                        )
+                    else:
+                        result = run_fn(
+                            temp_prj,
+                            job.plan_name,
+                            show_ras=show_ras,
+                            log=log,
+                            plan_suffix=job.plan_suffix,
+                        )
+                    wave_results.append(result)
+                    if result_callback:
+                        result_callback(result)
 
-        # 3. Copy results back and attach file lists to results
-        # Build a lookup so we can attach files_copied to the right result
-        result_by_name = {r.plan_name: r for r in results}
-        for temp_prj, job in temp_entries:
-            copied = copy_results_back(temp_prj, main_dir, job.plan_suffix, log=log)
-            if job.plan_name in result_by_name:
-                result_by_name[job.plan_name].files_copied = copied
-                result_by_name[job.plan_name].plan_suffix = job.plan_suffix
+            results.extend(wave_results)
+            log("\nAll simulations completed.")
 
-        log("\nAll results copied to main project folder.")
-        log("Open RAS Mapper and refresh to see new results.")
+            # 3. Copy results back and attach file lists to results
+            # Build a lookup so we can attach files_copied to the right result
+            result_by_name = {r.plan_name: r for r in wave_results}
+            for temp_prj, job in temp_entries:
+                copied = copy_results_back(temp_prj, main_dir, job.plan_suffix, log=log)
+                if job.plan_name in result_by_name:
+                    result_by_name[job.plan_name].files_copied = copied
+                    result_by_name[job.plan_name].plan_suffix = job.plan_suffix
+
+            log("\nAll results copied to main project folder.")
+            log("Open RAS Mapper and refresh to see new results.")
+
+            # Free this wave's space so held-back plans can be staged
+            for lease in leases:
+                scratch.release(lease)
+            leases.clear()
+            if cleanup:
+                _queue_cleanup(staged, log)
+                staged.clear()
 
     except Exception as e:
         log(f"Error during simulation: {e}")
@@ -591,9 +683,21 @@ def run_simulations(
         traceback.print_exc()
 
     finally:
-        if cleanup:
-            log("\nCleaning up temporary files...")
-            for temp_prj, _job in temp_entries:
-                cleanup_temp_dir(os.path.dirname(temp_prj), log=log)
+        for lease in leases:
+            scratch.release(lease)
+        if cleanup and staged:
+            _queue_cleanup(staged, log)
 
     return results
+
+
+def _queue_cleanup(
+    temp_entries: list[tuple[str, SimulationJob]],
+    log: Callable[[str], None],
+) -> None:
+    """Hand staged copies to the background cleanup service."""
+    # Deleted in the background — Ras.exe may still hold locks for a while
+    service = get_cleanup_service(log=log)
+    for temp_prj, _job in temp_entries:
+        service.enqueue(os.path.dirname(temp_prj), log=log)
+    log(f"\nQueued {len(temp_entries)} temporary folder(s) for cleanup.")
@@ -0,0 +1,305 @@
+"""Scratch space for staged project copies.
+
+Every plan runs against its own copy of the project, so a batch needs roughly
+``plans x project size`` of temp space plus room for results. A
+``ScratchManager`` is configured with one or more temp roots (fast NVMe,
+secondary SSD), checks free space before each copy and tracks what
+concurrent jobs have reserved so a drive is never over-committed. Callers hold
+back launches while :meth:`ScratchManager.reserve` returns None instead of
+letting a batch fill the drive halfway through.
+
+Optionally a RAM-backed root (tmpfs, or a RAM-disk drive on Windows) is tried
+first: small and medium models then do their ``.bco``/``.p##.hdf`` I/O in
+memory, as long as the copies fit in a fixed memory budget. Jobs that don't
+fit fall back to the disk roots.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from hecras_runner.cleanup import TEMP_PREFIX
+from hecras_runner.file_ops import _format_bytes
+from hecras_runner.rasmap import staged_size
+from hecras_runner.settings import ScratchSettings
+
+_GB = 1024**3
+
+# Placement policies: "headroom" picks the root with the most space left after
+# the job; "priority" picks the first root in configured order that fits
+# (list the fastest drive first).
+POLICIES = ("headroom", "priority")
+
+# Share of the project size reserved for new results when the plan has no
+# previous output to measure.
+DEFAULT_GROWTH_FACTOR = 0.25
+
+
+def default_ram_disk_path() -> str | None:
+    """Return the platform's RAM-backed temp filesystem, if there is one.
+
+    ``/dev/shm`` is tmpfs on Linux. Windows has no built-in equivalent, so a
+    RAM-disk drive has to be configured explicitly (``scratch.ram_disk_path``).
+    """
+    if sys.platform.startswith("linux") and os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return None
+
+
+def directory_size(path: str) -> int:
+    """Total size in bytes of all files under *path* (0 if unreadable)."""
+    total = 0
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return 0
+    for entry in entries:
+        with contextlib.suppress(OSError):
+            if entry.is_dir(follow_symlinks=False):
+                total += directory_size(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
+def estimate_footprint(
+    project_path: str,
+    plan_suffix: str | None = None,
+    growth_factor: float = DEFAULT_GROWTH_FACTOR,
+    project_bytes: int | None = None,
+) -> int:
+    """Estimate the scratch space one staged run of *project_path* needs.
+
+    The staged copy is the project's files minus unused map-layer data (see
+    :func:`hecras_runner.rasmap.staged_size`). Results are sized from the
+    plan's previous ``.p##.hdf`` when one exists, otherwise as *growth_factor*
+    of the project size. Pass *project_bytes* to skip re-walking the directory.
+    """
+    project_dir = os.path.dirname(os.path.abspath(project_path))
+    if project_bytes is None:
+        project_bytes = staged_size(project_path)
+
+    growth = int(project_bytes * growth_factor)
+    if plan_suffix:
+        basename = os.path.splitext(os.path.basename(project_path))[0]
+        previous = os.path.join(project_dir, f"{basename}.p{plan_suffix}.hdf")
+        with contextlib.suppress(OSError):
+            growth = max(growth, os.path.getsize(previous))
+    return project_bytes + growth
+
+
+@dataclass
+class ScratchLease:
+    """Space reserved on one scratch root for one staged job."""
+
+    root: str
+    footprint: int
+    outstanding: int  # part of the footprint not yet visible in disk usage
+    in_memory: bool = False  # placed on the RAM root
+    released: bool = False
+
+
+class ScratchManager:
+    """Place staged copies on the scratch root with room for them.
+
+    Free space is read from the filesystem on every decision and reduced by
+    the outstanding part of all active leases, so jobs reserved but not yet
+    (fully) written are accounted for. *min_free_gb* is always left untouched
+    on every disk root.
+
+    With *ram_root*, a job whose whole footprint fits in what is left of
+    *ram_budget_gb* is placed there first. The budget counts the staged copies
+    actually on the RAM root (until the cleanup service deletes them) plus the
+    unwritten part of active RAM leases, independent of the RAM filesystem's
+    own size limit, which is checked as well.
+    """
+
+    def __init__(
+        self,
+        roots: list[str] | None = None,
+        min_free_gb: float = 2.0,
+        policy: str = "headroom",
+        log: Callable[[str], None] = print,
+        ram_root: str | None = None,
+        ram_budget_gb: float = 0.0,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown scratch policy {policy!r} (expected one of {POLICIES})")
+        self.roots = [os.path.abspath(r) for r in (roots or [tempfile.gettempdir()])]
+        self.min_free_bytes = int(min_free_gb * _GB)
+        self.policy = policy
+        self.ram_root = os.path.abspath(ram_root) if ram_root else None
+        self.ram_budget_bytes = int(ram_budget_gb * _GB)
+        self._log = log
+        self._cond = threading.Condition()
+        self._reserved: dict[str, int] = dict.fromkeys(self.roots, 0)
+        if self.ram_root:
+            self._reserved.setdefault(self.ram_root, 0)
+        self._ram_fallback_logged = False
+
+    @classmethod
+    def from_settings(
+        cls, settings: ScratchSettings, log: Callable[[str], None] = print
+    ) -> ScratchManager:
+        """Build a manager from the ``scratch`` section of the app settings."""
+        ram_root = None
+        if settings.ram_disk:
+            ram_root = settings.ram_disk_path or default_ram_disk_path()
+            if ram_root is None:
+                log("No RAM disk available (set scratch.ram_disk_path); staging on disk")
+        return cls(
+            roots=list(settings.temp_roots) or None,
+            min_free_gb=settings.min_free_gb,
+            policy=settings.policy,
+            log=log,
+            ram_root=ram_root,
+            ram_budget_gb=settings.ram_budget_gb,
+        )
+
+    # ── Space accounting ──
+
+    def available(self, root: str) -> int:
+        """Bytes a new job may use on *root* (negative if already over-committed)."""
+        try:
+            free = shutil.disk_usage(root).free
+        except OSError:
+            return -1
+        with self._cond:
+            reserved = self._reserved.get(root, 0)
+        return free - reserved - self.min_free_bytes
+
+    def ram_in_use(self) -> int:
+        """Bytes charged against the RAM budget.
+
+        Released copies stay on the RAM root until background cleanup deletes
+        them (or forever with cleanup off), so they are measured rather than
+        tracked: every staged copy on the root, from any process, plus what
+        active leases have not written yet.
+        """
+        if not self.ram_root:
+            return 0
+        staged = 0
+        with contextlib.suppress(OSError), os.scandir(self.ram_root) as it:
+            for entry in it:
+                if entry.name.startswith(TEMP_PREFIX) and entry.is_dir(follow_symlinks=False):
+                    staged += directory_size(entry.path)
+        with self._cond:
+            return staged + self._reserved[self.ram_root]
+
+    def _fits_in_ram(self, footprint: int) -> bool:
+        """Whether *footprint* fits the RAM budget and the RAM filesystem."""
+        if not self.ram_root or not os.path.isdir(self.ram_root):
+            return False
+        if footprint > self.ram_budget_bytes - self.ram_in_use():
+            return False
+        try:
+            free = shutil.disk_usage(self.ram_root).free
+        except OSError:
+            return False
+        return free - self._reserved[self.ram_root] >= footprint
+
+    def _choose_root(self, footprint: int) -> str | None:
+        candidates = []
+        for root in self.roots:
+            if not os.path.isdir(root):
+                with contextlib.suppress(OSError):
+                    os.makedirs(root, exist_ok=True)
+            room = self.available(root)
+            if room >= footprint:
+                candidates.append((room, root))
+        if not candidates:
+            return None
+        if self.policy == "priority":
+            return candidates[0][1]
+        return max(candidates, key=lambda c: c[0])[1]
+
+    # ── Leases ──
+
+    def try_reserve(self, footprint: int, allow_ram: bool = True) -> ScratchLease | None:
+        """Reserve *footprint* bytes on the best root, or return None if none fits.
+
+        Pass ``allow_ram=False`` for copies that will not be deleted afterwards
+        (cleanup off); they would hold the RAM budget indefinitely.
+        """
+        fallback_note = False
+        with self._cond:
+            in_memory = allow_ram and self._fits_in_ram(footprint)
+            if in_memory:
+                root = self.ram_root
+            else:
+                root = self._choose_root(footprint)
+                if root is None:
+                    return None
+                if allow_ram and self.ram_root and not self._ram_fallback_logged:
+                    self._ram_fallback_logged = fallback_note = True
+            self._reserved[root] += footprint
+
+        if fallback_note:
+            self._log(
+                f"{_format_bytes(footprint)} per copy exceeds the remaining RAM budget; "
+                "staging on disk"
+            )
+        return ScratchLease(
+            root=root, footprint=footprint, outstanding=footprint, in_memory=in_memory
+        )
+
+    def reserve(
+        self,
+        footprint: int,
+        timeout: float | None = None,
+        poll_interval: float = 2.0,
+        allow_ram: bool = True,
+    ) -> ScratchLease | None:
+        """Like :meth:`try_reserve` but wait up to *timeout* seconds for space.
+
+        Space comes back when other leases are released or background cleanup
+        deletes old copies, so the wait re-checks the disks every
+        *poll_interval* seconds. Returns None on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        logged = False
+        while True:
+            lease = self.try_reserve(footprint, allow_ram=allow_ram)
+            if lease is not None:
+                return lease
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            if not logged:
+                self._log(f"Waiting for {_format_bytes(footprint)} of scratch space...")
+                logged = True
+            with self._cond:
+                wait = poll_interval if remaining is None else min(poll_interval, remaining)
+                self._cond.wait(wait)
+
+    def mark_staged(self, lease: ScratchLease, staged_bytes: int) -> None:
+        """Record that *staged_bytes* of the lease are now written to disk.
+
+        Written bytes already show up in the filesystem's free space, so they
+        stop counting against the reservation.
+        """
+        with self._cond:
+            if lease.released:
+                return
+            done = min(staged_bytes, lease.outstanding)
+            lease.outstanding -= done
+            self._reserved[lease.root] -= done
+            self._cond.notify_all()
+
+    def release(self, lease: ScratchLease) -> None:
+        """Return the rest of *lease* to the pool. Safe to call twice."""
+        with self._cond:
+            if lease.released:
+                return
+            lease.released = True
+            self._reserved[lease.root] -= lease.outstanding
+            lease.outstanding = 0
+            self._cond.notify_all()
@@ -32,12 +32,25 @@ class NetworkSettings:
     terrain_cache_max_gb: float = 10.0
 
 
+@dataclass
+class ScratchSettings:
+    """Where staged project copies are written."""
+
+    temp_roots: list[str] = field(default_factory=list)  # empty = system temp
+    min_free_gb: float = 2.0  # always left free on every root
+    policy: str = "headroom"  # or "priority": first listed root that fits
+    ram_disk: bool = False  # stage small projects on a RAM-backed filesystem
+    ram_disk_path: str = ""  # empty = /dev/shm where available
+    ram_budget_gb: float = 4.0
+
+
 @dataclass
 class AppSettings:
     """Top-level application settings."""
 
     db: DbSettings = field(default_factory=DbSettings)
     network: NetworkSettings = field(default_factory=NetworkSettings)
+    scratch: ScratchSettings = field(default_factory=ScratchSettings)
     update_url: str = "https://updates.arx.engineering/hecras-runner/version.json"
 
 
@@ -68,6 +81,7 @@ def load_settings() -> AppSettings:
 
     db_data = data.get("db", {})
     net_data = data.get("network", {})
+    scratch_data = data.get("scratch", {})
 
     # Use dataclass defaults for empty/missing values (fixes stale settings cache)
     _db_defaults = DbSettings()
@@ -85,8 +99,17 @@ def load_settings() -> AppSettings:
         max_concurrent=int(net_data.get("max_concurrent", 1)),
         terrain_cache_max_gb=float(net_data.get("terrain_cache_max_gb", 10.0)),
     )
+    roots = scratch_data.get("temp_roots", [])
+    scratch = ScratchSettings(
+        temp_roots=[str(r) for r in roots if r] if isinstance(roots, list) else [],
+        min_free_gb=float(scratch_data.get("min_free_gb", 2.0)),
+        policy=str(scratch_data.get("policy", "")) or "headroom",
+        ram_disk=bool(scratch_data.get("ram_disk", False)),
+        ram_disk_path=str(scratch_data.get("ram_disk_path", "")),
+        ram_budget_gb=float(scratch_data.get("ram_budget_gb", 4.0)),
+    )
     update_url = str(data.get("update_url", AppSettings.update_url))
-    return AppSettings(db=db, network=network, update_url=update_url)
+    return AppSettings(db=db, network=network, scratch=scratch, update_url=update_url)
 
 
 def save_settings(settings: AppSettings) -> None:
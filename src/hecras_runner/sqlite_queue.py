@@ -0,0 +1,645 @@
+"""SQLite job queue with the :class:`~hecras_runner.db.DbClient` interface.
+
+For running the distributed queue without PostgreSQL: offline, with
+several worker processes on one machine, or in tests. The queue is one
+SQLite file (``%APPDATA%/hecras_runner/queue.sqlite`` by default) in WAL
+mode, so readers never block the writer, and every state change is a
+short ``BEGIN IMMEDIATE`` transaction: a claim picks and assigns its jobs
+while holding the write lock, so no two processes get the same job.
+
+Claims follow the PostgreSQL queue: capability matching, priority with
+aging, fair-share across submitters and cached terrain first (see
+:meth:`SqliteQueueClient.claim_jobs`). There is no NOTIFY; workers waiting
+for jobs watch ``PRAGMA data_version``, which changes whenever another
+connection commits.
+
+The file must be on a local disk: SQLite locking is not reliable on SMB
+shares.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+
+from hecras_runner._queue_sql import (
+    DEFAULT_AGING_SECONDS,
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    LISTEN_SLICE,
+    batch_job,
+    batch_status,
+    claimed_job,
+    host_identity,
+    worker_row,
+)
+from hecras_runner.db import BatchSubmission, DbClient, WorkerInfo
+from hecras_runner.settings import _settings_dir
+
+QUEUE_SCHEMA_VERSION = 1
+
+# Seconds to wait for another process's write transaction
+_BUSY_TIMEOUT = 30.0
+
+# How often wait_for_jobs() checks whether another connection committed
+_POLL_SLICE = 0.25
+
+# Seconds since the epoch, as stored in every timestamp column
+_NOW = "((julianday('now') - 2440587.5) * 86400.0)"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS workers (
+    id              TEXT PRIMARY KEY,
+    hostname        TEXT NOT NULL,
+    ip_address      TEXT,
+    os_version      TEXT,
+    hecras_version  TEXT,
+    hecras_path     TEXT,
+    max_concurrent  INTEGER NOT NULL DEFAULT 1,
+    status          TEXT NOT NULL DEFAULT 'idle',
+    last_heartbeat  REAL NOT NULL,
+    registered_at   REAL NOT NULL,
+    metadata        TEXT NOT NULL DEFAULT '{{}}'
+);
+
+CREATE TABLE IF NOT EXISTS batches (
+    id              TEXT PRIMARY KEY,
+    project_path    TEXT NOT NULL,
+    project_title   TEXT NOT NULL DEFAULT '',
+    submitted_by    TEXT NOT NULL DEFAULT '',
+    submitted_at    REAL NOT NULL,
+    completed_at    REAL,
+    status          TEXT NOT NULL DEFAULT 'pending',
+    total_jobs      INTEGER NOT NULL DEFAULT 0,
+    queued_jobs     INTEGER NOT NULL DEFAULT 0,
+    assigned_jobs   INTEGER NOT NULL DEFAULT 0,
+    running_jobs    INTEGER NOT NULL DEFAULT 0,
+    completed_jobs  INTEGER NOT NULL DEFAULT 0,
+    failed_jobs     INTEGER NOT NULL DEFAULT 0,
+    cancelled_jobs  INTEGER NOT NULL DEFAULT 0
+);
+
+-- seq keeps submission order for ties (job ids are random UUIDs)
+CREATE TABLE IF NOT EXISTS jobs (
+    seq              INTEGER PRIMARY KEY,
+    id               TEXT NOT NULL UNIQUE,
+    batch_id         TEXT NOT NULL REFERENCES batches(id) ON DELETE CASCADE,
+    plan_name        TEXT NOT NULL,
+    plan_suffix      TEXT NOT NULL,
+    status           TEXT NOT NULL DEFAULT 'queued',
+    worker_id        TEXT,
+    assigned_at      REAL,
+    started_at       REAL,
+    completed_at     REAL,
+    elapsed_seconds  REAL,
+    error_message    TEXT,
+    exit_code        INTEGER,
+    hdf_verified     INTEGER,
+    progress         REAL NOT NULL DEFAULT 0.0,
+    metadata         TEXT NOT NULL DEFAULT '{{}}',
+    lease_expires_at REAL,
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    max_attempts     INTEGER NOT NULL DEFAULT {DEFAULT_MAX_ATTEMPTS},
+    requirements     TEXT NOT NULL DEFAULT '{{}}',
+    terrain_hash     TEXT NOT NULL DEFAULT '',
+    priority         INTEGER NOT NULL DEFAULT 0,
+    submitted_by     TEXT NOT NULL DEFAULT '',
+    queued_at        REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_batch_id ON jobs (batch_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_queued_fair
+    ON jobs (submitted_by, priority DESC, seq) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_jobs_held
+    ON jobs (worker_id) WHERE status IN ('assigned', 'running');
+CREATE INDEX IF NOT EXISTS idx_jobs_lease
+    ON jobs (lease_expires_at) WHERE status IN ('assigned', 'running');
+
+CREATE TABLE IF NOT EXISTS user_shares (
+    submitted_by TEXT PRIMARY KEY,
+    weight       REAL NOT NULL DEFAULT 1.0 CHECK (weight > 0)
+);
+
+-- Per-status counters and batch status, as the PostgreSQL counter trigger
+CREATE TRIGGER IF NOT EXISTS jobs_count_status
+AFTER UPDATE OF status ON jobs WHEN OLD.status <> NEW.status
+BEGIN
+    UPDATE batches SET
+        queued_jobs = queued_jobs + (NEW.status = 'queued') - (OLD.status = 'queued'),
+        assigned_jobs = assigned_jobs + (NEW.status = 'assigned') - (OLD.status = 'assigned'),
+        running_jobs = running_jobs + (NEW.status = 'running') - (OLD.status = 'running'),
+        completed_jobs = completed_jobs + (NEW.status = 'completed') - (OLD.status = 'completed'),
+        failed_jobs = failed_jobs + (NEW.status = 'failed') - (OLD.status = 'failed'),
+        cancelled_jobs = cancelled_jobs + (NEW.status = 'cancelled') - (OLD.status = 'cancelled')
+    WHERE id = NEW.batch_id;
+    UPDATE batches SET
+        status = CASE
+            WHEN status IN ('completed', 'failed', 'cancelled') THEN status
+            WHEN completed_jobs + failed_jobs + cancelled_jobs >= total_jobs
+                THEN CASE WHEN failed_jobs > 0 THEN 'failed' ELSE 'completed' END
+            WHEN status = 'pending' AND running_jobs > 0 THEN 'running'
+            ELSE status
+        END,
+        completed_at = CASE
+            WHEN status NOT IN ('completed', 'failed', 'cancelled')
+                 AND completed_jobs + failed_jobs + cancelled_jobs >= total_jobs
+                THEN {_NOW}
+            ELSE completed_at
+        END
+    WHERE id = NEW.batch_id;
+END;
+"""
+
+
+def _fits(requirement: str, capability: str) -> str:
+    """SQL condition: the job's numeric *requirement* is within the worker's *capability*."""
+    need = f"json_extract(j.requirements, '$.{requirement}')"
+    have = f"json_extract(:caps, '$.{capability}')"
+    return f"({need} IS NULL OR {have} IS NULL OR {need} <= {have})"
+
+
+_CACHED = "j.terrain_hash IN (SELECT value FROM json_each(:caps, '$.terrain_hashes'))"
+
+# Same order as the PostgreSQL claim: aged priority (capped at the top
+# queued priority), each submitter's weighted turn, cached terrain, then
+# submission order
+_SQL_PICK = f"""
+WITH active AS (
+    SELECT submitted_by, SUM(assigned_jobs + running_jobs) AS jobs
+    FROM batches
+    WHERE status IN ('pending', 'running')
+    GROUP BY submitted_by
+), candidates AS (
+    SELECT j.seq,
+           j.priority + CAST((:now - j.queued_at) / :aging AS INTEGER) AS aged,
+           MAX(j.priority) OVER () AS top,
+           (COALESCE(a.jobs, 0) + ROW_NUMBER() OVER (
+                PARTITION BY j.submitted_by ORDER BY j.priority DESC, {_CACHED} DESC, j.seq
+           )) / COALESCE(s.weight, 1.0) AS turn,
+           {_CACHED} AS cached
+    FROM jobs j
+    LEFT JOIN active a ON a.submitted_by = j.submitted_by
+    LEFT JOIN user_shares s ON s.submitted_by = j.submitted_by
+    WHERE j.status = 'queued'
+      AND {_fits("ram_gb", "ram_gb")}
+      AND {_fits("cores", "cores")}
+      AND {_fits("scratch_gb", "scratch_free_gb")}
+      AND (json_extract(j.requirements, '$.hecras_version') IS NULL
+           OR json_extract(:caps, '$.hecras_version') IS NULL
+           OR substr(json_extract(:caps, '$.hecras_version'), 1,
+                     length(json_extract(j.requirements, '$.hecras_version')))
+              = json_extract(j.requirements, '$.hecras_version'))
+)
+SELECT seq FROM candidates
+ORDER BY MIN(aged, top) DESC, turn, cached DESC, seq
+LIMIT :limit
+"""
+
+_SQL_REAP = f"""
+UPDATE jobs SET
+    status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+    error_message = CASE
+        WHEN attempts >= max_attempts
+            THEN 'Worker lost (lease expired) on all ' || attempts || ' attempts'
+        ELSE error_message
+    END,
+    completed_at = CASE WHEN attempts >= max_attempts THEN {_NOW} END,
+    worker_id = NULL,
+    lease_expires_at = NULL,
+    assigned_at = NULL,
+    started_at = NULL,
+    progress = 0.0
+WHERE status IN ('assigned', 'running') AND lease_expires_at < ?
+"""
+
+
+def default_queue_path() -> str:
+    """Location of the default local queue database."""
+    return os.path.join(_settings_dir(), "queue.sqlite")
+
+
+class SqliteQueueClient(DbClient):
+    """Local SQLite job queue, a drop-in for :class:`~hecras_runner.db.DbClient`.
+
+    Any number of threads and processes may share one queue file. Each
+    thread gets its own connection; the heartbeat thread, progress
+    buffering and :meth:`claim_job` are inherited from ``DbClient``.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        log: Callable[[str], None] = print,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        aging_seconds: float = DEFAULT_AGING_SECONDS,
+    ) -> None:
+        super().__init__(None, log=log, lease_seconds=lease_seconds, aging_seconds=aging_seconds)
+        self.path = path or default_queue_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+
+    @classmethod
+    def connect(  # type: ignore[override]
+        cls,
+        path: str | None = None,
+        log: Callable[[str], None] = print,
+    ) -> SqliteQueueClient | None:
+        """Open (and create if needed) the queue at *path*. Returns None on failure."""
+        try:
+            client = cls(path, log=log)
+            client.migrate()
+        except (OSError, sqlite3.Error) as e:
+            log(f"Local queue unavailable: {e}")
+            return None
+        log(f"Using local job queue {client.path}")
+        return client
+
+    def close(self) -> None:
+        """Stop the heartbeat and close every thread's connection."""
+        self.stop_heartbeat()
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            with contextlib.suppress(sqlite3.Error):
+                conn.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection (autocommit; transactions are explicit)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=_BUSY_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode = WAL")
+            # WAL + NORMAL only fsyncs at checkpoints; a power cut may lose
+            # the last commits but never corrupts the queue
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    @contextlib.contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """A transaction holding the database write lock from its start."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ── Schema ──
+
+    def migrate(self) -> None:
+        """Create the queue tables on first use."""
+        with self._write() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < QUEUE_SCHEMA_VERSION:
+                for statement in _split_script(_SCHEMA):
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {QUEUE_SCHEMA_VERSION}")
+
+    # ── Worker lifecycle ──
+
+    def register_worker(
+        self,
+        hecras_version: str = "",
+        hecras_path: str = "",
+        max_concurrent: int = 1,
+        capabilities: dict | None = None,
+    ) -> WorkerInfo:
+        """Register this process as a worker. Returns WorkerInfo."""
+        hostname, ip_address, os_version = host_identity()
+        worker_id = str(uuid.uuid4())
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO workers (id, hostname, ip_address, os_version, hecras_version,"
+                " hecras_path, max_concurrent, last_heartbeat, registered_at, metadata)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    worker_id,
+                    hostname,
+                    ip_address,
+                    os_version,
+                    hecras_version,
+                    hecras_path,
+                    max_concurrent,
+                    now,
+                    now,
+                    json.dumps(capabilities or {}),
+                ),
+            )
+        self._log(f"Registered as worker {worker_id} ({hostname})")
+        return WorkerInfo(worker_id=worker_id, hostname=hostname, ip_address=ip_address)
+
+    def heartbeat(self, worker_id: str) -> None:
+        """Update the worker heartbeat, extend its job leases and write buffered progress."""
+        with self._progress_lock:
+            progress, self._progress = self._progress, {}
+        now = time.time()
+        try:
+            with self._write() as conn:
+                conn.execute("UPDATE workers SET last_heartbeat = ? WHERE id = ?", (now, worker_id))
+                conn.execute(
+                    "UPDATE jobs SET lease_expires_at = ?"
+                    " WHERE worker_id = ? AND status IN ('assigned', 'running')",
+                    (now + self._lease_seconds, worker_id),
+                )
+                conn.executemany(
+                    "UPDATE jobs SET progress = ?"
+                    " WHERE id = ? AND worker_id = ? AND status IN ('assigned', 'running')",
+                    [(value, job_id, worker_id) for job_id, value in progress.items()],
+                )
+        except Exception:
+            with self._progress_lock:
+                for job_id, value in progress.items():
+                    self._progress.setdefault(job_id, value)
+            raise
+
+    def reap_expired_jobs(self) -> int:
+        """Requeue (or fail, after max_attempts) jobs whose lease has expired."""
+        with self._write() as conn:
+            return conn.execute(_SQL_REAP, (time.time(),)).rowcount
+
+    def set_worker_offline(self, worker_id: str) -> None:
+        """Mark a worker as offline."""
+        with self._write() as conn:
+            conn.execute("UPDATE workers SET status = 'offline' WHERE id = ?", (worker_id,))
+
+    # ── Batch submission ──
+
+    def submit_batch(
+        self,
+        project_path: str,
+        project_title: str,
+        jobs: list[dict],
+        submitted_by: str = "",
+        priority: int = 0,
+    ) -> BatchSubmission:
+        """Submit a batch of simulation jobs in one transaction.
+
+        Job dicts are as for :meth:`DbClient.submit_batch`.
+        """
+        batch_id = str(uuid.uuid4())
+        job_ids = [str(job.get("job_id") or uuid.uuid4()) for job in jobs]
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO batches (id, project_path, project_title, submitted_by,"
+                " submitted_at, total_jobs, queued_jobs) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (batch_id, project_path, project_title, submitted_by, now, len(jobs), len(jobs)),
+            )
+            conn.executemany(
+                "INSERT INTO jobs (id, batch_id, plan_name, plan_suffix, terrain_hash,"
+                " requirements, priority, submitted_by, queued_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        job_id,
+                        batch_id,
+                        job["plan_name"],
+                        job["plan_suffix"],
+                        job.get("terrain_hash") or "",
+                        json.dumps(job.get("requirements") or {}),
+                        int(job.get("priority", priority)),
+                        submitted_by,
+                        now,
+                    )
+                    for job_id, job in zip(job_ids, jobs, strict=True)
+                ],
+            )
+        self._log(f"Submitted batch {batch_id} with {len(jobs)} jobs")
+        return BatchSubmission(batch_id=batch_id, job_ids=job_ids)
+
+    def get_batch_status(self, batch_id: str) -> dict:
+        """Get summary status of a batch (one primary-key lookup)."""
+        row = (
+            self._connection()
+            .execute(
+                "SELECT status, total_jobs, queued_jobs, assigned_jobs, running_jobs,"
+                " completed_jobs, failed_jobs, cancelled_jobs FROM batches WHERE id = ?",
+                (batch_id,),
+            )
+            .fetchone()
+        )
+        return batch_status(row)
+
+    # ── Job pickup (worker side) ──
+
+    def claim_jobs(
+        self,
+        worker_id: str,
+        limit: int = 1,
+        capabilities: dict | None = None,
+    ) -> list[dict]:
+        """Claim up to *limit* queued jobs in one write transaction.
+
+        Matching and order are those of :meth:`DbClient.claim_jobs`. Jobs
+        come back in claim order; an unregistered *worker_id* claims nothing.
+        """
+        if limit < 1:
+            return []
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE workers SET metadata = json_patch(metadata, ?) WHERE id = ?",
+                (json.dumps(capabilities or {}), worker_id),
+            )
+            me = conn.execute("SELECT metadata FROM workers WHERE id = ?", (worker_id,)).fetchone()
+            if me is None:
+                return []
+            picked = [
+                seq
+                for (seq,) in conn.execute(
+                    _SQL_PICK,
+                    {"caps": me[0], "now": now, "aging": self._aging_seconds, "limit": limit},
+                )
+            ]
+            if not picked:
+                return []
+            marks = ", ".join("?" * len(picked))
+            conn.execute(
+                "UPDATE jobs SET status = 'assigned', worker_id = ?, assigned_at = ?,"
+                f" lease_expires_at = ?, attempts = attempts + 1 WHERE seq IN ({marks})",
+                (worker_id, now, now + self._lease_seconds, *picked),
+            )
+            rows = conn.execute(
+                "SELECT j.seq, j.id, j.batch_id, j.plan_name, j.plan_suffix, b.project_path,"
+                " j.metadata, j.attempts, j.terrain_hash"
+                f" FROM jobs j JOIN batches b ON b.id = j.batch_id WHERE j.seq IN ({marks})",
+                picked,
+            ).fetchall()
+        by_seq = {row[0]: (*row[1:6], json.loads(row[6]), *row[7:]) for row in rows}
+        return [claimed_job(by_seq[seq], worker_id) for seq in picked]
+
+    def start_job(self, job_id: str, worker_id: str | None = None) -> bool:
+        """Mark a job as running; False if *worker_id* no longer holds it."""
+        now = time.time()
+        with self._write() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, lease_expires_at = ?"
+                " WHERE id = ? AND (? IS NULL OR worker_id = ?)",
+                (now, now + self._lease_seconds, job_id, worker_id, worker_id),
+            )
+        return bool(cur.rowcount)
+
+    def complete_job(
+        self,
+        job_id: str,
+        success: bool,
+        elapsed_seconds: float,
+        error_message: str | None = None,
+        exit_code: int | None = None,
+        hdf_verified: bool | None = None,
+        worker_id: str | None = None,
+    ) -> bool:
+        """Mark a job as completed or failed (see :meth:`DbClient.complete_job`)."""
+        status = "completed" if success else "failed"
+        with self._progress_lock:
+            self._progress.pop(job_id, None)
+        with self._write() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, completed_at = ?, elapsed_seconds = ?,"
+                " error_message = ?, exit_code = ?, hdf_verified = ?,"
+                " progress = CASE WHEN ? THEN 1.0 ELSE progress END, lease_expires_at = NULL"
+                " WHERE id = ? AND (? IS NULL OR worker_id = ?)",
+                (
+                    status,
+                    time.time(),
+                    elapsed_seconds,
+                    error_message,
+                    exit_code,
+                    hdf_verified,
+                    success,
+                    job_id,
+                    worker_id,
+                    worker_id,
+                ),
+            )
+        updated = bool(cur.rowcount)
+        if not updated:
+            self._log(f"Job {job_id} is no longer held by this worker; result not recorded")
+        return updated
+
+    def update_progress(self, job_id: str, progress: float) -> None:
+        """Update job progress (0.0 to 1.0), buffered while the heartbeat runs."""
+        if self._heartbeat_thread is not None:
+            with self._progress_lock:
+                self._progress[job_id] = progress
+            return
+        with self._write() as conn:
+            conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (progress, job_id))
+
+    # ── Waiting for jobs ──
+
+    def _queued_batch(self, conn: sqlite3.Connection) -> str | None:
+        row = conn.execute(
+            "SELECT batch_id FROM jobs WHERE status = 'queued' ORDER BY seq DESC LIMIT 1"
+        ).fetchone()
+        return row[0] if row else None
+
+    def wait_for_jobs(self, timeout: float, stop: Callable[[], bool] | None = None) -> bool:
+        """Block until another connection queues a job, *timeout* passes or *stop* is True.
+
+        Returns True when a commit by another connection left queued jobs,
+        False otherwise; callers claim after either.
+        """
+        conn = self._connection()
+        seen = conn.execute("PRAGMA data_version").fetchone()[0]
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (stop is not None and stop()):
+                return False
+            time.sleep(min(remaining, _POLL_SLICE))
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != seen:
+                seen = version
+                if self._queued_batch(conn) is not None:
+                    return True
+
+    def listen_for_jobs(
+        self,
+        callback: Callable[[str], None],
+        stop: threading.Event | None = None,
+    ) -> threading.Thread:
+        """Start a daemon thread calling *callback* with a batch id when jobs are queued."""
+        stop = stop or threading.Event()
+
+        def _listen() -> None:
+            while not stop.is_set():
+                try:
+                    if self.wait_for_jobs(LISTEN_SLICE, stop=stop.is_set):
+                        batch_id = self._queued_batch(self._connection())
+                        if batch_id is not None:
+                            callback(batch_id)
+                except Exception as e:
+                    self._log(f"Queue watch error: {e}")
+                    stop.wait(LISTEN_SLICE)
+
+        t = threading.Thread(target=_listen, daemon=True)
+        t.start()
+        return t
+
+    # ── Queries ──
+
+    def get_active_workers(self) -> list[dict]:
+        """Return workers with heartbeat within the last 2 minutes."""
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT id, hostname, ip_address, status, hecras_version, max_concurrent,"
+                " last_heartbeat FROM workers WHERE last_heartbeat > ? ORDER BY hostname",
+                (time.time() - 120.0,),
+            )
+            .fetchall()
+        )
+        return [worker_row((*row[:6], datetime.fromtimestamp(row[6], UTC))) for row in rows]
+
+    def get_batch_jobs(self, batch_id: str) -> list[dict]:
+        """Return all jobs for a batch."""
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT id, plan_name, plan_suffix, status, worker_id, elapsed_seconds,"
+                " error_message, progress FROM jobs WHERE batch_id = ? ORDER BY plan_suffix",
+                (batch_id,),
+            )
+            .fetchall()
+        )
+        return [batch_job(row) for row in rows]
+
+
+def _split_script(script: str) -> list[str]:
+    """Statements of *script*, keeping trigger bodies whole.
+
+    ``executescript`` would commit the open transaction first, so the
+    schema is executed statement by statement inside ``migrate()``.
+    """
+    statements: list[str] = []
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        if line.lstrip().startswith("--"):
+            continue
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    return statements
@@ -0,0 +1,233 @@
+"""Generate synthetic HEC-RAS projects at realistic scale.
+
+``test_projects/small_project_01`` has four plans, which never exercises the
+parser or the staging pipeline the way a 99-plan production model does.
+:func:`generate_project` writes a project in the same text formats HEC-RAS
+uses: plans, cross-section geometries of configurable size, unsteady flows
+with DSS-backed boundaries, the DSS files themselves, and a ``.rasmap`` with
+a terrain folder whose HDF and tiles are sparse files of any size.
+
+Output is deterministic for a given :class:`SyntheticSpec`. Nothing here
+runs HEC-RAS; the projects are for parser, staging and I/O benchmarks (see
+``benchmarks/bench_io.py``) and scale tests.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import random
+from dataclasses import dataclass
+
+_MB = 1024**2
+_GB = 1024**3
+
+_MONTHS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+
+
+@dataclass
+class SyntheticSpec:
+    """Shape of a generated project."""
+
+    name: str = "synthetic"
+    plans: int = 99
+    geometries: int = 5
+    flows: int = 99  # plans cycle through flows when there are fewer
+    cross_sections: int = 1500  # per geometry; ~40 station/elevation points each
+    boundaries_per_flow: int = 8
+    dss_files: int = 4  # shared by the flows' boundaries
+    dss_mb: float = 1.0  # size of each DSS file
+    terrain_gb: float = 0.0  # total sparse terrain size; 0 for no terrain
+    terrain_tiles: int = 4  # .tif tiles under the terrain folder (plus the .hdf)
+    results_mb: float = 0.0  # size of each .p##.hdf; 0 for no results
+    seed: int = 1
+
+
+def _fixed_width(values: list[float], per_line: int = 10, width: int = 8) -> list[str]:
+    """Format numbers the way HEC-RAS writes data blocks (fixed 8-char columns)."""
+    lines = []
+    for i in range(0, len(values), per_line):
+        chunk = values[i : i + per_line]
+        lines.append("".join(f"{v:>{width}.6g}"[:width].rjust(width) for v in chunk))
+    return lines
+
+
+def _sparse_file(path: str, size: int) -> None:
+    """Create *path* with *size* bytes without writing them (sparse where supported)."""
+    with open(path, "wb") as f:
+        if size:
+            f.truncate(size)
+
+
+def _dated(day_offset: int) -> str:
+    day = 1 + day_offset % 28
+    month = _MONTHS[(day_offset // 28) % 12]
+    return f"{day:02d}{month}2024"
+
+
+def _write(path: str, lines: list[str]) -> None:
+    # HEC-RAS writes CRLF on every platform
+    with open(path, "w", encoding="utf-8", newline="\r\n") as f:
+        f.write("\n".join(lines))
+        f.write("\n")
+
+
+def _prj_lines(spec: SyntheticSpec, dss_names: list[str]) -> list[str]:
+    lines = [f"Proj Title={spec.name}", "Current Plan=p01", "Default Exp/Contr=0.3,0.1"]
+    lines.append("SI Units")
+    lines += [f"Geom File=g{i:02d}" for i in range(1, spec.geometries + 1)]
+    lines += [f"Unsteady File=u{i:02d}" for i in range(1, spec.flows + 1)]
+    lines += [f"Plan File=p{i:02d}" for i in range(1, spec.plans + 1)]
+    lines += ["BEGIN DESCRIPTION:", f"Synthetic project ({spec.plans} plans)", "END DESCRIPTION:"]
+    lines += [f"DSS File={dss_names[0]}", "DSS File=dss"]
+    return lines
+
+
+def _plan_lines(spec: SyntheticSpec, n: int) -> list[str]:
+    geom = 1 + (n - 1) % spec.geometries
+    flow = 1 + (n - 1) % spec.flows
+    start = _dated(n)
+    end = _dated(n + 2)
+    return [
+        f"Plan Title=plan_{n:02d}",
+        "Program Version=6.60",
+        f"Short Identifier=plan_{n:02d}".ljust(80),
+        f"Simulation Date={start},0000,{end},1200",
+        f"Geom File=g{geom:02d}",
+        f"Flow File=u{flow:02d}",
+        "Subcritical Flow",
+        "K Sum by GR= 0 ",
+        "Std Step Tol= 0.01 ",
+        "Computation Interval=10SEC",
+        "Output Interval=5MIN",
+        "Instantaneous Interval=1HOUR",
+        "Mapping Interval=1HOUR",
+        "Write Detailed= 0 ",
+        "Run HTab=-1 ",
+        "Run UNet=-1 ",
+        "Run PostProcess=-1 ",
+        "Run RASMapper= 0 ",
+    ]
+
+
+def _geom_lines(spec: SyntheticSpec, n: int, rng: random.Random) -> list[str]:
+    lines = [f"Geom Title=geometry_{n:02d}", "Program Version=6.60", "Viewing Rectangle=0,1,1,0"]
+    lines.append(f"River Reach=River {n:<10},Reach 1       ")
+    for xs in range(spec.cross_sections, 0, -1):
+        station = xs * 100
+        lines.append(f"Type RM Length L Ch R = 1 ,{station:<8},100,100,100")
+        lines.append("BEGIN DESCRIPTION:")
+        lines.append("END DESCRIPTION:")
+        lines.append("Node Last Edited Time=Jan/01/2024 00:00:00")
+        points: list[float] = []
+        base = 100 + xs * 0.01
+        for p in range(40):
+            points += [p * 5.0, round(base + abs(p - 20) * 0.5 + rng.random(), 2)]
+        lines.append(f"#Sta/Elev= {len(points) // 2} ")
+        lines += _fixed_width(points)
+        lines.append("#Mann= 3 , 0 , 0 ")
+        lines += _fixed_width([0, 0.06, 0, 60, 0.035, 0, 140, 0.06, 0], per_line=9)
+        lines.append("Bank Sta=60,140")
+        lines.append("Exp/Cntr=0.3,0.1")
+    return lines
+
+
+def _flow_lines(
+    spec: SyntheticSpec,
+    n: int,
+    dss_names: list[str],
+    rng: random.Random,
+) -> list[str]:
+    lines = [f"Flow Title=unsteady_{n:02d}", "Program Version=6.60", "Use Restart= 0 "]
+    for b in range(1, spec.boundaries_per_flow + 1):
+        dss = dss_names[(n + b) % len(dss_names)]
+        lines.append(
+            "Boundary Location=                ,                ,        ,        ,"
+            f"                ,Perimeter 1     ,                ,BC Line {b:<24},"
+        )
+        lines.append("Interval=1HOUR")
+        hydrograph = [round(rng.random() * 10, 2) for _ in range(37)]
+        lines.append(f"Flow Hydrograph= {len(hydrograph)} ")
+        lines += _fixed_width(hydrograph)
+        lines.append("Flow Hydrograph Slope= 0.01 ")
+        lines.append(f"DSS File={dss}")
+        lines.append(f"DSS Path=//BC_{n:02d}_{b:02d}/FLOW/01Jan2024-03Jan2024/5Minute/RUN:SYN/")
+        lines.append("Use DSS=True")
+        lines.append("Use Fixed Start Time=False")
+    return lines
+
+
+def _rasmap_text(spec: SyntheticSpec) -> str:
+    layers = []
+    if spec.terrain_gb > 0:
+        layers.append(
+            '    <Layer Name="terrain" Type="TerrainLayer" Checked="True" '
+            'Filename=".\\Terrain\\terrain.hdf">\n'
+            "      <ResampleMethod>near</ResampleMethod>\n"
+            "    </Layer>"
+        )
+    terrains = "\n".join(layers)
+    return (
+        "<RASMapper>\n  <Version>2.0.0</Version>\n"
+        f'  <Terrains Checked="True" Expanded="True">\n{terrains}\n  </Terrains>\n'
+        "</RASMapper>\n"
+    )
+
+
+def generate_project(dest_dir: str, spec: SyntheticSpec | None = None) -> str:
+    """Write a synthetic project into *dest_dir* and return the .prj path.
+
+    *dest_dir* is created if needed; existing files with the same names are
+    overwritten.
+    """
+    spec = spec or SyntheticSpec()
+    rng = random.Random(spec.seed)
+    os.makedirs(dest_dir, exist_ok=True)
+    base = os.path.join(dest_dir, spec.name)
+
+    dss_names = [f"{spec.name}_bc{i:02d}.dss" for i in range(1, max(spec.dss_files, 1) + 1)]
+    _write(f"{base}.prj", _prj_lines(spec, dss_names))
+    for n in range(1, spec.plans + 1):
+        _write(f"{base}.p{n:02d}", _plan_lines(spec, n))
+        if spec.results_mb > 0:
+            _sparse_file(f"{base}.p{n:02d}.hdf", int(spec.results_mb * _MB))
+    for n in range(1, spec.geometries + 1):
+        _write(f"{base}.g{n:02d}", _geom_lines(spec, n, rng))
+    for n in range(1, spec.flows + 1):
+        _write(f"{base}.u{n:02d}", _flow_lines(spec, n, dss_names, rng))
+    for name in dss_names:
+        with open(os.path.join(dest_dir, name), "wb") as f:
+            # Real bytes rather than a sparse file: DSS files are small and
+            # copied often, so their cost should be measured honestly.
+            f.write(rng.randbytes(int(spec.dss_mb * _MB)))
+
+    with open(f"{base}.rasmap", "w", encoding="utf-8", newline="\r\n") as f:
+        f.write(_rasmap_text(spec))
+    if spec.terrain_gb > 0:
+        terrain_dir = os.path.join(dest_dir, "Terrain")
+        os.makedirs(terrain_dir, exist_ok=True)
+        total = int(spec.terrain_gb * _GB)
+        tiles = max(spec.terrain_tiles, 0)
+        tile_size = total // (tiles + 1)
+        _sparse_file(os.path.join(terrain_dir, "terrain.hdf"), total - tile_size * tiles)
+        tile_names = [f"terrain.tile{t:02d}.tif" for t in range(1, tiles + 1)]
+        for name in tile_names:
+            _sparse_file(os.path.join(terrain_dir, name), tile_size)
+        with open(os.path.join(terrain_dir, "terrain.vrt"), "w", encoding="utf-8") as f:
+            f.write("<VRTDataset>\n")
+            for name in tile_names:
+                f.write(f'  <SourceFilename relativeToVRT="1">{name}</SourceFilename>\n')
+            f.write("</VRTDataset>\n")
+
+    return f"{base}.prj"
+
+
+def remove_results(project_path: str) -> None:
+    """Delete ``.p##.hdf`` files next to *project_path* (reset between runs)."""
+    project_dir = os.path.dirname(os.path.abspath(project_path))
+    base = os.path.splitext(os.path.basename(project_path))[0].lower()
+    for name in os.listdir(project_dir):
+        lower = name.lower()
+        if lower.startswith(f"{base}.p") and lower.endswith(".hdf"):
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(project_dir, name))
@@ -10,10 +10,24 @@ import hashlib
 import json
 import os
 import shutil
+import tempfile
 import time
 from collections.abc import Callable
 from dataclasses import asdict, dataclass, field
 
+from hecras_runner.rasmap import (
+    copy_tree_filtered,
+    is_inside,
+    parse_rasmap,
+    project_file_filter,
+    rasmap_path_for,
+)
+
+# Written last into a terrain cache entry. Entries are filled in a temporary
+# folder and renamed into place, so one without the marker (a worker killed
+# mid-copy) is never used.
+TERRAIN_CACHE_MARKER = ".complete"
+
 # Extensions that belong to a specific plan (suffix-matched)
 _RESULT_EXTENSIONS = ("p", "u", "x", "g", "c", "b", "bco", "dss", "ic.o")
 
@@ -29,6 +43,9 @@ class TransferManifest:
     share_results_dir: str
     terrain_hash: str = ""
     files: list[str] = field(default_factory=list)
+    # Terrain files from the .rasmap, relative with "/" separators; empty for
+    # projects without one, whose "Terrain" folder is cached as a whole
+    terrain_files: list[str] = field(default_factory=list)
 
 
 def project_to_share(
@@ -56,18 +73,24 @@ def project_to_share(
     os.makedirs(share_results_dir, exist_ok=True)
 
     files_copied: list[str] = []
+    keep = project_file_filter(project_path)
 
     for item in os.listdir(project_dir):
         src = os.path.join(project_dir, item)
         dst = os.path.join(share_project_dir, item)
         if os.path.isdir(src):
-            shutil.copytree(src, dst, dirs_exist_ok=True)
-            files_copied.append(f"{item}/")
+            if keep is None:
+                shutil.copytree(src, dst, dirs_exist_ok=True)
+                files_copied.append(f"{item}/")
+            else:
+                copied = copy_tree_filtered(src, dst, keep, item)
+                files_copied += [rel.replace(os.sep, "/") for rel in copied]
         else:
             shutil.copy2(src, dst)
             files_copied.append(item)
 
-    terrain_hash = compute_terrain_hash(project_dir)
+    terrain_files = _rasmap_terrain_files(project_path)
+    terrain_hash = compute_terrain_hash(project_dir, terrain_files)
 
     manifest = TransferManifest(
         job_id=job_id,
@@ -77,6 +100,7 @@ def project_to_share(
         share_results_dir=share_results_dir,
         terrain_hash=terrain_hash,
         files=files_copied,
+        terrain_files=terrain_files,
     )
 
     # Write manifest
@@ -88,6 +112,50 @@ def project_to_share(
     return manifest
 
 
+def default_terrain_cache_dir() -> str:
+    """Per-machine terrain cache (%APPDATA%/hecras_runner/terrain_cache/)."""
+    from hecras_runner.settings import _settings_dir
+
+    return os.path.join(_settings_dir(), "terrain_cache")
+
+
+def terrain_cache_complete(entry_dir: str) -> bool:
+    """True if the terrain cache entry *entry_dir* was fully written."""
+    return os.path.isfile(os.path.join(entry_dir, TERRAIN_CACHE_MARKER))
+
+
+def _fill_terrain_cache(
+    cache_path: str,
+    fill: Callable[[str], None],
+    terrain_hash: str,
+    log: Callable[[str], None],
+) -> None:
+    """Build a terrain cache entry with *fill* and rename it to *cache_path*.
+
+    The entry is assembled in a hidden temporary folder next to it. Another
+    worker that completed the same entry first wins; a failure only costs the
+    cache, never the job.
+    """
+    parent = os.path.dirname(cache_path)
+    tmp_dir = ""
+    try:
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{terrain_hash}.", suffix=".tmp", dir=parent)
+        fill(tmp_dir)
+        with open(os.path.join(tmp_dir, TERRAIN_CACHE_MARKER), "w", encoding="utf-8"):
+            pass
+        if os.path.isdir(cache_path) and not terrain_cache_complete(cache_path):
+            shutil.rmtree(cache_path)  # left by an interrupted copy
+        os.replace(tmp_dir, cache_path)
+        log(f"Cached terrain data ({terrain_hash[:12]}...)")
+    except OSError as e:
+        if not terrain_cache_complete(cache_path):
+            log(f"Could not cache terrain data: {e}")
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
 def share_to_local(
     manifest: TransferManifest,
     local_temp_dir: str,
@@ -104,38 +172,71 @@ def share_to_local(
 
     # Check terrain cache
     terrain_cached = False
+    cache_path = ""
     if terrain_cache_dir and manifest.terrain_hash:
         cache_path = os.path.join(terrain_cache_dir, manifest.terrain_hash)
-        if os.path.isdir(cache_path):
+        if terrain_cache_complete(cache_path):
             log("Using cached terrain data")
             terrain_cached = True
 
-    for item in os.listdir(share_dir):
-        if item == "manifest.json":
-            continue
+    if manifest.terrain_files:
+        # Exact terrain files: restore them from the cache and skip them on the share
+        cached = {os.path.normcase(os.path.normpath(rel)) for rel in manifest.terrain_files}
+        if terrain_cached:
+            for rel in manifest.terrain_files:
+                _copy_file(os.path.join(cache_path, rel), os.path.join(local_temp_dir, rel))
 
-        src = os.path.join(share_dir, item)
-        dst = os.path.join(local_temp_dir, item)
+        def keep(rel: str) -> bool:
+            return not (terrain_cached and os.path.normcase(rel) in cached)
 
-        if os.path.isdir(src):
-            # Skip terrain copy if cached
-            if terrain_cached and item.lower() == "terrain":
-                # Symlink or copy from cache
-                cache_terrain = os.path.join(terrain_cache_dir, manifest.terrain_hash)
-                shutil.copytree(cache_terrain, dst, dirs_exist_ok=True)
+        for item in os.listdir(share_dir):
+            if item == "manifest.json":
+                continue
+            src = os.path.join(share_dir, item)
+            dst = os.path.join(local_temp_dir, item)
+            if os.path.isdir(src):
+                copy_tree_filtered(src, dst, keep, item)
+            elif keep(item):
+                shutil.copy2(src, dst)
+
+        if cache_path and not terrain_cached:
+
+            def fill(entry_dir: str) -> None:
+                for rel in manifest.terrain_files:
+                    _copy_file(os.path.join(local_temp_dir, rel), os.path.join(entry_dir, rel))
+
+            _fill_terrain_cache(cache_path, fill, manifest.terrain_hash, log)
+    else:
+        for item in os.listdir(share_dir):
+            if item == "manifest.json":
                 continue
-            shutil.copytree(src, dst, dirs_exist_ok=True)
-        else:
-            shutil.copy2(src, dst)
 
-    # Update terrain cache
-    if terrain_cache_dir and manifest.terrain_hash and not terrain_cached:
-        terrain_src = os.path.join(local_temp_dir, "Terrain")
-        if os.path.isdir(terrain_src):
-            cache_path = os.path.join(terrain_cache_dir, manifest.terrain_hash)
-            os.makedirs(cache_path, exist_ok=True)
-            shutil.copytree(terrain_src, cache_path, dirs_exist_ok=True)
-            log(f"Cached terrain data ({manifest.terrain_hash[:12]}...)")
+            src = os.path.join(share_dir, item)
+            dst = os.path.join(local_temp_dir, item)
+
+            if os.path.isdir(src):
+                # Skip terrain copy if cached
+                if terrain_cached and item.lower() == "terrain":
+                    shutil.copytree(
+                        cache_path,
+                        dst,
+                        ignore=shutil.ignore_patterns(TERRAIN_CACHE_MARKER),
+                        dirs_exist_ok=True,
+                    )
+                    continue
+                shutil.copytree(src, dst, dirs_exist_ok=True)
+            else:
+                shutil.copy2(src, dst)
+
+        # Update terrain cache
+        if cache_path and not terrain_cached:
+            terrain_src = os.path.join(local_temp_dir, "Terrain")
+            if os.path.isdir(terrain_src):
+
+                def fill(entry_dir: str) -> None:
+                    shutil.copytree(terrain_src, entry_dir, dirs_exist_ok=True)
+
+                _fill_terrain_cache(cache_path, fill, manifest.terrain_hash, log)
 
     prj_path = os.path.join(local_temp_dir, f"{manifest.project_name}.prj")
     log(f"Downloaded project to {local_temp_dir}")
@@ -233,28 +334,54 @@ def verify_transfer(
         return False
 
 
-def compute_terrain_hash(project_dir: str) -> str:
-    """Compute a fast hash of terrain directory contents.
+def _copy_file(src: str, dst: str) -> None:
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    shutil.copy2(src, dst)
+
+
+def _rasmap_terrain_files(project_path: str) -> list[str]:
+    """Terrain files the project's .rasmap uses, relative with "/" separators."""
+    rasmap = rasmap_path_for(project_path)
+    deps = parse_rasmap(rasmap) if rasmap else None
+    if deps is None:
+        return []
+    project_dir = deps.project_dir
+    files = []
+    for path in deps.terrain_files():
+        if is_inside(path, project_dir):  # terrain outside the project is not transferred
+            files.append(os.path.relpath(path, project_dir).replace(os.sep, "/"))
+    return sorted(files)
+
 
-    Uses filenames + sizes + first 4KB of each file for speed.
-    Returns empty string if no Terrain directory found.
+def compute_terrain_hash(project_dir: str, terrain_files: list[str] | None = None) -> str:
+    """Compute a fast hash of a project's terrain.
+
+    Uses filenames + sizes + first 4KB of each file for speed. *terrain_files*
+    (relative to *project_dir*, as resolved from the .rasmap) are hashed when
+    given; otherwise everything under the ``Terrain`` directory is.
+    Returns empty string if there is no terrain.
     """
-    terrain_dir = os.path.join(project_dir, "Terrain")
-    if not os.path.isdir(terrain_dir):
-        return ""
+    if terrain_files:
+        paths = [(rel, os.path.join(project_dir, rel)) for rel in sorted(terrain_files)]
+    else:
+        terrain_dir = os.path.join(project_dir, "Terrain")
+        if not os.path.isdir(terrain_dir):
+            return ""
+        paths = []
+        for root, _dirs, files in os.walk(terrain_dir):
+            for filename in sorted(files):
+                filepath = os.path.join(root, filename)
+                paths.append((os.path.relpath(filepath, terrain_dir), filepath))
 
     h = hashlib.sha256()
-    for root, _dirs, files in os.walk(terrain_dir):
-        for filename in sorted(files):
-            filepath = os.path.join(root, filename)
-            rel_path = os.path.relpath(filepath, terrain_dir)
-            try:
-                size = os.path.getsize(filepath)
-                h.update(f"{rel_path}:{size}:".encode())
-                with open(filepath, "rb") as f:
-                    h.update(f.read(4096))
-            except OSError:
-                continue
+    for rel_path, filepath in paths:
+        try:
+            size = os.path.getsize(filepath)
+            h.update(f"{rel_path}:{size}:".encode())
+            with open(filepath, "rb") as f:
+                h.update(f.read(4096))
+        except OSError:
+            continue
 
     return h.hexdigest()[:24]
 
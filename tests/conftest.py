@@ -12,6 +12,14 @@ PROJECT_PRJ = REPO_ROOT / "test_projects" / "small_project_01.prj"
 SYNTHETIC_PRJ = TESTS_DIR / "synthetic" / "minimal.prj"
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_appdata(tmp_path_factory):
+    """Keep state written under %APPDATA%/hecras_runner out of the real profile."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("APPDATA", str(tmp_path_factory.mktemp("appdata")))
+        yield
+
+
 @pytest.fixture(scope="session")
 def qapp():
     """Shared QApplication instance for tests that need Qt."""
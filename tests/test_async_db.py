@@ -0,0 +1,284 @@
+"""Tests for hecras_runner.async_db (all mocked — no real DB needed)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from hecras_runner.async_db import AsyncDbClient, EventLoopThread
+from hecras_runner.db import JOBS_CHANNEL, BatchSubmission
+from hecras_runner.settings import DbSettings
+
+
+def _nolog(msg: str) -> None:
+    pass
+
+
+def _make_mock_pool():
+    """Mock AsyncConnectionPool whose connection() is an async context manager."""
+    pool = MagicMock()
+    conn = MagicMock()
+    cursor = MagicMock()
+    cursor.fetchone = AsyncMock(return_value=None)
+    cursor.fetchall = AsyncMock(return_value=[])
+    cursor.rowcount = 1
+    conn.execute = AsyncMock(return_value=cursor)
+    conn.commit = AsyncMock()
+    conn.rollback = AsyncMock()
+    pool.connection.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.connection.return_value.__aexit__ = AsyncMock(return_value=False)
+    pool.close = AsyncMock()
+    return pool, conn, cursor
+
+
+class TestEventLoopThread:
+    def test_run_and_submit(self):
+        loop = EventLoopThread()
+        try:
+
+            async def _where() -> str:
+                await asyncio.sleep(0)
+                return threading.current_thread().name
+
+            assert loop.run(_where(), timeout=5) == "db-loop"
+            assert loop.submit(_where()).result(5) == "db-loop"
+        finally:
+            loop.stop()
+        assert loop.loop.is_closed()
+
+    def test_run_reraises(self):
+        loop = EventLoopThread()
+        try:
+
+            async def _boom() -> None:
+                raise ValueError("bad")
+
+            with pytest.raises(ValueError, match="bad"):
+                loop.run(_boom(), timeout=5)
+        finally:
+            loop.stop()
+
+    def test_stop_cancels_pending_tasks(self):
+        loop = EventLoopThread()
+        started = threading.Event()
+        cleaned_up: list[bool] = []
+
+        async def _forever() -> None:
+            started.set()
+            try:
+                await asyncio.sleep(3600)
+            finally:
+                await asyncio.sleep(0)  # cleanup may still await
+                cleaned_up.append(True)
+
+        future = loop.submit(_forever())
+        assert started.wait(5)
+
+        loop.stop()
+
+        assert cleaned_up == [True]
+        assert future.cancelled()
+        assert loop.loop.is_closed()
+
+
+class TestAsyncDbClientConnect:
+    def test_connect_without_psycopg(self):
+        messages: list[str] = []
+        with patch.dict("sys.modules", {"psycopg_pool": None}):
+            client = asyncio.run(AsyncDbClient.connect(DbSettings(), log=messages.append))
+        assert client is None
+        assert any("not installed" in m for m in messages)
+
+    def test_connect_failure(self):
+        pool_module = MagicMock()
+        pool_module.AsyncConnectionPool.return_value.open = AsyncMock(
+            side_effect=OSError("unreachable")
+        )
+        messages: list[str] = []
+        with patch.dict("sys.modules", {"psycopg_pool": pool_module}):
+            client = asyncio.run(AsyncDbClient.connect(DbSettings(), log=messages.append))
+        assert client is None
+        assert any("unreachable" in m for m in messages)
+
+
+class TestAsyncDbClient:
+    def test_register_worker(self):
+        pool, conn, cursor = _make_mock_pool()
+        cursor.fetchone.return_value = ("worker-uuid-123",)
+        client = AsyncDbClient(pool, log=_nolog)
+
+        info = asyncio.run(client.register_worker(hecras_path="Ras.exe", max_concurrent=2))
+
+        assert info.worker_id == "worker-uuid-123"
+        assert "INSERT INTO" in conn.execute.call_args[0][0]
+        conn.commit.assert_awaited_once()
+
+    def test_submit_batch(self):
+        pool, conn, _ = _make_mock_pool()
+        client = AsyncDbClient(pool, log=_nolog)
+        jobs = [{"plan_name": "plan01", "plan_suffix": "01", "job_id": "j1"}]
+
+        result = asyncio.run(client.submit_batch("p.prj", "Title", jobs))
+
+        assert isinstance(result, BatchSubmission)
+        assert result.job_ids == ["j1"]
+        sql, params = conn.execute.call_args[0]
+        assert "pg_notify" in sql
+        assert params[-2:] == (JOBS_CHANNEL, result.batch_id)
+
+    def test_claim_jobs(self):
+        pool, conn, cursor = _make_mock_pool()
+        cursor.fetchall.return_value = [("j1", "b1", "plan01", "01", "p.prj", None, 1, "abc")]
+        client = AsyncDbClient(pool, log=_nolog, lease_seconds=60, aging_seconds=300)
+
+        jobs = asyncio.run(client.claim_jobs("w1", 2, capabilities={"cores": 8}))
+
+        assert jobs == [
+            {
+                "job_id": "j1",
+                "batch_id": "b1",
+                "plan_name": "plan01",
+                "plan_suffix": "01",
+                "project_path": "p.prj",
+                "metadata": {},
+                "attempt": 1,
+                "terrain_hash": "abc",
+                "worker_id": "w1",
+            }
+        ]
+        assert conn.execute.call_args[0][1] == ('{"cores": 8}', "w1", 300, 32, 2, "w1", 60)
+        assert asyncio.run(client.claim_jobs("w1", 0)) == []
+
+    def test_complete_job_lease_lost(self):
+        pool, _, cursor = _make_mock_pool()
+        cursor.rowcount = 0
+        client = AsyncDbClient(pool, log=_nolog)
+
+        done = asyncio.run(client.complete_job("j1", True, 1.0, worker_id="w1"))
+
+        assert done is False
+
+    def test_get_batch_status(self):
+        pool, _, cursor = _make_mock_pool()
+        cursor.fetchone.return_value = ("running", 4, 1, 0, 1, 2, 0, 0)
+        client = AsyncDbClient(pool, log=_nolog)
+
+        status = asyncio.run(client.get_batch_status("b1"))
+
+        assert status["status"] == "running"
+        assert status["completed"] == 2
+
+    def test_get_batch_status_not_found(self):
+        pool, _, _ = _make_mock_pool()
+        client = AsyncDbClient(pool, log=_nolog)
+        assert asyncio.run(client.get_batch_status("b1"))["status"] == "not_found"
+
+    def test_concurrent_queries_share_the_loop(self):
+        pool, _, cursor = _make_mock_pool()
+        cursor.fetchall.return_value = [("w1", "host", None, "idle", None, 1, None)]
+        client = AsyncDbClient(pool, log=_nolog)
+
+        async def _many() -> list:
+            return await asyncio.gather(*(client.get_active_workers() for _ in range(20)))
+
+        results = asyncio.run(_many())
+
+        assert len(results) == 20
+        assert results[0][0]["hostname"] == "host"
+
+    def test_progress_buffered_until_heartbeat(self):
+        pool, conn, _ = _make_mock_pool()
+        client = AsyncDbClient(pool, log=_nolog, lease_seconds=60)
+
+        async def _run() -> None:
+            await client.start_heartbeat("w1", interval=60, flush_interval=0.01)
+            await client.update_progress("j1", 0.25)
+            await client.update_progress("j1", 0.5)
+            for _ in range(200):
+                if conn.execute.await_count:
+                    break
+                await asyncio.sleep(0.01)
+            await client.stop_heartbeat()
+
+        asyncio.run(_run())
+
+        sql, params = conn.execute.call_args[0]
+        assert "last_heartbeat" in sql
+        assert params == ("w1", 60, "j1", 0.5, "w1")
+        assert client._progress == {}
+
+    def test_wait_for_jobs_notified(self):
+        pool, _, _ = _make_mock_pool()
+        client = AsyncDbClient(pool, log=_nolog)
+        listen = MagicMock()
+
+        async def _notifies(timeout=None, stop_after=None):
+            yield MagicMock(payload="b1")
+
+        listen.notifies = _notifies
+
+        with patch.object(client, "_connect_listener", AsyncMock(return_value=listen)):
+            assert asyncio.run(client.wait_for_jobs(5)) is True
+
+    def test_wait_for_jobs_listener_unavailable(self):
+        pool, _, _ = _make_mock_pool()
+        messages: list[str] = []
+        client = AsyncDbClient(pool, log=messages.append)
+
+        with patch.object(client, "_connect_listener", AsyncMock(side_effect=OSError("no route"))):
+            assert asyncio.run(client.wait_for_jobs(0.05)) is False
+
+        assert any("LISTEN connection failed" in m for m in messages)
+
+    def test_wait_for_jobs_lost_connection_waits_before_reconnecting(self):
+        pool, _, _ = _make_mock_pool()
+        client = AsyncDbClient(pool, log=_nolog)
+        listen = MagicMock()
+        listen.close = AsyncMock()
+
+        async def _notifies(timeout=None, stop_after=None):
+            raise OSError("server closed the connection")
+            yield
+
+        listen.notifies = _notifies
+        connect = AsyncMock(return_value=listen)
+
+        with patch.object(client, "_connect_listener", connect):
+            assert asyncio.run(client.wait_for_jobs(0.2)) is False
+
+        connect.assert_awaited_once()
+        assert client._listen_retry_at > time.monotonic()
+
+    def test_listen_for_jobs_calls_back(self):
+        pool, _, _ = _make_mock_pool()
+        client = AsyncDbClient(pool, log=_nolog)
+        stop = threading.Event()
+        payloads: list[str] = []
+        listen = MagicMock()
+        listen.close = AsyncMock()
+
+        async def _notifies(timeout=None, stop_after=None):
+            yield MagicMock(payload="b1")
+            stop.set()
+
+        listen.notifies = _notifies
+
+        async def _run() -> None:
+            task = await client.listen_for_jobs(payloads.append, stop=stop)
+            await asyncio.wait_for(task, 5)
+
+        with patch.object(client, "_connect_listener", AsyncMock(return_value=listen)):
+            asyncio.run(_run())
+
+        assert payloads == ["b1"]
+        listen.close.assert_awaited_once()
+
+    def test_close(self):
+        pool, _, _ = _make_mock_pool()
+        client = AsyncDbClient(pool, log=_nolog)
+        asyncio.run(client.close())
+        pool.close.assert_awaited_once()
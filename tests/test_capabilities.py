@@ -0,0 +1,73 @@
+"""Tests for hecras_runner.capabilities — worker capabilities and job requirements."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+from hecras_runner.capabilities import (
+    cached_terrain_hashes,
+    hecras_version_from_path,
+    job_requirements,
+    total_ram_bytes,
+    worker_capabilities,
+)
+from hecras_runner.scratch import ScratchManager
+from hecras_runner.transfer import TERRAIN_CACHE_MARKER
+
+
+class TestWorkerCapabilities:
+    def test_version_from_install_folder(self):
+        assert hecras_version_from_path(r"C:\Program Files (x86)\HEC\HEC-RAS\6.6\Ras.exe") == "6.6"
+        assert hecras_version_from_path(r"D:\tools\ras\Ras.exe") == ""
+
+    def test_cached_terrain_hashes(self, tmp_path: Path):
+        for name in ("abc", "def", ".ghi.x1y2.tmp"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / TERRAIN_CACHE_MARKER).write_text("")
+        (tmp_path / "partial").mkdir()  # interrupted before completion
+        (tmp_path / "stray.txt").write_text("")
+        assert cached_terrain_hashes(str(tmp_path)) == ["abc", "def"]
+        assert cached_terrain_hashes(str(tmp_path / "missing")) == []
+        assert cached_terrain_hashes(None) == []
+
+    def test_total_ram(self):
+        assert total_ram_bytes() >= 0
+
+    def test_capabilities(self, tmp_path: Path):
+        (tmp_path / "cache" / "abc").mkdir(parents=True)
+        (tmp_path / "cache" / "abc" / TERRAIN_CACHE_MARKER).write_text("")
+        scratch = ScratchManager([str(tmp_path)])
+        with (
+            patch("hecras_runner.capabilities.total_ram_bytes", return_value=32 * 1024**3),
+            patch("hecras_runner.capabilities.os.cpu_count", return_value=8),
+            patch.object(ScratchManager, "available", return_value=100 * 1024**3),
+        ):
+            caps = worker_capabilities(r"C:\HEC-RAS\6.5\Ras.exe", scratch, str(tmp_path / "cache"))
+        assert caps == {
+            "ram_gb": 32.0,
+            "cores": 8,
+            "hecras_version": "6.5",
+            "scratch_free_gb": 100.0,
+            "terrain_hashes": ["abc"],
+        }
+
+    def test_unknown_values_left_out(self):
+        with (
+            patch("hecras_runner.capabilities.total_ram_bytes", return_value=0),
+            patch("hecras_runner.capabilities.os.cpu_count", return_value=None),
+        ):
+            assert worker_capabilities() == {"terrain_hashes": []}
+
+
+class TestJobRequirements:
+    def test_scratch_from_footprint(self, tmp_path: Path):
+        prj = tmp_path / "proj.prj"
+        prj.write_text("Proj Title=Test\n")
+        with patch("hecras_runner.capabilities.estimate_footprint", return_value=3 * 1024**3):
+            req = job_requirements(str(prj), "01", ram_gb=16, hecras_version="6")
+        assert req == {"scratch_gb": 3.0, "ram_gb": 16, "hecras_version": "6"}
+
+    def test_unreadable_project(self, tmp_path: Path):
+        with patch("hecras_runner.capabilities.estimate_footprint", side_effect=OSError):
+            assert job_requirements(str(tmp_path / "nope.prj"), "01") == {}
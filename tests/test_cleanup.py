@@ -0,0 +1,144 @@
+"""Tests for hecras_runner.cleanup."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from hecras_runner.cleanup import CleanupService
+
+
+def _nolog(msg: str) -> None:
+    pass
+
+
+def _make_dir(parent: Path, name: str) -> Path:
+    d = parent / name
+    d.mkdir()
+    (d / "file.txt").write_text("content")
+    return d
+
+
+class TestCleanupService:
+    def test_enqueue_deletes_in_background(self, tmp_path: Path):
+        service = CleanupService(state_path=str(tmp_path / "state.json"), log=_nolog)
+        service.start()
+        try:
+            target = _make_dir(tmp_path, "HECRAS_abc")
+            service.enqueue(str(target))
+            assert service.wait_idle(timeout=5)
+            assert not target.exists()
+            assert service.pending() == []
+        finally:
+            service.shutdown(timeout=1)
+
+    def test_retries_until_unlocked(self, tmp_path: Path):
+        service = CleanupService(
+            state_path=str(tmp_path / "state.json"), log=_nolog, base_delay=0.01
+        )
+        target = _make_dir(tmp_path, "HECRAS_locked")
+        real_rmtree = __import__("shutil").rmtree
+        calls = {"n": 0}
+
+        def flaky_rmtree(path):
+            calls["n"] += 1
+            if calls["n"] < 3:
+                raise PermissionError("locked")
+            real_rmtree(path)
+
+        with patch("hecras_runner.cleanup.shutil.rmtree", side_effect=flaky_rmtree):
+            service.start()
+            service.enqueue(str(target))
+            assert service.wait_idle(timeout=5)
+            service.shutdown(timeout=1)
+
+        assert calls["n"] == 3
+        assert not target.exists()
+
+    def test_gives_up_but_keeps_persisted(self, tmp_path: Path):
+        state = tmp_path / "state.json"
+        service = CleanupService(state_path=str(state), log=_nolog, base_delay=0.01, max_attempts=2)
+        target = _make_dir(tmp_path, "HECRAS_stuck")
+        messages: list[str] = []
+
+        with patch("hecras_runner.cleanup.shutil.rmtree", side_effect=PermissionError("locked")):
+            service.start()
+            service.enqueue(str(target), log=messages.append)
+            assert service.wait_idle(timeout=5)
+            service.shutdown(timeout=1)
+
+        assert any("Could not clean up" in m for m in messages)
+        assert json.loads(state.read_text()) == [str(target)]
+
+    def test_resumes_persisted_deletions(self, tmp_path: Path):
+        state = tmp_path / "state.json"
+        target = _make_dir(tmp_path, "HECRAS_left_over")
+        state.write_text(json.dumps([str(target)]))
+
+        service = CleanupService(state_path=str(state), log=_nolog)
+        service.start()
+        try:
+            assert service.wait_idle(timeout=5)
+        finally:
+            service.shutdown(timeout=1)
+
+        assert not target.exists()
+        assert json.loads(state.read_text()) == []
+
+    def test_processes_sharing_state_keep_each_others_entries(self, tmp_path: Path):
+        state = tmp_path / "state.json"
+        gui = CleanupService(state_path=str(state), log=_nolog)
+        cli = CleanupService(state_path=str(state), log=_nolog)
+        ours = _make_dir(tmp_path, "HECRAS_gui")
+        theirs = tmp_path / "HECRAS_cli"
+
+        gui.start()
+        try:
+            cli.enqueue(str(theirs))  # not started: stays pending
+            gui.enqueue(str(ours))
+            assert gui.wait_idle(timeout=5)
+        finally:
+            gui.shutdown(timeout=1)
+
+        assert not ours.exists()
+        assert json.loads(state.read_text()) == [str(theirs)]
+        assert not (tmp_path / "state.json.lock").exists()
+
+    def test_stale_state_lock_is_broken(self, tmp_path: Path):
+        state = tmp_path / "state.json"
+        lock = tmp_path / "state.json.lock"
+        lock.write_text("")
+        os.utime(lock, (time.time() - 3600, time.time() - 3600))
+        service = CleanupService(state_path=str(state), log=_nolog)
+
+        service.enqueue(str(tmp_path / "HECRAS_x"))
+
+        assert json.loads(state.read_text()) == [str(tmp_path / "HECRAS_x")]
+        assert not lock.exists()
+
+    def test_sweep_orphans_only_old_hecras_dirs(self, tmp_path: Path):
+        temp_root = tmp_path / "tmp"
+        temp_root.mkdir()
+        old = _make_dir(temp_root, "HECRAS_old")
+        fresh = _make_dir(temp_root, "HECRAS_fresh")
+        other = _make_dir(temp_root, "other_old")
+        stale = time.time() - 48 * 3600
+        for d in (old, other):
+            os.utime(d / "file.txt", (stale, stale))
+            os.utime(d, (stale, stale))
+
+        service = CleanupService(state_path=str(tmp_path / "state.json"), log=_nolog)
+        service.start()
+        try:
+            count = service.sweep_orphans(str(temp_root), max_age_hours=12)
+            assert service.wait_idle(timeout=5)
+        finally:
+            service.shutdown(timeout=1)
+
+        assert count == 1
+        assert not old.exists()
+        assert fresh.exists()
+        assert other.exists()
@@ -3,9 +3,19 @@
 from __future__ import annotations
 
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from hecras_runner.cli import build_parser, main
+from hecras_runner.preflight import PreflightIssue, PreflightReport
+
+
+@pytest.fixture
+def _preflight_ok():
+    """Pre-flight passes (the bundled test project ships without its DSS file)."""
+    with patch("hecras_runner.cli.validate_plans", return_value=PreflightReport()) as mock:
+        yield mock
 
 
 class TestBuildParser:
@@ -71,7 +81,8 @@ class TestBuildParser:
         parser = build_parser()
         args = parser.parse_args(["worker"])
         assert args.max_concurrent == 1
-        assert args.poll_interval == 5.0
+        assert args.poll_interval == 60.0
+        assert args.progress_interval == 5.0
         assert args.timeout == 7200.0
 
 
@@ -94,6 +105,16 @@ class TestMainListMode:
         assert "Minimal" in output
         assert "Test Plan" in output
 
+    def test_list_shows_geometry_sizes(self, tmp_project: Path, capsys):
+        from hecras_runner.geom_hdf import GeomHdfInfo
+
+        info = GeomHdfInfo(flow_areas={"Perimeter 1": 4321}, cross_sections=3, structures=1)
+        with patch("hecras_runner.parser.read_geom_hdf", return_value=info):
+            result = main([str(tmp_project), "--list", "--no-cache"])
+        assert result == 0
+        output = capsys.readouterr().out
+        assert "g01: 4,321 2D cells in 1 area(s), 3 cross sections, 1 structures" in output
+
 
 class TestMainErrors:
     def test_missing_file(self, capsys):
@@ -121,6 +142,7 @@ class TestMainErrors:
         assert "not found" in err
 
 
+@pytest.mark.usefixtures("_preflight_ok")
 class TestBackendSelection:
     @patch("hecras_runner.cli.run_simulations")
     @patch("hecras_runner.cli.check_hecras_installed", return_value=True)
@@ -154,7 +176,18 @@ class TestBackendSelection:
         kwargs = mock_run.call_args[1]
         assert kwargs["timeout_seconds"] == 3600.0
 
+    @patch("hecras_runner.cli.run_simulations")
+    @patch("hecras_runner.cli.check_hecras_installed", return_value=True)
+    def test_ram_disk_passed_to_scratch(self, _mock_check, mock_run, prtest1_prj: Path, tmp_path):
+        ram = str(tmp_path / "ram")
+        result = main([str(prtest1_prj), "--all", "--ram-disk", ram, "--ram-budget", "1.5"])
+        assert result == 0
+        scratch = mock_run.call_args[1]["scratch"]
+        assert scratch.ram_root == ram
+        assert scratch.ram_budget_bytes == int(1.5 * 1024**3)
+
 
+@pytest.mark.usefixtures("_preflight_ok")
 class TestMainRunMode:
     @patch("hecras_runner.cli.run_simulations")
     @patch("hecras_runner.cli.check_hecras_installed", return_value=True)
@@ -193,3 +226,185 @@ class TestMainRunMode:
         assert result == 0
         jobs = mock_run.call_args[1]["jobs"]
         assert all(j.dss_path == r"C:\new\file.dss" for j in jobs)
+
+    @patch("hecras_runner.cli.run_simulations")
+    @patch("hecras_runner.cli.check_hecras_installed", return_value=False)
+    def test_queue_submits_selected_plans(
+        self, _mock_check, mock_run, prtest1_prj: Path, tmp_path, capsys
+    ):
+        from hecras_runner.sqlite_queue import SqliteQueueClient
+
+        path = str(tmp_path / "queue.sqlite")
+        result = main([str(prtest1_prj), "--plans", "plan_01", "plan_03", "--queue", path])
+        assert result == 0
+        mock_run.assert_not_called()
+        assert f"hecras-runner worker --queue {path}" in capsys.readouterr().out
+
+        queue = SqliteQueueClient.connect(path, log=lambda _msg: None)
+        assert queue is not None
+        worker = queue.register_worker()
+        jobs = queue.claim_jobs(worker.worker_id, 5)
+        queue.close()
+        assert [(j["plan_name"], j["plan_suffix"]) for j in jobs] == [
+            ("plan_01", "01"),
+            ("plan_03", "03"),
+        ]
+        assert {j["project_path"] for j in jobs} == {str(prtest1_prj.resolve())}
+
+    def test_queue_rejects_dss(self, prtest1_prj: Path, tmp_path, capsys):
+        path = str(tmp_path / "queue.sqlite")
+        result = main([str(prtest1_prj), "--all", "--dss", "x.dss", "--queue", path])
+        assert result == 1
+        assert "--queue" in capsys.readouterr().err
+
+
+class TestPreflight:
+    @patch("hecras_runner.cli.run_simulations")
+    @patch("hecras_runner.cli.check_hecras_installed", return_value=True)
+    def test_errors_abort_before_running(self, _mock_check, mock_run, prtest1_prj: Path, capsys):
+        result = main([str(prtest1_prj), "--all"])
+        assert result == 1
+        mock_run.assert_not_called()
+        err = capsys.readouterr().err
+        assert "DSS file not found: 100yCC_2024.dss" in err
+        assert "--skip-preflight" in err
+
+    @patch("hecras_runner.cli.run_simulations")
+    @patch("hecras_runner.cli.check_hecras_installed", return_value=True)
+    def test_skip_preflight(self, _mock_check, mock_run, prtest1_prj: Path):
+        with patch("hecras_runner.cli.validate_plans") as validate:
+            result = main([str(prtest1_prj), "--all", "--skip-preflight"])
+        assert result == 0
+        validate.assert_not_called()
+        mock_run.assert_called_once()
+
+    @patch("hecras_runner.cli.run_simulations")
+    @patch("hecras_runner.cli.check_hecras_installed", return_value=True)
+    def test_warnings_do_not_block(self, _mock_check, mock_run, prtest1_prj: Path, capsys):
+        report = PreflightReport(
+            issues=[PreflightIssue("p01", "plan_01", "Terrain file not found: t.hdf", "warning")]
+        )
+        with patch("hecras_runner.cli.validate_plans", return_value=report):
+            result = main([str(prtest1_prj), "--plans", "plan_01"])
+        assert result == 0
+        mock_run.assert_called_once()
+        assert "WARNING: plan_01 (p01): Terrain file not found" in capsys.readouterr().err
+
+
+class TestIndexCommand:
+    def test_index_subcommand_is_not_treated_as_run(self):
+        args = build_parser().parse_args(["index", "C:/share", "--unrun"])
+        assert args.command == "index"
+        assert args.roots == ["C:/share"]
+        assert args.unrun is True
+
+    def test_scan_and_query(self, tmp_path: Path, synthetic_prj: Path, capsys):
+        import shutil
+
+        root = tmp_path / "share"
+        shutil.copytree(synthetic_prj.parent, root / "proj")
+        db = str(tmp_path / "index.sqlite")
+
+        assert main(["index", str(root), "--db", db]) == 0
+        assert "Indexed 1 project(s)" in capsys.readouterr().out
+
+        assert main(["index", "--db", db, "--geometry", "test*"]) == 0
+        out = capsys.readouterr().out
+        assert "p01: Test Plan" in out
+        assert "not run" in out
+        assert "1 plan(s)" in out
+
+    def test_missing_root_is_an_error(self, tmp_path: Path):
+        db = str(tmp_path / "index.sqlite")
+        assert main(["index", str(tmp_path / "nope"), "--db", db]) == 1
+
+    def test_dss_with_plan_filters_is_rejected(self, tmp_path: Path, capsys):
+        db = str(tmp_path / "index.sqlite")
+        with pytest.raises(SystemExit) as exc:
+            main(["index", "--db", db, "--dss", "*.dss", "--unrun"])
+        assert exc.value.code == 2
+        assert "--dss cannot be combined with plan filters" in capsys.readouterr().err
+
+
+class TestWorkerCommand:
+    def _run(self, db, run_job) -> int:
+        from hecras_runner.settings import AppSettings
+
+        settings = AppSettings()
+        settings.db.host = "db.local"
+        handlers = []
+
+        def _claim(worker_id, limit, capabilities=None):
+            batch = db.batches.pop(0) if db.batches else []
+            if not batch:
+                handlers[0](2, None)  # Ctrl+C once the queue is drained
+            return batch
+
+        db.claim_jobs.side_effect = _claim
+        with (
+            patch("hecras_runner.cli.load_settings", return_value=settings),
+            patch("hecras_runner.cli.find_hecras_exe", return_value="Ras.exe"),
+            patch("hecras_runner.db.DbClient.connect", return_value=db),
+            patch("hecras_runner.cli.signal.signal", side_effect=lambda s, h: handlers.append(h)),
+            patch("hecras_runner.cli._run_worker_job", side_effect=run_job),
+            patch("hecras_runner.cli.shutdown_cleanup_service"),
+        ):
+            return main(["worker", "--max-concurrent", "3"])
+
+    def test_claims_for_all_free_slots(self):
+        db = MagicMock()
+        db.register_worker.return_value.worker_id = "w1"
+        db.batches = [
+            [{"job_id": f"j{i}", "plan_name": f"plan{i}", "plan_suffix": f"0{i}"} for i in (1, 2)],
+        ]
+        ran: list[str] = []
+
+        assert self._run(db, lambda job, *a: ran.append(job["job_id"])) == 0
+
+        assert db.claim_jobs.call_args_list[0].args == ("w1", 3)
+        caps = db.claim_jobs.call_args_list[0].kwargs["capabilities"]
+        assert caps["cores"] >= 1
+        assert "terrain_hashes" in caps
+        assert db.register_worker.call_args.kwargs["capabilities"]["cores"] >= 1
+        db.start_heartbeat.assert_called_once_with("w1", flush_interval=5.0)
+        assert sorted(ran) == ["j1", "j2"]
+        db.set_worker_offline.assert_called_once_with("w1")
+
+    def test_failed_job_is_completed_as_failed(self):
+        db = MagicMock()
+        db.register_worker.return_value.worker_id = "w1"
+        db.batches = [[{"job_id": "j1", "plan_name": "plan1", "plan_suffix": "01"}]]
+
+        def boom(job, *args):
+            raise RuntimeError("Insufficient scratch space")
+
+        assert self._run(db, boom) == 0
+        db.complete_job.assert_called_once()
+        assert db.complete_job.call_args.kwargs["error_message"] == "Insufficient scratch space"
+
+    def test_local_queue(self, tmp_path: Path):
+        from hecras_runner.settings import AppSettings
+        from hecras_runner.sqlite_queue import SqliteQueueClient
+
+        path = str(tmp_path / "queue.sqlite")
+        queue = SqliteQueueClient.connect(path, log=lambda _msg: None)
+        assert queue is not None
+        batch = queue.submit_batch("p.prj", "P", [{"plan_name": "plan01", "plan_suffix": "01"}])
+        handlers = []
+
+        def run_job(job, ras_exe, args, db, *rest):
+            assert args.queue == path
+            db.complete_job(job["job_id"], True, 1.0, worker_id=job["worker_id"])
+            handlers[0](2, None)
+
+        with (
+            patch("hecras_runner.cli.load_settings", return_value=AppSettings()),
+            patch("hecras_runner.cli.find_hecras_exe", return_value="Ras.exe"),
+            patch("hecras_runner.cli.signal.signal", side_effect=lambda s, h: handlers.append(h)),
+            patch("hecras_runner.cli._run_worker_job", side_effect=run_job),
+            patch("hecras_runner.cli.shutdown_cleanup_service"),
+        ):
+            assert main(["worker", "--queue", path]) == 0
+
+        assert queue.get_batch_status(batch.batch_id)["status"] == "completed"
+        queue.close()
@@ -2,9 +2,18 @@
 
 from __future__ import annotations
 
+import os
+import threading
+import time
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from hecras_runner._queue_sql import CURRENT_SCHEMA_VERSION
 from hecras_runner.db import (
+    JOBS_CHANNEL,
+    BatchSubmission,
     DbClient,
     WorkerInfo,
 )
@@ -52,13 +61,16 @@ class TestDbClientWorker:
         client = DbClient(pool, log=_nolog)
 
         with (
-            patch("hecras_runner.db.socket.gethostname", return_value="PC-01"),
-            patch("hecras_runner.db.socket.gethostbyname", return_value="192.168.1.1"),
-            patch("hecras_runner.db.platform.platform", return_value="Windows-11"),
+            patch("hecras_runner._queue_sql.socket.gethostname", return_value="PC-01"),
+            patch("hecras_runner._queue_sql.socket.gethostbyname", return_value="192.168.1.1"),
+            patch("hecras_runner._queue_sql.platform.platform", return_value="Windows-11"),
         ):
-            info = client.register_worker(hecras_version="6.6", max_concurrent=2)
+            info = client.register_worker(
+                hecras_version="6.6", max_concurrent=2, capabilities={"cores": 8}
+            )
 
         assert isinstance(info, WorkerInfo)
+        assert conn.execute.call_args[0][1][-1] == '{"cores": 8}'
         assert info.worker_id == "worker-uuid-123"
         assert info.hostname == "PC-01"
         assert info.ip_address == "192.168.1.1"
@@ -70,10 +82,122 @@ class TestDbClientWorker:
         client.heartbeat("worker-123")
 
         conn.execute.assert_called()
-        sql = conn.execute.call_args[0][0]
+        sql = conn.execute.call_args_list[0][0][0]
         assert "UPDATE" in sql
         assert "last_heartbeat" in sql
 
+    def test_heartbeat_extends_job_leases(self):
+        pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog, lease_seconds=120)
+
+        client.heartbeat("worker-123")
+
+        sql, params = conn.execute.call_args[0]
+        assert "lease_expires_at" in sql
+        assert params == ("worker-123", 120, "worker-123")
+        conn.execute.assert_called_once()
+        conn.commit.assert_called_once()
+
+    def test_heartbeat_writes_buffered_progress(self):
+        pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog, lease_seconds=120)
+        client._heartbeat_thread = MagicMock()  # buffering while the thread runs
+
+        client.update_progress("job-1", 0.25)
+        client.update_progress("job-2", 0.1)
+        client.update_progress("job-1", 0.5)  # only the latest value is written
+        conn.execute.assert_not_called()
+
+        client.heartbeat("worker-123")
+
+        sql, params = conn.execute.call_args[0]
+        assert "(VALUES (%s::uuid, %s::real), (%s::uuid, %s::real))" in sql
+        assert params == ("worker-123", 120, "job-1", 0.5, "job-2", 0.1, "worker-123")
+        assert client._progress == {}
+
+    def test_heartbeat_filters_on_updated_row(self):
+        # A job completed while the flush waits for its row lock must be
+        # re-checked against its new status, not a snapshot of a joined copy.
+        pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+        client._heartbeat_thread = MagicMock()
+        client.update_progress("job-1", 0.5)
+
+        client.heartbeat("worker-123")
+
+        sql = conn.execute.call_args[0][0]
+        assert "WHERE j.worker_id = %s AND j.status IN ('assigned', 'running')" in sql
+        assert "held" not in sql
+
+    def test_heartbeat_failure_keeps_progress(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.side_effect = RuntimeError("connection lost")
+        client = DbClient(pool, log=_nolog)
+        client._heartbeat_thread = MagicMock()
+        client.update_progress("job-1", 0.5)
+
+        with pytest.raises(RuntimeError):
+            client.heartbeat("worker-123")
+
+        assert client._progress == {"job-1": 0.5}
+
+    def test_completed_job_drops_buffered_progress(self):
+        pool, _ = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+        client._heartbeat_thread = MagicMock()
+        client.update_progress("job-1", 0.5)
+
+        client.complete_job("job-1", True, 1.0)
+
+        assert client._progress == {}
+
+    def test_heartbeat_loop_flushes_progress_between_beats(self):
+        pool, _ = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+
+        with (
+            patch.object(client, "heartbeat") as beat,
+            patch.object(client, "reap_expired_jobs", return_value=0) as reap,
+        ):
+            client.start_heartbeat("worker-123", interval=60, flush_interval=0.01)
+            time.sleep(0.1)
+            assert not beat.called  # nothing pending, heartbeat not due
+            client.update_progress("job-1", 0.5)
+            deadline = time.monotonic() + 2
+            while not beat.called and time.monotonic() < deadline:
+                time.sleep(0.01)
+            client.stop_heartbeat()
+
+        beat.assert_called_with("worker-123")
+        reap.assert_not_called()
+
+    def test_heartbeat_loop_reaps_expired_jobs(self):
+        pool, _ = _make_mock_pool()
+        messages: list[str] = []
+        client = DbClient(pool, log=messages.append)
+
+        with (
+            patch.object(client, "heartbeat"),
+            patch.object(client, "reap_expired_jobs", return_value=2) as reap,
+        ):
+            client.start_heartbeat("worker-123", interval=0.01)
+            deadline = time.monotonic() + 2
+            while not reap.called and time.monotonic() < deadline:
+                time.sleep(0.01)
+            client.stop_heartbeat()
+
+        assert reap.called
+        assert any("Requeued 2 job(s)" in m for m in messages)
+
+    def test_reap_expired_jobs(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.return_value.fetchone.return_value = (3,)
+        client = DbClient(pool, log=_nolog)
+
+        assert client.reap_expired_jobs() == 3
+        assert "reap_expired_jobs()" in conn.execute.call_args[0][0]
+        conn.commit.assert_called_once()
+
     def test_set_worker_offline(self):
         pool, conn = _make_mock_pool()
         client = DbClient(pool, log=_nolog)
@@ -88,44 +212,108 @@ class TestDbClientWorker:
 class TestDbClientBatch:
     def test_submit_batch(self):
         pool, conn = _make_mock_pool()
-        conn.execute.return_value.fetchone.return_value = ("batch-uuid-456",)
         client = DbClient(pool, log=_nolog)
 
         jobs = [
             {"plan_name": "plan01", "plan_suffix": "01"},
             {"plan_name": "plan02", "plan_suffix": "02"},
         ]
-        batch_id = client.submit_batch(
+        submission = client.submit_batch(
             project_path=r"C:\project\test.prj",
             project_title="Test Project",
             jobs=jobs,
             submitted_by="user@host",
         )
 
-        assert batch_id == "batch-uuid-456"
-        # Should have called execute for batch INSERT + 2 job INSERTs + commit
-        assert conn.execute.call_count >= 3
+        assert isinstance(submission, BatchSubmission)
+        assert len(submission.job_ids) == 2
+        assert len(set(submission.job_ids)) == 2
+        # Batch, jobs and notification in a single statement
+        assert conn.execute.call_count == 1
+        conn.commit.assert_called_once()
+        params = conn.execute.call_args[0][1]
+        assert submission.batch_id in params
+        assert submission.job_ids in params
+        assert ["plan01", "plan02"] in params
+        assert ["01", "02"] in params
+        assert ["", ""] in params  # no terrain hash
+        assert ["{}", "{}"] in params  # no requirements
+
+    def test_submit_batch_carries_requirements(self):
+        pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
 
-    def test_get_batch_status(self):
+        jobs = [
+            {
+                "plan_name": "plan01",
+                "plan_suffix": "01",
+                "terrain_hash": "abc",
+                "requirements": {"ram_gb": 32},
+            }
+        ]
+        client.submit_batch("p.prj", "P", jobs)
+
+        params = conn.execute.call_args[0][1]
+        assert ["abc"] in params
+        assert ['{"ram_gb": 32}'] in params
+
+    def test_submit_batch_priority(self):
         pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
 
-        # First call: batch row
-        # Second call: job counts
-        conn.execute.return_value.fetchone.side_effect = [
-            ("running", 3),
-            None,
+        jobs = [
+            {"plan_name": "plan01", "plan_suffix": "01"},
+            {"plan_name": "plan02", "plan_suffix": "02", "priority": 5},
         ]
-        conn.execute.return_value.fetchall.return_value = [
-            ("completed", 1),
-            ("running", 1),
-            ("queued", 1),
+        client.submit_batch("p.prj", "P", jobs, submitted_by="alice", priority=10)
+
+        sql, params = conn.execute.call_args[0]
+        assert "priority, submitted_by" in sql
+        assert [10, 5] in params
+        # Submitter is copied onto every job for the fair-share ranking
+        assert params.count("alice") == 2
+
+    def test_submit_batch_keeps_caller_job_ids(self):
+        pool, _ = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+        job_id = "0b6f5d2c-3c1e-4a55-9d6f-0c8e7f1a2b3c"
+
+        jobs = [
+            {"job_id": job_id, "plan_name": "plan01", "plan_suffix": "01"},
+            {"plan_name": "plan02", "plan_suffix": "02"},
         ]
+        submission = client.submit_batch("p.prj", "P", jobs)
+
+        assert submission.job_ids[0] == job_id
+        assert submission.job_ids[1] != job_id
+
+    def test_submit_batch_notifies_workers(self):
+        pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+
+        jobs = [{"plan_name": "plan01", "plan_suffix": "01"}]
+        submission = client.submit_batch("p.prj", "P", jobs)
+
+        sql, params = conn.execute.call_args[0]
+        assert "pg_notify" in sql
+        assert params[-2:] == (JOBS_CHANNEL, submission.batch_id)
+
+    def test_get_batch_status(self):
+        pool, conn = _make_mock_pool()
+        # status, total, queued, assigned, running, completed, failed, cancelled
+        conn.execute.return_value.fetchone.return_value = ("running", 3, 1, 0, 1, 1, 0, 0)
         client = DbClient(pool, log=_nolog)
 
         status = client.get_batch_status("batch-123")
 
         assert status["status"] == "running"
         assert status["total"] == 3
+        assert status["completed"] == 1
+        assert status["running"] == 1
+        assert status["queued"] == 1
+        # Counters live on the batch row: no GROUP BY over jobs
+        assert conn.execute.call_count == 1
+        assert "GROUP BY" not in conn.execute.call_args[0][0]
 
     def test_get_batch_status_not_found(self):
         pool, conn = _make_mock_pool()
@@ -139,10 +327,9 @@ class TestDbClientBatch:
 class TestDbClientJob:
     def test_claim_job(self):
         pool, conn = _make_mock_pool()
-        # claim_job calls execute twice (UPDATE returning, then SELECT project_path)
-        conn.execute.return_value.fetchone.side_effect = [
-            ("job-uuid-789", "batch-uuid-456", "plan01", "01"),
-            (r"C:\project\test.prj",),
+        # One UPDATE ... FROM batches returns the job and its project path
+        conn.execute.return_value.fetchall.return_value = [
+            ("job-uuid-789", "batch-uuid-456", "plan01", "01", r"C:\project\test.prj", {}, 1, ""),
         ]
         client = DbClient(pool, log=_nolog)
 
@@ -153,34 +340,113 @@ class TestDbClientJob:
         assert job["plan_name"] == "plan01"
         assert job["plan_suffix"] == "01"
         assert job["project_path"] == r"C:\project\test.prj"
+        assert conn.execute.call_count == 1
+        assert pool.connection.call_count == 1
 
     def test_claim_job_returns_none_when_empty(self):
         pool, conn = _make_mock_pool()
-        conn.execute.return_value.fetchone.return_value = None
+        conn.execute.return_value.fetchall.return_value = []
         client = DbClient(pool, log=_nolog)
 
         job = client.claim_job("worker-123")
         assert job is None
 
+    def test_claim_jobs_fills_slots_in_one_statement(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.return_value.fetchall.return_value = [
+            ("j1", "b1", "plan01", "01", "p.prj", {"priority": 1}, 1, "abc"),
+            ("j2", "b1", "plan02", "02", "p.prj", None, 2, None),
+        ]
+        client = DbClient(pool, log=_nolog)
+
+        jobs = client.claim_jobs("worker-123", 3)
+
+        assert [j["job_id"] for j in jobs] == ["j1", "j2"]
+        assert jobs[0]["metadata"] == {"priority": 1}
+        assert jobs[1]["metadata"] == {}
+        assert jobs[1]["attempt"] == 2
+        assert jobs[0]["terrain_hash"] == "abc"
+        assert jobs[1]["terrain_hash"] == ""
+        sql, params = conn.execute.call_args[0]
+        assert "SKIP LOCKED" in sql
+        assert "lease_expires_at" in sql
+        assert "attempts = j.attempts + 1" in sql
+        assert params == (
+            "{}",
+            "worker-123",
+            client._aging_seconds,
+            32,
+            3,
+            "worker-123",
+            client._lease_seconds,
+        )
+        assert conn.execute.call_count == 1
+        assert all(j["worker_id"] == "worker-123" for j in jobs)
+
+    def test_claim_jobs_matches_capabilities(self):
+        pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+        caps = {"ram_gb": 64.0, "terrain_hashes": ["abc"]}
+
+        client.claim_jobs("worker-123", 2, capabilities=caps)
+
+        sql, params = conn.execute.call_args[0]
+        # Capabilities are stored on the worker row in the same statement
+        assert "UPDATE hecras_runner.workers SET metadata = metadata ||" in sql
+        assert params[0] == '{"ram_gb": 64.0, "terrain_hashes": ["abc"]}'
+        assert "(j.requirements->>'ram_gb')::real <= (me.caps->>'ram_gb')::real" in sql
+        assert "me.caps->>'scratch_free_gb'" in sql
+        assert "starts_with(me.caps->>'hecras_version'" in sql
+        assert "COALESCE(me.caps->'terrain_hashes' ? j.terrain_hash, false) AS cached" in sql
+
+    def test_claim_jobs_priority_and_fair_share(self):
+        pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog, aging_seconds=120)
+
+        client.claim_jobs("worker-123", 1)
+
+        sql, params = conn.execute.call_args[0]
+        # Aged priority (capped at the top queued priority), then the
+        # submitter's weighted turn, then cached terrain, then the oldest
+        assert "ORDER BY LEAST(c.aged, c.top) DESC, c.turn, c.cached DESC, c.queued_at, j.id" in sql
+        assert "PARTITION BY q.submitted_by" in sql
+        assert "ORDER BY q.priority DESC, q.cached DESC, q.queued_at, q.id" in sql
+        assert "user_shares" in sql
+        assert "assigned_jobs + running_jobs" in sql
+        assert params[2] == 120
+
+    def test_claim_jobs_reads_queued_index_per_submitter(self):
+        pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+
+        client.claim_jobs("worker-123", 50)
+
+        sql, params = conn.execute.call_args[0]
+        # Loose index scan over submitters, then each one's next jobs in
+        # the order of idx_jobs_queued_claim
+        assert "WITH RECURSIVE" in sql
+        assert "j.submitted_by > s.submitted_by" in sql
+        assert "CROSS JOIN LATERAL" in sql
+        assert "ORDER BY j.priority DESC, j.queued_at, j.id\n        LIMIT %s" in sql
+        assert params[3:5] == (50, 50)  # the window covers the whole claim
+
+    def test_claim_jobs_zero_limit(self):
+        pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+        assert client.claim_jobs("worker-123", 0) == []
+        conn.execute.assert_not_called()
+
     def test_start_job(self):
         pool, conn = _make_mock_pool()
         client = DbClient(pool, log=_nolog)
 
         client.start_job("job-123")
 
-        # Should update job status + batch status
-        assert conn.execute.call_count >= 2
+        # Job status only; the counter trigger marks the batch running
+        assert conn.execute.call_count == 1
 
     def test_complete_job_success(self):
         pool, conn = _make_mock_pool()
-        # For complete_job: UPDATE job, SELECT batch_id, SELECT remaining count
-        conn.execute.return_value.fetchone.side_effect = [
-            None,  # UPDATE result
-            ("batch-123",),  # batch_id
-            (0,),  # remaining count (all done)
-            (0,),  # failed count
-            None,  # UPDATE batch
-        ]
         client = DbClient(pool, log=_nolog)
 
         client.complete_job(
@@ -190,9 +456,36 @@ class TestDbClientJob:
             hdf_verified=True,
         )
 
-        conn.execute.assert_called()
+        # The counter trigger settles the batch inside this one statement
+        assert conn.execute.call_count == 1
+        assert conn.execute.call_args[0][1][0] == "completed"
         conn.commit.assert_called()
 
+    def test_complete_job_only_when_still_held(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.return_value.rowcount = 0  # reaped and claimed elsewhere
+        client = DbClient(pool, log=_nolog)
+
+        assert client.complete_job("job-123", True, 1.0, worker_id="worker-1") is False
+        sql, params = conn.execute.call_args[0]
+        assert "worker_id = %s::uuid" in sql
+        assert params[-2:] == ("worker-1", "worker-1")
+
+    def test_start_job_lease_lost(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.return_value.rowcount = 0
+        client = DbClient(pool, log=_nolog)
+
+        assert client.start_job("job-123", worker_id="worker-1") is False
+
+    def test_complete_job_failure(self):
+        pool, conn = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+
+        client.complete_job("job-123", success=False, elapsed_seconds=0.0, error_message="x")
+
+        assert conn.execute.call_args[0][1][0] == "failed"
+
     def test_update_progress(self):
         pool, conn = _make_mock_pool()
         client = DbClient(pool, log=_nolog)
@@ -202,6 +495,7 @@ class TestDbClientJob:
         conn.execute.assert_called()
         args = conn.execute.call_args[0]
         assert "progress" in args[0]
+        assert client._progress == {}
 
 
 class TestDbClientQueries:
@@ -249,6 +543,206 @@ class TestDbClientMigrate:
         assert any("advisory_lock" in sql for sql in all_sql)
         assert any("advisory_unlock" in sql for sql in all_sql)
 
+    def test_migration_2_installs_notify_trigger(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.return_value.fetchone.return_value = (1,)
+        client = DbClient(pool, log=_nolog)
+
+        client.migrate()
+
+        all_sql = " ".join(c[0][0] for c in conn.execute.call_args_list if c[0])
+        assert "CREATE TRIGGER jobs_notify_queued" in all_sql
+        assert f"pg_notify('{JOBS_CHANNEL}'" in all_sql
+        conn.commit.assert_called()
+
+    def test_migration_3_adds_counters_and_backfills(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.return_value.fetchone.return_value = (2,)
+        client = DbClient(pool, log=_nolog)
+
+        client.migrate()
+
+        all_sql = " ".join(c[0][0] for c in conn.execute.call_args_list if c[0])
+        assert "CREATE TRIGGER jobs_notify_queued" not in all_sql
+        assert "ADD COLUMN IF NOT EXISTS completed_jobs" in all_sql
+        assert "CREATE TRIGGER jobs_count_status" in all_sql
+        recorded = [c[0][1] for c in conn.execute.call_args_list if "schema_version (" in c[0][0]]
+        assert [params[0] for params in recorded] == [3, 4, 5, 6, 7]
+
+    def test_migration_4_adds_leases_and_reaper(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.return_value.fetchone.return_value = (3,)
+        client = DbClient(pool, log=_nolog)
+
+        client.migrate()
+
+        all_sql = " ".join(c[0][0] for c in conn.execute.call_args_list if c[0])
+        assert "ADD COLUMN IF NOT EXISTS lease_expires_at" in all_sql
+        assert "FUNCTION hecras_runner.reap_expired_jobs()" in all_sql
+        assert "jobs_count_status" not in all_sql
+
+    def test_migration_5_adds_requirements(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.return_value.fetchone.return_value = (4,)
+        client = DbClient(pool, log=_nolog)
+
+        client.migrate()
+
+        all_sql = " ".join(c[0][0] for c in conn.execute.call_args_list if c[0])
+        assert "ADD COLUMN IF NOT EXISTS requirements JSONB" in all_sql
+        assert "ADD COLUMN IF NOT EXISTS terrain_hash" in all_sql
+        assert "lease_expires_at" not in all_sql
+
+    def test_migration_6_adds_priority_and_fair_share_index(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.return_value.fetchone.return_value = (5,)
+        client = DbClient(pool, log=_nolog)
+
+        client.migrate()
+
+        all_sql = " ".join(c[0][0] for c in conn.execute.call_args_list if c[0])
+        assert "ADD COLUMN IF NOT EXISTS priority" in all_sql
+        assert "CREATE TABLE IF NOT EXISTS hecras_runner.user_shares" in all_sql
+        assert "(submitted_by, priority DESC, id) WHERE status = 'queued'" in all_sql
+        assert "requirements JSONB" not in all_sql
+
+    def test_migration_7_indexes_queued_jobs_in_claim_order(self):
+        pool, conn = _make_mock_pool()
+        conn.execute.return_value.fetchone.return_value = (6,)
+        client = DbClient(pool, log=_nolog)
+
+        client.migrate()
+
+        all_sql = " ".join(c[0][0] for c in conn.execute.call_args_list if c[0])
+        assert "DROP INDEX IF EXISTS hecras_runner.idx_jobs_queued_fair" in all_sql
+        assert "(submitted_by, priority DESC, queued_at, id) WHERE status = 'queued'" in all_sql
+        assert "user_shares" not in all_sql
+
+
+def _notify(payload: str) -> MagicMock:
+    n = MagicMock()
+    n.payload = payload
+    return n
+
+
+class TestWaitForJobs:
+    def test_returns_true_on_notification(self):
+        pool, _ = _make_mock_pool()
+        listener = MagicMock()
+        listener.notifies.return_value = iter([_notify("batch-1")])
+        client = DbClient(pool, log=_nolog)
+
+        with patch.object(client, "_connect_listener", return_value=listener) as connect:
+            assert client.wait_for_jobs(5.0) is True
+            # The LISTEN connection is kept for the next wait
+            assert client.wait_for_jobs(0.05) is False
+        connect.assert_called_once()
+
+    def test_times_out_without_notification(self):
+        pool, _ = _make_mock_pool()
+        listener = MagicMock()
+        listener.notifies.side_effect = lambda timeout, stop_after: time.sleep(timeout) or iter(())
+        client = DbClient(pool, log=_nolog)
+
+        t0 = time.monotonic()
+        with patch.object(client, "_connect_listener", return_value=listener):
+            assert client.wait_for_jobs(0.2) is False
+        assert 0.15 < time.monotonic() - t0 < 1.0
+
+    def test_stop_returns_immediately(self):
+        pool, _ = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+        with patch.object(client, "_connect_listener") as connect:
+            assert client.wait_for_jobs(60.0, stop=lambda: True) is False
+        connect.assert_not_called()
+
+    def test_connection_failure_falls_back_to_sleep(self):
+        pool, _ = _make_mock_pool()
+        client = DbClient(pool, log=_nolog)
+        with patch.object(client, "_connect_listener", side_effect=OSError("refused")) as connect:
+            assert client.wait_for_jobs(0.1) is False
+            assert client.wait_for_jobs(0.1) is False
+        # Not retried on every wait
+        assert connect.call_count == 1
+
+    def test_lost_connection_is_reopened(self):
+        pool, _ = _make_mock_pool()
+        broken = MagicMock()
+        broken.notifies.side_effect = OSError("server closed the connection")
+        healthy = MagicMock()
+        healthy.notifies.return_value = iter([_notify("b")])
+        client = DbClient(pool, log=_nolog)
+
+        with (
+            patch.object(client, "_connect_listener", side_effect=[broken, healthy]),
+            patch("hecras_runner.db.LISTEN_RETRY_DELAY", 0.0),
+        ):
+            assert client.wait_for_jobs(5.0) is True
+        broken.close.assert_called_once()
+
+    def test_lost_connection_waits_before_reconnecting(self):
+        pool, _ = _make_mock_pool()
+        broken = MagicMock()
+        broken.notifies.side_effect = OSError("server closed the connection")
+        messages: list[str] = []
+        client = DbClient(pool, log=messages.append)
+
+        with patch.object(client, "_connect_listener", return_value=broken) as connect:
+            assert client.wait_for_jobs(0.2) is False
+
+        connect.assert_called_once()
+        assert client._listen_retry_at > time.monotonic()
+        assert any("LISTEN connection lost" in m for m in messages)
+
+
+class TestListenForJobs:
+    def test_callback_and_stop(self):
+        pool, _ = _make_mock_pool()
+        listener = MagicMock()
+        listener.notifies.side_effect = [iter([_notify("batch-1")])] + [iter(())] * 1000
+        received: list[str] = []
+        stop = threading.Event()
+        client = DbClient(pool, log=_nolog)
+
+        with patch.object(client, "_connect_listener", return_value=listener):
+            thread = client.listen_for_jobs(received.append, stop=stop)
+            deadline = time.monotonic() + 2
+            while not received and time.monotonic() < deadline:
+                time.sleep(0.01)
+            stop.set()
+            thread.join(timeout=3)
+
+        assert received == ["batch-1"]
+        assert not thread.is_alive()
+        listener.close.assert_called_once()
+
+
+@pytest.mark.skipif(
+    not os.environ.get("HECRAS_TEST_PG_DSN"),
+    reason="set HECRAS_TEST_PG_DSN to a local PostgreSQL to run",
+)
+class TestNotifyDispatchLive:
+    """LISTEN/NOTIFY round trip against a real server (no schema needed)."""
+
+    def test_notification_wakes_waiter(self):
+        psycopg_pool = pytest.importorskip("psycopg_pool")
+        pool = psycopg_pool.ConnectionPool(os.environ["HECRAS_TEST_PG_DSN"], min_size=1, open=True)
+        client = DbClient(pool, log=_nolog)
+        try:
+            assert client.wait_for_jobs(0.2) is False  # opens the LISTEN connection
+
+            def _notify_later() -> None:
+                time.sleep(0.2)
+                with pool.connection() as conn:
+                    conn.execute("SELECT pg_notify(%s, %s)", (JOBS_CHANNEL, "live"))
+
+            threading.Thread(target=_notify_later).start()
+            t0 = time.monotonic()
+            assert client.wait_for_jobs(10.0) is True
+            assert time.monotonic() - t0 < 2.0
+        finally:
+            client.close()
+
 
 class TestDbClientClose:
     def test_close(self):
@@ -256,3 +750,67 @@ class TestDbClientClose:
         client = DbClient(pool, log=_nolog)
         client.close()
         pool.close.assert_called_once()
+
+
+@pytest.mark.skipif(
+    not os.environ.get("HECRAS_TEST_PG_DSN"),
+    reason="set HECRAS_TEST_PG_DSN to a local PostgreSQL to run",
+)
+class TestJobQueueLive:
+    """The job lifecycle against a real server with docs/db_schema.sql applied.
+
+    Drops and recreates the hecras_runner schema; point the DSN at a
+    scratch database.
+    """
+
+    @pytest.fixture
+    def client(self):
+        psycopg_pool = pytest.importorskip("psycopg_pool")
+        pool = psycopg_pool.ConnectionPool(os.environ["HECRAS_TEST_PG_DSN"], min_size=1, open=True)
+        script = (Path(__file__).parent.parent / "docs" / "db_schema.sql").read_text()
+        with pool.connection() as conn:
+            conn.execute("DROP SCHEMA IF EXISTS hecras_runner CASCADE")
+            conn.execute(script)
+        client = DbClient(pool, log=_nolog)
+        yield client
+        client.close()
+
+    def test_schema_script_is_current(self, client: DbClient):
+        with client._pool.connection() as conn:
+            assert client._get_schema_version(conn) == CURRENT_SCHEMA_VERSION
+
+    def test_submit_claim_complete_reap(self, client: DbClient):
+        worker = client.register_worker()
+        plans = [{"plan_name": f"plan{i}", "plan_suffix": f"0{i}"} for i in range(3)]
+        sweep = client.submit_batch("sweep.prj", "Sweep", plans, submitted_by="alice")
+        check = client.submit_batch("check.prj", "Check", plans[:1], submitted_by="bob")
+
+        jobs = client.claim_jobs(worker.worker_id, 3)
+
+        # Same priority: submitters take turns, the older batch first
+        assert [j["project_path"] for j in jobs] == ["sweep.prj", "check.prj", "sweep.prj"]
+        assert client.get_batch_status(sweep.batch_id)["assigned"] == 2
+        assert client.get_batch_status(check.batch_id)["status"] == "pending"
+
+        done = jobs[1]["job_id"]
+        assert client.start_job(done, worker_id=worker.worker_id)
+        assert client.get_batch_status(check.batch_id)["status"] == "running"
+        assert client.complete_job(done, True, 1.0, worker_id=worker.worker_id)
+        client._progress[done] = 0.5  # a flush that raced the completion
+        client.heartbeat(worker.worker_id)
+        status = client.get_batch_status(check.batch_id)
+        assert (status["status"], status["completed"], status["running"]) == ("completed", 1, 0)
+        assert client.get_batch_jobs(check.batch_id)[0]["progress"] == 1.0
+
+        lost = jobs[0]["job_id"]
+        with client._pool.connection() as conn:
+            conn.execute(
+                "UPDATE hecras_runner.jobs SET lease_expires_at = now() - interval '1 second'"
+                " WHERE id = %s",
+                (lost,),
+            )
+        assert client.reap_expired_jobs() == 1
+        status = client.get_batch_status(sweep.batch_id)
+        assert (status["queued"], status["assigned"]) == (2, 1)
+        by_id = {j["id"]: j for j in client.get_batch_jobs(sweep.batch_id)}
+        assert by_id[lost]["status"] == "queued"
@@ -0,0 +1,92 @@
+"""Tests for hecras_runner.document — round-trip Key=value documents."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from hecras_runner.document import RasDocument
+
+PLAN = (
+    b"Plan Title=plan_01\r\n"
+    b"Geom File=g02\r\n"
+    b"Flow File=u01\r\n"
+    b"Simulation Date=01JAN2024,0000,02JAN2024,1200\r\n"
+    b"Computation Interval=2MIN\r\n"
+    b"Write Detailed= 0 \r\n"
+    b"Unknown block without key\r\n"
+    b"  1.5  2.5  3.5\r\n"
+    b"DSS File=a.dss\r\n"
+    b"DSS File=C:\\Data\\b.dss"
+)
+
+
+class TestRoundTrip:
+    def test_unmodified_document_is_byte_identical(self):
+        doc = RasDocument.from_bytes(PLAN)
+        assert doc.to_bytes() == PLAN
+        assert doc.modified is False
+
+    def test_latin1_detected_and_preserved(self, tmp_path: Path):
+        data = "Plan Title=D\xe9bit\nDSS File=x.dss\n".encode("latin-1")
+        path = tmp_path / "test.p01"
+        path.write_bytes(data)
+
+        doc = RasDocument.load(str(path))
+        assert doc.encoding == "latin-1"
+        assert doc.get("Plan Title") == "D\xe9bit"
+
+        doc.set("DSS File", "y.dss")
+        doc.save(str(path))
+        assert path.read_bytes() == "Plan Title=D\xe9bit\nDSS File=y.dss\n".encode("latin-1")
+
+    def test_edit_keeps_other_lines_and_line_endings(self):
+        doc = RasDocument.from_bytes(PLAN)
+        assert doc.set("Write Detailed", " 1 ") is True
+        expected = PLAN.replace(b"Write Detailed= 0 ", b"Write Detailed= 1 ")
+        assert doc.to_bytes() == expected
+
+
+class TestKeyedAccess:
+    def test_get_and_get_all(self):
+        doc = RasDocument.from_bytes(PLAN)
+        assert doc.get("Geom File") == "g02"
+        assert doc.get("Write Detailed") == " 0 "
+        assert doc.get("Missing") is None
+        assert doc.get("Missing", "x") == "x"
+        assert doc.get_all("DSS File") == ["a.dss", "C:\\Data\\b.dss"]
+        assert "Flow File" in doc
+        assert doc.keys()[:3] == ["Plan Title", "Geom File", "Flow File"]
+
+    def test_set_same_value_is_not_a_change(self):
+        doc = RasDocument.from_bytes(PLAN)
+        assert doc.set("Geom File", "g02") is False
+        assert doc.modified is False
+
+    def test_set_inserts_missing_key(self):
+        doc = RasDocument.from_bytes(b"Proj Title=t\r\nPlan File=p01\r\n")
+        assert doc.set("Current Plan", "p01", insert_at=1) is True
+        assert doc.to_bytes() == b"Proj Title=t\r\nCurrent Plan=p01\r\nPlan File=p01\r\n"
+        assert doc.get("Plan File") == "p01"
+
+    def test_append_terminates_last_line(self):
+        doc = RasDocument.from_bytes(b"Plan Title=t")
+        doc.set("Write Detailed", " 1 ")
+        assert doc.to_bytes() == b"Plan Title=t\nWrite Detailed= 1 \n"
+
+    def test_set_all_and_update_all(self):
+        doc = RasDocument.from_bytes(PLAN)
+        assert doc.update_all("DSS File", lambda v: None if v == "a.dss" else "b.dss") == 1
+        assert doc.get_all("DSS File") == ["a.dss", "b.dss"]
+        assert doc.set_all("DSS File", "c.dss") == 2
+        assert doc.to_bytes().endswith(b"DSS File=c.dss\r\nDSS File=c.dss")
+
+    def test_copy_is_independent(self):
+        base = RasDocument.from_bytes(PLAN)
+        variants = []
+        for interval in ("1MIN", "5MIN"):
+            variant = base.copy()
+            variant.set("Computation Interval", interval)
+            variants.append(variant)
+
+        assert base.get("Computation Interval") == "2MIN"
+        assert [v.get("Computation Interval") for v in variants] == ["1MIN", "5MIN"]
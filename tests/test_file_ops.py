@@ -10,6 +10,7 @@ from hecras_runner.file_ops import (
     cleanup_temp_dir,
     copy_project_to_temp,
     copy_results_back,
+    files_identical,
     update_dss_paths,
 )
 
@@ -91,6 +92,69 @@ class TestCopyProjectToTemp:
         finally:
             cleanup_temp_dir(os.path.dirname(temp_prj), log=_nolog)
 
+    def test_plan_patches_applied_during_copy(self, tmp_project: Path):
+        temp_prj = copy_project_to_temp(
+            str(tmp_project),
+            log=_nolog,
+            plan_key="p01",
+            write_detailed=True,
+            plan_overrides={"Computation Interval": "10SEC"},
+        )
+        try:
+            temp_dir = Path(temp_prj).parent
+            assert "Current Plan=p01\n" in (temp_dir / "minimal.prj").read_text()
+            plan = (temp_dir / "minimal.p01").read_text()
+            assert "Write Detailed= 1 \n" in plan
+            assert "Computation Interval=10SEC\n" in plan
+            # Source project is untouched
+            assert "Write Detailed= 1" not in (tmp_project.parent / "minimal.p01").read_text()
+        finally:
+            cleanup_temp_dir(os.path.dirname(temp_prj), log=_nolog)
+
+    def test_unpatched_files_keep_bytes_and_mtime(self, tmp_project: Path):
+        u01 = tmp_project.parent / "minimal.u01"
+        os.utime(u01, (1_000_000, 1_000_000))
+        temp_prj = copy_project_to_temp(str(tmp_project), log=_nolog)
+        try:
+            staged = Path(temp_prj).parent / "minimal.u01"
+            assert staged.read_bytes() == u01.read_bytes()
+            assert staged.stat().st_mtime_ns == u01.stat().st_mtime_ns
+        finally:
+            cleanup_temp_dir(os.path.dirname(temp_prj), log=_nolog)
+
+    def test_crlf_line_endings_preserved(self, tmp_path: Path):
+        proj_dir = tmp_path / "project"
+        proj_dir.mkdir()
+        (proj_dir / "test.prj").write_bytes(b"Proj Title=Test\r\nCurrent Plan=p01\r\n")
+        (proj_dir / "test.p02").write_bytes(b"Plan Title=two\r\n")
+
+        temp_prj = copy_project_to_temp(str(proj_dir / "test.prj"), log=_nolog, plan_key="p02")
+        try:
+            assert Path(temp_prj).read_bytes() == b"Proj Title=Test\r\nCurrent Plan=p02\r\n"
+        finally:
+            cleanup_temp_dir(os.path.dirname(temp_prj), log=_nolog)
+
+    def test_stages_only_rasmap_terrain_files(self, tmp_path: Path):
+        proj_dir = tmp_path / "project"
+        proj_dir.mkdir()
+        (proj_dir / "test.prj").write_text("Proj Title=Test\n")
+        (proj_dir / "test.rasmap").write_text(
+            '<RASMapper><Terrains><Layer Name="t" Type="TerrainLayer" '
+            'Filename=".\\Terrain\\t.hdf" /></Terrains></RASMapper>'
+        )
+        terrain = proj_dir / "Terrain"
+        terrain.mkdir()
+        (terrain / "t.hdf").write_bytes(b"\x01")
+        (terrain / "t.source.tif").write_bytes(b"\x02")
+        (terrain / "superseded.hdf").write_bytes(b"\x03")
+
+        temp_prj = copy_project_to_temp(str(proj_dir / "test.prj"), log=_nolog)
+        try:
+            temp_terrain = Path(temp_prj).parent / "Terrain"
+            assert sorted(p.name for p in temp_terrain.iterdir()) == ["t.hdf", "t.source.tif"]
+        finally:
+            cleanup_temp_dir(os.path.dirname(temp_prj), log=_nolog)
+
 
 class TestUpdateDssPaths:
     def test_updates_u_files(self, tmp_path: Path):
@@ -203,6 +267,64 @@ class TestCopyResultsBack:
         copied = copy_results_back(str(temp_dir), str(main_dir), "01", log=_nolog)
         assert copied == []
 
+    def test_skips_unchanged_files(self, tmp_path: Path):
+        import shutil
+
+        temp_dir = tmp_path / "temp"
+        temp_dir.mkdir()
+        main_dir = tmp_path / "main"
+        main_dir.mkdir()
+
+        # Unchanged input: staged with copy2, so size and mtime match
+        (main_dir / "project.g03.hdf").write_bytes(b"\x01" * 4096)
+        shutil.copy2(main_dir / "project.g03.hdf", temp_dir / "project.g03.hdf")
+        # Produced by the run
+        (temp_dir / "project.p03.hdf").write_text("plan hdf")
+
+        messages: list[str] = []
+        copied = copy_results_back(str(temp_dir), str(main_dir), "03", log=messages.append)
+
+        assert copied == ["project.p03.hdf"]
+        assert any("Skipped 1 unchanged" in m and "4.0 KB" in m for m in messages)
+
+    def test_skips_same_content_with_different_mtime(self, tmp_path: Path):
+        temp_dir = tmp_path / "temp"
+        temp_dir.mkdir()
+        main_dir = tmp_path / "main"
+        main_dir.mkdir()
+
+        (main_dir / "project.u03").write_text("Flow Title=flow\n")
+        (temp_dir / "project.u03").write_text("Flow Title=flow\n")
+        os.utime(main_dir / "project.u03", (1_000_000, 1_000_000))
+
+        copied = copy_results_back(str(temp_dir), str(main_dir), "03", log=_nolog)
+        assert copied == []
+
+    def test_copies_same_size_changed_content(self, tmp_path: Path):
+        temp_dir = tmp_path / "temp"
+        temp_dir.mkdir()
+        main_dir = tmp_path / "main"
+        main_dir.mkdir()
+
+        (main_dir / "project.p03").write_text("Write Detailed= 0 \n")
+        (temp_dir / "project.p03").write_text("Write Detailed= 1 \n")
+        os.utime(main_dir / "project.p03", (1_000_000, 1_000_000))
+
+        copied = copy_results_back(str(temp_dir), str(main_dir), "03", log=_nolog)
+        assert copied == ["project.p03"]
+        assert (main_dir / "project.p03").read_text() == "Write Detailed= 1 \n"
+
+
+class TestFilesIdentical:
+    def test_missing_destination(self, tmp_path: Path):
+        (tmp_path / "a").write_text("x")
+        assert files_identical(str(tmp_path / "a"), str(tmp_path / "b")) is False
+
+    def test_size_mismatch(self, tmp_path: Path):
+        (tmp_path / "a").write_text("x")
+        (tmp_path / "b").write_text("xy")
+        assert files_identical(str(tmp_path / "a"), str(tmp_path / "b")) is False
+
 
 class TestCleanupTempDir:
     def test_removes_directory(self, tmp_path: Path):
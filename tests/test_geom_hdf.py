@@ -0,0 +1,75 @@
+"""Tests for hecras_runner.geom_hdf — geometry HDF size metadata."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from hecras_runner.geom_hdf import GeomHdfInfo, read_geom_hdf
+
+
+class TestUnavailable:
+    def test_missing_file(self, tmp_path: Path):
+        assert read_geom_hdf(str(tmp_path / "model.g01.hdf")) is None
+
+    def test_without_h5py(self, tmp_path: Path, monkeypatch):
+        path = tmp_path / "model.g01.hdf"
+        path.write_bytes(b"\x89HDF\r\n\x1a\n")
+        monkeypatch.setitem(sys.modules, "h5py", None)  # import raises ImportError
+        assert read_geom_hdf(str(path)) is None
+
+
+class TestReadGeomHdf:
+    @pytest.fixture
+    def h5py(self):
+        return pytest.importorskip("h5py")
+
+    def _write(self, h5py, path: Path, with_cell_count: bool = True) -> None:
+        import numpy as np
+
+        fields = [("Name", "S16")]
+        rows = [(b"Perimeter 1",), (b"Overbank",)]
+        if with_cell_count:
+            fields.append(("Cell Count", "<i4"))
+            rows = [(b"Perimeter 1", 1200), (b"Overbank", 345)]
+        with h5py.File(path, "w") as hf:
+            areas = hf.create_group("Geometry/2D Flow Areas")
+            areas.create_dataset("Attributes", data=np.array(rows, dtype=fields))
+            areas.create_dataset("Perimeter 1/Cells Center Coordinate", shape=(1210, 2))
+            areas.create_dataset("Overbank/Cells Center Coordinate", shape=(350, 2))
+            hf.create_dataset("Geometry/Cross Sections/Attributes", shape=(7,), dtype="<i4")
+            hf.create_dataset("Geometry/Structures/Attributes", shape=(2,), dtype="<i4")
+
+    def test_counts_from_attribute_tables(self, h5py, tmp_path: Path):
+        path = tmp_path / "model.g01.hdf"
+        self._write(h5py, path)
+
+        info = read_geom_hdf(str(path))
+        assert info == GeomHdfInfo(
+            flow_areas={"Perimeter 1": 1200, "Overbank": 345},
+            cross_sections=7,
+            structures=2,
+        )
+
+    def test_cell_count_falls_back_to_dataset_shape(self, h5py, tmp_path: Path):
+        path = tmp_path / "model.g01.hdf"
+        self._write(h5py, path, with_cell_count=False)
+
+        info = read_geom_hdf(str(path))
+        assert info is not None
+        assert info.flow_areas == {"Perimeter 1": 1210, "Overbank": 350}
+
+    def test_1d_only_geometry(self, h5py, tmp_path: Path):
+        path = tmp_path / "model.g01.hdf"
+        with h5py.File(path, "w") as hf:
+            hf.create_dataset("Geometry/Cross Sections/Attributes", shape=(12,), dtype="<i4")
+
+        info = read_geom_hdf(str(path))
+        assert info == GeomHdfInfo(flow_areas={}, cross_sections=12, structures=0)
+
+    def test_corrupt_file(self, h5py, tmp_path: Path):
+        path = tmp_path / "model.g01.hdf"
+        path.write_bytes(b"not an hdf file")
+        assert read_geom_hdf(str(path)) is None
@@ -4,9 +4,15 @@ from __future__ import annotations
 
 import pytest
 
-from hecras_runner.gui import build_plan_rows, format_result_progress, plan_rows_to_jobs
+from hecras_runner.gui import (
+    build_pending_rows,
+    build_plan_rows,
+    format_geom_label,
+    format_result_progress,
+    plan_rows_to_jobs,
+)
 from hecras_runner.models import PlanRow
-from hecras_runner.parser import FlowEntry, GeomEntry, PlanEntry, RasProject
+from hecras_runner.parser import FlowEntry, GeomEntry, LazyRasProject, PlanEntry, RasProject
 from hecras_runner.runner import SimulationResult
 
 # ── build_plan_rows ──
@@ -92,6 +98,38 @@ class TestBuildPlanRows:
         assert build_plan_rows(project) == []
 
 
+# ── build_pending_rows ──
+
+
+class TestBuildPendingRows:
+    def test_rows_from_prj_only(self, synthetic_prj):
+        rows = build_pending_rows(LazyRasProject(str(synthetic_prj)))
+        assert [r.key for r in rows] == ["p01"]
+        assert rows[0].title == "\u2026"
+        assert rows[0].selected is True
+
+
+# ── format_geom_label ──
+
+
+class TestFormatGeomLabel:
+    def test_missing_geometry(self):
+        assert format_geom_label("g03", None) == "g03: ?"
+
+    def test_without_hdf_metadata(self):
+        assert format_geom_label("g01", GeomEntry(key="g01", title="geoBR")) == "g01: geoBR"
+
+    def test_with_hdf_metadata(self):
+        geom = GeomEntry(
+            key="g01",
+            title="geoBR",
+            flow_areas_2d={"A": 12000, "B": 345},
+            cross_sections=14,
+            structures=2,
+        )
+        assert format_geom_label("g01", geom) == "g01: geoBR (12,345 cells, 14 XS)"
+
+
 # ── format_result_progress ──
 
 
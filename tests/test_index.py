@@ -0,0 +1,143 @@
+"""Tests for hecras_runner.index — SQLite workspace index."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from hecras_runner.index import WorkspaceIndex, iter_project_dirs
+
+SYNTHETIC_DIR = Path(__file__).parent / "synthetic"
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    """Two copies of the synthetic project in nested folders plus noise."""
+    root = tmp_path / "share"
+    for sub in ("a", "b/deep"):
+        shutil.copytree(SYNTHETIC_DIR, root / sub)
+    # Second project has been run and uses another geometry title
+    (root / "b" / "deep" / "minimal.g01").write_text("Geom Title=Levee Breach\n")
+    (root / "b" / "deep" / "minimal.p01.hdf").write_bytes(b"\x89HDF")
+    # ESRI projection files share the extension and must be ignored
+    (root / "gis").mkdir()
+    (root / "gis" / "terrain.prj").write_text('PROJCS["NAD83"]')
+    return root
+
+
+@pytest.fixture
+def index(tmp_path: Path):
+    idx = WorkspaceIndex(str(tmp_path / "index.sqlite"), log=lambda _m: None)
+    yield idx
+    idx.close()
+
+
+def _bump_mtime(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+
+class TestScan:
+    def test_indexes_projects_and_skips_projection_files(self, index, workspace):
+        stats = index.scan([str(workspace)])
+        assert stats.found == 2
+        assert stats.updated == 2
+        assert index.project_count() == 2
+
+    def test_rescan_skips_unchanged_projects(self, index, workspace):
+        index.scan([str(workspace)])
+        with patch("hecras_runner.index.parse_project") as parse:
+            stats = index.scan([str(workspace)])
+        parse.assert_not_called()
+        assert stats.unchanged == 2
+        assert stats.updated == 0
+
+    def test_changed_file_triggers_reparse(self, index, workspace):
+        index.scan([str(workspace)])
+        geom = workspace / "a" / "minimal.g01"
+        geom.write_text("Geom Title=Updated\n")
+        _bump_mtime(geom)
+
+        stats = index.scan([str(workspace)])
+        assert stats.updated == 1
+        assert stats.unchanged == 1
+        assert [p.geom_title for p in index.find_plans(geometry="Updated")] == ["Updated"]
+
+    def test_new_results_file_updates_status(self, index, workspace):
+        index.scan([str(workspace)])
+        (workspace / "a" / "minimal.p01.hdf").write_bytes(b"\x89HDF")
+
+        index.scan([str(workspace)])
+        assert index.find_plans(unrun=True) == []
+
+    def test_removed_project_is_dropped(self, index, workspace):
+        index.scan([str(workspace)])
+        shutil.rmtree(workspace / "a")
+
+        stats = index.scan([str(workspace)])
+        assert stats.removed == 1
+        assert index.project_count() == 1
+
+    def test_scanning_other_root_keeps_existing_entries(self, index, workspace, tmp_path):
+        index.scan([str(workspace)])
+        other = tmp_path / "other"
+        other.mkdir()
+        index.scan([str(other)])
+        assert index.project_count() == 2
+
+    def test_iter_project_dirs_yields_only_dirs_with_prj(self, workspace):
+        dirs = sorted(os.path.relpath(d, workspace) for d, _ in iter_project_dirs([workspace]))
+        assert dirs == ["a", os.path.join("b", "deep"), "gis"]
+
+
+class TestQueries:
+    def test_find_plans_by_geometry_title_wildcard(self, index, workspace):
+        index.scan([str(workspace)])
+        plans = index.find_plans(geometry="*breach")
+        assert len(plans) == 1
+        plan = plans[0]
+        assert plan.project_path == str(workspace / "b" / "deep" / "minimal.prj")
+        assert plan.key == "p01"
+        assert plan.geom_ref == "g01"
+        assert plan.flow_title == "Test Flow"
+        assert plan.has_results is True
+        assert plan.is_current is True
+
+    def test_find_plans_by_geometry_key(self, index, workspace):
+        index.scan([str(workspace)])
+        assert len(index.find_plans(geometry="g01")) == 2
+
+    def test_unrun_plans(self, index, workspace):
+        index.scan([str(workspace)])
+        unrun = index.find_plans(unrun=True)
+        assert [p.project_path for p in unrun] == [str(workspace / "a" / "minimal.prj")]
+        assert index.projects_with_unrun_plans() == [(str(workspace / "a" / "minimal.prj"), 1)]
+
+    def test_find_dss(self, index, workspace):
+        index.scan([str(workspace)])
+        refs = index.find_dss("other.dss")
+        assert {source for _p, source, _d in refs} == {"u01"}
+        assert len(refs) == 2
+
+    def test_search_matches_any_field(self, index, workspace):
+        index.scan([str(workspace)])
+        assert len(index.search("test plan")) == 2
+        assert len(index.search("levee")) == 1
+        assert len(index.search("deep")) == 1
+        assert len(index.search("levee", unrun=True)) == 0
+
+    def test_like_metacharacters_are_literal(self, index, workspace):
+        index.scan([str(workspace)])
+        assert index.find_plans(plan="%") == []
+        assert index.search("x%y") == []
+
+    def test_index_persists_between_instances(self, workspace, tmp_path):
+        db = str(tmp_path / "persist.sqlite")
+        with WorkspaceIndex(db, log=lambda _m: None) as idx:
+            idx.scan([str(workspace)])
+        with WorkspaceIndex(db, log=lambda _m: None) as idx:
+            assert idx.project_count() == 2
@@ -185,6 +185,27 @@ class TestPlanTableModel:
         assert row.progress == "Complete (5s)"
         assert row.result_tag == "success"
 
+    def test_update_details_keeps_selection_and_progress(self, model, sample_rows):
+        model.set_plans([PlanRow(key="p01", title="\u2026"), PlanRow(key="p02", title="\u2026")])
+        model.toggle_selection(0)
+        model.update_progress("p02", "42%")
+
+        model.update_details(sample_rows)
+
+        first, second = model.all_rows()
+        assert first.title == "plan_01"
+        assert first.geom == "g01: geom_01"
+        assert first.selected is False
+        assert second.title == "plan_02"
+        assert second.is_current is True
+        assert second.progress == "42%"
+
+    def test_retain_keys(self, model, sample_rows):
+        model.set_plans(sample_rows)
+        model.retain_keys({"p01", "p03"})
+        assert [r.key for r in model.all_rows()] == ["p01", "p03"]
+        assert model.rowCount() == 2
+
     def test_header_data(self, model):
         for i, name in enumerate(COLUMNS):
             assert model.headerData(i, Qt.Orientation.Horizontal) == name
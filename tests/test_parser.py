@@ -4,9 +4,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from hecras_runner.geom_hdf import GeomHdfInfo
 from hecras_runner.parser import (
     FlowEntry,
     GeomEntry,
+    LazyRasProject,
     PlanEntry,
     parse_flow_file,
     parse_geom_file,
@@ -125,6 +127,51 @@ class TestEncodingFallback:
         proj = parse_project(str(prj))
         assert proj.title == "Tést"
 
+    def test_latin1_line_after_utf8_lines(self, tmp_path: Path):
+        u = tmp_path / "test.u01"
+        u.write_bytes(b"Flow Title=Flow\r\nDSS File=a.dss\r\nDSS File=C:\\D\xe9p\\b.dss\r\n")
+        entry = parse_flow_file(str(u), "u01")
+        assert entry.title == "Flow"
+        assert entry.dss_files == ["a.dss", "C:\\Dép\\b.dss"]
+
+
+class TestStreamingReader:
+    """Header lookups stop reading as soon as the keys are found."""
+
+    def test_geom_stops_after_title(self, tmp_path: Path):
+        import io
+        from unittest.mock import patch
+
+        class CountingReader(io.BytesIO):
+            lines_read = 0
+
+            def __next__(self):
+                CountingReader.lines_read += 1
+                return super().__next__()
+
+        body = b"Geom Title=Big\r\n" + b"Type RM Length L Ch R = 1 ,100\r\n" * 10_000
+        with patch("builtins.open", return_value=CountingReader(body)):
+            entry = parse_geom_file(str(tmp_path / "big.g01"), "g01")
+
+        assert entry.title == "Big"
+        assert CountingReader.lines_read == 1
+
+    def test_plan_values_with_crlf(self, tmp_path: Path):
+        p = tmp_path / "test.p01"
+        p.write_bytes(
+            b"Plan Title=CRLF Plan\r\nGeom File=g02\r\nFlow File=u03\r\n"
+            b"Simulation Date=01JAN2024,0000,02JAN2024,1200\r\nWrite Detailed= 0 \r\n"
+        )
+        entry = parse_plan_file(str(p), "p01")
+        assert entry == PlanEntry(
+            key="p01",
+            title="CRLF Plan",
+            geom_ref="g02",
+            flow_ref="u03",
+            sim_start="01JAN2024,0000",
+            sim_end="02JAN2024,1200",
+        )
+
 
 class TestIndividualParsers:
     """Test parse_plan_file, parse_geom_file, parse_flow_file directly."""
@@ -168,3 +215,177 @@ class TestIndividualParsers:
         assert parse_plan_file("/nonexistent/path.p01", "p01") is None
         assert parse_geom_file("/nonexistent/path.g01", "g01") is None
         assert parse_flow_file("/nonexistent/path.u01", "u01") is None
+
+
+class TestConcurrentParse:
+    """parse_project(max_workers=...) matches the sequential result."""
+
+    def test_same_result_as_sequential(self, prtest1_prj: Path):
+        assert parse_project(str(prtest1_prj), max_workers=4) == parse_project(str(prtest1_prj))
+
+    def test_order_is_deterministic(self, tmp_path: Path):
+        import random
+        import time
+        from unittest.mock import patch
+
+        prj_lines = ["Proj Title=Many"]
+        for i in range(1, 21):
+            prj_lines.append(f"Plan File=p{i:02d}")
+            (tmp_path / f"many.p{i:02d}").write_text(
+                f"Plan Title=plan{i:02d}\nGeom File=g01\nFlow File=u{i:02d}\n"
+            )
+            (tmp_path / f"many.u{i:02d}").write_text(f"Flow Title=flow{i:02d}\n")
+        (tmp_path / "many.g01").write_text("Geom Title=geom\n")
+        prj = tmp_path / "many.prj"
+        prj.write_text("\n".join(prj_lines) + "\n")
+
+        real_parse = parse_plan_file
+
+        def slow_parse(path: str, key: str):
+            time.sleep(random.uniform(0, 0.01))
+            return real_parse(path, key)
+
+        with patch("hecras_runner.parser.parse_plan_file", side_effect=slow_parse):
+            proj = parse_project(str(prj), max_workers=8)
+
+        assert [p.key for p in proj.plans] == [f"p{i:02d}" for i in range(1, 21)]
+        # Geometry and flows only referenced from plans are still picked up, in plan order
+        assert [g.key for g in proj.geometries] == ["g01"]
+        assert [f.key for f in proj.flows] == [f"u{i:02d}" for i in range(1, 21)]
+
+    def test_missing_files_skipped(self, tmp_path: Path):
+        prj = tmp_path / "test.prj"
+        prj.write_text("Proj Title=Test\nPlan File=p98\nPlan File=p99\nGeom File=g99\n")
+        proj = parse_project(str(prj), max_workers=4)
+        assert proj.plans == []
+        assert proj.geometries == []
+
+
+class TestLazyRasProject:
+    def test_construction_reads_only_prj(self, prtest1_prj: Path):
+        from unittest.mock import patch
+
+        with (
+            patch("hecras_runner.parser.parse_plan_file") as plan,
+            patch("hecras_runner.parser.parse_geom_file") as geom,
+            patch("hecras_runner.parser.parse_flow_file") as flow,
+        ):
+            lazy = LazyRasProject(str(prtest1_prj))
+
+        plan.assert_not_called()
+        geom.assert_not_called()
+        flow.assert_not_called()
+        assert lazy.title == "small_project_01"
+        assert lazy.plan_keys == ["p01", "p02", "p03", "p04"]
+        assert lazy.current_plan == "p01"
+
+    def test_entries_loaded_on_first_access(self, prtest1_prj: Path):
+        lazy = LazyRasProject(str(prtest1_prj))
+        assert lazy.snapshot().plans == []
+
+        plan = lazy.plan("p03")
+        assert plan is not None
+        assert plan.flow_ref == "u03"
+        assert lazy.plan("p03") is plan
+        assert [p.key for p in lazy.snapshot().plans] == ["p03"]
+        assert lazy.geometry("g02").title == "geometry_01"
+
+    def test_prefetch_reports_each_entry(self, prtest1_prj: Path):
+        lazy = LazyRasProject(str(prtest1_prj))
+        seen: list[tuple[str, str]] = []
+        lazy.prefetch(max_workers=4, on_entry=lambda kind, key, _e: seen.append((kind, key)))
+
+        assert sorted(seen) == sorted(
+            [("plan", f"p0{i}") for i in range(1, 5)]
+            + [("flow", f"u0{i}") for i in range(1, 5)]
+            + [("geom", "g02")]
+        )
+
+    def test_to_project_matches_parse_project(self, prtest1_prj: Path):
+        lazy = LazyRasProject(str(prtest1_prj))
+        lazy.plan("p02")
+        assert lazy.to_project() == parse_project(str(prtest1_prj))
+
+    def test_missing_plan_file_reported_as_none(self, tmp_path: Path):
+        prj = tmp_path / "test.prj"
+        prj.write_text("Proj Title=Test\nPlan File=p99\n")
+        lazy = LazyRasProject(str(prj))
+        seen: list[object] = []
+        lazy.prefetch(max_workers=1, on_entry=lambda _kind, _key, entry: seen.append(entry))
+        assert seen == [None]
+        assert lazy.to_project().plans == []
+
+
+class TestGeomHdfMetadata:
+    INFO = GeomHdfInfo(flow_areas={"Perimeter 1": 1200, "Overbank": 345}, cross_sections=7)
+
+    def test_not_read_by_default(self, tmp_project: Path):
+        from unittest.mock import patch
+
+        with patch("hecras_runner.parser.read_geom_hdf") as read:
+            project = parse_project(str(tmp_project))
+        read.assert_not_called()
+        geom = project.geometries[0]
+        assert geom.flow_areas_2d is None
+        assert geom.cells_2d is None
+
+    def test_counts_attached_to_geometry(self, tmp_project: Path):
+        from unittest.mock import patch
+
+        with patch("hecras_runner.parser.read_geom_hdf", return_value=self.INFO) as read:
+            project = parse_project(str(tmp_project), read_hdf=True)
+        read.assert_called_once_with(str(tmp_project.parent / "minimal.g01.hdf"))
+        geom = project.geometries[0]
+        assert geom.title == "Test Geom"
+        assert geom.flow_areas_2d == {"Perimeter 1": 1200, "Overbank": 345}
+        assert geom.cells_2d == 1545
+        assert geom.cross_sections == 7
+        assert geom.structures == 0
+
+    def test_counts_cached_by_hdf_stamp(self, tmp_project: Path, tmp_path: Path):
+        from unittest.mock import patch
+
+        from hecras_runner.project_cache import ProjectCache
+
+        (tmp_project.parent / "minimal.g01.hdf").write_bytes(b"\x89HDF")
+        cache_dir = str(tmp_path / "cache")
+        with patch("hecras_runner.parser.read_geom_hdf", return_value=self.INFO):
+            parse_project(
+                str(tmp_project),
+                cache=ProjectCache(str(tmp_project), cache_dir),
+                read_hdf=True,
+            )
+
+        with patch("hecras_runner.parser.read_geom_hdf") as read:
+            project = parse_project(
+                str(tmp_project),
+                cache=ProjectCache(str(tmp_project), cache_dir),
+                read_hdf=True,
+            )
+        read.assert_not_called()
+        assert project.geometries[0].cells_2d == 1545
+
+    def test_run_without_read_hdf_keeps_cached_counts(self, tmp_project: Path, tmp_path: Path):
+        from unittest.mock import patch
+
+        from hecras_runner.project_cache import ProjectCache
+
+        (tmp_project.parent / "minimal.g01.hdf").write_bytes(b"\x89HDF")
+        cache_dir = str(tmp_path / "cache")
+        with patch("hecras_runner.parser.read_geom_hdf", return_value=self.INFO):
+            parse_project(
+                str(tmp_project),
+                cache=ProjectCache(str(tmp_project), cache_dir),
+                read_hdf=True,
+            )
+        # A plain run (e.g. the CLI without --list-plans) saves the cache too
+        parse_project(str(tmp_project), cache=ProjectCache(str(tmp_project), cache_dir))
+
+        with patch("hecras_runner.parser.read_geom_hdf") as read:
+            project = parse_project(
+                str(tmp_project),
+                cache=ProjectCache(str(tmp_project), cache_dir),
+                read_hdf=True,
+            )
+        read.assert_not_called()
+        assert project.geometries[0].cells_2d == 1545
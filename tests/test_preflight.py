@@ -0,0 +1,153 @@
+"""Tests for hecras_runner.preflight — plan validation before launch."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from hecras_runner.preflight import validate_plans
+from hecras_runner.runner import SimulationJob
+
+PLAN = (
+    "Plan Title=Test Plan\n"
+    "Geom File=g01\n"
+    "Flow File=u01\n"
+    "Simulation Date=01JAN2024,0000,02JAN2024,1200\n"
+)
+
+RASMAP = """<RASMapper>
+  <Terrains Checked="True">
+    <Layer Name="existing" Type="TerrainLayer" Filename=".\\Terrain\\existing.hdf" />
+  </Terrains>
+  <Results>
+    <Layer Name="p01" Type="RASResults" Filename=".\\minimal.p01.hdf" />
+  </Results>
+</RASMapper>
+"""
+
+
+@pytest.fixture
+def project(tmp_project: Path) -> Path:
+    """Synthetic project with a valid plan 01 and its DSS files present."""
+    (tmp_project.parent / "minimal.p01").write_text(PLAN)
+    (tmp_project.parent / "test.dss").write_bytes(b"")
+    (tmp_project.parent / "other.dss").write_bytes(b"")
+    return tmp_project
+
+
+def _messages(report) -> list[str]:
+    return [i.message for i in report.issues]
+
+
+class TestValidatePlans:
+    def test_valid_plan(self, project: Path):
+        report = validate_plans(str(project), [SimulationJob("Test Plan", "01")])
+        assert report.ok
+        assert report.issues == []
+        assert report.plans_checked == 1
+
+    def test_missing_plan_file(self, project: Path):
+        report = validate_plans(str(project), [SimulationJob("Gone", "07")])
+        assert _messages(report) == ["Plan file not found: minimal.p07"]
+        assert report.failed_suffixes() == {"07"}
+
+    def test_missing_geometry_and_dss_reported_together(self, project: Path):
+        os.remove(project.parent / "minimal.g01")
+        os.remove(project.parent / "other.dss")
+
+        report = validate_plans(str(project), [SimulationJob("Test Plan", "01")])
+        assert _messages(report) == [
+            "Geometry file not found: minimal.g01",
+            "DSS file not found: other.dss",
+        ]
+        assert not report.ok
+
+    def test_missing_flow_file(self, project: Path):
+        os.remove(project.parent / "minimal.u01")
+        report = validate_plans(str(project), [SimulationJob("Test Plan", "01")])
+        assert _messages(report) == ["Flow file not found: minimal.u01"]
+
+    @pytest.mark.parametrize(
+        "sim_date",
+        ["", "Simulation Date=02JAN2024,1200,01JAN2024,0000\n", "Simulation Date=garbage\n"],
+    )
+    def test_invalid_simulation_window(self, project: Path, sim_date: str):
+        (project.parent / "minimal.p01").write_text(
+            "Plan Title=Test Plan\nGeom File=g01\nFlow File=u01\n" + sim_date
+        )
+        report = validate_plans(str(project), [SimulationJob("Test Plan", "01")])
+        assert len(report.errors) == 1
+        assert "Simulation window" in report.errors[0].message
+
+    def test_dss_override_checked_instead_of_flow_references(self, project: Path, tmp_path):
+        os.remove(project.parent / "other.dss")
+        job = SimulationJob("Test Plan", "01", dss_path=str(tmp_path / "missing.dss"))
+        report = validate_plans(str(project), [job])
+        assert _messages(report) == [f"DSS file not found: {tmp_path / 'missing.dss'}"]
+
+    def test_relative_dss_resolved_against_project_dir(self, project: Path):
+        (project.parent / "minimal.u01").write_text(
+            "Flow Title=Test Flow\nDSS File=.\\data\\in.dss\nDSS File=dss\n"
+        )
+        (project.parent / "data").mkdir()
+        (project.parent / "data" / "in.dss").write_bytes(b"")
+        report = validate_plans(str(project), [SimulationJob("Test Plan", "01")])
+        assert report.ok
+
+    def test_missing_project(self, tmp_path: Path):
+        report = validate_plans(str(tmp_path / "none.prj"), [SimulationJob("p", "01")])
+        assert not report.ok
+        assert report.errors[0].plan_key == ""
+
+    def test_issues_keep_job_order_when_concurrent(self, project: Path):
+        jobs = [SimulationJob(f"plan{i}", f"{i:02d}") for i in range(9, 1, -1)]
+        report = validate_plans(str(project), jobs, max_workers=8)
+        assert [i.plan_key for i in report.issues] == [f"p{i:02d}" for i in range(9, 1, -1)]
+
+    def test_plans_checked_concurrently(self, project: Path):
+        from hecras_runner import preflight
+
+        real = preflight.parse_plan_file
+
+        def slow(path: str, key: str):
+            time.sleep(0.2)
+            return real(path, key)
+
+        jobs = [SimulationJob("Test Plan", "01")] * 8
+        with patch("hecras_runner.preflight.parse_plan_file", side_effect=slow):
+            t0 = time.monotonic()
+            report = validate_plans(str(project), jobs, max_workers=8)
+            elapsed = time.monotonic() - t0
+        assert report.ok
+        assert elapsed < 1.0
+
+
+class TestTerrain:
+    def test_missing_terrain_blocks_unpreprocessed_geometry(self, project: Path):
+        (project.parent / "minimal.rasmap").write_text(RASMAP)
+        report = validate_plans(str(project), [SimulationJob("Test Plan", "01")])
+        assert [(i.severity, i.message) for i in report.issues] == [
+            ("error", "Terrain file not found: .\\Terrain\\existing.hdf")
+        ]
+
+    def test_missing_terrain_is_warning_when_preprocessed(self, project: Path):
+        (project.parent / "minimal.rasmap").write_text(RASMAP)
+        geom_hdf = project.parent / "minimal.g01.hdf"
+        geom_hdf.write_bytes(b"")
+        later = (project.parent / "minimal.g01").stat().st_mtime + 10
+        os.utime(geom_hdf, (later, later))
+
+        report = validate_plans(str(project), [SimulationJob("Test Plan", "01")])
+        assert report.ok
+        assert [i.severity for i in report.issues] == ["warning"]
+
+    def test_present_terrain(self, project: Path):
+        (project.parent / "minimal.rasmap").write_text(RASMAP)
+        (project.parent / "Terrain").mkdir()
+        (project.parent / "Terrain" / "existing.hdf").write_bytes(b"")
+        report = validate_plans(str(project), [SimulationJob("Test Plan", "01")])
+        assert report.issues == []
@@ -0,0 +1,131 @@
+"""Tests for hecras_runner.project_cache."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from hecras_runner.parser import parse_project
+from hecras_runner.project_cache import ProjectCache
+
+
+def _touch_later(path: Path, text: str) -> None:
+    """Rewrite *path* and move its mtime forward so the change is detectable."""
+    st = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+
+class TestProjectCache:
+    def test_second_parse_is_served_from_cache(self, tmp_project: Path, tmp_path: Path):
+        cache_dir = str(tmp_path / "cache")
+        first = parse_project(str(tmp_project), cache=ProjectCache(str(tmp_project), cache_dir))
+
+        cache = ProjectCache(str(tmp_project), cache_dir)
+        with (
+            patch("hecras_runner.parser.parse_plan_file") as plan,
+            patch("hecras_runner.parser.parse_geom_file") as geom,
+            patch("hecras_runner.parser.parse_flow_file") as flow,
+        ):
+            second = parse_project(str(tmp_project), cache=cache)
+
+        plan.assert_not_called()
+        geom.assert_not_called()
+        flow.assert_not_called()
+        assert cache.misses == 0
+        assert cache.hits == 4  # prj, plan, geom, flow
+        assert second == first
+
+    def test_changed_file_is_reparsed(self, tmp_project: Path, tmp_path: Path):
+        cache_dir = str(tmp_path / "cache")
+        parse_project(str(tmp_project), cache=ProjectCache(str(tmp_project), cache_dir))
+
+        geom = next(tmp_project.parent.glob("minimal.g*"))
+        _touch_later(geom, "Geom Title=Renamed\n")
+
+        cache = ProjectCache(str(tmp_project), cache_dir)
+        proj = parse_project(str(tmp_project), cache=cache)
+        assert proj.geometries[0].title == "Renamed"
+        assert cache.misses == 1
+
+    def test_parser_version_change_discards_cache(self, tmp_project: Path, tmp_path: Path):
+        cache_dir = str(tmp_path / "cache")
+        parse_project(str(tmp_project), cache=ProjectCache(str(tmp_project), cache_dir))
+
+        with patch("hecras_runner.project_cache.PARSER_VERSION", -1):
+            cache = ProjectCache(str(tmp_project), cache_dir)
+        parse_project(str(tmp_project), cache=cache)
+        assert cache.hits == 0
+
+    def test_corrupt_cache_file_ignored(self, tmp_project: Path, tmp_path: Path):
+        cache = ProjectCache(str(tmp_project), str(tmp_path / "cache"))
+        os.makedirs(os.path.dirname(cache.path))
+        Path(cache.path).write_text("{not json")
+
+        proj = parse_project(
+            str(tmp_project), cache=ProjectCache(str(tmp_project), str(tmp_path / "cache"))
+        )
+        assert proj.title == "Minimal"
+
+    def test_removed_files_are_pruned(self, tmp_project: Path, tmp_path: Path):
+        cache_dir = str(tmp_path / "cache")
+        cache = ProjectCache(str(tmp_project), cache_dir)
+        parse_project(str(tmp_project), cache=cache)
+
+        # Drop the plan from the project; its entry should not be written back
+        prj_text = tmp_project.read_text()
+        lines = [ln for ln in prj_text.splitlines() if not ln.startswith("Plan File=")]
+        _touch_later(tmp_project, "\n".join(lines) + "\n")
+        parse_project(str(tmp_project), cache=ProjectCache(str(tmp_project), cache_dir))
+
+        with open(cache.path, encoding="utf-8") as f:
+            files = json.load(f)["files"]
+        assert not any(entry["kind"] == "plan" for entry in files.values())
+
+    def test_missing_project_still_raises(self, tmp_path: Path):
+        prj = tmp_path / "missing.prj"
+        with pytest.raises(OSError):
+            parse_project(str(prj), cache=ProjectCache(str(prj), str(tmp_path / "cache")))
+
+    def test_concurrent_parse_with_cache(self, prtest1_prj: Path, tmp_path: Path):
+        cache_dir = str(tmp_path / "cache")
+        expected = parse_project(str(prtest1_prj))
+
+        first = parse_project(
+            str(prtest1_prj), cache=ProjectCache(str(prtest1_prj), cache_dir), max_workers=4
+        )
+        cache = ProjectCache(str(prtest1_prj), cache_dir)
+        second = parse_project(str(prtest1_prj), cache=cache, max_workers=4)
+
+        assert first == expected
+        assert second == expected
+        assert cache.misses == 0
+
+    def test_entry_added_during_save_is_written_later(self, tmp_project: Path, tmp_path: Path):
+        from hecras_runner.parser import parse_geom_file
+
+        cache_dir = str(tmp_path / "cache")
+        cache = ProjectCache(str(tmp_project), cache_dir)
+        parse_project(str(tmp_project), cache=cache)
+        geom = str(next(tmp_project.parent.glob("minimal.g*")))
+        _touch_later(Path(geom), "Geom Title=Renamed\n")
+        real_dump = json.dump
+
+        def dump_while_parsing(data, f):
+            # Another thread caches a new entry while this save is writing
+            cache.get_or_parse(geom, "geom", lambda: parse_geom_file(geom, "g01"))
+            real_dump(data, f)
+
+        cache._dirty = True  # something else is pending
+        with patch("hecras_runner.project_cache.json.dump", side_effect=dump_while_parsing):
+            cache.save()
+        cache.save()
+
+        with open(cache.path, encoding="utf-8") as f:
+            saved = json.load(f)["files"][os.path.basename(geom)]
+        assert saved["entry"]["title"] == "Renamed"
+        assert os.listdir(cache_dir) == [os.path.basename(cache.path)]
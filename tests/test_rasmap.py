@@ -0,0 +1,172 @@
+"""Tests for hecras_runner.rasmap."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from hecras_runner.rasmap import (
+    expand_layer_file,
+    parse_rasmap,
+    project_file_filter,
+    rasmap_path_for,
+    staged_files,
+    staged_size,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SMALL_PROJECT = REPO_ROOT / "test_projects" / "small_project_01.prj"
+
+RASMAP = """<RASMapper>
+  <Version>2.0.0</Version>
+  <RASProjectionFilename Filename=".\\Projection\\utm.prj" />
+  <Features Checked="True">
+    <Layer Name="Lines" Type="PolylineFeatureLayer" Filename=".\\Features\\Lines.shp" />
+  </Features>
+  <Geometries Checked="True">
+    <Layer Name="g01" Type="RASGeometry" Filename=".\\proj.g01.hdf" />
+  </Geometries>
+  <MapLayers Checked="True">
+    <Layer Name="LandCover" Type="LandCoverLayer" Filename=".\\Land Cover\\lc.hdf" />
+  </MapLayers>
+  <Terrains Checked="True">
+    <Layer Name="existing" Type="TerrainLayer" Filename=".\\Terrain\\existing.hdf" />
+  </Terrains>
+</RASMapper>
+"""
+
+
+def _project(root: Path) -> Path:
+    """Project with a terrain (HDF + VRT + tile), land cover and unused extras."""
+    prj = root / "proj.prj"
+    prj.write_text("Proj Title=Test\n")
+    (root / "proj.rasmap").write_text(RASMAP)
+
+    terrain = root / "Terrain"
+    terrain.mkdir()
+    (terrain / "existing.hdf").write_bytes(b"\x01" * 100)
+    (terrain / "existing.vrt").write_text(
+        '<VRTDataset><SimpleSource><SourceFilename relativeToVRT="1">'
+        "tiles/dem_a.tif</SourceFilename></SimpleSource></VRTDataset>"
+    )
+    (terrain / "tiles").mkdir()
+    (terrain / "tiles" / "dem_a.tif").write_bytes(b"\x02" * 200)
+    (terrain / "tiles" / "dem_old.tif").write_bytes(b"\x03" * 5000)  # unused
+    (terrain / "old_terrain.hdf").write_bytes(b"\x04" * 5000)  # unused
+
+    land = root / "Land Cover"
+    land.mkdir()
+    (land / "lc.hdf").write_bytes(b"\x05" * 10)
+    (land / "lc.tif").write_bytes(b"\x06" * 10)
+
+    (root / "Projection").mkdir()
+    (root / "Projection" / "utm.prj").write_text("PROJCS[]")
+
+    features = root / "Features"
+    features.mkdir()
+    for ext in (".shp", ".shx", ".dbf"):
+        (features / f"Lines{ext}").write_bytes(b"\x00")
+
+    (root / "data").mkdir()
+    (root / "data" / "inflow.dss").write_bytes(b"\x07" * 10)
+    return prj
+
+
+def _rel(paths: list[str], root: Path) -> set[str]:
+    return {os.path.relpath(p, root).replace(os.sep, "/") for p in paths}
+
+
+class TestParseRasmap:
+    def test_layers_and_projection(self, tmp_path: Path):
+        _project(tmp_path)
+        deps = parse_rasmap(str(tmp_path / "proj.rasmap"))
+        assert deps is not None
+        assert [t.name for t in deps.terrains] == ["existing"]
+        assert deps.terrains[0].filename == ".\\Terrain\\existing.hdf"
+        assert deps.terrains[0].exists
+        assert {layer.type for layer in deps.map_layers} == {
+            "LandCoverLayer",
+            "PolylineFeatureLayer",
+        }
+        assert deps.projection == str(tmp_path / "Projection" / "utm.prj")
+
+    def test_geometry_layers_ignored(self, tmp_path: Path):
+        _project(tmp_path)
+        deps = parse_rasmap(str(tmp_path / "proj.rasmap"))
+        assert deps is not None
+        assert all(not layer.path.endswith(".g01.hdf") for layer in deps.map_layers)
+
+    def test_invalid_xml(self, tmp_path: Path):
+        rasmap = tmp_path / "proj.rasmap"
+        rasmap.write_text("<RASMapper>")
+        assert parse_rasmap(str(rasmap)) is None
+
+    def test_missing_file(self, tmp_path: Path):
+        assert parse_rasmap(str(tmp_path / "nope.rasmap")) is None
+
+    def test_bundled_project(self):
+        deps = parse_rasmap(str(SMALL_PROJECT.with_suffix(".rasmap")))
+        assert deps is not None
+        assert [t.filename for t in deps.terrains] == [".\\Terrain\\existing_01\\existing_01.hdf"]
+        files = _rel(deps.terrain_files(), SMALL_PROJECT.parent)
+        assert "Terrain/existing_01/existing_01.hdf" in files
+        assert "Terrain/existing_01/existing_01.vrt" in files
+        assert "Terrain/existing_01/MergedInputs.vrt" not in files
+
+
+class TestExpandLayerFile:
+    def test_terrain_hdf_vrt_and_tiles(self, tmp_path: Path):
+        _project(tmp_path)
+        files = expand_layer_file(str(tmp_path / "Terrain" / "existing.hdf"))
+        assert _rel(files, tmp_path) == {
+            "Terrain/existing.hdf",
+            "Terrain/existing.vrt",
+            "Terrain/tiles/dem_a.tif",
+        }
+
+    def test_shapefile_sidecars(self, tmp_path: Path):
+        _project(tmp_path)
+        files = expand_layer_file(str(tmp_path / "Features" / "Lines.shp"))
+        assert _rel(files, tmp_path) == {
+            "Features/Lines.shp",
+            "Features/Lines.shx",
+            "Features/Lines.dbf",
+        }
+
+    def test_missing_layer(self, tmp_path: Path):
+        assert expand_layer_file(str(tmp_path / "Terrain" / "none.hdf")) == []
+
+    def test_vrt_cycle(self, tmp_path: Path):
+        (tmp_path / "a.vrt").write_text(
+            '<VRTDataset><SourceFilename relativeToVRT="1">a.vrt</SourceFilename></VRTDataset>'
+        )
+        assert _rel(expand_layer_file(str(tmp_path / "a.vrt")), tmp_path) == {"a.vrt"}
+
+
+class TestProjectFileFilter:
+    def test_no_rasmap_keeps_everything(self, tmp_path: Path):
+        prj = tmp_path / "proj.prj"
+        prj.write_text("Proj Title=Test\n")
+        assert rasmap_path_for(str(prj)) is None
+        assert project_file_filter(str(prj)) is None
+
+    def test_layer_folders_filtered(self, tmp_path: Path):
+        prj = _project(tmp_path)
+        keep = project_file_filter(str(prj))
+        assert keep is not None
+        assert keep(os.path.join("Terrain", "existing.hdf"))
+        assert keep(os.path.join("Terrain", "tiles", "dem_a.tif"))
+        assert not keep(os.path.join("Terrain", "old_terrain.hdf"))
+        assert not keep(os.path.join("Terrain", "tiles", "dem_old.tif"))
+        assert keep(os.path.join("Land Cover", "lc.tif"))
+        assert not keep(os.path.join("Features", "Lines.shp"))
+        # Folders the .rasmap does not mention are kept whole
+        assert keep(os.path.join("data", "inflow.dss"))
+
+    def test_staged_files_and_size(self, tmp_path: Path):
+        prj = _project(tmp_path)
+        staged = {f.replace(os.sep, "/") for f in staged_files(str(prj))}
+        assert "Terrain/old_terrain.hdf" not in staged
+        assert {"proj.prj", "proj.rasmap", "data/inflow.dss", "Projection/utm.prj"} <= staged
+        assert staged_size(str(prj)) == sum((tmp_path / rel).stat().st_size for rel in staged)
+        assert staged_size(str(prj)) < 5000
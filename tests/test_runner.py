@@ -489,11 +489,82 @@ class TestRunSimulations:
         assert results[0].plan_name == "plan01"
         assert results[0].success is True
 
-        # Temp dir should have been cleaned up
+        # Temp dir is deleted in the background
         import os
 
+        from hecras_runner.cleanup import get_cleanup_service
+
+        assert get_cleanup_service().wait_idle(timeout=10)
         assert not os.path.exists(os.path.dirname(temp_prj))
 
+    def test_holds_back_plans_when_scratch_is_short(self, tmp_project: Path):
+        """Plans that don't fit run in a later wave instead of failing."""
+        from collections import namedtuple
+
+        from hecras_runner.scratch import ScratchManager, directory_size
+
+        jobs = [
+            SimulationJob(plan_name="plan01", plan_suffix="01"),
+            SimulationJob(plan_name="plan02", plan_suffix="02"),
+        ]
+        project_bytes = directory_size(str(tmp_project.parent))
+        # Room for one staged copy plus results, not two
+        usage = namedtuple("usage", "total used free")(0, 0, int(project_bytes * 1.4))
+        scratch = ScratchManager(min_free_gb=0)
+
+        def fake_run(temp_prj, plan_name, **kwargs):
+            return SimulationResult(
+                plan_name=plan_name,
+                plan_suffix=kwargs["plan_suffix"],
+                success=True,
+                elapsed_seconds=1.0,
+            )
+
+        messages: list[str] = []
+        with (
+            patch("hecras_runner.scratch.shutil.disk_usage", return_value=usage),
+            patch("hecras_runner.runner.run_hecras_plan", side_effect=fake_run),
+        ):
+            results = run_simulations(
+                str(tmp_project),
+                jobs,
+                parallel=False,
+                cleanup=False,
+                backend="com",
+                log=messages.append,
+                scratch=scratch,
+            )
+
+        assert [r.plan_name for r in results] == ["plan01", "plan02"]
+        assert all(r.success for r in results)
+        assert any("holding back 1" in m for m in messages)
+
+    def test_fails_plans_when_no_scratch_space(self, tmp_project: Path):
+        from collections import namedtuple
+
+        from hecras_runner.scratch import ScratchManager
+
+        usage = namedtuple("usage", "total used free")(0, 0, 0)
+        jobs = [SimulationJob(plan_name="plan01", plan_suffix="01")]
+        with (
+            patch("hecras_runner.scratch.shutil.disk_usage", return_value=usage),
+            patch("hecras_runner.runner.run_hecras_plan") as mock_run,
+        ):
+            results = run_simulations(
+                str(tmp_project),
+                jobs,
+                parallel=False,
+                backend="com",
+                log=_nolog,
+                scratch=ScratchManager(min_free_gb=0, log=_nolog),
+                scratch_wait_seconds=0,
+            )
+
+        mock_run.assert_not_called()
+        assert len(results) == 1
+        assert results[0].success is False
+        assert results[0].error_message == "Insufficient scratch space"
+
     def test_returns_list_of_results(self, tmp_project: Path):
         """Verify return type is list[SimulationResult]."""
         jobs = [
@@ -591,6 +662,34 @@ class TestRunSimulations:
 
             shutil.rmtree(os.path.dirname(temp_prj))
 
+    def test_no_cleanup_stages_on_disk(self, tmp_project: Path, tmp_path: Path):
+        """Copies that are never deleted must not hold the RAM budget."""
+        from hecras_runner.scratch import ScratchManager
+
+        disk, ram = tmp_path / "disk", tmp_path / "ram"
+        disk.mkdir()
+        ram.mkdir()
+        scratch = ScratchManager([str(disk)], min_free_gb=0, ram_root=str(ram), ram_budget_gb=1)
+        jobs = [SimulationJob(plan_name="plan01", plan_suffix="01")]
+
+        mock_result = SimulationResult(
+            plan_name="plan01", plan_suffix="01", success=True, elapsed_seconds=1.0
+        )
+        with patch("hecras_runner.runner.run_hecras_plan", return_value=mock_result) as mock_run:
+            run_simulations(
+                str(tmp_project),
+                jobs,
+                parallel=False,
+                cleanup=False,
+                backend="com",
+                log=_nolog,
+                scratch=scratch,
+            )
+
+        temp_prj = Path(mock_run.call_args[0][0])
+        assert temp_prj.parent.parent == disk
+        assert list(ram.iterdir()) == []
+
     def test_cli_backend_dispatch(self, tmp_project: Path):
         """Verify backend='cli' dispatches to run_hecras_cli."""
         jobs = [SimulationJob(plan_name="plan01", plan_suffix="01")]
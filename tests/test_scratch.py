@@ -0,0 +1,212 @@
+"""Tests for hecras_runner.scratch — scratch root selection and reservations."""
+
+from __future__ import annotations
+
+import shutil
+from collections import namedtuple
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from hecras_runner.scratch import ScratchManager, directory_size, estimate_footprint
+from hecras_runner.settings import ScratchSettings
+
+_Usage = namedtuple("_Usage", "total used free")
+
+
+def _fake_usage(free_by_root: dict[str, int]):
+    def disk_usage(path: str) -> _Usage:
+        free = free_by_root[str(path)]
+        return _Usage(free * 2, free, free)
+
+    return disk_usage
+
+
+class TestFootprint:
+    def test_directory_size_recurses(self, tmp_path: Path):
+        (tmp_path / "a.txt").write_bytes(b"x" * 100)
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.txt").write_bytes(b"x" * 50)
+        assert directory_size(str(tmp_path)) == 150
+
+    def test_directory_size_missing_dir(self, tmp_path: Path):
+        assert directory_size(str(tmp_path / "nope")) == 0
+
+    def test_growth_factor_without_previous_results(self, tmp_path: Path):
+        (tmp_path / "model.prj").write_bytes(b"x" * 1000)
+        assert estimate_footprint(str(tmp_path / "model.prj"), "01") == 1250
+
+    def test_previous_results_size_used(self, tmp_path: Path):
+        (tmp_path / "model.prj").write_bytes(b"x" * 1000)
+        (tmp_path / "model.p01.hdf").write_bytes(b"x" * 3000)
+        # Project (including the old HDF) plus room for a new HDF of the same size
+        assert estimate_footprint(str(tmp_path / "model.prj"), "01") == 7000
+
+
+class TestScratchManager:
+    def test_headroom_policy_picks_most_free(self, tmp_path: Path):
+        a, b = tmp_path / "a", tmp_path / "b"
+        a.mkdir()
+        b.mkdir()
+        mgr = ScratchManager([str(a), str(b)], min_free_gb=0)
+        usage = _fake_usage({str(a): 1000, str(b): 5000})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            lease = mgr.try_reserve(500)
+        assert lease is not None
+        assert lease.root == str(b)
+
+    def test_priority_policy_picks_first_that_fits(self, tmp_path: Path):
+        a, b, c = tmp_path / "a", tmp_path / "b", tmp_path / "c"
+        for d in (a, b, c):
+            d.mkdir()
+        mgr = ScratchManager([str(a), str(b), str(c)], min_free_gb=0, policy="priority")
+        usage = _fake_usage({str(a): 100, str(b): 1000, str(c): 5000})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            lease = mgr.try_reserve(500)
+        assert lease is not None
+        assert lease.root == str(b)
+
+    def test_reservations_prevent_overcommit(self, tmp_path: Path):
+        mgr = ScratchManager([str(tmp_path)], min_free_gb=0)
+        usage = _fake_usage({str(tmp_path): 1000})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            first = mgr.try_reserve(600)
+            assert first is not None
+            assert mgr.try_reserve(600) is None
+
+            mgr.release(first)
+            assert mgr.try_reserve(600) is not None
+
+    def test_mark_staged_moves_bytes_out_of_reservation(self, tmp_path: Path):
+        mgr = ScratchManager([str(tmp_path)], min_free_gb=0)
+        usage = _fake_usage({str(tmp_path): 1000})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            lease = mgr.try_reserve(600)
+            assert lease is not None
+            mgr.mark_staged(lease, 500)
+            assert lease.outstanding == 100
+            assert mgr.available(str(tmp_path)) == 900
+
+            mgr.release(lease)
+            mgr.release(lease)  # second release is a no-op
+            assert mgr.available(str(tmp_path)) == 1000
+
+    def test_min_free_is_kept(self, tmp_path: Path):
+        mgr = ScratchManager([str(tmp_path)], min_free_gb=1.0)
+        usage = _fake_usage({str(tmp_path): 1024**3 + 100})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            assert mgr.try_reserve(200) is None
+            assert mgr.try_reserve(100) is not None
+
+    def test_reserve_times_out(self, tmp_path: Path):
+        messages: list[str] = []
+        mgr = ScratchManager([str(tmp_path)], min_free_gb=0, log=messages.append)
+        usage = _fake_usage({str(tmp_path): 10})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            assert mgr.reserve(100, timeout=0.05, poll_interval=0.01) is None
+        assert any("Waiting for" in m for m in messages)
+
+    def test_ram_root_preferred_when_within_budget(self, tmp_path: Path):
+        disk, ram = tmp_path / "disk", tmp_path / "ram"
+        disk.mkdir()
+        ram.mkdir()
+        mgr = ScratchManager(
+            [str(disk)], min_free_gb=0, ram_root=str(ram), ram_budget_gb=1000 / 1024**3
+        )
+        usage = _fake_usage({str(disk): 10_000, str(ram): 10_000})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            lease = mgr.try_reserve(600)
+            assert lease is not None
+            assert lease.in_memory is True
+            assert lease.root == str(ram)
+
+            # Staged bytes are measured on the RAM root instead of reserved
+            copy = ram / "HECRAS_a"
+            copy.mkdir()
+            (copy / "model.prj").write_bytes(b"x" * 400)
+            mgr.mark_staged(lease, 400)
+            assert mgr.ram_in_use() == 600
+            second = mgr.try_reserve(600)
+            assert second is not None
+            assert second.in_memory is False
+            assert second.root == str(disk)
+
+            # The released copy still occupies RAM until it is deleted
+            mgr.release(lease)
+            assert mgr.try_reserve(700).in_memory is False
+            assert mgr.try_reserve(600).in_memory is True
+
+    def test_ram_budget_freed_when_copy_deleted(self, tmp_path: Path):
+        disk, ram = tmp_path / "disk", tmp_path / "ram"
+        disk.mkdir()
+        ram.mkdir()
+        mgr = ScratchManager(
+            [str(disk)], min_free_gb=0, ram_root=str(ram), ram_budget_gb=1000 / 1024**3
+        )
+        usage = _fake_usage({str(disk): 10_000, str(ram): 10_000})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            lease = mgr.try_reserve(800)
+            copy = ram / "HECRAS_a"
+            copy.mkdir()
+            (copy / "model.p01.hdf").write_bytes(b"x" * 800)
+            mgr.mark_staged(lease, 800)
+            mgr.release(lease)
+            assert mgr.try_reserve(800).in_memory is False
+
+            shutil.rmtree(copy)
+            assert mgr.try_reserve(800).in_memory is True
+
+    def test_ram_not_used_when_disallowed(self, tmp_path: Path):
+        disk, ram = tmp_path / "disk", tmp_path / "ram"
+        disk.mkdir()
+        ram.mkdir()
+        mgr = ScratchManager([str(disk)], min_free_gb=0, ram_root=str(ram), ram_budget_gb=1.0)
+        usage = _fake_usage({str(disk): 10_000, str(ram): 10_000})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            lease = mgr.try_reserve(600, allow_ram=False)
+        assert lease is not None
+        assert lease.root == str(disk)
+
+    def test_ram_fallback_logged_once(self, tmp_path: Path):
+        messages: list[str] = []
+        mgr = ScratchManager(
+            [str(tmp_path)],
+            min_free_gb=0,
+            log=messages.append,
+            ram_root=str(tmp_path),
+            ram_budget_gb=100 / 1024**3,
+        )
+        usage = _fake_usage({str(tmp_path): 10_000})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            assert mgr.try_reserve(500).in_memory is False
+            assert mgr.try_reserve(500).in_memory is False
+        assert sum("RAM budget" in m for m in messages) == 1
+
+    def test_ram_root_limited_by_filesystem_size(self, tmp_path: Path):
+        disk, ram = tmp_path / "disk", tmp_path / "ram"
+        disk.mkdir()
+        ram.mkdir()
+        mgr = ScratchManager([str(disk)], min_free_gb=0, ram_root=str(ram), ram_budget_gb=1.0)
+        usage = _fake_usage({str(disk): 10_000, str(ram): 300})
+        with patch("hecras_runner.scratch.shutil.disk_usage", side_effect=usage):
+            lease = mgr.try_reserve(600)
+        assert lease is not None
+        assert lease.in_memory is False
+
+    def test_from_settings_ram_disk(self, tmp_path: Path):
+        settings = ScratchSettings(ram_disk=True, ram_disk_path=str(tmp_path), ram_budget_gb=2)
+        mgr = ScratchManager.from_settings(settings)
+        assert mgr.ram_root == str(tmp_path)
+        assert mgr.ram_budget_bytes == 2 * 1024**3
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError, match="policy"):
+            ScratchManager(policy="fastest")
+
+    def test_from_settings_defaults_to_system_temp(self):
+        import tempfile
+
+        mgr = ScratchManager.from_settings(ScratchSettings())
+        assert mgr.roots == [tempfile.gettempdir()]
+        assert mgr.policy == "headroom"
@@ -61,6 +61,18 @@ class TestLoadSettings:
         assert s.network.share_path == r"\\SRV\q"
         assert s.network.max_concurrent == 3
 
+    def test_loads_scratch_settings(self, tmp_path: Path):
+        data = {"scratch": {"temp_roots": ["D:\\scratch", ""], "min_free_gb": 20, "policy": ""}}
+        settings_file = tmp_path / "settings.json"
+        settings_file.write_text(json.dumps(data))
+
+        with patch("hecras_runner.settings._settings_path", return_value=str(settings_file)):
+            s = load_settings()
+
+        assert s.scratch.temp_roots == ["D:\\scratch"]
+        assert s.scratch.min_free_gb == 20.0
+        assert s.scratch.policy == "headroom"
+
     def test_corrupt_json_returns_defaults(self, tmp_path: Path):
         settings_file = tmp_path / "settings.json"
         settings_file.write_text("{bad json")
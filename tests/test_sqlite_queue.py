@@ -0,0 +1,275 @@
+"""Tests for hecras_runner.sqlite_queue — runs against real SQLite files."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from hecras_runner.sqlite_queue import SqliteQueueClient
+
+
+def _nolog(msg: str) -> None:
+    pass
+
+
+def _plans(n: int, **extra: object) -> list[dict]:
+    return [{"plan_name": f"plan{i:02d}", "plan_suffix": f"{i:02d}", **extra} for i in range(n)]
+
+
+@pytest.fixture
+def queue(tmp_path: Path):
+    client = SqliteQueueClient.connect(str(tmp_path / "queue.sqlite"), log=_nolog)
+    assert client is not None
+    yield client
+    client.close()
+
+
+class TestConnect:
+    def test_creates_schema_once(self, tmp_path: Path):
+        path = str(tmp_path / "sub" / "queue.sqlite")
+        first = SqliteQueueClient.connect(path, log=_nolog)
+        assert first is not None
+        first.submit_batch("p.prj", "P", _plans(1))
+        first.close()
+
+        second = SqliteQueueClient.connect(path, log=_nolog)
+        assert second is not None
+        worker = second.register_worker()
+        assert len(second.claim_jobs(worker.worker_id, 5)) == 1
+        second.close()
+
+    def test_unusable_path(self, tmp_path: Path):
+        (tmp_path / "queue.sqlite").mkdir()
+        messages: list[str] = []
+        assert (
+            SqliteQueueClient.connect(str(tmp_path / "queue.sqlite"), log=messages.append) is None
+        )
+        assert any("unavailable" in m for m in messages)
+
+
+class TestJobLifecycle:
+    def test_submit_claim_complete(self, queue: SqliteQueueClient):
+        worker = queue.register_worker(hecras_version="6.6")
+        batch = queue.submit_batch("p.prj", "P", _plans(2), submitted_by="alice")
+
+        jobs = queue.claim_jobs(worker.worker_id, 5)
+
+        assert [j["job_id"] for j in jobs] == batch.job_ids
+        assert jobs[0]["project_path"] == "p.prj"
+        assert jobs[0]["attempt"] == 1
+        assert queue.get_batch_status(batch.batch_id)["assigned"] == 2
+
+        assert queue.start_job(jobs[0]["job_id"], worker_id=worker.worker_id)
+        assert queue.get_batch_status(batch.batch_id)["status"] == "running"
+        queue.update_progress(jobs[0]["job_id"], 0.5)
+        assert queue.get_batch_jobs(batch.batch_id)[0]["progress"] == 0.5
+
+        assert queue.complete_job(jobs[0]["job_id"], True, 12.5, worker_id=worker.worker_id)
+        assert queue.complete_job(jobs[1]["job_id"], False, 1.0, error_message="boom")
+
+        status = queue.get_batch_status(batch.batch_id)
+        assert status["status"] == "failed"
+        assert (status["completed"], status["failed"]) == (1, 1)
+        done = queue.get_batch_jobs(batch.batch_id)
+        assert done[0]["elapsed_seconds"] == 12.5
+        assert done[1]["error_message"] == "boom"
+
+    def test_claim_job_empty_queue(self, queue: SqliteQueueClient):
+        worker = queue.register_worker()
+        assert queue.claim_job(worker.worker_id) is None
+        assert queue.claim_jobs(worker.worker_id, 0) == []
+
+    def test_unregistered_worker_claims_nothing(self, queue: SqliteQueueClient):
+        queue.submit_batch("p.prj", "P", _plans(1))
+        assert queue.claim_jobs("nobody", 1) == []
+
+    def test_batch_not_found(self, queue: SqliteQueueClient):
+        assert queue.get_batch_status("missing")["status"] == "not_found"
+
+    def test_other_workers_result_not_recorded(self, queue: SqliteQueueClient):
+        worker = queue.register_worker()
+        queue.submit_batch("p.prj", "P", _plans(1))
+        job = queue.claim_job(worker.worker_id)
+        assert job is not None
+
+        assert not queue.start_job(job["job_id"], worker_id="someone-else")
+        assert not queue.complete_job(job["job_id"], True, 1.0, worker_id="someone-else")
+
+    def test_heartbeat_writes_buffered_progress(self, queue: SqliteQueueClient):
+        worker = queue.register_worker()
+        batch = queue.submit_batch("p.prj", "P", _plans(1))
+        job = queue.claim_job(worker.worker_id)
+        assert job is not None
+
+        queue.start_heartbeat(worker.worker_id, interval=60, flush_interval=60)
+        queue.update_progress(job["job_id"], 0.75)
+        assert queue.get_batch_jobs(batch.batch_id)[0]["progress"] == 0.0
+        queue.stop_heartbeat()
+
+        assert queue.get_batch_jobs(batch.batch_id)[0]["progress"] == 0.75
+        assert [w["id"] for w in queue.get_active_workers()] == [worker.worker_id]
+
+    def test_flush_after_complete_keeps_final_progress(self, queue: SqliteQueueClient):
+        worker = queue.register_worker()
+        batch = queue.submit_batch("p.prj", "P", _plans(1))
+        job = queue.claim_job(worker.worker_id)
+        assert job is not None
+
+        # The flush took 0.5 from the buffer just before the job completed
+        assert queue.complete_job(job["job_id"], True, 1.0, worker_id=worker.worker_id)
+        queue._progress[job["job_id"]] = 0.5
+        queue.heartbeat(worker.worker_id)
+
+        assert queue.get_batch_jobs(batch.batch_id)[0]["progress"] == 1.0
+
+    def test_expired_lease_is_requeued_then_failed(self, tmp_path: Path):
+        queue = SqliteQueueClient(str(tmp_path / "q.sqlite"), log=_nolog, lease_seconds=-1)
+        queue.migrate()
+        worker = queue.register_worker()
+        batch = queue.submit_batch("p.prj", "P", _plans(1))
+
+        for _ in range(3):
+            assert queue.claim_job(worker.worker_id) is not None
+            assert queue.reap_expired_jobs() == 1
+
+        status = queue.get_batch_status(batch.batch_id)
+        assert status["status"] == "failed"
+        assert "on all 3 attempts" in queue.get_batch_jobs(batch.batch_id)[0]["error_message"]
+        queue.close()
+
+
+class TestClaimOrder:
+    def test_capabilities_filter_jobs(self, queue: SqliteQueueClient):
+        worker = queue.register_worker()
+        queue.submit_batch(
+            "p.prj",
+            "P",
+            [
+                {"plan_name": "big", "plan_suffix": "01", "requirements": {"ram_gb": 64}},
+                {"plan_name": "old", "plan_suffix": "02", "requirements": {"hecras_version": "5"}},
+                {"plan_name": "ok", "plan_suffix": "03", "requirements": {"hecras_version": "6"}},
+            ],
+        )
+
+        caps = {"ram_gb": 32, "hecras_version": "6.6"}
+        jobs = queue.claim_jobs(worker.worker_id, 5, capabilities=caps)
+
+        assert [j["plan_name"] for j in jobs] == ["ok"]
+
+    def test_cached_terrain_first(self, queue: SqliteQueueClient):
+        worker = queue.register_worker(capabilities={"terrain_hashes": ["t2"]})
+        queue.submit_batch("a.prj", "A", _plans(1, terrain_hash="t1"))
+        queue.submit_batch("b.prj", "B", _plans(1, terrain_hash="t2"))
+
+        job = queue.claim_job(worker.worker_id)
+
+        assert job is not None
+        assert job["terrain_hash"] == "t2"
+
+    def test_aging_is_capped_at_top_priority(self, tmp_path: Path):
+        queue = SqliteQueueClient(str(tmp_path / "q.sqlite"), log=_nolog, aging_seconds=0.001)
+        queue.migrate()
+        worker = queue.register_worker()
+        queue.submit_batch("sweep.prj", "Sweep", _plans(3), submitted_by="alice")
+        time.sleep(0.05)
+        queue.submit_batch("check.prj", "Check", _plans(1), submitted_by="bob")
+
+        jobs = queue.claim_jobs(worker.worker_id, 2)
+
+        # The older sweep does not outrank a later batch of the same priority
+        assert [j["project_path"] for j in jobs] == ["sweep.prj", "check.prj"]
+        queue.close()
+
+    def test_priority_then_fair_share(self, queue: SqliteQueueClient):
+        worker = queue.register_worker()
+        queue.submit_batch("sweep.prj", "Sweep", _plans(6), submitted_by="alice")
+        queue.submit_batch("check.prj", "Check", _plans(2), submitted_by="bob")
+        queue.submit_batch("urgent.prj", "Urgent", _plans(1), submitted_by="carol", priority=5)
+
+        jobs = queue.claim_jobs(worker.worker_id, 5)
+
+        assert [j["project_path"] for j in jobs] == [
+            "urgent.prj",
+            "sweep.prj",
+            "check.prj",
+            "sweep.prj",
+            "check.prj",
+        ]
+
+    def test_share_weight(self, queue: SqliteQueueClient):
+        worker = queue.register_worker()
+        queue.submit_batch("a.prj", "A", _plans(4), submitted_by="alice")
+        queue.submit_batch("b.prj", "B", _plans(4), submitted_by="bob")
+        with queue._write() as conn:
+            conn.execute("INSERT INTO user_shares VALUES ('alice', 2.0)")
+
+        jobs = queue.claim_jobs(worker.worker_id, 3)
+
+        assert [j["project_path"] for j in jobs].count("a.prj") == 2
+
+    def test_aging_lifts_old_jobs(self, tmp_path: Path):
+        queue = SqliteQueueClient(str(tmp_path / "q.sqlite"), log=_nolog, aging_seconds=0.001)
+        queue.migrate()
+        worker = queue.register_worker()
+        queue.submit_batch("old.prj", "Old", _plans(1), submitted_by="alice")
+        time.sleep(0.05)
+        queue.submit_batch("new.prj", "New", _plans(1), submitted_by="bob", priority=5)
+
+        job = queue.claim_job(worker.worker_id)
+
+        assert job is not None
+        assert job["project_path"] == "old.prj"
+        queue.close()
+
+
+class TestConcurrency:
+    def test_parallel_claims_never_share_a_job(self, tmp_path: Path):
+        path = str(tmp_path / "queue.sqlite")
+        setup = SqliteQueueClient.connect(path, log=_nolog)
+        assert setup is not None
+        batch = setup.submit_batch("p.prj", "P", _plans(200))
+        setup.close()
+
+        claimed: list[str] = []
+        lock = threading.Lock()
+
+        def _worker() -> None:
+            client = SqliteQueueClient(path, log=_nolog)
+            worker = client.register_worker()
+            while jobs := client.claim_jobs(worker.worker_id, 3):
+                with lock:
+                    claimed.extend(j["job_id"] for j in jobs)
+            client.close()
+
+        threads = [threading.Thread(target=_worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+
+        assert sorted(claimed) == sorted(batch.job_ids)
+
+    def test_wait_for_jobs_sees_other_connections(self, queue: SqliteQueueClient):
+        other = SqliteQueueClient(queue.path, log=_nolog)
+        timer = threading.Timer(0.1, other.submit_batch, ("p.prj", "P", _plans(1)))
+        timer.start()
+        try:
+            assert queue.wait_for_jobs(5) is True
+        finally:
+            timer.join()
+            other.close()
+        assert queue.wait_for_jobs(0.3) is False
+
+    def test_listen_for_jobs(self, queue: SqliteQueueClient):
+        stop = threading.Event()
+        payloads: list[str] = []
+        queue.listen_for_jobs(lambda batch_id: (payloads.append(batch_id), stop.set()), stop=stop)
+        time.sleep(0.1)
+
+        batch = SqliteQueueClient(queue.path, log=_nolog).submit_batch("p.prj", "P", _plans(1))
+
+        assert stop.wait(5)
+        assert payloads == [batch.batch_id]
@@ -0,0 +1,75 @@
+"""Tests for hecras_runner.synthetic — generated projects."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from hecras_runner.parser import parse_project
+from hecras_runner.preflight import validate_plans
+from hecras_runner.rasmap import parse_rasmap
+from hecras_runner.runner import SimulationJob
+from hecras_runner.synthetic import SyntheticSpec, generate_project, remove_results
+
+SMALL = SyntheticSpec(
+    plans=12,
+    geometries=3,
+    flows=6,
+    cross_sections=20,
+    boundaries_per_flow=3,
+    dss_files=2,
+    dss_mb=0.01,
+    terrain_gb=0.01,
+    terrain_tiles=2,
+    results_mb=0.5,
+)
+
+
+class TestGenerateProject:
+    def test_parses_with_expected_shape(self, tmp_path: Path):
+        prj = generate_project(str(tmp_path), SMALL)
+        project = parse_project(prj)
+
+        assert project.title == "synthetic"
+        assert project.current_plan == "p01"
+        assert [p.key for p in project.plans] == [f"p{i:02d}" for i in range(1, 13)]
+        assert [g.title for g in project.geometries] == [f"geometry_0{i}" for i in (1, 2, 3)]
+        assert len(project.flows) == 6
+        assert project.plans[3].geom_ref == "g01"
+        assert project.plans[6].flow_ref == "u01"
+        assert set(project.flows[0].dss_files) == {"synthetic_bc01.dss", "synthetic_bc02.dss"}
+
+    def test_passes_preflight(self, tmp_path: Path):
+        prj = generate_project(str(tmp_path), SMALL)
+        jobs = [SimulationJob(f"plan_{i:02d}", f"{i:02d}") for i in range(1, 13)]
+        report = validate_plans(prj, jobs)
+        assert report.issues == []
+
+    def test_terrain_and_results_sizes(self, tmp_path: Path):
+        prj = generate_project(str(tmp_path), SMALL)
+        terrain = tmp_path / "Terrain"
+        total = sum(f.stat().st_size for f in terrain.iterdir() if f.suffix in (".hdf", ".tif"))
+        assert total == int(0.01 * 1024**3)
+        deps = parse_rasmap(str(tmp_path / "synthetic.rasmap"))
+        assert deps is not None
+        assert [t.filename for t in deps.terrains] == [".\\Terrain\\terrain.hdf"]
+        # HDF, VRT and every tile
+        assert len(deps.terrain_files()) == 2 + SMALL.terrain_tiles
+        assert (tmp_path / "synthetic.p05.hdf").stat().st_size == 512 * 1024
+
+        remove_results(prj)
+        assert not list(tmp_path.glob("*.p??.hdf"))
+
+    def test_files_use_crlf(self, tmp_path: Path):
+        generate_project(str(tmp_path), SMALL)
+        data = (tmp_path / "synthetic.p01").read_bytes()
+        assert b"\r\n" in data
+        assert b"\n" not in data.replace(b"\r\n", b"")
+
+    def test_deterministic(self, tmp_path: Path):
+        generate_project(str(tmp_path / "a"), SMALL)
+        generate_project(str(tmp_path / "b"), SMALL)
+        for name in os.listdir(tmp_path / "a"):
+            a, b = tmp_path / "a" / name, tmp_path / "b" / name
+            if a.is_file():
+                assert a.read_bytes() == b.read_bytes(), name
@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import json
+import shutil
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from hecras_runner.transfer import (
+    TERRAIN_CACHE_MARKER,
     cleanup_share_job,
     compute_terrain_hash,
     is_result_file,
@@ -92,6 +95,84 @@ class TestShareToLocal:
         assert (local / "myproject.p01").exists()
         assert (local / "Terrain" / "source.tif").exists()
 
+    def test_rasmap_terrain_transferred_and_cached_by_file(self, tmp_path: Path):
+        project_dir = tmp_path / "project"
+        project_dir.mkdir()
+        prj = _make_project(project_dir, "myproject")
+        (project_dir / "myproject.rasmap").write_text(
+            '<RASMapper><Terrains><Layer Name="t" Type="TerrainLayer" '
+            'Filename=".\\Terrain\\t.hdf" /></Terrains></RASMapper>'
+        )
+        (project_dir / "Terrain" / "t.hdf").write_bytes(b"\x03" * 100)
+        share = tmp_path / "share"
+        cache = tmp_path / "cache"
+
+        manifest = project_to_share(str(prj), str(share), "job-003", "01", log=_nolog)
+        assert manifest.terrain_files == ["Terrain/t.hdf"]
+        assert "Terrain/t.hdf" in manifest.files
+        # source.tif is not part of the referenced terrain
+        assert not (Path(manifest.share_project_dir) / "Terrain" / "source.tif").exists()
+
+        share_to_local(manifest, str(tmp_path / "first"), log=_nolog, terrain_cache_dir=str(cache))
+        cached = cache / manifest.terrain_hash / "Terrain" / "t.hdf"
+        assert cached.read_bytes() == b"\x03" * 100
+
+        # A cache hit restores the terrain without reading it from the share
+        (Path(manifest.share_project_dir) / "Terrain" / "t.hdf").unlink()
+        second = tmp_path / "second"
+        share_to_local(manifest, str(second), log=_nolog, terrain_cache_dir=str(cache))
+        assert (second / "Terrain" / "t.hdf").read_bytes() == b"\x03" * 100
+        assert (second / "myproject.p01").exists()
+
+    def test_partial_cache_entry_is_not_trusted(self, tmp_path: Path):
+        project_dir = tmp_path / "project"
+        project_dir.mkdir()
+        prj = _make_project(project_dir, "myproject")
+        manifest = project_to_share(str(prj), str(tmp_path / "share"), "job-004", "01", log=_nolog)
+        cache = tmp_path / "cache"
+        # Left by a worker killed while copying: no completion marker
+        partial = cache / manifest.terrain_hash
+        partial.mkdir(parents=True)
+        (partial / "source.tif").write_bytes(b"\x01" * 10)
+
+        local = tmp_path / "local"
+        share_to_local(manifest, str(local), log=_nolog, terrain_cache_dir=str(cache))
+
+        assert (local / "Terrain" / "source.tif").exists()
+        entry = cache / manifest.terrain_hash
+        assert (entry / TERRAIN_CACHE_MARKER).exists()
+        assert (entry / "source.tif").stat().st_size == 500
+        assert [p.name for p in cache.iterdir()] == [manifest.terrain_hash]
+
+        # The marker is not copied into a restored project
+        again = tmp_path / "again"
+        share_to_local(manifest, str(again), log=_nolog, terrain_cache_dir=str(cache))
+        assert not (again / "Terrain" / TERRAIN_CACHE_MARKER).exists()
+        assert (again / "Terrain" / "source.tif").exists()
+
+    def test_failed_cache_fill_leaves_no_entry(self, tmp_path: Path):
+        project_dir = tmp_path / "project"
+        project_dir.mkdir()
+        prj = _make_project(project_dir, "myproject")
+        manifest = project_to_share(str(prj), str(tmp_path / "share"), "job-005", "01", log=_nolog)
+        cache = tmp_path / "cache"
+        messages: list[str] = []
+        real_copytree = shutil.copytree
+
+        def _copytree(src, dst, *args, **kwargs):
+            if str(dst).startswith(str(cache)):
+                raise OSError("disk full")
+            return real_copytree(src, dst, *args, **kwargs)
+
+        with patch("hecras_runner.transfer.shutil.copytree", side_effect=_copytree):
+            local_prj = share_to_local(
+                manifest, str(tmp_path / "local"), log=messages.append, terrain_cache_dir=str(cache)
+            )
+
+        assert Path(local_prj).exists()
+        assert list(cache.iterdir()) == []
+        assert any("Could not cache terrain data" in m for m in messages)
+
 
 class TestResultsToShare:
     def test_copies_result_files(self, tmp_path: Path):
@@ -199,6 +280,16 @@ class TestComputeTerrainHash:
 
         assert h1 != h2
 
+    def test_only_listed_files_hashed(self, tmp_path: Path):
+        terrain = tmp_path / "Terrain"
+        terrain.mkdir()
+        (terrain / "t.hdf").write_bytes(b"\x01" * 500)
+        h1 = compute_terrain_hash(str(tmp_path), ["Terrain/t.hdf"])
+
+        (terrain / "unused.tif").write_bytes(b"\x02" * 500)
+        assert compute_terrain_hash(str(tmp_path), ["Terrain/t.hdf"]) == h1
+        assert compute_terrain_hash(str(tmp_path)) != h1
+
 
 class TestCleanupShareJob:
     def test_removes_job_directories(self, tmp_path: Path):